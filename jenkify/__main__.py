@@ -2,13 +2,25 @@
 import click
 
 from jenkify.cli.jenkins.basic.commands import jenkins_basic_commands
+from jenkify.cli.jenkins.catalog.commands import jenkins_catalog_commands
+from jenkify.cli.jenkins.daemon.commands import jenkins_daemon_commands
 from jenkify.cli.jenkins.example.commands import jenkins_example_commands
+from jenkify.cli.jenkins.history.commands import jenkins_history_commands
+from jenkify.cli.jenkins.load_test.commands import jenkins_load_test_commands
+from jenkify.cli.jenkins.logs.commands import jenkins_logs_commands
+from jenkify.cli.jenkins.test_results.commands import jenkins_test_results_commands
 from jenkify.cli.jenkins.yaml.commands import jenkins_yaml_commands
 
 # noinspection PyTypeChecker
 cli = click.CommandCollection(sources=[
     jenkins_basic_commands,
+    jenkins_catalog_commands,
+    jenkins_daemon_commands,
     jenkins_example_commands,
+    jenkins_history_commands,
+    jenkins_load_test_commands,
+    jenkins_logs_commands,
+    jenkins_test_results_commands,
     jenkins_yaml_commands,
 ])
 
@@ -2,6 +2,8 @@
 import click
 from typeguard import typechecked
 
+from jenkify.utils.request_hedging import DEFAULT_HEDGE_BUDGET_PERCENT
+
 
 @typechecked
 def verbose_option(func):
@@ -15,3 +17,65 @@ def input_file_option(func):
     """A decorator for the input file command line argument"""
     return click.option('-if', '--input-file', type=click.STRING, is_flag=False, required=True,
                         help='Input file path')(func)
+
+
+@typechecked
+def events_option(func):
+    """A decorator for the build events output format command line argument"""
+    return click.option('-ev', '--events', type=click.Choice(['ndjson']), is_flag=False, required=False,
+                        help='Stream build state transitions as they happen in the given format')(func)
+
+
+@typechecked
+def events_output_option(func):
+    """A decorator for the build events output path command line argument"""
+    return click.option('-evo', '--events-output', type=click.STRING, is_flag=False, required=False,
+                        default='-', help='File or FIFO path to stream build events to (default: stdout)')(func)
+
+
+@typechecked
+def record_option(func):
+    """A decorator for the HTTP cassette recording path command line argument"""
+    return click.option('-rec', '--record', type=click.STRING, is_flag=False, required=False,
+                        help='Record every HTTP request and response with its latency to this cassette file')(func)
+
+
+@typechecked
+def replay_option(func):
+    """A decorator for the HTTP cassette replay path command line argument"""
+    return click.option('-rep', '--replay', type=click.STRING, is_flag=False, required=False,
+                        help='Serve HTTP requests from this recorded cassette file instead of Jenkins')(func)
+
+
+@typechecked
+def replay_latency_scale_option(func):
+    """A decorator for the HTTP cassette replay latency scale command line argument"""
+    return click.option('-rls', '--replay-latency-scale', type=click.FloatRange(min=0), is_flag=False,
+                        required=False, default=1.0,
+                        help='Multiply recorded latencies by this factor when replaying (0 for none)')(func)
+
+
+@typechecked
+def deadline_option(func):
+    """A decorator for the command deadline command line argument"""
+    return click.option('-dl', '--deadline', type=click.FloatRange(min=0), is_flag=False, required=False,
+                        help='Seconds the whole command may take: requests are cut short and builds still running '
+                             'at the deadline are reported as TIMEOUT')(func)
+
+
+@typechecked
+def hedge_percentile_option(func):
+    """A decorator for the GET request hedging percentile command line argument"""
+    return click.option('-hp', '--hedge-percentile', type=click.FloatRange(min=50, max=100), is_flag=False,
+                        required=False,
+                        help='Hedge GET requests: send a duplicate of a request outstanding for longer than this '
+                             'percentile of its host\'s recent latencies, and use whichever answers first')(func)
+
+
+@typechecked
+def hedge_budget_option(func):
+    """A decorator for the GET request hedging budget command line argument"""
+    return click.option('-hb', '--hedge-budget', type=click.FloatRange(min=0, max=100), is_flag=False,
+                        required=False, default=DEFAULT_HEDGE_BUDGET_PERCENT,
+                        help='Maximum percentage of the GET requests to a host which are hedged '
+                             '(with --hedge-percentile)')(func)
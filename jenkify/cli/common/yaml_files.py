@@ -0,0 +1,22 @@
+"""Shared loading of the YAML files given to commands"""
+import logging
+import sys
+
+import yaml
+from click import FileError
+from typeguard import typechecked
+
+
+@typechecked
+def load_yaml_file_or_exit(yaml_file_path: str) -> dict:
+    """
+    Loads a YAML file given to a command, exiting if it cannot be loaded
+    :param yaml_file_path: Path of the YAML file
+    :return: dict of the YAML file
+    """
+    try:
+        with open(yaml_file_path, 'r', encoding='utf-8') as yaml_file:
+            return yaml.safe_load(yaml_file)
+    except FileError as exception:
+        logging.fatal("Could not load file: %s -> %s", yaml_file_path, exception.message)
+        sys.exit(1)
@@ -7,13 +7,17 @@ from http import HTTPStatus
 import click
 from typeguard import typechecked
 
-from jenkify.cli.common.options import verbose_option
+from jenkify.cli.common.options import verbose_option, deadline_option
 from jenkify.cli.jenkins.basic.options import (
-  job_name_option, build_number_option, url_end_option, build_parameters_option,
+  job_name_option, build_number_option, url_end_option, build_parameters_option, log_store_option,
+  log_store_codec_option, tail_option, line_range_option,
 )
+from jenkify.use_cases.jenkins_console_output import JenkinsConsoleOutputUseCase, parse_line_range
 from jenkify.use_cases.jenkins_job_info import JenkinsJobInfoUseCase
+from jenkify.utils.jenkins.jenkins_log_store import JenkinsBuildLogStore
 from jenkify.utils.jenkins.jenkins_rest_api.jenkins_utils import JenkinsUtils
 from jenkify.utils.logging_utils import initialize_logging
+from jenkify.utils.request_deadline import start_request_deadline
 
 
 @click.group(name='jenkins_basic_commands')
@@ -24,12 +28,14 @@ def jenkins_basic_commands() -> None:
 class BasicCommands(ABC):
     @jenkins_basic_commands.command()
     @verbose_option
+    @deadline_option
     @job_name_option
     @staticmethod
     @typechecked
-    def start_build(verbose: bool, job_name: str) -> None:
+    def start_build(verbose: bool, deadline: float | None, job_name: str) -> None:
         """Kicks off a Jenkins job build based on job name"""
         initialize_logging(verbose)
+        start_request_deadline(deadline)
         logging.info('Kicking off build (%s)...', job_name)
         if JenkinsUtils().start_jenkins_build(job_name).status_code == HTTPStatus.CREATED:
             logging.info('Successfully kicked off build (%s)!', job_name)
@@ -38,13 +44,15 @@ class BasicCommands(ABC):
 
     @jenkins_basic_commands.command()
     @verbose_option
+    @deadline_option
     @url_end_option
     @build_parameters_option
     @staticmethod
     @typechecked
-    def start_build_url(verbose: bool, url_end: str, build_parameters: str | None) -> None:
+    def start_build_url(verbose: bool, deadline: float | None, url_end: str, build_parameters: str | None) -> None:
         """Starts Jenkins job based on URL ending"""
         initialize_logging(verbose)
+        start_request_deadline(deadline)
         logging.info('Kicking off build (%s)...', url_end)
         if (JenkinsUtils().start_jenkins_build_url_end(
                 JenkinsUtils.trim_url_end_option_util(url_end),
@@ -56,29 +64,56 @@ class BasicCommands(ABC):
 
     @jenkins_basic_commands.command()
     @verbose_option
+    @deadline_option
     @job_name_option
     @build_number_option
+    @log_store_option
+    @log_store_codec_option
+    @tail_option
+    @line_range_option
     @staticmethod
     @typechecked
-    def get_console_output(verbose: bool, job_name: str, build_number: int) -> None:
+    def get_console_output(verbose: bool,
+                           deadline: float | None,
+                           job_name: str,
+                           build_number: int,
+                           *,
+                           log_store: str | None,
+                           log_store_codec: str,
+                           tail: int | None,
+                           line_range: str | None) -> None:
         """Gets console output for specific Jenkins job build"""
+        if tail is not None and line_range is not None:
+            raise click.UsageError('--tail and --line-range are mutually exclusive')
+        try:
+            first_line_number, last_line_number = parse_line_range(line_range) if line_range else (1, None)
+        except ValueError as exception:
+            raise click.BadParameter(str(exception), param_hint='--line-range') from exception
         initialize_logging(verbose)
+        start_request_deadline(deadline)
         logging.info('Getting console output for (%s) build number #%s...',
                      job_name,
                      build_number)
+        console_output_use_case = JenkinsConsoleOutputUseCase(
+            jenkins_build_log_store=JenkinsBuildLogStore(log_store, log_store_codec) if log_store else None)
         logging.info('Console output: \n%s',
-                     JenkinsUtils()
-                     .get_jenkins_build_console_output(job_name, build_number))
+                     '\n'.join(console_output_use_case.get_build_console_output_lines(f'job/{job_name}',
+                                                                                     build_number,
+                                                                                     first_line_number,
+                                                                                     last_line_number,
+                                                                                     tail)))
 
     @jenkins_basic_commands.command()
     @verbose_option
+    @deadline_option
     @job_name_option
     @build_number_option
     @staticmethod
     @typechecked
-    def get_jenkins_build_json(verbose: bool, job_name: str, build_number: int) -> None:
+    def get_jenkins_build_json(verbose: bool, deadline: float | None, job_name: str, build_number: int) -> None:
         """Gets Jenkins job build JSON data from REST API"""
         initialize_logging(verbose)
+        start_request_deadline(deadline)
         logging.info('Getting API JSON for (%s) build number #%s...',
                      job_name,
                      build_number)
@@ -88,13 +123,15 @@ class BasicCommands(ABC):
 
     @jenkins_basic_commands.command()
     @verbose_option
+    @deadline_option
     @url_end_option
     @build_number_option
     @staticmethod
     @typechecked
-    def get_jenkins_job_status(verbose: bool, url_end: str, build_number: int) -> None:
+    def get_jenkins_job_status(verbose: bool, deadline: float | None, url_end: str, build_number: int) -> None:
         """Gets jenkins_responses job status"""
         initialize_logging(verbose)
+        start_request_deadline(deadline)
         url_end = JenkinsUtils.trim_url_end_option_util(url_end)
         logging.info('Getting job status for (%s) build number #%s...', url_end, build_number)
         job_status = JenkinsJobInfoUseCase().get_jenkins_job_result_status(url_end, build_number)
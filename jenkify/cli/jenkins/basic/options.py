@@ -2,6 +2,8 @@
 import click
 from typeguard import typechecked
 
+from jenkify.utils.jenkins.jenkins_log_store import DEFAULT_LOG_STORE_CODEC, LOG_STORE_CODECS
+
 
 @typechecked
 def job_name_option(func):
@@ -29,3 +31,32 @@ def build_parameters_option(func):
     """Build parameters command line argument"""
     return click.option('-bp', '--build-parameters', type=click.STRING, is_flag=False, required=False,
                       help='Build parameters as raw JSON')(func)
+
+
+@typechecked
+def log_store_option(func):
+    """Local build log store directory command line argument"""
+    return click.option('-ls', '--log-store', type=click.STRING, is_flag=False, required=False,
+                        help='Directory to store finished builds\' logs in and serve them from')(func)
+
+
+@typechecked
+def log_store_codec_option(func):
+    """Local build log store compression command line argument"""
+    return click.option('-lsc', '--log-store-codec', type=click.Choice(list(LOG_STORE_CODECS)), is_flag=False,
+                        required=False, default=DEFAULT_LOG_STORE_CODEC,
+                        help='Compression of newly stored logs')(func)
+
+
+@typechecked
+def tail_option(func):
+    """Amount of lines from the end of the log command line argument"""
+    return click.option('-t', '--tail', type=click.IntRange(min=0), is_flag=False, required=False,
+                        help='Only output this many lines from the end of the log')(func)
+
+
+@typechecked
+def line_range_option(func):
+    """Range of log lines command line argument"""
+    return click.option('-lr', '--line-range', type=click.STRING, is_flag=False, required=False,
+                        help='Only output this line (e.g. 42) or inclusive range of lines (e.g. 100-150, 100-)')(func)
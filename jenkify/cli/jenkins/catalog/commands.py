@@ -0,0 +1,90 @@
+"""Jenkins job catalog CLI commands module"""
+import asyncio
+import logging
+import sys
+from abc import ABC
+
+import click
+import yaml
+from dotenv import load_dotenv
+from typeguard import typechecked
+
+from jenkify.cli.common.options import verbose_option, deadline_option
+from jenkify.cli.common.yaml_files import load_yaml_file_or_exit
+from jenkify.cli.jenkins.catalog.options import (
+    catalog_build_jobs_yaml_file_option,
+    host_urls_option,
+    job_catalog_option,
+    select_option,
+    ttl_minutes_option,
+)
+from jenkify.cli.jenkins.yaml.options import max_concurrent_requests_per_host_option
+from jenkify.constants.jenkins_yaml import BUILD, HOSTS, URL, END_GLOB
+from jenkify.use_cases.jenkins_job_catalog import get_job_selector_pattern, index_jobs
+from jenkify.utils.environment.Environment import Environment
+from jenkify.utils.jenkins.jenkins_job_catalog_store import JenkinsJobCatalogStore
+from jenkify.utils.logging_utils import initialize_logging
+from jenkify.utils.request_deadline import start_request_deadline
+
+
+@click.group(name='jenkins_catalog_commands')
+def jenkins_catalog_commands() -> None:
+    """Entry point"""
+
+
+class CatalogCommands(ABC):
+    @jenkins_catalog_commands.command()
+    @verbose_option
+    @deadline_option
+    @job_catalog_option
+    @catalog_build_jobs_yaml_file_option
+    @host_urls_option
+    @ttl_minutes_option
+    @select_option
+    @max_concurrent_requests_per_host_option
+    @staticmethod
+    @typechecked
+    def index_jobs(verbose: bool,
+                   deadline: float | None,
+                   job_catalog: str,
+                   *,
+                   build_jobs_yaml: str | None,
+                   host_urls: tuple,
+                   ttl_minutes: int,
+                   select: str | None,
+                   max_concurrent_requests_per_host: int) -> None:
+        """Crawls the jobs of each host into the local job catalog, re-crawling only folders past their TTL"""
+        load_dotenv()
+        initialize_logging(verbose)
+        start_request_deadline(deadline)
+        selected_host_urls = list(host_urls)
+        if build_jobs_yaml is not None:
+            build_jobs_dict = load_yaml_file_or_exit(build_jobs_yaml)
+            selected_host_urls.extend(host[URL] for host in build_jobs_dict[BUILD][HOSTS])
+        if len(selected_host_urls) == 0:
+            selected_host_urls.append(Environment.get_jenkins_request_settings_from_env().url)
+        selected_host_urls = list(dict.fromkeys(selected_host_urls))
+        logging.info('Indexing the jobs of %s host(s) into %s...', len(selected_host_urls), job_catalog)
+        jenkins_job_catalog_store = JenkinsJobCatalogStore(job_catalog)
+        try:
+            crawl_counts = asyncio.run(index_jobs(jenkins_job_catalog_store,
+                                                  selected_host_urls,
+                                                  ttl_minutes,
+                                                  max_concurrent_requests_per_host))
+            job_counts = jenkins_job_catalog_store.get_job_counts()
+            for host_url, host_crawl_counts in crawl_counts.items():
+                logging.info('Indexed %s job(s) on %s, %s folder quer(ies) made, %s failed',
+                             job_counts.get(host_url, 0),
+                             host_url,
+                             host_crawl_counts['queried'],
+                             host_crawl_counts['failed'])
+            if select is not None:
+                job_selector_pattern = get_job_selector_pattern({END_GLOB: select})
+                selected_url_ends = {host_url: list(filter(job_selector_pattern.fullmatch,
+                                                           jenkins_job_catalog_store.get_job_url_ends(host_url)))
+                                     for host_url in selected_host_urls}
+                click.echo(yaml.safe_dump(selected_url_ends, sort_keys=False), nl=False)
+        finally:
+            jenkins_job_catalog_store.close()
+        if any(host_crawl_counts['failed'] > 0 for host_crawl_counts in crawl_counts.values()):
+            sys.exit(1)
@@ -0,0 +1,69 @@
+"""Jenkins job catalog command-line options"""
+import click
+from typeguard import typechecked
+
+from jenkify.use_cases.jenkins_job_catalog import DEFAULT_JOB_CATALOG_TTL_MINUTES
+from jenkify.utils.jenkins.jenkins_job_catalog_store import DEFAULT_JOB_CATALOG_STORE_PATH
+
+
+@typechecked
+def job_catalog_option(func):
+    """Job catalog file"""
+    return click.option('-jc',
+                        '--job-catalog',
+                        type=click.STRING,
+                        is_flag=False,
+                        required=False,
+                        default=DEFAULT_JOB_CATALOG_STORE_PATH,
+                        help='SQLite file the job catalog is stored in'
+                        )(func)
+
+
+@typechecked
+def catalog_build_jobs_yaml_file_option(func):
+    """Build jobs YAML file selecting the hosts to index"""
+    return click.option('-bjy',
+                        '--build-jobs-yaml',
+                        type=click.STRING,
+                        is_flag=False,
+                        required=False,
+                        help='Index every host of this build jobs YAML file'
+                        )(func)
+
+
+@typechecked
+def host_urls_option(func):
+    """URLs of the hosts to index"""
+    return click.option('-hu',
+                        '--host-url',
+                        'host_urls',
+                        type=click.STRING,
+                        multiple=True,
+                        required=False,
+                        help='URL of a host to index (repeatable), JENKINS_URL if no host is selected'
+                        )(func)
+
+
+@typechecked
+def ttl_minutes_option(func):
+    """Time to live of the indexed folders"""
+    return click.option('-ttl',
+                        '--ttl-minutes',
+                        type=click.IntRange(min=0),
+                        is_flag=False,
+                        required=False,
+                        default=DEFAULT_JOB_CATALOG_TTL_MINUTES,
+                        help='Only re-crawl folders indexed longer ago than this, 0 to re-crawl everything'
+                        )(func)
+
+
+@typechecked
+def select_option(func):
+    """Job glob to list after indexing"""
+    return click.option('-s',
+                        '--select',
+                        type=click.STRING,
+                        is_flag=False,
+                        required=False,
+                        help='Output the URL ends matching this end-glob on each host as YAML'
+                        )(func)
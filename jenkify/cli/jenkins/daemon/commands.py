@@ -0,0 +1,29 @@
+"""Jenkins daemon CLI commands module"""
+from abc import ABC
+
+import click
+from dotenv import load_dotenv
+from typeguard import typechecked
+
+from jenkify.cli.common.options import verbose_option
+from jenkify.cli.jenkins.daemon.options import socket_path_option
+from jenkify.utils.daemon.server import serve_daemon
+from jenkify.utils.logging_utils import initialize_logging
+
+
+@click.group(name='jenkins_daemon_commands')
+def jenkins_daemon_commands() -> None:
+    """Entry point"""
+
+
+class DaemonCommands(ABC):
+    @jenkins_daemon_commands.command()
+    @verbose_option
+    @socket_path_option
+    @staticmethod
+    @typechecked
+    def serve(verbose: bool, socket_path: str) -> None:
+        """Runs a long-lived daemon which keeps host connections warm for submitted commands"""
+        load_dotenv()
+        initialize_logging(verbose)
+        serve_daemon(socket_path, click.get_current_context().find_root().command)
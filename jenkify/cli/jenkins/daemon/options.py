@@ -0,0 +1,31 @@
+"""Daemon command-line options"""
+import click
+from typeguard import typechecked
+
+from jenkify.utils.daemon.server import get_default_daemon_socket_path
+
+
+@typechecked
+def socket_path_option(func):
+    """Unix socket path the daemon listens on"""
+    return click.option('-sp',
+                        '--socket-path',
+                        type=click.STRING,
+                        is_flag=False,
+                        required=False,
+                        default=get_default_daemon_socket_path,
+                        show_default='$XDG_RUNTIME_DIR/jenkify.sock',
+                        help='Unix socket path for the daemon to listen on, only accessible to its owner'
+                        )(func)
+
+
+@typechecked
+def daemon_socket_option(func):
+    """Unix socket path of a running daemon to submit the command to"""
+    return click.option('-ds',
+                        '--daemon-socket',
+                        type=click.STRING,
+                        is_flag=False,
+                        required=False,
+                        help='Submit the command to the jenkify daemon listening on this Unix socket'
+                        )(func)
@@ -10,14 +10,23 @@ import yaml
 from dotenv import load_dotenv
 from typeguard import typechecked
 
-from jenkify.cli.common.options import verbose_option
+from jenkify.cli.common.options import verbose_option, deadline_option
 from jenkify.cli.jenkins.basic.options import job_name_option
-from jenkify.cli.jenkins.example.options import with_failure_option
+from jenkify.cli.jenkins.example.options import (
+    with_failure_option,
+    run_count_option,
+    iterations_option,
+    request_count_option,
+    budget_micros_option,
+)
 from jenkify.constants.jenkins_env import JENKINS_URL, JENKINS_USER, JENKINS_TOKEN
 from jenkify.utils.jenkins.jekins_request_settings import JenkinsRequestSettings
+from jenkify.utils.jenkins.jenkins_request_benchmark import benchmark_request_overhead, get_over_budget_endpoints
 from jenkify.utils.jenkins.jenkins_wfapi.base import get_job_name_and_run_count
 from jenkify.utils.jenkins.jenkins_wfapi.runs import get_job_runs_response_content
+from jenkify.utils.json.json_benchmark import benchmark_json_decoding, get_synthetic_job_runs_content
 from jenkify.utils.logging_utils import initialize_logging, logging_line_break
+from jenkify.utils.request_deadline import start_request_deadline
 
 
 @click.group(name='jenkins_example_commands')
@@ -61,13 +70,15 @@ class ExampleCommands(ABC):
 
     @jenkins_example_commands.command()
     @verbose_option
+    @deadline_option
     @job_name_option
     @staticmethod
     @typechecked
-    def get_run_count(verbose: bool, job_name: str) -> None:
+    def get_run_count(verbose: bool, deadline: float | None, job_name: str) -> None:
         """Gets the run count for a specific job"""
         load_dotenv()
         initialize_logging(verbose)
+        start_request_deadline(deadline)
         logging_line_break()
         logging.info('%s', json.dumps(get_job_name_and_run_count(
             JenkinsRequestSettings(
@@ -80,13 +91,15 @@ class ExampleCommands(ABC):
 
     @jenkins_example_commands.command()
     @verbose_option
+    @deadline_option
     @job_name_option
     @staticmethod
     @typechecked
-    def get_job_runs_content(verbose: bool, job_name: str) -> None:
+    def get_job_runs_content(verbose: bool, deadline: float | None, job_name: str) -> None:
         """Gets the run data for a specific job"""
         load_dotenv()
         initialize_logging(verbose)
+        start_request_deadline(deadline)
         logging_line_break()
         logging.info('%s', json.dumps(get_job_runs_response_content(
             JenkinsRequestSettings(
@@ -96,3 +109,42 @@ class ExampleCommands(ABC):
             ),
             job_name,
         ), indent=2))
+
+    @jenkins_example_commands.command()
+    @verbose_option
+    @run_count_option
+    @iterations_option
+    @staticmethod
+    @typechecked
+    def benchmark_json_decoding(verbose: bool, run_count: int, iterations: int) -> None:
+        """Compares the JSON codecs and streaming decoding on a synthetic wfapi/runs payload"""
+        initialize_logging(verbose)
+        logging_line_break()
+        content = get_synthetic_job_runs_content(run_count)
+        logging.info('Decoding %s runs (%s KiB) %s time(s) per strategy...',
+                     run_count,
+                     len(content) // 1024,
+                     iterations)
+        logging.info('\n%s', yaml.dump(benchmark_json_decoding(content, iterations), sort_keys=False))
+        logging_line_break()
+
+    @jenkins_example_commands.command()
+    @verbose_option
+    @request_count_option
+    @budget_micros_option
+    @staticmethod
+    @typechecked
+    def benchmark_request_overhead(verbose: bool, request_count: int, budget_micros: float) -> None:
+        """Measures the client-side CPU time per polling request, failing if it exceeds the budget"""
+        initialize_logging(verbose)
+        logging_line_break()
+        logging.info('Timing %s request(s) per endpoint against canned responses...', request_count)
+        cpu_micros_per_request = benchmark_request_overhead(request_count)
+        logging.info('\n%s', yaml.dump(cpu_micros_per_request, sort_keys=False))
+        logging_line_break()
+        over_budget_endpoints = get_over_budget_endpoints(cpu_micros_per_request, budget_micros)
+        if len(over_budget_endpoints) > 0:
+            logging.error('CPU time per request of %s exceeds the budget of %s microseconds!',
+                          ', '.join(over_budget_endpoints),
+                          budget_micros)
+            sys.exit(1)
@@ -2,9 +2,41 @@
 import click
 from typeguard import typechecked
 
+from jenkify.utils.jenkins.jenkins_request_benchmark import DEFAULT_REQUEST_CPU_BUDGET_MICROS
+
 
 @typechecked
 def with_failure_option(func):
     """A decorator for the example output command"""
     return click.option('-wf', '--with-failure', type=click.BOOL, is_flag=True, required=False,
                         help='Include failure in example-output')(func)
+
+
+@typechecked
+def run_count_option(func):
+    """A decorator for the benchmark payload size"""
+    return click.option('-rc', '--run-count', type=click.IntRange(min=1), is_flag=False, required=False,
+                        default=5000, help='Amount of runs in the synthetic wfapi/runs payload')(func)
+
+
+@typechecked
+def iterations_option(func):
+    """A decorator for the benchmark iterations"""
+    return click.option('-it', '--iterations', type=click.IntRange(min=1), is_flag=False, required=False,
+                        default=5, help='Amount of timed runs of each decoding strategy')(func)
+
+
+@typechecked
+def request_count_option(func):
+    """A decorator for the request overhead benchmark's request count"""
+    return click.option('-rqc', '--request-count', type=click.IntRange(min=1), is_flag=False, required=False,
+                        default=5000, help='Amount of timed requests per endpoint')(func)
+
+
+@typechecked
+def budget_micros_option(func):
+    """A decorator for the request overhead benchmark's budget"""
+    return click.option('-bm', '--budget-micros', type=click.FloatRange(min=0), is_flag=False, required=False,
+                        default=DEFAULT_REQUEST_CPU_BUDGET_MICROS,
+                        help='Fail if the client-side CPU time per request of an endpoint exceeds this many '
+                             'microseconds')(func)
@@ -0,0 +1,111 @@
+"""Jenkins build history CLI commands module"""
+import asyncio
+import logging
+import sys
+import time
+from abc import ABC
+
+import click
+import yaml
+from dotenv import load_dotenv
+from typeguard import typechecked
+
+from jenkify.cli.common.options import verbose_option, deadline_option
+from jenkify.cli.common.yaml_files import load_yaml_file_or_exit
+from jenkify.cli.jenkins.history.options import (
+    history_build_jobs_yaml_file_option,
+    history_store_option,
+    history_url_ends_option,
+    since_days_option,
+)
+from jenkify.cli.jenkins.yaml.options import max_concurrent_requests_per_host_option
+from jenkify.constants.jenkins_yaml import BUILD, HOSTS, JOBS, URL, END
+from jenkify.use_cases.jenkins_build_history import (
+    MILLIS_PER_DAY,
+    analyze_build_columns,
+    sync_build_history,
+)
+from jenkify.utils.environment.Environment import Environment
+from jenkify.utils.jenkins.jenkins_build_history_store import JenkinsBuildHistoryStore
+from jenkify.utils.jenkins.jenkins_rest_api.jenkins_utils import JenkinsUtils
+from jenkify.utils.logging_utils import initialize_logging
+from jenkify.utils.request_deadline import start_request_deadline
+
+
+@click.group(name='jenkins_history_commands')
+def jenkins_history_commands() -> None:
+    """Entry point"""
+
+
+class HistoryCommands(ABC):
+    @jenkins_history_commands.command()
+    @verbose_option
+    @deadline_option
+    @history_store_option
+    @history_build_jobs_yaml_file_option
+    @history_url_ends_option
+    @max_concurrent_requests_per_host_option
+    @staticmethod
+    @typechecked
+    def sync_history(verbose: bool,
+                     deadline: float | None,
+                     history_store: str,
+                     *,
+                     build_jobs_yaml: str | None,
+                     url_ends: tuple,
+                     max_concurrent_requests_per_host: int) -> None:
+        """Incrementally ingests the finished builds of the selected jobs into the local history store"""
+        if build_jobs_yaml is None and len(url_ends) == 0:
+            raise click.UsageError('Select jobs with --build-jobs-yaml and/or --url-end')
+        load_dotenv()
+        initialize_logging(verbose)
+        start_request_deadline(deadline)
+        jobs = [(Environment.get_jenkins_request_settings_from_env().url,
+                 JenkinsUtils.trim_url_end_option_util(url_end)) for url_end in url_ends]
+        if build_jobs_yaml is not None:
+            build_jobs_dict = load_yaml_file_or_exit(build_jobs_yaml)
+            jobs.extend((host[URL], job[END]) for host in build_jobs_dict[BUILD][HOSTS] for job in host[JOBS])
+        jobs = list(dict.fromkeys(jobs))
+        logging.info('Syncing build history of %s job(s) into %s...', len(jobs), history_store)
+        jenkins_build_history_store = JenkinsBuildHistoryStore(history_store)
+        try:
+            ingested_build_counts = asyncio.run(sync_build_history(jenkins_build_history_store,
+                                                                   jobs,
+                                                                   max_concurrent_requests_per_host))
+        finally:
+            jenkins_build_history_store.close()
+        for (host_url, url_end), ingested_build_count in ingested_build_counts.items():
+            if ingested_build_count is not None:
+                logging.info('Ingested %s new build(s) of %s on %s', ingested_build_count, url_end, host_url)
+        if None in ingested_build_counts.values():
+            sys.exit(1)
+
+    @jenkins_history_commands.command()
+    @verbose_option
+    @history_store_option
+    @history_url_ends_option
+    @since_days_option
+    @staticmethod
+    @typechecked
+    def analyze_history(verbose: bool,
+                        history_store: str,
+                        url_ends: tuple,
+                        since_days: int | None) -> None:
+        """Outputs duration percentiles, result rates and queue time trends of the stored build history as YAML"""
+        initialize_logging(verbose)
+        since_timestamp_millis = (int(time.time() * 1000) - since_days * MILLIS_PER_DAY
+                                  if since_days is not None else 0)
+        selected_url_ends = {JenkinsUtils.trim_url_end_option_util(url_end) for url_end in url_ends}
+        jenkins_build_history_store = JenkinsBuildHistoryStore(history_store)
+        try:
+            build_history_analysis = {
+                f'{host_url}/{url_end}': analyze_build_columns(
+                    jenkins_build_history_store.get_build_columns(host_url, url_end, since_timestamp_millis))
+                for host_url, url_end in jenkins_build_history_store.get_jobs()
+                if len(selected_url_ends) == 0 or url_end in selected_url_ends}
+        finally:
+            jenkins_build_history_store.close()
+        if len(build_history_analysis) == 0:
+            logging.warning('No build history stored in %s, run sync-history first', history_store)
+            return
+        click.echo(yaml.safe_dump(build_history_analysis, sort_keys=False), nl=False)
@@ -0,0 +1,55 @@
+"""Jenkins build history command-line options"""
+import click
+from typeguard import typechecked
+
+from jenkify.utils.jenkins.jenkins_build_history_store import DEFAULT_BUILD_HISTORY_STORE_PATH
+
+
+@typechecked
+def history_store_option(func):
+    """Build history store file"""
+    return click.option('-hs',
+                        '--history-store',
+                        type=click.STRING,
+                        is_flag=False,
+                        required=False,
+                        default=DEFAULT_BUILD_HISTORY_STORE_PATH,
+                        help='SQLite file the build history is stored in'
+                        )(func)
+
+
+@typechecked
+def history_build_jobs_yaml_file_option(func):
+    """Build jobs YAML file selecting the jobs whose history is synced"""
+    return click.option('-bjy',
+                        '--build-jobs-yaml',
+                        type=click.STRING,
+                        is_flag=False,
+                        required=False,
+                        help='Select every job of this build jobs (or tracking) YAML file'
+                        )(func)
+
+
+@typechecked
+def history_url_ends_option(func):
+    """URL ends of the jobs whose history is synced or analyzed"""
+    return click.option('-ue',
+                        '--url-end',
+                        'url_ends',
+                        type=click.STRING,
+                        multiple=True,
+                        required=False,
+                        help='URL end of a job on JENKINS_URL to select (repeatable)'
+                        )(func)
+
+
+@typechecked
+def since_days_option(func):
+    """Analysis window"""
+    return click.option('-sd',
+                        '--since-days',
+                        type=click.IntRange(min=1),
+                        is_flag=False,
+                        required=False,
+                        help='Only analyze builds started within this many days'
+                        )(func)
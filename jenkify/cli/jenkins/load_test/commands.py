@@ -0,0 +1,73 @@
+"""Jenkins load test CLI commands module"""
+import asyncio
+import logging
+import sys
+from abc import ABC
+
+import click
+import yaml
+from click import FileError
+from dotenv import load_dotenv
+from typeguard import typechecked
+
+from jenkify.cli.common.options import verbose_option, deadline_option
+from jenkify.cli.jenkins.load_test.options import duration_option, poll_seconds_option, rate_option
+from jenkify.cli.jenkins.yaml.options import build_jobs_yaml_file_option, max_concurrent_requests_per_host_option
+from jenkify.use_cases.jenkins_load_test import get_load_test_report, get_load_test_targets, run_load_test
+from jenkify.utils.logging_utils import initialize_logging, logging_line_break
+from jenkify.utils.request_deadline import start_request_deadline
+
+
+@click.group(name='jenkins_load_test_commands')
+def jenkins_load_test_commands() -> None:
+    """Entry point"""
+
+
+class LoadTestCommands(ABC):
+    @jenkins_load_test_commands.command()
+    @verbose_option
+    @deadline_option
+    @build_jobs_yaml_file_option
+    @duration_option
+    @rate_option
+    @poll_seconds_option
+    @max_concurrent_requests_per_host_option
+    @staticmethod
+    @typechecked
+    def load_test(verbose: bool,
+                  deadline: float | None,
+                  build_jobs_yaml: str,
+                  *,
+                  duration: float,
+                  rate: str,
+                  poll_seconds: float,
+                  max_concurrent_requests_per_host: int) -> None:
+        """Triggers the jobs of a YAML file at a controlled rate and reports latency percentiles per host as YAML"""
+        try:
+            start_rate, _, end_rate = rate.partition(':')
+            start_rate = float(start_rate)
+            end_rate = float(end_rate) if end_rate != '' else start_rate
+        except ValueError as exception:
+            raise click.BadParameter(str(exception), param_hint='--rate') from exception
+        if start_rate <= 0 or end_rate <= 0:
+            raise click.BadParameter('rates must be positive', param_hint='--rate')
+        load_dotenv()
+        initialize_logging(verbose)
+        start_request_deadline(deadline)
+        try:
+            with open(build_jobs_yaml, 'r', encoding='utf-8') as build_jobs_file:
+                load_test_targets = get_load_test_targets(yaml.safe_load(build_jobs_file))
+        except FileError as exception:
+            logging.fatal("Could not load file: %s -> %s", build_jobs_yaml, exception.message)
+            sys.exit(1)
+        logging_line_break()
+        logging.info('Load testing %s job(s) for %s seconds at %s to %s builds per second...',
+                     len(load_test_targets), duration, start_rate, end_rate)
+        load_test_builds = asyncio.run(run_load_test(load_test_targets,
+                                                     duration,
+                                                     start_rate,
+                                                     end_rate,
+                                                     poll_seconds=poll_seconds,
+                                                     max_concurrent_requests_per_host=max_concurrent_requests_per_host))
+        logging_line_break()
+        click.echo(yaml.safe_dump(get_load_test_report(load_test_builds), sort_keys=False), nl=False)
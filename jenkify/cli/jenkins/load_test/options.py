@@ -0,0 +1,40 @@
+"""Jenkins load test command-line options"""
+import click
+from typeguard import typechecked
+
+
+@typechecked
+def duration_option(func):
+    """How long to trigger builds for"""
+    return click.option('-d',
+                        '--duration',
+                        type=click.FloatRange(min=0, min_open=True),
+                        is_flag=False,
+                        required=True,
+                        help='Seconds to keep triggering builds for'
+                        )(func)
+
+
+@typechecked
+def rate_option(func):
+    """Constant or ramping trigger rate"""
+    return click.option('-r',
+                        '--rate',
+                        type=click.STRING,
+                        is_flag=False,
+                        required=True,
+                        help='Builds per second, constant (e.g. 0.5) or ramping linearly over the duration (e.g. 0.1:2)'
+                        )(func)
+
+
+@typechecked
+def poll_seconds_option(func):
+    """Interval between polls of each load test build"""
+    return click.option('-ps',
+                        '--poll-seconds',
+                        type=click.FloatRange(min=0, min_open=True),
+                        is_flag=False,
+                        required=False,
+                        default=1.0,
+                        help='Seconds between polls of each triggered build\'s queue item and build'
+                        )(func)
@@ -0,0 +1,93 @@
+"""Jenkins build log CLI commands module"""
+import asyncio
+import logging
+import re
+from abc import ABC
+
+import click
+from dotenv import load_dotenv
+from typeguard import typechecked
+
+from jenkify.cli.common.options import verbose_option, deadline_option
+from jenkify.cli.common.yaml_files import load_yaml_file_or_exit
+from jenkify.cli.jenkins.logs.options import (
+    build_range_option,
+    context_lines_option,
+    ignore_case_option,
+    pattern_option,
+    search_tracking_yaml_file_option,
+    search_url_end_option,
+)
+from jenkify.cli.jenkins.yaml.options import max_concurrent_requests_per_host_option
+from jenkify.utils.environment.Environment import Environment
+from jenkify.utils.jenkins.jenkins_rest_api.jenkins_log_search import (
+    get_builds_to_search_from_build_range,
+    get_builds_to_search_from_tracking_dict,
+    search_builds_console_output,
+)
+from jenkify.utils.jenkins.jenkins_rest_api.jenkins_utils import JenkinsUtils
+from jenkify.utils.logging_utils import initialize_logging
+from jenkify.utils.request_deadline import start_request_deadline
+
+
+@click.group(name='jenkins_logs_commands')
+def jenkins_logs_commands() -> None:
+    """Entry point"""
+
+
+class LogsCommands(ABC):
+    @jenkins_logs_commands.command()
+    @verbose_option
+    @deadline_option
+    @pattern_option
+    @search_tracking_yaml_file_option
+    @search_url_end_option
+    @build_range_option
+    @context_lines_option
+    @ignore_case_option
+    @max_concurrent_requests_per_host_option
+    @staticmethod
+    @typechecked
+    def search_logs(verbose: bool,
+                    deadline: float | None,
+                    pattern: str,
+                    *,
+                    build_jobs_tracking_yaml: str | None,
+                    url_end: str | None,
+                    build_range: str | None,
+                    context_lines: int,
+                    ignore_case: bool,
+                    max_concurrent_requests_per_host: int) -> None:
+        """Searches the console output of many builds concurrently for a regular expression"""
+        if (build_jobs_tracking_yaml is None) == (url_end is None or build_range is None):
+            raise click.UsageError('Select builds with either --build-jobs-tracking-yaml '
+                                   'or both --url-end and --build-range')
+        try:
+            compiled_pattern = re.compile(pattern, re.IGNORECASE if ignore_case else 0)
+        except re.error as exception:
+            raise click.BadParameter(str(exception), param_hint='--pattern') from exception
+        load_dotenv()
+        initialize_logging(verbose)
+        start_request_deadline(deadline)
+        if build_jobs_tracking_yaml is not None:
+            builds_to_search = get_builds_to_search_from_tracking_dict(load_yaml_file_or_exit(build_jobs_tracking_yaml))
+        else:
+            try:
+                builds_to_search = get_builds_to_search_from_build_range(
+                    Environment.get_jenkins_request_settings_from_env().url,
+                    JenkinsUtils.trim_url_end_option_util(url_end),
+                    build_range)
+            except ValueError as exception:
+                raise click.BadParameter(str(exception), param_hint='--build-range') from exception
+        logging.info('Searching the console output of %s build(s) for %s...', len(builds_to_search), pattern)
+        match_counts = asyncio.run(search_builds_console_output(builds_to_search,
+                                                                compiled_pattern,
+                                                                context_lines,
+                                                                max_concurrent_requests_per_host))
+        for build_label, match_count in match_counts.items():
+            logging.debug('%s: %s match(es)', build_label, match_count)
+        logging.info('Found %s match(es) in %s of %s build(s), %s build log(s) unavailable',
+                     sum(match_count for match_count in match_counts.values() if match_count is not None),
+                     len([match_count for match_count in match_counts.values() if match_count]),
+                     len(match_counts),
+                     len([match_count for match_count in match_counts.values() if match_count is None]))
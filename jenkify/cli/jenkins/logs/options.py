@@ -0,0 +1,71 @@
+"""Jenkins build log command-line options"""
+import click
+from typeguard import typechecked
+
+
+@typechecked
+def pattern_option(func):
+    """Regular expression searched for in build logs"""
+    return click.option('-p',
+                        '--pattern',
+                        type=click.STRING,
+                        is_flag=False,
+                        required=True,
+                        help='Regular expression searched for in each log line'
+                        )(func)
+
+
+@typechecked
+def context_lines_option(func):
+    """Amount of lines printed around each match"""
+    return click.option('-C',
+                        '--context-lines',
+                        type=click.IntRange(min=0),
+                        is_flag=False,
+                        required=False,
+                        default=0,
+                        help='Amount of lines printed before and after each match'
+                        )(func)
+
+
+@typechecked
+def ignore_case_option(func):
+    """Case-insensitive matching"""
+    return click.option('-i', '--ignore-case', type=click.BOOL, is_flag=True, required=False,
+                        help='Match the pattern case-insensitively')(func)
+
+
+@typechecked
+def search_tracking_yaml_file_option(func):
+    """Build jobs tracking YAML file selecting the builds to search"""
+    return click.option('-bjty',
+                        '--build-jobs-tracking-yaml',
+                        type=click.STRING,
+                        is_flag=False,
+                        required=False,
+                        help='Search every build of this build jobs tracking YAML file'
+                        )(func)
+
+
+@typechecked
+def search_url_end_option(func):
+    """URL end of the job whose builds are searched"""
+    return click.option('-ue',
+                        '--url-end',
+                        type=click.STRING,
+                        is_flag=False,
+                        required=False,
+                        help='URL end of the job whose builds to search (requires --build-range)'
+                        )(func)
+
+
+@typechecked
+def build_range_option(func):
+    """Build numbers of the job to search"""
+    return click.option('-br',
+                        '--build-range',
+                        type=click.STRING,
+                        is_flag=False,
+                        required=False,
+                        help='Build number (e.g. 42) or inclusive range (e.g. 100-150) to search'
+                        )(func)
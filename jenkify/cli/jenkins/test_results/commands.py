@@ -0,0 +1,71 @@
+"""Jenkins test results CLI commands module"""
+import asyncio
+import json
+import logging
+import sys
+from abc import ABC
+from xml.etree import ElementTree
+
+import click
+import yaml
+from click import FileError
+from dotenv import load_dotenv
+from typeguard import typechecked
+
+from jenkify.cli.common.options import verbose_option, deadline_option
+from jenkify.cli.jenkins.test_results.options import output_format_option, test_results_output_option
+from jenkify.cli.jenkins.yaml.options import (
+    build_jobs_tracking_yaml_file_option,
+    max_concurrent_requests_per_host_option,
+)
+from jenkify.use_cases.jenkins_test_results import collect_test_results, get_tracked_builds
+from jenkify.utils.logging_utils import initialize_logging
+from jenkify.utils.request_deadline import start_request_deadline
+
+
+@click.group(name='jenkins_test_results_commands')
+def jenkins_test_results_commands() -> None:
+    """Entry point"""
+
+
+class TestResultsCommands(ABC):
+    @jenkins_test_results_commands.command()
+    @verbose_option
+    @deadline_option
+    @build_jobs_tracking_yaml_file_option
+    @output_format_option
+    @test_results_output_option
+    @max_concurrent_requests_per_host_option
+    @staticmethod
+    @typechecked
+    def collect_test_results(verbose: bool,
+                             deadline: float | None,
+                             build_jobs_tracking_yaml: str,
+                             *,
+                             output_format: str,
+                             output: str,
+                             max_concurrent_requests_per_host: int) -> None:
+        """Collects the failed tests of every tracked build into one deduplicated JSON summary or JUnit XML report"""
+        load_dotenv()
+        initialize_logging(verbose)
+        start_request_deadline(deadline)
+        try:
+            with open(build_jobs_tracking_yaml, 'r', encoding='utf-8') as build_jobs_tracking_file:
+                build_jobs_tracking_dict = yaml.safe_load(build_jobs_tracking_file)
+        except FileError as exception:
+            logging.fatal("Could not load file: %s -> %s", build_jobs_tracking_yaml, exception.message)
+            sys.exit(1)
+        tracked_builds = get_tracked_builds(build_jobs_tracking_dict)
+        logging.info('Collecting the test results of %s build(s)...', len(tracked_builds))
+        test_results_summary = asyncio.run(collect_test_results(tracked_builds, max_concurrent_requests_per_host))
+        if output_format == 'junit':
+            test_results_element = test_results_summary.get_junit_xml_element()
+            ElementTree.indent(test_results_element)
+            test_results_text = ElementTree.tostring(test_results_element, encoding='unicode', xml_declaration=True)
+        else:
+            test_results_text = json.dumps(test_results_summary.get_summary_dict(), indent=2)
+        with click.open_file(output, 'w', encoding='utf-8') as output_file:
+            output_file.write(test_results_text + '\n')
+        logging.info('%s failed test(s) across %s build(s) with test results',
+                     len(test_results_summary.failed_tests),
+                     sum(test_results_summary.reporting_build_counts.values()))
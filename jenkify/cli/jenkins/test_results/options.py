@@ -0,0 +1,31 @@
+"""Jenkins test results command-line options"""
+import click
+from typeguard import typechecked
+
+from jenkify.use_cases.jenkins_test_results import TEST_RESULTS_OUTPUT_FORMATS
+
+
+@typechecked
+def output_format_option(func):
+    """Format of the collected test results"""
+    return click.option('-of',
+                        '--output-format',
+                        type=click.Choice(TEST_RESULTS_OUTPUT_FORMATS),
+                        is_flag=False,
+                        required=False,
+                        default='json',
+                        help='Output a JSON summary or a JUnit XML report of the failed tests'
+                        )(func)
+
+
+@typechecked
+def test_results_output_option(func):
+    """File the collected test results are written to"""
+    return click.option('-o',
+                        '--output',
+                        type=click.STRING,
+                        is_flag=False,
+                        required=False,
+                        default='-',
+                        help='File to write the collected test results to (default: stdout)'
+                        )(func)
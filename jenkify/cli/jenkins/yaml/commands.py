@@ -12,17 +12,58 @@ from dotenv import load_dotenv
 from typeguard import typechecked
 
 from jenkify.cli.common.options import verbose_option
+from jenkify.cli.common.yaml_files import load_yaml_file_or_exit
+from jenkify.cli.jenkins.catalog.options import job_catalog_option
 from jenkify.cli.jenkins.yaml.options import (
+    abort_remaining_option,
     build_jobs_tracking_yaml_file_option,
     build_jobs_yaml_file_option,
+    fail_fast_option,
+    max_concurrent_requests_per_host_option,
+    max_in_flight_option,
+    reuse_max_age_option,
+    reuse_results_option,
+    shards_option,
+    stage_progress_option,
+    yaml_command_settings_options,
+)
+from jenkify.cli.jenkins.yaml.yaml_command_settings import YamlCommandSettings
+from jenkify.constants.jenkins_yaml import BUILD, HOSTS, JOBS, URL, END, SUCCESSFUL_JOBS, FAILED_JOBS
+from jenkify.exceptions.build_job_dag_exception import BuildJobDagException
+from jenkify.exceptions.build_matrix_exception import BuildMatrixException
+from jenkify.exceptions.job_catalog_exception import JobCatalogException
+from jenkify.use_cases.jenkins_build_dag import (
+    has_build_job_dependencies,
+    prune_build_job_dependencies,
+    run_build_jobs_dag,
 )
-from jenkify.constants.jenkins_yaml import BUILD, HOSTS, SUCCESSFUL_JOBS, FAILED_JOBS
 from jenkify.use_cases.jenkins_build_job_tracking import validate_jenkins_job_build_tracking_yaml
+from jenkify.use_cases.jenkins_build_matrix import expand_build_matrices
 from jenkify.use_cases.jenkins_builds import process_build_host
+from jenkify.use_cases.jenkins_host_preflight import (
+    get_failed_preflight_host_urls,
+    log_host_preflights,
+    preflight_jenkins_hosts,
+)
+from jenkify.use_cases.jenkins_job_catalog import has_build_job_selectors, resolve_build_job_selectors
+from jenkify.utils.build_events import STDOUT_EVENTS_OUTPUT, BuildEventStream, open_build_event_stream
+from jenkify.utils.daemon.client import get_daemon_command_args, submit_command_to_daemon
+from jenkify.utils.http_cassette import close_http_cassette, open_http_cassette
+from jenkify.utils.jenkins.jenkins_job_catalog_store import JenkinsJobCatalogStore
 from jenkify.utils.jenkins.jenkins_rest_api.jenkins_poll_status import (
     track_multiple_build_job_statuses,
 )
+from jenkify.utils.jenkins.jenkins_rest_api.jenkins_sharded_poll_status import (
+    track_multiple_build_job_statuses_sharded,
+)
 from jenkify.utils.logging_utils import initialize_logging, logging_line_break
+from jenkify.utils.request_coalescing import log_request_coalescing_stats
+from jenkify.utils.request_deadline import start_request_deadline
+from jenkify.utils.request_hedging import (
+    RequestHedgingPolicy,
+    log_request_hedging_stats,
+    start_request_hedging,
+)
 
 
 @click.group(name='jenkins_yaml_commands')
@@ -34,29 +75,213 @@ class YamlCommands(ABC):
     @jenkins_yaml_commands.command()
     @verbose_option
     @build_jobs_yaml_file_option
+    @max_in_flight_option
+    @reuse_results_option
+    @reuse_max_age_option
+    @job_catalog_option
+    @yaml_command_settings_options
     @staticmethod
     @typechecked
-    def start_build_jobs_yaml(verbose: bool, build_jobs_yaml: str) -> None:
+    def start_build_jobs_yaml(verbose: bool,
+                              build_jobs_yaml: str,
+                              *,
+                              max_in_flight: int | None,
+                              reuse_results: bool,
+                              reuse_max_age: int,
+                              job_catalog: str,
+                              yaml_command_settings: YamlCommandSettings) -> None:
         """Kicks off Jenkins jobs based on YAML input"""
-        load_dotenv()
-        initialize_logging(verbose)
+        build_event_stream = YamlCommands.start_yaml_command(
+            verbose, yaml_command_settings, ('build_jobs_yaml', 'events_output', 'job_catalog'))
         logging_line_break()
         logging.info('Parsing YAML: %s...', build_jobs_yaml)
-        successful_jobs = []
-        failed_jobs = []
+        build_jobs_dict = YamlCommands.load_build_jobs_yaml(build_jobs_yaml, job_catalog)
         try:
-            with open(build_jobs_yaml, 'r', encoding='utf-8') as yaml_file_contents:
-                build_jobs_dict = yaml.safe_load(yaml_file_contents)
-                for build_host_index, build_host in enumerate(build_jobs_dict[BUILD][HOSTS]):
-                    jobs_info_dict: dict = process_build_host(build_host)
-                    successful_jobs.append(jobs_info_dict[SUCCESSFUL_JOBS])
-                    failed_jobs.append(jobs_info_dict[FAILED_JOBS])
-        except FileError as exception:
-            logging.fatal("Could not load file: %s -> %s", build_jobs_yaml, exception.message)
+            jobs_info_dict = YamlCommands.run_build_jobs(
+                build_jobs_dict,
+                max_in_flight,
+                reuse_max_age if reuse_results else None,
+                YamlCommands.preflight_build_hosts(build_jobs_dict, yaml_command_settings.preflight))
+        except BuildJobDagException as exception:
+            logging.fatal('Invalid job dependencies in %s -> %s', build_jobs_yaml, exception.message)
             sys.exit(1)
 
         logging.info('Run of %s completed:', build_jobs_yaml)
         logging.debug('Successful builds: %s', jobs_info_dict[SUCCESSFUL_JOBS])
+        YamlCommands.write_build_jobs_outputs(build_jobs_yaml, build_jobs_dict, jobs_info_dict[FAILED_JOBS])
+        if build_event_stream is not None:
+            build_event_stream.close()
+        logging_line_break()
+
+
+    @jenkins_yaml_commands.command()
+    @verbose_option
+    @build_jobs_tracking_yaml_file_option
+    @shards_option
+    @max_concurrent_requests_per_host_option
+    @fail_fast_option
+    @abort_remaining_option
+    @stage_progress_option
+    @yaml_command_settings_options
+    @staticmethod
+    @typechecked
+    def track_build_jobs_status(verbose: bool,
+                                build_jobs_tracking_yaml: str,
+                                *,
+                                shards: int,
+                                max_concurrent_requests_per_host: int,
+                                fail_fast: bool,
+                                abort_remaining: bool,
+                                stage_progress: bool,
+                                yaml_command_settings: YamlCommandSettings):
+        """Tracks build job status"""
+        build_event_stream = YamlCommands.start_yaml_command(
+            verbose, yaml_command_settings, ('build_jobs_tracking_yaml', 'events_output'), shards)
+        YamlCommands.validate_build_jobs_tracking_yaml(build_jobs_tracking_yaml)
+        build_jobs_tracking_dict = load_yaml_file_or_exit(build_jobs_tracking_yaml)
+        skipped_host_urls = YamlCommands.preflight_build_hosts(build_jobs_tracking_dict,
+                                                               yaml_command_settings.preflight)
+        tracked_host_indices = [host_index for host_index, host in enumerate(build_jobs_tracking_dict[BUILD][HOSTS])
+                                if host[URL] not in skipped_host_urls]
+        tracked_build_jobs_tracking_dict = {**build_jobs_tracking_dict, BUILD: {
+            **build_jobs_tracking_dict[BUILD],
+            HOSTS: [build_jobs_tracking_dict[BUILD][HOSTS][host_index] for host_index in tracked_host_indices]}}
+        if shards > 1:
+            logging.info('Tracking builds asynchronously across %s shards...', shards)
+            track_multiple_build_job_statuses_sharded(tracked_build_jobs_tracking_dict,
+                                                      shards,
+                                                      max_concurrent_requests_per_host,
+                                                      fail_fast=fail_fast or abort_remaining,
+                                                      abort_remaining=abort_remaining,
+                                                      stage_progress=stage_progress)
+        else:
+            logging.info('Tracking builds asynchronously...')
+            asyncio.run(track_multiple_build_job_statuses(tracked_build_jobs_tracking_dict,
+                                                          max_concurrent_requests_per_host,
+                                                          fail_fast=fail_fast or abort_remaining,
+                                                          abort_remaining=abort_remaining,
+                                                          stage_progress=stage_progress))
+        for host_index, host in zip(tracked_host_indices, tracked_build_jobs_tracking_dict[BUILD][HOSTS]):
+            build_jobs_tracking_dict[BUILD][HOSTS][host_index] = host
+        try:
+            with open(build_jobs_tracking_yaml, 'w', encoding='utf-8') as build_jobs_tracking_file:
+                yaml.dump(build_jobs_tracking_dict, build_jobs_tracking_file)
+        except FileError as exception:
+            logging.fatal("Could not load file: %s -> %s", build_jobs_tracking_yaml, exception.message)
+            sys.exit(1)
+
+        if build_event_stream is not None:
+            build_event_stream.close()
+
+        logging.info('Wrote statuses to %s', build_jobs_tracking_yaml)
+
+    @staticmethod
+    @typechecked
+    def start_yaml_command(verbose: bool,
+                           yaml_command_settings: YamlCommandSettings,
+                           path_param_names: tuple,
+                           shards: int = 1) -> BuildEventStream | None:
+        """
+        Submits the command to the daemon if a daemon socket is given (exiting with its exit code),
+        otherwise sets up logging, the deadline, hedging, the HTTP cassette and the build event stream of this process
+        :param verbose: Increase output verbosity
+        :param yaml_command_settings: Settings of the command
+        :param path_param_names: Names of the command's parameters holding file paths, see get_daemon_command_args
+        :param shards: Amount of processes the command is split across
+        :return: build event stream if events are streamed
+        """
+        YamlCommands.validate_http_cassette_options(yaml_command_settings.record,
+                                                    yaml_command_settings.replay,
+                                                    yaml_command_settings.daemon_socket,
+                                                    shards)
+        if yaml_command_settings.daemon_socket is not None:
+            YamlCommands.validate_daemon_events_output(yaml_command_settings.events,
+                                                       yaml_command_settings.events_output)
+            sys.exit(submit_command_to_daemon(yaml_command_settings.daemon_socket,
+                                              get_daemon_command_args(path_param_names),
+                                              verbose))
+        load_dotenv()
+        initialize_logging(verbose)
+        start_request_deadline(yaml_command_settings.deadline)
+        YamlCommands.start_request_hedging(yaml_command_settings.hedge_percentile, yaml_command_settings.hedge_budget)
+        open_http_cassette(yaml_command_settings.record,
+                           yaml_command_settings.replay,
+                           yaml_command_settings.replay_latency_scale)
+        click.get_current_context().call_on_close(close_http_cassette)
+        click.get_current_context().call_on_close(log_request_coalescing_stats)
+        if yaml_command_settings.events is None:
+            return None
+        return open_build_event_stream(yaml_command_settings.events_output)
+
+    @staticmethod
+    @typechecked
+    def load_build_jobs_yaml(build_jobs_yaml: str, job_catalog: str) -> dict:
+        """
+        Loads a build jobs YAML file, resolving its job selectors and expanding its build matrices.
+        Exits if it cannot be loaded or is invalid
+        :param build_jobs_yaml: Build jobs YAML file path
+        :param job_catalog: Job catalog path, only opened if the file has job selectors
+        :return: build jobs dict
+        """
+        build_jobs_dict = load_yaml_file_or_exit(build_jobs_yaml)
+        try:
+            if has_build_job_selectors(build_jobs_dict):
+                jenkins_job_catalog_store = JenkinsJobCatalogStore(job_catalog)
+                try:
+                    build_jobs_dict = resolve_build_job_selectors(build_jobs_dict, jenkins_job_catalog_store)
+                finally:
+                    jenkins_job_catalog_store.close()
+            return expand_build_matrices(build_jobs_dict)
+        except BuildMatrixException as exception:
+            logging.fatal('Invalid build matrix in %s -> %s', build_jobs_yaml, exception.message)
+            sys.exit(1)
+        except JobCatalogException as exception:
+            logging.fatal('Could not resolve job selectors of %s -> %s', build_jobs_yaml, exception.message)
+            sys.exit(1)
+
+    @staticmethod
+    @typechecked
+    def run_build_jobs(build_jobs_dict: dict,
+                       max_in_flight: int | None,
+                       reuse_max_age_minutes: int | None,
+                       skipped_host_urls: set) -> dict:
+        """
+        Kicks off the jobs of every host which is not skipped, in dependency order (and in waves) if needed
+        :param build_jobs_dict: Build jobs dict
+        :param max_in_flight: Maximum amount of unfinished builds per host, see run_build_jobs_dag
+        :param reuse_max_age_minutes: Maximum age of reused builds, None to kick off new builds
+        :param skipped_host_urls: Hosts whose jobs are skipped (and reported as failed)
+        :return: dict of successful and failed jobs
+        :raises BuildJobDagException: if the job dependencies are invalid
+        """
+        if has_build_job_dependencies(build_jobs_dict) or max_in_flight is not None:
+            logging.info('Running jobs in dependency order...')
+            return asyncio.run(run_build_jobs_dag(build_jobs_dict,
+                                                  max_in_flight,
+                                                  reuse_max_age_minutes,
+                                                  skipped_host_urls))
+        successful_jobs = []
+        failed_jobs = []
+        for build_host in build_jobs_dict[BUILD][HOSTS]:
+            if build_host[URL] in skipped_host_urls:
+                failed_jobs.extend({URL: build_host[URL], END: job[END], 'index': job_index}
+                                   for job_index, job in enumerate(build_host[JOBS]))
+                continue
+            jobs_info_dict: dict = process_build_host(build_host, reuse_max_age_minutes)
+            successful_jobs.extend(jobs_info_dict[SUCCESSFUL_JOBS])
+            failed_jobs.extend(jobs_info_dict[FAILED_JOBS])
+        return {SUCCESSFUL_JOBS: successful_jobs, FAILED_JOBS: failed_jobs}
+
+    @staticmethod
+    @typechecked
+    def write_build_jobs_outputs(build_jobs_yaml: str, build_jobs_dict: dict, failed_jobs: list) -> None:
+        """
+        Writes the build numbers to track next to the build jobs YAML file, and the remaining (failed) jobs if any.
+        Exits if they cannot be written
+        :param build_jobs_yaml: Build jobs YAML file path
+        :param build_jobs_dict: Build jobs dict, with the build numbers recorded on its jobs
+        :param failed_jobs: Failed jobs
+        """
         tracking_output_filename = build_jobs_yaml.replace('.yaml', '-tracking.yaml')
         logging.info('Writing build numbers to track to %s...', tracking_output_filename)
         tracking_build_jobs_dict = copy.deepcopy(build_jobs_dict)
@@ -67,11 +292,12 @@ class YamlCommands(ABC):
         try:
             with open(tracking_output_filename, 'w', encoding='utf-8') as output_file:
                 yaml.dump(tracking_build_jobs_dict, output_file)
-            if len(jobs_info_dict[FAILED_JOBS]) > 0:
-                logging.debug('Failed builds: %s', jobs_info_dict[FAILED_JOBS])
+            if len(failed_jobs) > 0:
+                logging.debug('Failed builds: %s', failed_jobs)
                 for build_host_index, build_host in enumerate(remaining_build_jobs_dict[BUILD][HOSTS]):
                     failed_jobs_dict = list(filter(lambda job: job.get('build-index', -1) == -1, build_host['jobs']))
                     remaining_build_jobs_dict[BUILD][HOSTS][build_host_index]['jobs'] = failed_jobs_dict
+                prune_build_job_dependencies(remaining_build_jobs_dict)
                 output_file_name = build_jobs_yaml.replace('.yaml', '-remaining.yaml')
                 logging.info('Outputting remaining (failed) jobs to %s...', output_file_name)
                 with open(output_file_name, 'w', encoding='utf-8') as output_file:
@@ -80,18 +306,10 @@ class YamlCommands(ABC):
             logging.fatal("Could not load file: %s -> %s", build_jobs_yaml, exception.message)
             sys.exit(1)
 
-        logging_line_break()
-
-
-    @jenkins_yaml_commands.command()
-    @verbose_option
-    @build_jobs_tracking_yaml_file_option
     @staticmethod
     @typechecked
-    def track_build_jobs_status(verbose: bool, build_jobs_tracking_yaml: str):
-        """Tracks build job status"""
-        load_dotenv()
-        initialize_logging(verbose)
+    def validate_build_jobs_tracking_yaml(build_jobs_tracking_yaml: str) -> None:
+        """Validates a tracking build jobs YAML file, logging every validation error and exiting if there are any"""
         logging.info('Validating tracking build jobs YAML: %s...', build_jobs_tracking_yaml)
         validation_errors = validate_jenkins_job_build_tracking_yaml(build_jobs_tracking_yaml)
         if len(validation_errors) > 0:
@@ -104,17 +322,54 @@ class YamlCommands(ABC):
                               validation_error.message)
             sys.exit(1)
         logging.info('Successfully validated tracking builds jobs YAML: %s!', build_jobs_tracking_yaml)
-        try:
-            with open(build_jobs_tracking_yaml, 'r', encoding='utf-8') as build_jobs_tracking_file:
-                build_jobs_tracking_dict = yaml.safe_load(build_jobs_tracking_file)
-                logging.info('Tracking builds asynchronously...')
-                loop = asyncio.get_event_loop()
-                loop.run_until_complete(track_multiple_build_job_statuses(build_jobs_tracking_dict))
-                loop.close()
-            with open(build_jobs_tracking_yaml, 'w', encoding='utf-8') as build_jobs_tracking_file:
-                yaml.dump(build_jobs_tracking_dict, build_jobs_tracking_file)
-        except FileError as exception:
-            logging.fatal("Could not load file: %s -> %s", build_jobs_tracking_yaml, exception.message)
+
+    @staticmethod
+    @typechecked
+    def preflight_build_hosts(build_jobs_dict: dict, preflight: str | None) -> set:
+        """
+        Checks every host of a build jobs (or tracking) dict concurrently if a preflight policy is given, logging the
+        results in one table. Exits if any host failed and the policy is to abort
+        :return: URLs of the hosts whose jobs are skipped
+        """
+        if preflight is None:
+            return set()
+        logging.info('Preflighting %s host(s)...', len(build_jobs_dict[BUILD][HOSTS]))
+        host_preflights = asyncio.run(preflight_jenkins_hosts(build_jobs_dict))
+        log_host_preflights(host_preflights)
+        failed_host_urls = get_failed_preflight_host_urls(host_preflights)
+        if len(failed_host_urls) > 0 and preflight == 'abort':
+            logging.fatal('Preflight failed for %s host(s), exiting before any work starts', len(failed_host_urls))
             sys.exit(1)
+        for host_url in failed_host_urls:
+            logging.warning('Skipping the jobs of %s as it failed preflight', host_url)
+        return failed_host_urls
 
-        logging.info('Wrote statuses to %s', build_jobs_tracking_yaml)
+    @staticmethod
+    @typechecked
+    def start_request_hedging(hedge_percentile: float | None, hedge_budget: float) -> None:
+        """Hedges the command's GET requests if a hedging percentile is given, logging the hedges made when it ends"""
+        if hedge_percentile is None:
+            return
+        start_request_hedging(RequestHedgingPolicy(hedge_percentile, hedge_budget))
+        click.get_current_context().call_on_close(log_request_hedging_stats)
+
+    @staticmethod
+    @typechecked
+    def validate_daemon_events_output(events: str | None, events_output: str) -> None:
+        """Events of daemon commands cannot reach the submitting process's stdout"""
+        if events is not None and events_output == STDOUT_EVENTS_OUTPUT:
+            raise click.UsageError('--events-output must be a file or FIFO path when submitting to a daemon')
+
+    @staticmethod
+    @typechecked
+    def validate_http_cassette_options(record: str | None,
+                                       replay: str | None,
+                                       daemon_socket: str | None,
+                                       shards: int = 1) -> None:
+        """A cassette records or replays the requests of this process only"""
+        if record is None and replay is None:
+            return
+        if record is not None and replay is not None:
+            raise click.UsageError('--record and --replay are mutually exclusive')
+        if daemon_socket is not None or shards > 1:
+            raise click.UsageError('--record and --replay cannot be combined with --daemon-socket or --shards')
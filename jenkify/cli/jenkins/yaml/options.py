@@ -1,7 +1,38 @@
 """Jenkins YAML parsing command-line options"""
+import functools
+
 import click
 from typeguard import typechecked
 
+from jenkify.cli.common.options import (
+    deadline_option,
+    events_option,
+    events_output_option,
+    hedge_budget_option,
+    hedge_percentile_option,
+    record_option,
+    replay_latency_scale_option,
+    replay_option,
+)
+from jenkify.cli.jenkins.daemon.options import daemon_socket_option
+from jenkify.cli.jenkins.yaml.yaml_command_settings import YamlCommandSettings
+from jenkify.use_cases.jenkins_build_reuse import DEFAULT_REUSE_RESULTS_MAX_AGE_MINUTES
+from jenkify.use_cases.jenkins_host_preflight import HOST_PREFLIGHT_POLICIES
+from jenkify.utils.jenkins.jenkins_rest_api.jenkins_poll_status import (
+    DEFAULT_MAX_CONCURRENT_REQUESTS_PER_HOST,
+)
+
+YAML_COMMAND_SETTINGS_PARAM_NAMES = ('deadline',
+                                     'preflight',
+                                     'events',
+                                     'events_output',
+                                     'record',
+                                     'replay',
+                                     'replay_latency_scale',
+                                     'hedge_percentile',
+                                     'hedge_budget',
+                                     'daemon_socket')
+
 
 @typechecked
 def build_jobs_yaml_file_option(func):
@@ -25,3 +56,130 @@ def build_jobs_tracking_yaml_file_option(func):
                         required=True,
                         help='Build jobs tracking YAML file path'
                         )(func)
+
+
+@typechecked
+def shards_option(func):
+    """Amount of processes to shard build job tracking across (by host)"""
+    return click.option('-s',
+                        '--shards',
+                        type=click.IntRange(min=1),
+                        is_flag=False,
+                        required=False,
+                        default=1,
+                        help='Amount of processes to split tracking across, by host'
+                        )(func)
+
+
+@typechecked
+def max_concurrent_requests_per_host_option(func):
+    """Maximum amount of concurrent requests made to a single host"""
+    return click.option('-mcr',
+                        '--max-concurrent-requests-per-host',
+                        type=click.IntRange(min=1),
+                        is_flag=False,
+                        required=False,
+                        default=DEFAULT_MAX_CONCURRENT_REQUESTS_PER_HOST,
+                        help='Maximum amount of concurrent requests made to a single host'
+                        )(func)
+
+
+@typechecked
+def max_in_flight_option(func):
+    """Maximum amount of unfinished builds kicked off on a single host"""
+    return click.option('-mif',
+                        '--max-in-flight',
+                        type=click.IntRange(min=1),
+                        is_flag=False,
+                        required=False,
+                        help='Release builds to each host in waves, up to this many unfinished builds per host'
+                        )(func)
+
+
+@typechecked
+def fail_fast_option(func):
+    """Stop tracking on the first failed build"""
+    return click.option('-ff', '--fail-fast', type=click.BOOL, is_flag=True, required=False,
+                        help='Stop tracking as soon as any build fails or is aborted')(func)
+
+
+@typechecked
+def abort_remaining_option(func):
+    """Abort unfinished builds when failing fast"""
+    return click.option('-ar', '--abort-remaining', type=click.BOOL, is_flag=True, required=False,
+                        help='Abort every unfinished build on the first failure (implies --fail-fast)')(func)
+
+
+@typechecked
+def stage_progress_option(func):
+    """Report stage-level progress of in-progress pipeline builds"""
+    return click.option('-stp', '--stage-progress', type=click.BOOL, is_flag=True, required=False,
+                        help='Report each stage state change of in-progress pipeline builds')(func)
+
+
+@typechecked
+def reuse_results_option(func):
+    """Reuse recent identical successful builds instead of kicking off new ones"""
+    return click.option('-rr',
+                        '--reuse-results',
+                        type=click.BOOL,
+                        is_flag=True,
+                        required=False,
+                        help='Track a recent successful build with the same parameters and revision '
+                             'instead of kicking off a new one. The revision is compared to the latest one Jenkins '
+                             'has built of each branch: commits pushed since then are not noticed'
+                        )(func)
+
+
+@typechecked
+def reuse_max_age_option(func):
+    """Maximum age of reused builds"""
+    return click.option('-rma',
+                        '--reuse-max-age',
+                        type=click.IntRange(min=1),
+                        is_flag=False,
+                        required=False,
+                        default=DEFAULT_REUSE_RESULTS_MAX_AGE_MINUTES,
+                        help='Only reuse builds started within this many minutes'
+                        )(func)
+
+
+@typechecked
+def preflight_option(func):
+    """Policy for hosts failing the preflight check made before any work starts"""
+    return click.option('-pf',
+                        '--preflight',
+                        type=click.Choice(HOST_PREFLIGHT_POLICIES),
+                        is_flag=False,
+                        required=False,
+                        help='Check every host concurrently before any work starts, then skip the jobs of hosts '
+                             'which failed (skip) or exit without doing anything (abort)'
+                        )(func)
+
+
+@typechecked
+def yaml_command_settings_options(func):
+    """
+    Deadline, preflight, events, HTTP cassette, hedging and daemon options shared by the YAML commands,
+    passed to the command as a single yaml_command_settings argument
+    """
+    settings_options = (deadline_option,
+                        preflight_option,
+                        events_option,
+                        events_output_option,
+                        record_option,
+                        replay_option,
+                        replay_latency_scale_option,
+                        hedge_percentile_option,
+                        hedge_budget_option,
+                        daemon_socket_option)
+
+    @functools.wraps(func)
+    def command(*args, **kwargs):
+        yaml_command_settings = YamlCommandSettings(**{param_name: kwargs.pop(param_name)
+                                                       for param_name in YAML_COMMAND_SETTINGS_PARAM_NAMES})
+        return func(*args, yaml_command_settings=yaml_command_settings, **kwargs)
+
+    for settings_option in reversed(settings_options):
+        command = settings_option(command)
+    return command
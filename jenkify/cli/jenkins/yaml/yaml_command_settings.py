@@ -0,0 +1,29 @@
+"""Data class module for the settings shared by the Jenkins YAML commands"""
+from dataclasses import dataclass
+
+
+@dataclass
+class YamlCommandSettings:
+    """Data class for the deadline, preflight, events, HTTP cassette, hedging and daemon settings of YAML commands"""
+    def __init__(self,
+                 *,
+                 deadline: float | None,
+                 preflight: str | None,
+                 events: str | None,
+                 events_output: str,
+                 record: str | None,
+                 replay: str | None,
+                 replay_latency_scale: float,
+                 hedge_percentile: float | None,
+                 hedge_budget: float,
+                 daemon_socket: str | None):
+        self.deadline = deadline
+        self.preflight = preflight
+        self.events = events
+        self.events_output = events_output
+        self.record = record
+        self.replay = replay
+        self.replay_latency_scale = replay_latency_scale
+        self.hedge_percentile = hedge_percentile
+        self.hedge_budget = hedge_budget
+        self.daemon_socket = daemon_socket
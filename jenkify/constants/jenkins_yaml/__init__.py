@@ -9,3 +9,20 @@ BUILD_PARAMETERS = 'build-parameters'
 
 SUCCESSFUL_JOBS = 'successful-jobs'
 FAILED_JOBS = 'failed-jobs'
+
+BUILD_INDEX = 'build-index'
+USER_INPUT = 'user-input'
+STATUS = 'status'
+STAGES = 'stages'
+ID = 'id'
+DEPENDS_ON = 'depends-on'
+SUBMITTED_INPUTS = 'submitted-inputs'
+BUILD_MATRIX = 'build-matrix'
+AXES = 'axes'
+INCLUDE = 'include'
+EXCLUDE = 'exclude'
+NAME = 'name'
+VALUE = 'value'
+VALUES = 'values'
+END_GLOB = 'end-glob'
+END_REGEX = 'end-regex'
@@ -0,0 +1,12 @@
+"""Build event type enum"""
+from enum import Enum
+
+
+class BuildEventType(Enum):
+    """Build event type enum"""
+    TRIGGERED = 'triggered'
+    QUEUED = 'queued'
+    STARTED = 'started'
+    STAGE = 'stage'
+    INPUT_SUBMITTED = 'input-submitted'
+    FINISHED = 'finished'
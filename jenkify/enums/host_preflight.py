@@ -0,0 +1,10 @@
+"""Host preflight status enum"""
+from enum import Enum
+
+
+class HostPreflightStatus(Enum):
+    """Host preflight status enum"""
+    OK = 'ok'
+    UNREACHABLE = 'unreachable'
+    UNAUTHORIZED = 'unauthorized'
+    ERROR = 'error'
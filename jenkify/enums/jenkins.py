@@ -9,3 +9,5 @@ class JenkinsJobStatus(Enum):
     UNSTABLE = 2
     FAILURE = 3
     ABORTED = 4
+    SKIPPED = 5
+    TIMEOUT = 6
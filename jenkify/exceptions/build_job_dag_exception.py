@@ -0,0 +1,9 @@
+"""Build job dependency graph exceptions module"""
+
+
+class BuildJobDagException(Exception):
+    """Raised when the depends-on edges of a build jobs YAML do not form a valid DAG"""
+
+    def __init__(self, message=None):
+        self.message = message
+        super().__init__(self.message)
@@ -0,0 +1,9 @@
+"""Build matrix exceptions module"""
+
+
+class BuildMatrixException(Exception):
+    """Raised when the build-matrix section of a build jobs YAML job is malformed"""
+
+    def __init__(self, message=None):
+        self.message = message
+        super().__init__(self.message)
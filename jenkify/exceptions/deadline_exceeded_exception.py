@@ -0,0 +1,9 @@
+"""Deadline exceeded exceptions module"""
+from jenkify.exceptions.request_retry_exception import RequestRetryException
+
+
+class DeadlineExceededException(RequestRetryException):
+    """
+    Raised when a request cannot be made (or retried) before the command's deadline.
+    A RequestRetryException, so that callers treating a failed request as no response keep doing so
+    """
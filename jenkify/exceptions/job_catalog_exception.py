@@ -0,0 +1,9 @@
+"""Job catalog exceptions module"""
+
+
+class JobCatalogException(Exception):
+    """Raised when a job selector of a build jobs YAML cannot be resolved from the job catalog"""
+
+    def __init__(self, message=None):
+        self.message = message
+        super().__init__(self.message)
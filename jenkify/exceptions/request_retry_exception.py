@@ -4,6 +4,11 @@
 class RequestRetryException(Exception):
     """Default request retry exception"""
 
-    def __init__(self, message=None):
+    def __init__(self, message=None, status_code=None):
+        """
+        :param message: Message of the exception
+        :param status_code: Status code of the last response, None if there was none
+        """
         self.message = message
+        self.status_code = status_code
         super().__init__(self.message)
@@ -0,0 +1,82 @@
+"""Module containing the executor- and queue-aware admission controller for kicking off builds"""
+import logging
+import threading
+
+from typeguard import typechecked
+
+from jenkify.utils.environment.Environment import Environment
+from jenkify.utils.jenkins.jenkins_rest_api.jenkins_utils import JenkinsUtils
+
+
+class JenkinsBuildAdmissionController:
+    """
+    Releases builds to each host in waves, limited by a maximum amount of in-flight builds per host
+    and by the host's idle executors minus the length of its build queue
+    """
+    _max_in_flight: int
+    _in_flight_counts: dict[str, int]
+
+    def __init__(self, max_in_flight: int):
+        self._max_in_flight = max_in_flight
+        self._in_flight_counts = {}
+        self._in_flight_counts_lock = threading.Lock()
+
+    @typechecked
+    def get_in_flight_count(self, host_url: str) -> int:
+        """Gets the amount of builds kicked off on the host which have not finished yet"""
+        with self._in_flight_counts_lock:
+            return self._in_flight_counts.get(host_url, 0)
+
+    @typechecked
+    def get_available_slots(self, host_url: str) -> int:
+        """
+        Gets how many more builds may be kicked off on the host right now
+        :param host_url: URL of the host
+        :return: amount of builds to release in the next wave
+        """
+        in_flight_count = self.get_in_flight_count(host_url)
+        if (free_slots := self._max_in_flight - in_flight_count) <= 0:
+            return 0
+        jenkins_utils = JenkinsUtils(Environment.get_jenkins_request_settings_for_host(host_url))
+        computer_set_dict = jenkins_utils.get_jenkins_computer_set_dict()
+        queue_dict = jenkins_utils.get_jenkins_queue_dict()
+        if computer_set_dict is None or queue_dict is None:
+            logging.warning('Could not read executor and queue load of %s, limiting by max in-flight only',
+                            host_url)
+            return free_slots
+        idle_executors = computer_set_dict['totalExecutors'] - computer_set_dict['busyExecutors']
+        queue_length = len(queue_dict.get('items', []))
+        available_slots = min(free_slots, max(idle_executors - queue_length, 0))
+        if available_slots == 0 and in_flight_count == 0:
+            available_slots = 1
+        logging.info('Host %s: %s in flight, %s idle executor(s), %s queued, releasing %s build(s)',
+                     host_url,
+                     in_flight_count,
+                     idle_executors,
+                     queue_length,
+                     available_slots)
+        return available_slots
+
+    @typechecked
+    def admit(self, ready_build_jobs: list) -> list:
+        """
+        Admits the next wave of ready build jobs, in the order given, host by host
+        :param ready_build_jobs: (job id, host URL) tuples, highest priority first
+        :return: ids of the admitted jobs, which count as in flight until released
+        """
+        admitted_job_ids = []
+        host_urls = list(dict.fromkeys(host_url for _, host_url in ready_build_jobs))
+        for host_url in host_urls:
+            available_slots = self.get_available_slots(host_url)
+            host_job_ids = [job_id for job_id, job_host_url in ready_build_jobs if job_host_url == host_url]
+            admitted_job_ids.extend(host_job_ids[:available_slots])
+            with self._in_flight_counts_lock:
+                self._in_flight_counts[host_url] = (self._in_flight_counts.get(host_url, 0) +
+                                                    len(host_job_ids[:available_slots]))
+        return admitted_job_ids
+
+    @typechecked
+    def release(self, host_url: str) -> None:
+        """Releases an in-flight slot of the host once its build has finished (or failed to start)"""
+        with self._in_flight_counts_lock:
+            self._in_flight_counts[host_url] -= 1
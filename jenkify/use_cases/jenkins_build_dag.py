@@ -0,0 +1,372 @@
+"""Module containing the dependency-aware (DAG) scheduler for build jobs YAML input"""
+import asyncio
+import logging
+import os
+import statistics
+from collections import Counter
+
+from typeguard import typechecked
+
+from jenkify.constants.jenkins_yaml import (
+    BUILD, HOSTS, JOBS, URL, END, ID, DEPENDS_ON, STATUS, USER_INPUT, SUCCESSFUL_JOBS, FAILED_JOBS,
+    SUBMITTED_INPUTS,
+)
+from jenkify.enums.jenkins import JenkinsJobStatus
+from jenkify.exceptions.build_job_dag_exception import BuildJobDagException
+from jenkify.use_cases.jenkins_build_admission import JenkinsBuildAdmissionController
+from jenkify.use_cases.jenkins_builds import kick_off_build_job_group
+from jenkify.utils.environment.Environment import Environment
+from jenkify.utils.jenkins.jenkins_rest_api.jenkins_poll_scheduler import JenkinsPollScheduler
+from jenkify.utils.jenkins.jenkins_rest_api.jenkins_poll_status import JenkinsBuildPoll
+from jenkify.utils.jenkins.jenkins_rest_api.jenkins_utils import JenkinsUtils
+from jenkify.utils.request_deadline import is_request_deadline_exceeded
+
+DAG_SUCCESSFUL_STATUSES = (JenkinsJobStatus.SUCCESS, JenkinsJobStatus.UNSTABLE)
+DAG_HOST = 'host'
+DAG_JOB_INDEX = 'job-index'
+DAG_DOWNSTREAM = 'downstream'
+
+
+@typechecked
+def has_build_job_dependencies(build_jobs_dict: dict) -> bool:
+    """Checks whether any job of the build jobs dict declares depends-on edges"""
+    return any(len(job.get(DEPENDS_ON, [])) > 0
+               for host in build_jobs_dict[BUILD][HOSTS]
+               for job in host[JOBS])
+
+
+@typechecked
+def get_build_job_id(job: dict) -> str:
+    """Gets the id a job is referred to by in depends-on edges, its URL end unless set explicitly"""
+    return job.get(ID, job[END])
+
+
+@typechecked
+def get_build_job_dag(build_jobs_dict: dict) -> dict:
+    """
+    Builds the dependency graph of the build jobs dict.
+    Jobs sharing a URL end without an explicit id get unique keys but cannot be depended on
+    :param build_jobs_dict: Build jobs dict (usually parsed from YAML)
+    :return: dict mapping each job id to its host, job index, upstream and downstream job ids
+    :raises BuildJobDagException: on duplicate ids, unknown dependencies or dependency cycles
+    """
+    job_id_counts = Counter(get_build_job_id(job)
+                            for host in build_jobs_dict[BUILD][HOSTS]
+                            for job in host[JOBS])
+    build_job_dag: dict = {}
+    for host in build_jobs_dict[BUILD][HOSTS]:
+        for job_index, job in enumerate(host[JOBS]):
+            job_id = get_build_job_id(job)
+            if job_id_counts[job_id] > 1:
+                if ID in job:
+                    raise BuildJobDagException(f'Duplicate build job id: {job_id}')
+                job_id = f'{host[URL]}/{job_id}[{job_index}]'
+            build_job_dag[job_id] = {DAG_HOST: host,
+                                     DAG_JOB_INDEX: job_index,
+                                     DEPENDS_ON: list(job.get(DEPENDS_ON, [])),
+                                     DAG_DOWNSTREAM: []}
+    for job_id, node in build_job_dag.items():
+        for upstream_job_id in node[DEPENDS_ON]:
+            if job_id_counts[upstream_job_id] > 1:
+                raise BuildJobDagException(f'Build job {job_id} depends on ambiguous job: {upstream_job_id}, '
+                                           f'set a unique {ID}')
+            if upstream_job_id not in build_job_dag:
+                raise BuildJobDagException(f'Build job {job_id} depends on unknown job: {upstream_job_id}')
+            build_job_dag[upstream_job_id][DAG_DOWNSTREAM].append(job_id)
+    if len(get_build_job_topological_order(build_job_dag)) != len(build_job_dag):
+        raise BuildJobDagException('Build job dependencies contain a cycle')
+    return build_job_dag
+
+
+@typechecked
+def get_build_job_topological_order(build_job_dag: dict) -> list:
+    """Orders job ids so that every job comes after its upstream jobs (omits jobs on cycles)"""
+    upstream_counts = {job_id: len(node[DEPENDS_ON]) for job_id, node in build_job_dag.items()}
+    ordered_job_ids = [job_id for job_id, upstream_count in upstream_counts.items() if upstream_count == 0]
+    for job_id in ordered_job_ids:
+        for downstream_job_id in build_job_dag[job_id][DAG_DOWNSTREAM]:
+            upstream_counts[downstream_job_id] -= 1
+            if upstream_counts[downstream_job_id] == 0:
+                ordered_job_ids.append(downstream_job_id)
+    return ordered_job_ids
+
+
+@typechecked
+def get_build_job_critical_path_priorities(build_job_dag: dict, estimated_durations: dict) -> dict:
+    """
+    Computes each job's priority as the estimated duration of the longest path from it to a sink,
+    so that jobs on the critical path are kicked off first
+    :param build_job_dag: Dependency graph from get_build_job_dag
+    :param estimated_durations: Estimated duration of each job id (None if unknown)
+    :return: dict mapping each job id to its priority
+    """
+    known_durations = [duration for duration in estimated_durations.values() if duration is not None]
+    default_duration = statistics.mean(known_durations) if len(known_durations) > 0 else 1
+    priorities: dict = {}
+    for job_id in reversed(get_build_job_topological_order(build_job_dag)):
+        duration = estimated_durations.get(job_id, None)
+        priorities[job_id] = ((duration if duration is not None else default_duration) +
+                              max((priorities[downstream_job_id]
+                                   for downstream_job_id in build_job_dag[job_id][DAG_DOWNSTREAM]),
+                                  default=0))
+    return priorities
+
+
+@typechecked
+def get_build_job_estimated_duration(build_host: dict, job: dict) -> int | None:
+    """Estimates a job's duration from its last successful build"""
+    last_successful_build_dict = JenkinsUtils(
+        Environment.get_jenkins_request_settings_for_host(build_host[URL])
+    ).get_jenkins_build_dict_url_end(f'{job[END]}/lastSuccessfulBuild', tree='duration')
+    return last_successful_build_dict.get('duration', None) if last_successful_build_dict is not None else None
+
+
+@typechecked
+def skip_downstream_build_jobs(build_job_dag: dict, job_id: str, statuses: dict) -> list:
+    """Marks every job downstream of a failed job as skipped and returns the skipped job ids"""
+    skipped_job_ids = []
+    job_ids_to_visit = list(build_job_dag[job_id][DAG_DOWNSTREAM])
+    while len(job_ids_to_visit) > 0:
+        if (downstream_job_id := job_ids_to_visit.pop()) in statuses:
+            continue
+        statuses[downstream_job_id] = JenkinsJobStatus.SKIPPED
+        node = build_job_dag[downstream_job_id]
+        node[DAG_HOST][JOBS][node[DAG_JOB_INDEX]][STATUS] = JenkinsJobStatus.SKIPPED.name
+        logging.warning('Skipping %s as its upstream %s did not succeed', downstream_job_id, job_id)
+        skipped_job_ids.append(downstream_job_id)
+        job_ids_to_visit.extend(node[DAG_DOWNSTREAM])
+    return skipped_job_ids
+
+
+@typechecked
+def get_build_job_info(build_job_dag: dict, job_id: str) -> dict:
+    """Gets the URL, URL end and index of a job, as reported in the successful and failed jobs"""
+    node = build_job_dag[job_id]
+    return {URL: node[DAG_HOST][URL], END: node[DAG_HOST][JOBS][node[DAG_JOB_INDEX]][END], 'index': node[DAG_JOB_INDEX]}
+
+
+@typechecked
+async def estimate_build_job_durations(build_job_dag: dict, skipped_host_urls: set) -> dict:
+    """Concurrently estimates the duration of every job which is not on a skipped host (see priorities)"""
+    estimated_job_ids = [job_id for job_id, node in build_job_dag.items()
+                         if node[DAG_HOST][URL] not in skipped_host_urls]
+    return dict(zip(estimated_job_ids, await asyncio.gather(*[
+        asyncio.to_thread(get_build_job_estimated_duration,
+                          build_job_dag[job_id][DAG_HOST],
+                          build_job_dag[job_id][DAG_HOST][JOBS][build_job_dag[job_id][DAG_JOB_INDEX]])
+        for job_id in estimated_job_ids])))
+
+
+@typechecked
+def skip_build_jobs_of_hosts(build_job_dag: dict, skipped_host_urls: set, statuses: dict) -> None:
+    """Marks every job of the skipped hosts, and every job downstream of them, as skipped"""
+    for job_id, node in build_job_dag.items():
+        if node[DAG_HOST][URL] in skipped_host_urls and job_id not in statuses:
+            statuses[job_id] = JenkinsJobStatus.SKIPPED
+            node[DAG_HOST][JOBS][node[DAG_JOB_INDEX]][STATUS] = JenkinsJobStatus.SKIPPED.name
+            logging.warning('Skipping %s as its host %s is skipped', job_id, node[DAG_HOST][URL])
+            skip_downstream_build_jobs(build_job_dag, job_id, statuses)
+
+
+class BuildJobsDagRun:
+    """
+    State of a run of a build jobs DAG: the status of each finished job and the polls of those in flight,
+    all polled from a single scheduler
+    """
+    build_job_dag: dict
+    priorities: dict
+    admission_controller: JenkinsBuildAdmissionController | None
+    reuse_max_age_minutes: int | None
+    statuses: dict
+    poll_scheduler: JenkinsPollScheduler
+    build_polls: dict
+    next_build_numbers: dict
+    successful_jobs: list
+    failed_jobs: list
+
+    def __init__(self,
+                 build_job_dag: dict,
+                 priorities: dict,
+                 admission_controller: JenkinsBuildAdmissionController | None,
+                 reuse_max_age_minutes: int | None):
+        """See run_build_jobs_dag"""
+        self.build_job_dag = build_job_dag
+        self.priorities = priorities
+        self.admission_controller = admission_controller
+        self.reuse_max_age_minutes = reuse_max_age_minutes
+        self.statuses = {}
+        self.poll_scheduler = JenkinsPollScheduler(int(os.getenv('POLL_RATE_SECONDS')))
+        self.build_polls = {}
+        self.next_build_numbers = {}
+        self.successful_jobs = []
+        self.failed_jobs = []
+
+    def get_ready_job_ids(self) -> list:
+        """Gets the jobs not kicked off yet whose upstream jobs all succeeded, highest priority first"""
+        polled_job_ids = set(self.build_polls.values())
+        return sorted((job_id for job_id, node in self.build_job_dag.items()
+                       if job_id not in self.statuses and
+                       job_id not in polled_job_ids and
+                       all(self.statuses.get(upstream_job_id, None) in DAG_SUCCESSFUL_STATUSES
+                           for upstream_job_id in node[DEPENDS_ON])),
+                      key=self.priorities.get,
+                      reverse=True)
+
+    def fail_job(self, job_id: str, status: JenkinsJobStatus) -> None:
+        """Records a job which could not be kicked off as failed, skipping its downstream jobs"""
+        self.statuses[job_id] = status
+        node = self.build_job_dag[job_id]
+        node[DAG_HOST][JOBS][node[DAG_JOB_INDEX]][STATUS] = status.name
+        self.failed_jobs.append(get_build_job_info(self.build_job_dag, job_id))
+        skip_downstream_build_jobs(self.build_job_dag, job_id, self.statuses)
+
+    def release_job(self, job_id: str) -> None:
+        """Releases a job's slot in the admission controller, if any"""
+        if self.admission_controller is not None:
+            self.admission_controller.release(self.build_job_dag[job_id][DAG_HOST][URL])
+
+    async def admit_jobs(self, ready_job_ids: list) -> list:
+        """Gets the ready jobs which may be kicked off now, all of them without an admission controller"""
+        if self.admission_controller is None or len(ready_job_ids) == 0:
+            return ready_job_ids
+        return await asyncio.to_thread(self.admission_controller.admit,
+                                       [(job_id, self.build_job_dag[job_id][DAG_HOST][URL])
+                                        for job_id in ready_job_ids])
+
+    async def kick_off_jobs(self, job_ids: list) -> dict:
+        """
+        Kicks off jobs concurrently, one group per host and URL end so that each job of a group is tracked with
+        the build number following the previous one's
+        :return: dict mapping each job id to its build number to track, None if it could not be kicked off
+        """
+        job_id_groups: dict = {}
+        for job_id in job_ids:
+            node = self.build_job_dag[job_id]
+            job_id_groups.setdefault((id(node[DAG_HOST]), node[DAG_HOST][JOBS][node[DAG_JOB_INDEX]][END]),
+                                     []).append(job_id)
+        build_number_groups = await asyncio.gather(*[
+            asyncio.to_thread(kick_off_build_job_group,
+                              self.build_job_dag[job_id_group[0]][DAG_HOST],
+                              [self.build_job_dag[job_id][DAG_JOB_INDEX] for job_id in job_id_group],
+                              self.next_build_numbers.get(group_key, 0),
+                              self.reuse_max_age_minutes)
+            for group_key, job_id_group in job_id_groups.items()])
+        build_numbers = {}
+        for (group_key, job_id_group), build_number_group in zip(job_id_groups.items(), build_number_groups):
+            build_numbers.update(zip(job_id_group, build_number_group))
+            self.next_build_numbers[group_key] = max([self.next_build_numbers.get(group_key, 0),
+                                                      *(build_number + 1 for build_number in build_number_group
+                                                        if build_number is not None)])
+        return build_numbers
+
+    def start_polling_job(self, job_id: str, build_number: int) -> JenkinsBuildPoll:
+        """
+        Records a kicked off job as successful and sets up the poll of its build
+        :return: the build poll, to be scheduled
+        """
+        node = self.build_job_dag[job_id]
+        build_host = node[DAG_HOST]
+        job = build_host[JOBS][node[DAG_JOB_INDEX]]
+        self.successful_jobs.append({**get_build_job_info(self.build_job_dag, job_id), 'build_number': build_number})
+        build_poll = JenkinsBuildPoll(Environment.get_jenkins_request_settings_for_host(build_host[URL]),
+                                      job[END],
+                                      build_number,
+                                      job.get(USER_INPUT, None))
+        self.build_polls[build_poll] = job_id
+        return build_poll
+
+    async def finish_build_polls(self) -> None:
+        """
+        Runs the scheduler until a build has finished and records the finished builds.
+        Past the deadline, builds which have not finished are recorded as TIMEOUT
+        """
+        for build_poll in await self.poll_scheduler.run(until_first_done=True):
+            self.finish_job(self.build_polls.pop(build_poll), build_poll.build_job_status)
+        if is_request_deadline_exceeded():
+            for build_poll, job_id in self.build_polls.items():
+                build_poll.time_out()
+                self.finish_job(job_id, build_poll.build_job_status)
+            self.build_polls.clear()
+
+    def finish_job(self, job_id: str, poll_result: dict) -> None:
+        """Records the status (and submitted inputs) a job's build finished with, skipping downstream on failure"""
+        self.release_job(job_id)
+        node = self.build_job_dag[job_id]
+        job = node[DAG_HOST][JOBS][node[DAG_JOB_INDEX]]
+        self.statuses[job_id] = poll_result[STATUS]
+        job[STATUS] = poll_result[STATUS].name
+        if len(poll_result[SUBMITTED_INPUTS]) > 0:
+            job[SUBMITTED_INPUTS] = poll_result[SUBMITTED_INPUTS]
+        if poll_result[STATUS] not in DAG_SUCCESSFUL_STATUSES:
+            skip_downstream_build_jobs(self.build_job_dag, job_id, self.statuses)
+
+    async def run_step(self) -> None:
+        """Kicks off the jobs which are ready (or times them out past the deadline), then waits for a build to finish"""
+        ready_job_ids = self.get_ready_job_ids()
+        if is_request_deadline_exceeded():
+            for job_id in ready_job_ids:
+                logging.error('Deadline reached before %s could be kicked off, not kicking it off', job_id)
+                self.fail_job(job_id, JenkinsJobStatus.TIMEOUT)
+            ready_job_ids = []
+        ready_job_ids = await self.admit_jobs(ready_job_ids)
+        build_numbers = await self.kick_off_jobs(ready_job_ids)
+        build_polls = []
+        for job_id in ready_job_ids:
+            if build_numbers[job_id] is None:
+                self.release_job(job_id)
+                self.fail_job(job_id, JenkinsJobStatus.UNKNOWN)
+            else:
+                build_polls.append(self.start_polling_job(job_id, build_numbers[job_id]))
+        self.poll_scheduler.schedule(build_polls)
+        if len(self.build_polls) > 0:
+            await self.finish_build_polls()
+
+    async def run(self) -> dict:
+        """Runs steps until every job has a status, see run_build_jobs_dag"""
+        while len(self.statuses) < len(self.build_job_dag):
+            await self.run_step()
+        self.failed_jobs.extend(get_build_job_info(self.build_job_dag, job_id)
+                                for job_id, status in self.statuses.items() if status == JenkinsJobStatus.SKIPPED)
+        logging.info('Build jobs DAG complete: %s', {job_id: status.name for job_id, status in self.statuses.items()})
+        return {SUCCESSFUL_JOBS: self.successful_jobs, FAILED_JOBS: self.failed_jobs}
+
+
+@typechecked
+async def run_build_jobs_dag(build_jobs_dict: dict,
+                             max_in_flight: int | None = None,
+                             reuse_max_age_minutes: int | None = None,
+                             skipped_host_urls: set | None = None) -> dict:
+    """
+    Kicks off each job as soon as all of its upstream jobs have succeeded (or are unstable),
+    highest critical path priority first, and tracks it to completion.
+    Jobs downstream of a failure are skipped. Build numbers and statuses are recorded on the jobs.
+    Jobs still waiting to be kicked off at the command's deadline are recorded as TIMEOUT instead
+    :param build_jobs_dict: Build jobs dict (usually parsed from YAML)
+    :param max_in_flight: If set, ready jobs are released to each host in waves through an
+        executor- and queue-aware admission controller, up to this many unfinished builds per host
+    :param reuse_max_age_minutes: If set, recent identical successful builds are tracked instead of kicking off
+        new builds (see kick_off_build_job)
+    :param skipped_host_urls: Hosts whose jobs are skipped without any request being made (e.g. failed preflight)
+    :return: dict of successful and failed (including skipped) jobs
+    """
+    build_job_dag = get_build_job_dag(build_jobs_dict)
+    skipped_host_urls = skipped_host_urls if skipped_host_urls is not None else set()
+    build_jobs_dag_run = BuildJobsDagRun(
+        build_job_dag,
+        get_build_job_critical_path_priorities(build_job_dag,
+                                               await estimate_build_job_durations(build_job_dag, skipped_host_urls)),
+        JenkinsBuildAdmissionController(max_in_flight) if max_in_flight is not None else None,
+        reuse_max_age_minutes)
+    skip_build_jobs_of_hosts(build_job_dag, skipped_host_urls, build_jobs_dag_run.statuses)
+    return await build_jobs_dag_run.run()
+
+
+@typechecked
+def prune_build_job_dependencies(build_jobs_dict: dict) -> None:
+    """Removes depends-on edges to jobs which are no longer part of the build jobs dict"""
+    job_ids = {get_build_job_id(job) for host in build_jobs_dict[BUILD][HOSTS] for job in host[JOBS]}
+    for host in build_jobs_dict[BUILD][HOSTS]:
+        for job in host[JOBS]:
+            if DEPENDS_ON in job:
+                job[DEPENDS_ON] = [upstream_job_id for upstream_job_id in job[DEPENDS_ON]
+                                   if upstream_job_id in job_ids]
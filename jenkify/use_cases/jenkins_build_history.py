@@ -0,0 +1,168 @@
+"""Module containing the ingestion and analysis of build history"""
+import asyncio
+import logging
+import statistics
+from collections import Counter
+
+from typeguard import typechecked
+
+from jenkify.exceptions.request_retry_exception import RequestRetryException
+from jenkify.utils.environment.Environment import Environment
+from jenkify.utils.jenkins.jenkins_build_history_store import JenkinsBuildHistoryStore
+from jenkify.utils.jenkins.jenkins_rest_api.jenkins_poll_status import (
+    DEFAULT_MAX_CONCURRENT_REQUESTS_PER_HOST,
+    run_host_request,
+)
+from jenkify.utils.jenkins.jenkins_rest_api.jenkins_utils import JenkinsUtils
+from jenkify.utils.jenkins.jenkins_wfapi.runs import get_job_runs_since_build_number
+
+BUILD_HISTORY_PERCENTILES = (50, 90, 95, 99)
+BUILD_HISTORY_RESULTS = ('SUCCESS', 'UNSTABLE', 'FAILURE', 'ABORTED', 'NOT_BUILT')
+MILLIS_PER_DAY = 24 * 60 * 60 * 1000
+BUILD_HISTORY_PAGE_SIZE = 100
+
+
+@typechecked
+def fetch_job_builds_since(jenkins_utils: JenkinsUtils, url_end: str, next_build_number: int) -> list | None:
+    """
+    Fetches the builds of a job from a build number onwards, a page at a time from the newest build, so that a sync
+    only downloads the builds since its cursor instead of the job's whole history
+    :param jenkins_utils: Utils of the job's host
+    :param url_end: URL end of the job
+    :param next_build_number: Lowest build number to fetch
+    :return: list of the builds, or None if a page could not be fetched
+    """
+    builds_by_number: dict = {}
+    start_index = 0
+    while True:
+        build_history_page_dict = jenkins_utils.get_jenkins_job_build_history_page_dict(
+            url_end, start_index, start_index + BUILD_HISTORY_PAGE_SIZE)
+        if build_history_page_dict is None:
+            return None
+        page_builds = build_history_page_dict.get('allBuilds', [])
+        # builds started while paging shift the pages, so a build may be seen twice
+        builds_by_number.update((build['number'], build) for build in page_builds
+                                if build['number'] >= next_build_number)
+        if len(page_builds) < BUILD_HISTORY_PAGE_SIZE or page_builds[-1]['number'] < next_build_number:
+            return list(builds_by_number.values())
+        start_index += BUILD_HISTORY_PAGE_SIZE
+
+
+@typechecked
+def fetch_job_build_history(host_url: str, url_end: str, next_build_number: int) -> tuple | None:
+    """
+    Fetches the builds of a job from the sync cursor onwards, along with queue times of pipeline runs
+    :param host_url: URL of the host the job lives on
+    :param url_end: URL end of the job
+    :param next_build_number: Lowest build number not ingested as finished yet
+    :return: tuple of the finished builds to add and the next sync cursor, or None if the job could not be fetched
+    """
+    jenkins_request_settings = Environment.get_jenkins_request_settings_for_host(host_url)
+    new_builds = fetch_job_builds_since(JenkinsUtils(jenkins_request_settings), url_end, next_build_number)
+    if new_builds is None:
+        logging.error('Could not get build history of %s on %s!', url_end, host_url)
+        return None
+    finished_builds = [build for build in new_builds
+                       if not build.get('building', False) and build.get('result', None) is not None]
+    unfinished_build_numbers = [build['number'] for build in new_builds if build not in finished_builds]
+    queue_durations: dict = {}
+    if len(finished_builds) > 0:
+        try:
+            queue_durations = {int(run['id']): run.get('queueDurationMillis', None)
+                               for run in get_job_runs_since_build_number(jenkins_request_settings,
+                                                                          url_end,
+                                                                          min(build['number']
+                                                                              for build in finished_builds))}
+        except RequestRetryException:
+            logging.debug('wfapi/runs unavailable for %s, queue times unknown', url_end)
+    return ([{'build_number': build['number'],
+              'result': build['result'],
+              'timestamp_millis': build['timestamp'],
+              'duration_millis': build['duration'],
+              'queue_duration_millis': queue_durations.get(build['number'], None)}
+             for build in finished_builds],
+            min(unfinished_build_numbers) if len(unfinished_build_numbers) > 0 else
+            max((build['number'] + 1 for build in new_builds), default=next_build_number))
+
+
+@typechecked
+async def sync_build_history(
+        jenkins_build_history_store: JenkinsBuildHistoryStore,
+        jobs: list,
+        max_concurrent_requests_per_host: int = DEFAULT_MAX_CONCURRENT_REQUESTS_PER_HOST) -> dict:
+    """
+    Incrementally ingests the finished builds of many jobs, fetching concurrently and writing from the event loop
+    :param jenkins_build_history_store: Store to ingest into
+    :param jobs: (host URL, URL end) of each job to sync
+    :param max_concurrent_requests_per_host: Maximum amount of concurrent requests made to a host
+    :return: dict mapping each job to its amount of newly ingested builds (None if it could not be fetched)
+    """
+    host_semaphores: dict = {}
+    for host_url, _ in jobs:
+        host_semaphores.setdefault(host_url, asyncio.Semaphore(max_concurrent_requests_per_host))
+    fetched_build_histories = await asyncio.gather(*[
+        run_host_request(host_semaphores[host_url],
+                         fetch_job_build_history,
+                         host_url,
+                         url_end,
+                         jenkins_build_history_store.get_next_build_number(host_url, url_end))
+        for host_url, url_end in jobs])
+    ingested_build_counts: dict = {}
+    for (host_url, url_end), fetched_build_history in zip(jobs, fetched_build_histories):
+        if fetched_build_history is None:
+            ingested_build_counts[(host_url, url_end)] = None
+            continue
+        builds, next_build_number = fetched_build_history
+        jenkins_build_history_store.add_builds(host_url, url_end, builds, next_build_number)
+        ingested_build_counts[(host_url, url_end)] = len(builds)
+    return ingested_build_counts
+
+
+@typechecked
+def get_percentiles(values, percentiles: tuple = BUILD_HISTORY_PERCENTILES) -> dict:
+    """Computes the given percentiles (inclusive method) of a non-empty sequence of values"""
+    if len(values) == 1:
+        return {f'p{percentile}': values[0] for percentile in percentiles}
+    cut_points = statistics.quantiles(values, n=100, method='inclusive')
+    return {f'p{percentile}': round(cut_points[percentile - 1]) for percentile in percentiles}
+
+
+@typechecked
+def get_trend_per_day(timestamps_millis, values) -> float | None:
+    """Computes the least-squares slope of values over time, in value units per day"""
+    if len(set(timestamps_millis)) < 2:
+        return None
+    return round(statistics.linear_regression([timestamp / MILLIS_PER_DAY for timestamp in timestamps_millis],
+                                              values).slope, 1)
+
+
+@typechecked
+def analyze_build_columns(build_columns: dict) -> dict:
+    """
+    Computes duration percentiles, result rates and duration and queue time trends of a job's builds
+    :param build_columns: Columns of a job's builds from JenkinsBuildHistoryStore.get_build_columns
+    :return: dict of statistics, durations in milliseconds and trends in milliseconds per day
+    """
+    if (build_count := len(build_columns['build_number'])) == 0:
+        return {'builds': 0}
+    result_counts = Counter(build_columns['result'])
+    analysis = {
+        'builds': build_count,
+        'first-build': min(build_columns['build_number']),
+        'last-build': max(build_columns['build_number']),
+        'result-rates': {result: round(result_counts[result] / build_count, 3)
+                         for result in BUILD_HISTORY_RESULTS if result_counts[result] > 0},
+        'failure-rate': round(result_counts['FAILURE'] / build_count, 3),
+        'duration-millis': {**get_percentiles(build_columns['duration_millis']),
+                            'mean': round(statistics.fmean(build_columns['duration_millis'])),
+                            'max': max(build_columns['duration_millis'])},
+        'duration-trend-millis-per-day': get_trend_per_day(build_columns['timestamp_millis'],
+                                                           build_columns['duration_millis']),
+    }
+    if len(build_columns['queue_duration_millis']) > 0:
+        analysis['queue-duration-millis'] = {**get_percentiles(build_columns['queue_duration_millis']),
+                                             'mean': round(statistics.fmean(build_columns['queue_duration_millis'])),
+                                             'max': max(build_columns['queue_duration_millis'])}
+        analysis['queue-duration-trend-millis-per-day'] = get_trend_per_day(build_columns['queue_timestamp_millis'],
+                                                                            build_columns['queue_duration_millis'])
+    return analysis
@@ -0,0 +1,173 @@
+"""Module containing the expansion of build-matrix sections of build jobs YAML input into concrete jobs"""
+import copy
+import itertools
+import logging
+
+from typeguard import typechecked
+
+from jenkify.constants.jenkins_yaml import (
+    BUILD, HOSTS, JOBS, URL, END, ID, DEPENDS_ON, BUILD_PARAMETERS, BUILD_MATRIX, AXES, INCLUDE, EXCLUDE, NAME,
+    VALUE, VALUES,
+)
+from jenkify.exceptions.build_matrix_exception import BuildMatrixException
+from jenkify.use_cases.jenkins_build_dag import get_build_job_id
+
+
+@typechecked
+def get_build_matrix_combinations(build_matrix: dict) -> list:
+    """
+    Expands the axes of a build matrix into every combination of their values, without the combinations matching
+    an exclude rule (all of whose parameters are equal), plus every include rule as a combination of its own
+    :param build_matrix: build-matrix section of a job
+    :return: list of dicts mapping each parameter name to its value
+    :raises BuildMatrixException: if an axis has no name or values
+    """
+    axes = build_matrix.get(AXES, [])
+    for axis in axes:
+        if NAME not in axis or len(axis.get(VALUES, [])) == 0:
+            raise BuildMatrixException(f'Build matrix axis without a {NAME} or {VALUES}: {axis}')
+    combinations = [dict(zip((axis[NAME] for axis in axes), values))
+                    for values in itertools.product(*(axis[VALUES] for axis in axes))] if len(axes) > 0 else []
+    combinations = [combination for combination in combinations
+                    if not any(all(combination.get(name, None) == value for name, value in exclude_rule.items())
+                               for exclude_rule in build_matrix.get(EXCLUDE, []))]
+    return combinations + [dict(include_rule) for include_rule in build_matrix.get(INCLUDE, [])]
+
+
+@typechecked
+def get_build_parameters_key(job: dict) -> tuple:
+    """Gets a hashable key of a job's build parameters, independent of their order"""
+    return tuple(sorted((build_parameter[NAME], str(build_parameter[VALUE]))
+                        for build_parameter in job.get(BUILD_PARAMETERS, None) or []))
+
+
+@typechecked
+def get_build_job_trigger_key(job: dict) -> tuple:
+    """
+    Gets a hashable key of what a job triggers: its URL end, build parameters (independent of their order) and every
+    other setting (e.g. user input), but not its id and dependencies
+    """
+    return (job[END],
+            get_build_parameters_key(job),
+            repr(sorted((key, value) for key, value in job.items()
+                        if key not in (END, ID, DEPENDS_ON, BUILD_PARAMETERS))))
+
+
+@typechecked
+def expand_build_matrix_job(job: dict) -> list:
+    """
+    Expands a job with a build-matrix section into one job per parameter combination, each with the job's fixed
+    build parameters overridden by the combination's and an id of the form <id or end>[NAME=value,...]
+    :param job: Job with a build-matrix section
+    :return: list of the expanded jobs
+    :raises BuildMatrixException: if the build matrix is malformed or expands to nothing
+    """
+    matrix_job_id = get_build_job_id(job)
+    combinations = get_build_matrix_combinations(job[BUILD_MATRIX])
+    if len(combinations) == 0:
+        raise BuildMatrixException(f'Build matrix of {matrix_job_id} expands to no combinations')
+    expanded_jobs = []
+    for combination in combinations:
+        expanded_job = {key: value for key, value in job.items() if key != BUILD_MATRIX}
+        expanded_job[BUILD_PARAMETERS] = [
+            *(dict(build_parameter) for build_parameter in job.get(BUILD_PARAMETERS, None) or []
+              if build_parameter[NAME] not in combination),
+            *({NAME: name, VALUE: value} for name, value in combination.items())]
+        expanded_job[ID] = (f'{matrix_job_id}'
+                            f'[{','.join(f'{name}={value}' for name, value in combination.items())}]')
+        expanded_jobs.append(expanded_job)
+    return expanded_jobs
+
+
+@typechecked
+def collapse_build_job(job: dict, kept_job: dict, job_id_aliases: dict) -> None:
+    """
+    Collapses a job into the job it duplicates: dependencies on it become dependencies on the kept job,
+    which inherits its upstream jobs
+    """
+    if ID in job and job[ID] != get_build_job_id(kept_job):
+        for aliases in job_id_aliases.values():
+            aliases[:] = [get_build_job_id(kept_job) if alias == job[ID] else alias for alias in aliases]
+        job_id_aliases[job[ID]] = [get_build_job_id(kept_job)]
+    for upstream_job_id in job.get(DEPENDS_ON, []):
+        if upstream_job_id not in kept_job.setdefault(DEPENDS_ON, []):
+            kept_job[DEPENDS_ON].append(upstream_job_id)
+
+
+@typechecked
+def collapse_duplicate_build_job_triggers(host_url: str,
+                                          jobs: list,
+                                          matrix_expanded_job_ids: set,
+                                          job_id_aliases: dict) -> list:
+    """
+    Collapses each job expanded from a build matrix into the first job of the host triggering the same thing
+    (see get_build_job_trigger_key), as Jenkins would merge their queue items into a single build anyway.
+    Jobs written out by hand are always kept, duplicates or not
+    :param host_url: URL of the host
+    :param jobs: Jobs of the host, with their build matrices expanded
+    :param matrix_expanded_job_ids: Ids of the jobs expanded from a build matrix
+    :param job_id_aliases: Job ids mapped to the ids which replace them in dependencies, updated in place
+    :return: list of the jobs which are kept
+    """
+    first_jobs: dict = {}
+    for job in jobs:
+        if get_build_job_id(job) not in matrix_expanded_job_ids:
+            first_jobs.setdefault(get_build_job_trigger_key(job), job)
+    kept_jobs = []
+    for job in jobs:
+        if get_build_job_id(job) in matrix_expanded_job_ids:
+            trigger_key = get_build_job_trigger_key(job)
+            if (kept_job := first_jobs.setdefault(trigger_key, job)) is not job:
+                logging.info('Collapsing duplicate trigger of %s on %s with parameters %s',
+                             job[END], host_url, dict(trigger_key[1]))
+                collapse_build_job(job, kept_job, job_id_aliases)
+                continue
+        kept_jobs.append(job)
+    return kept_jobs
+
+
+@typechecked
+def alias_build_job_dependencies(build_jobs_dict: dict, job_id_aliases: dict) -> None:
+    """Replaces dependencies on matrix and collapsed jobs with dependencies on the jobs which replace them"""
+    for host in build_jobs_dict[BUILD][HOSTS]:
+        for job in host[JOBS]:
+            if DEPENDS_ON in job:
+                job[DEPENDS_ON] = list(dict.fromkeys(aliased_job_id
+                                                     for upstream_job_id in job[DEPENDS_ON]
+                                                     for aliased_job_id in job_id_aliases.get(upstream_job_id,
+                                                                                              [upstream_job_id])
+                                                     if aliased_job_id != get_build_job_id(job)))
+
+
+@typechecked
+def expand_build_matrices(build_jobs_dict: dict) -> dict:
+    """
+    Expands every job with a build-matrix section into one job per parameter combination (see
+    expand_build_matrix_job). Depending on a matrix job's id depends on all of its combinations. Expanded jobs
+    triggering the same thing as another job of the same host are collapsed into it
+    (see collapse_duplicate_build_job_triggers)
+    :param build_jobs_dict: Build jobs dict (usually parsed from YAML)
+    :return: expanded copy of the build jobs dict
+    :raises BuildMatrixException: if a build matrix is malformed or expands to nothing
+    """
+    expanded_build_jobs_dict = copy.deepcopy(build_jobs_dict)
+    job_id_aliases: dict = {}
+    collapsed_job_count = 0
+    for host in expanded_build_jobs_dict[BUILD][HOSTS]:
+        expanded_jobs = []
+        matrix_expanded_job_ids = set()
+        for job in host[JOBS]:
+            if BUILD_MATRIX not in job:
+                expanded_jobs.append(job)
+                continue
+            matrix_jobs = expand_build_matrix_job(job)
+            job_id_aliases[get_build_job_id(job)] = [matrix_job[ID] for matrix_job in matrix_jobs]
+            matrix_expanded_job_ids.update(matrix_job[ID] for matrix_job in matrix_jobs)
+            expanded_jobs.extend(matrix_jobs)
+        host[JOBS] = collapse_duplicate_build_job_triggers(host[URL], expanded_jobs, matrix_expanded_job_ids,
+                                                           job_id_aliases)
+        collapsed_job_count += len(expanded_jobs) - len(host[JOBS])
+    alias_build_job_dependencies(expanded_build_jobs_dict, job_id_aliases)
+    if collapsed_job_count > 0:
+        logging.info('Collapsed %s duplicate trigger(s)', collapsed_job_count)
+    return expanded_build_jobs_dict
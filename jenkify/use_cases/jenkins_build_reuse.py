@@ -0,0 +1,86 @@
+"""Module containing the lookup of finished builds which can be reused instead of triggering an identical build"""
+from typeguard import typechecked
+
+from jenkify.constants.jenkins_yaml import BUILDS
+
+DEFAULT_REUSE_RESULTS_BUILD_COUNT = 20
+DEFAULT_REUSE_RESULTS_MAX_AGE_MINUTES = 60
+
+
+@typechecked
+def get_build_parameter_value_key(value) -> str:
+    """Gets a comparable form of a build parameter value, as YAML and Jenkins JSON spell booleans differently"""
+    return str(value).lower() if isinstance(value, bool) else str(value)
+
+
+@typechecked
+def get_build_parameter_values(build_dict: dict) -> dict:
+    """Gets the parameters a build ran with, from its ParametersAction"""
+    return {parameter['name']: get_build_parameter_value_key(parameter.get('value', None))
+            for action in build_dict.get('actions', [])
+            if action is not None
+            for parameter in action.get('parameters', [])}
+
+
+@typechecked
+def get_build_branch_revisions(build_dict: dict) -> dict:
+    """Gets the SCM revision a build checked out for each branch it built, from its BuildData actions"""
+    return {branch['name']: action['lastBuiltRevision']['SHA1']
+            for action in build_dict.get('actions', [])
+            if action is not None and action.get('lastBuiltRevision', None) is not None
+            for branch in action['lastBuiltRevision'].get('branch', [])}
+
+
+@typechecked
+def get_branch_head_revisions(job_builds_dict: dict) -> dict:
+    """
+    Gets the latest revision Jenkins has checked out of each branch, from the newest of the job's latest builds
+    (running ones included) which built the branch
+    """
+    branch_head_revisions: dict = {}
+    for build in sorted(job_builds_dict.get(BUILDS, []), key=lambda build: build['number'], reverse=True):
+        for branch_name, revision in get_build_branch_revisions(build).items():
+            branch_head_revisions.setdefault(branch_name, revision)
+    return branch_head_revisions
+
+
+@typechecked
+def get_expected_build_parameter_values(job_builds_dict: dict, build_parameters: dict | None) -> dict:
+    """Gets the parameters a new build would run with: the job's defaults overridden by the given parameters"""
+    expected_parameter_values = {
+        parameter_definition['name']: get_build_parameter_value_key(
+            (parameter_definition.get('defaultParameterValue', None) or {}).get('value', None))
+        for job_property in job_builds_dict.get('property', [])
+        if job_property is not None
+        for parameter_definition in job_property.get('parameterDefinitions', [])}
+    for name, value in (build_parameters or {}).items():
+        expected_parameter_values[name] = get_build_parameter_value_key(value)
+    return expected_parameter_values
+
+
+@typechecked
+def find_reusable_build_number(job_builds_dict: dict,
+                               build_parameters: dict | None,
+                               min_timestamp_millis: int) -> int | None:
+    """
+    Finds the latest successful build which ran with the parameters a new build would run with and checked out
+    the head of each branch it built, as far as Jenkins knows it (see get_branch_head_revisions).
+    Commits pushed since Jenkins last built a branch are unknown to it, so a build of the previous head is reused
+    :param job_builds_dict: Job dict from JenkinsUtils.get_jenkins_job_reusable_builds_dict
+    :param build_parameters: Parameters the new build would be triggered with
+    :param min_timestamp_millis: Builds started before this time are not reused
+    :return: build number to reuse, or None if a new build has to be started
+    """
+    builds = sorted(job_builds_dict.get(BUILDS, []), key=lambda build: build['number'], reverse=True)
+    branch_head_revisions = get_branch_head_revisions(job_builds_dict)
+    expected_parameter_values = get_expected_build_parameter_values(job_builds_dict, build_parameters)
+    for build in builds:
+        if build.get('timestamp', 0) < min_timestamp_millis:
+            break
+        if (not build.get('building', False) and
+                build.get('result', None) == 'SUCCESS' and
+                all(branch_head_revisions[branch_name] == revision
+                    for branch_name, revision in get_build_branch_revisions(build).items()) and
+                get_build_parameter_values(build) == expected_parameter_values):
+            return build['number']
+    return None
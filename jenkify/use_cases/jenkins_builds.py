@@ -1,62 +1,163 @@
 """Jenkins builds module"""
+import contextvars
 import logging
+import time
+from concurrent.futures import ThreadPoolExecutor
 from http import HTTPStatus
 
 from typeguard import typechecked
 
-from jenkify.constants.jenkins_yaml import JOBS, END, URL, BUILDS, SUCCESSFUL_JOBS, FAILED_JOBS, BUILD_PARAMETERS
+from jenkify.constants.jenkins_yaml import (
+    JOBS, END, URL, BUILDS, SUCCESSFUL_JOBS, FAILED_JOBS, BUILD_PARAMETERS, BUILD_INDEX,
+)
+from jenkify.enums.build_events import BuildEventType
+from jenkify.use_cases.jenkins_build_reuse import DEFAULT_REUSE_RESULTS_BUILD_COUNT, find_reusable_build_number
+from jenkify.utils.build_events import emit_build_event
+from jenkify.utils.environment.Environment import Environment
+from jenkify.utils.jenkins.jenkins_rest_api.jenkins_poll_status import DEFAULT_MAX_CONCURRENT_REQUESTS_PER_HOST
 from jenkify.utils.jenkins.jenkins_rest_api.jenkins_utils import JenkinsUtils
 
 
 @typechecked
-def process_build_host(build_host: dict) -> dict:
-    """Function which parses/processes build host from dict"""
+def kick_off_build_job(jenkins_utils: JenkinsUtils,
+                       build_host: dict,
+                       build_job_index: int,
+                       min_build_number: int = 0,
+                       reuse_max_age_minutes: int | None = None) -> int | None:
+    """
+    Kicks off a single job of a build host and records the build number to track on the job
+    :param jenkins_utils: Jenkins utilities for the build host
+    :param build_host: Build host dict (usually parsed from YAML)
+    :param build_job_index: Index of the job within the build host's jobs
+    :param min_build_number: Lowest build number to track, past the builds of the same job just kicked off
+        which may not be listed by Jenkins yet
+    :param reuse_max_age_minutes: If set, a successful build of the job no older than this, with the same
+        parameters and SCM revision, is tracked instead of kicking off a new build
+    :return: build number to track, or None if the build could not be kicked off
+    """
+    build_job_url_end = build_host[JOBS][build_job_index][END]
+    build_parameters = jenkins_utils.get_jenkins_build_params_from_yaml_list(
+        build_host[JOBS][build_job_index].get(BUILD_PARAMETERS, None)
+    )
+    if reuse_max_age_minutes is None:
+        jenkins_job_pre_run_dict = jenkins_utils.get_jenkins_job_latest_builds_dict(build_job_url_end)
+    else:
+        jenkins_job_pre_run_dict = jenkins_utils.get_jenkins_job_reusable_builds_dict(
+            build_job_url_end, DEFAULT_REUSE_RESULTS_BUILD_COUNT)
+    if jenkins_job_pre_run_dict is None:
+        logging.error('Failed to kick off build [%s] (%s)!',
+                      build_host[URL],
+                      build_job_url_end)
+        return None
+    build_number_to_track = 0
+    builds_sorted_by_build_number = sorted(jenkins_job_pre_run_dict[BUILDS],
+                                           key=lambda x: x['number'], reverse=True)
+    if len(builds_sorted_by_build_number) > 0:
+        build_number_to_track = builds_sorted_by_build_number[0]['number'] + 1
+    build_number_to_track = max(build_number_to_track, min_build_number)
+    if reuse_max_age_minutes is not None:
+        reusable_build_number = find_reusable_build_number(
+            jenkins_job_pre_run_dict,
+            build_parameters,
+            round((time.time() - reuse_max_age_minutes * 60) * 1000))
+        if reusable_build_number is not None:
+            logging.info('Reusing successful build [%s] (%s) #%s with the same parameters and revision',
+                         build_host[URL],
+                         build_job_url_end,
+                         reusable_build_number)
+            build_host[JOBS][build_job_index][BUILD_INDEX] = reusable_build_number
+            emit_build_event(BuildEventType.TRIGGERED, build_host[URL], build_job_url_end, reusable_build_number,
+                             reused=True)
+            return reusable_build_number
+    response_status_code = jenkins_utils.start_jenkins_build_url_end(build_job_url_end, build_parameters)
+    if response_status_code != HTTPStatus.CREATED:
+        logging.error(
+            'Failed to kick off build [%s] (%s)!',
+            build_host[URL],
+            build_job_url_end
+        )
+        return None
+    logging.info(
+        'Successfully kicked off build [%s] (%s)!',
+        build_host[URL],
+        build_job_url_end
+    )
+    build_host[JOBS][build_job_index][BUILD_INDEX] = build_number_to_track
+    emit_build_event(BuildEventType.TRIGGERED, build_host[URL], build_job_url_end, build_number_to_track)
+    return build_number_to_track
+
+
+@typechecked
+def kick_off_build_job_group(build_host: dict,
+                             build_job_indices: list,
+                             min_build_number: int = 0,
+                             reuse_max_age_minutes: int | None = None) -> list:
+    """
+    Kicks off jobs of a build host triggering the same job one after the other, so that each is tracked
+    with the build number following the previous one's
+    :param build_host: Build host dict (usually parsed from YAML)
+    :param build_job_indices: Indices of the jobs within the build host's jobs, all with the same URL end
+    :param min_build_number: Lowest build number to track
+    :param reuse_max_age_minutes: If set, reuse recent identical successful builds (see kick_off_build_job)
+    :return: list of the build number to track of each job, None for those which could not be kicked off
+    """
+    jenkins_utils = JenkinsUtils(Environment.get_jenkins_request_settings_for_host(build_host[URL]))
+    build_numbers_to_track = []
+    for build_job_index in build_job_indices:
+        build_number_to_track = kick_off_build_job(jenkins_utils,
+                                                   build_host,
+                                                   build_job_index,
+                                                   min_build_number,
+                                                   reuse_max_age_minutes)
+        if build_number_to_track is not None:
+            min_build_number = max(min_build_number, build_number_to_track + 1)
+        build_numbers_to_track.append(build_number_to_track)
+    return build_numbers_to_track
+
+
+@typechecked
+def get_build_job_indices_by_url_end(build_host: dict, build_job_indices: list) -> dict:
+    """Groups job indices of a build host by the URL end of the job they trigger, keeping their order"""
+    build_job_indices_by_url_end: dict = {}
+    for build_job_index in build_job_indices:
+        build_job_indices_by_url_end.setdefault(build_host[JOBS][build_job_index][END], []).append(build_job_index)
+    return build_job_indices_by_url_end
+
+
+@typechecked
+def process_build_host(build_host: dict, reuse_max_age_minutes: int | None = None) -> dict:
+    """
+    Function which parses/processes build host from dict.
+    Different jobs are kicked off concurrently, triggers of the same job (e.g. expanded from a build matrix) in order
+    :param build_host: Build host dict (usually parsed from YAML)
+    :param reuse_max_age_minutes: If set, reuse recent identical successful builds (see kick_off_build_job)
+    """
     successful_jobs = []
     failed_jobs = []
+    build_job_indices_by_url_end = get_build_job_indices_by_url_end(build_host, list(range(len(build_host[JOBS]))))
+    # Executor threads do not inherit context variables (the command's deadline and build event stream),
+    # so each group runs in its own copy of the caller's context
+    with ThreadPoolExecutor(max_workers=DEFAULT_MAX_CONCURRENT_REQUESTS_PER_HOST) as executor:
+        build_numbers_to_track_by_url_end = dict(zip(build_job_indices_by_url_end, executor.map(
+            lambda context, build_job_indices: context.run(kick_off_build_job_group,
+                                                           build_host,
+                                                           build_job_indices,
+                                                           reuse_max_age_minutes=reuse_max_age_minutes),
+            [contextvars.copy_context() for _ in build_job_indices_by_url_end],
+            build_job_indices_by_url_end.values())))
+    build_numbers_to_track = {}
+    for build_job_url_end, build_job_indices in build_job_indices_by_url_end.items():
+        build_numbers_to_track.update(zip(build_job_indices, build_numbers_to_track_by_url_end[build_job_url_end]))
     for build_job_index in range(len(build_host[JOBS])):
         build_job_url_end = build_host[JOBS][build_job_index][END]
-        jenkins_utils = JenkinsUtils()
-        jenkins_job_pre_run_dict = jenkins_utils.get_jenkins_build_dict_url_end(build_job_url_end)
-        build_number_to_track = 0
-        if jenkins_job_pre_run_dict is not None:
-            builds_sorted_by_build_number = sorted(jenkins_job_pre_run_dict[BUILDS],
-                                                   key=lambda x: x['number'], reverse=True)
-            if jenkins_job_pre_run_dict is not None and len(builds_sorted_by_build_number) > 0:
-                build_number_to_track = builds_sorted_by_build_number[0]['number'] + 1
-            response_status_code = jenkins_utils.start_jenkins_build_url_end(
-              build_job_url_end,
-              jenkins_utils.get_jenkins_build_params_from_yaml_list(
-                build_host[JOBS][build_job_index].get(BUILD_PARAMETERS, None)
-              )
+        if (build_number_to_track := build_numbers_to_track[build_job_index]) is not None:
+            successful_jobs.append(
+                {URL: build_host[URL],
+                 END: build_job_url_end,
+                 'index': build_job_index,
+                 'build_number': build_number_to_track}
             )
-            if response_status_code == HTTPStatus.CREATED:
-                logging.info(
-                    'Successfully kicked off build [%s] (%s)!',
-                    build_host[URL],
-                    build_job_url_end
-                )
-                successful_jobs.append(
-                    {URL: build_host[URL],
-                     END: build_job_url_end,
-                     'index': build_job_index,
-                     'build_number': build_number_to_track}
-                )
-                build_host[JOBS][build_job_index]['build-index'] = build_number_to_track
-            else:
-                logging.error(
-                    'Failed to kick off build [%s] (%s)!',
-                    build_host[URL],
-                    build_job_url_end
-                )
-                failed_jobs.append(
-                    {URL: build_host[URL],
-                     END: build_job_url_end,
-                     'index': build_job_index}
-                )
         else:
-            logging.error('Failed to kick off build [%s] (%s)!',
-                          build_host[URL],
-                          build_job_url_end)
             failed_jobs.append(
                 {URL: build_host[URL],
                  END: build_job_url_end,
@@ -0,0 +1,96 @@
+"""Jenkins console output module"""
+import logging
+
+from typeguard import typechecked
+
+from jenkify.utils.environment.Environment import Environment
+from jenkify.utils.jenkins.jekins_request_settings import JenkinsRequestSettings
+from jenkify.utils.jenkins.jenkins_log_store import JenkinsBuildLogStore
+from jenkify.utils.jenkins.jenkins_rest_api.jenkins_utils import JenkinsUtils
+
+
+@typechecked
+def parse_line_range(line_range: str) -> tuple:
+    """
+    Parses an inclusive line range
+    :param line_range: Single line number (e.g. 42), range (e.g. 100-150) or open-ended range (e.g. 100-)
+    :return: tuple of the first line number and the last line number (None if open-ended)
+    :raises ValueError: if the line range is malformed
+    """
+    first_line_number, separator, last_line_number = line_range.partition('-')
+    first_line_number = int(first_line_number)
+    if separator == '':
+        return first_line_number, first_line_number
+    return first_line_number, int(last_line_number) if last_line_number != '' else None
+
+
+class JenkinsConsoleOutputUseCase:
+    _jenkins_request_settings: JenkinsRequestSettings
+    _jenkins_utils: JenkinsUtils
+    _jenkins_build_log_store: JenkinsBuildLogStore | None
+
+    def __init__(self,
+                 jenkins_request_settings: JenkinsRequestSettings =
+                 Environment.get_jenkins_request_settings_from_env(),
+                 jenkins_utils: JenkinsUtils = JenkinsUtils(),
+                 jenkins_build_log_store: JenkinsBuildLogStore | None = None,
+                 ):
+        self._jenkins_request_settings = jenkins_request_settings
+        self._jenkins_utils = jenkins_utils
+        self._jenkins_build_log_store = jenkins_build_log_store
+
+    @typechecked
+    def store_finished_build_log(self, url_end: str, build_number: int) -> bool:
+        """
+        Streams a build's console output into the log store if the build has finished (its log can no longer change)
+        :return: whether the build's log is stored
+        """
+        host_url = self._jenkins_request_settings.url
+        if self._jenkins_build_log_store.has_build_log(host_url, url_end, build_number):
+            return True
+        build_dict = self._jenkins_utils.get_jenkins_build_dict_url_end_build_number(url_end, build_number)
+        if build_dict is None or build_dict.get('building', True):
+            logging.debug('Not storing log of %s #%s as the build has not finished', url_end, build_number)
+            return False
+        if (response := self._jenkins_utils.get_jenkins_build_console_output_stream(url_end, build_number)) is None:
+            return False
+        with response:
+            line_count = self._jenkins_build_log_store.store_build_log(host_url,
+                                                                       url_end,
+                                                                       build_number,
+                                                                       response.iter_lines())
+        logging.info('Stored %s line(s) of %s #%s in the log store', line_count, url_end, build_number)
+        return True
+
+    @typechecked
+    def get_build_console_output_lines(self,
+                                       url_end: str,
+                                       build_number: int,
+                                       first_line_number: int = 1,
+                                       last_line_number: int | None = None,
+                                       tail: int | None = None) -> list:
+        """
+        Gets lines of a build's console output, served from the log store without contacting Jenkins once stored
+        :param url_end: URL end of the job
+        :param build_number: Build number of the job
+        :param first_line_number: First line to get, starting at 1
+        :param last_line_number: Last line to get, the log's last line if None
+        :param tail: If set, get this many lines from the end of the log instead of a line range
+        :return: list of lines without line endings
+        """
+        host_url = self._jenkins_request_settings.url
+        if (self._jenkins_build_log_store is not None and
+                self.store_finished_build_log(url_end, build_number)):
+            logging.debug('Serving console output of %s #%s from the log store', url_end, build_number)
+            if tail is not None:
+                line_count = self._jenkins_build_log_store.get_build_log_line_count(host_url, url_end, build_number)
+                first_line_number, last_line_number = max(line_count - tail + 1, 1), None
+            return self._jenkins_build_log_store.get_build_log_lines(host_url,
+                                                                     url_end,
+                                                                     build_number,
+                                                                     first_line_number,
+                                                                     last_line_number)
+        lines = self._jenkins_utils.get_jenkins_build_console_output_url_end(f'{url_end}/{build_number}').splitlines()
+        if tail is not None:
+            return lines[-tail:] if tail > 0 else []
+        return lines[max(first_line_number, 1) - 1:last_line_number]
@@ -0,0 +1,169 @@
+"""
+Module containing the preflight of build hosts: every host is checked concurrently, before any job is kicked off or
+tracked, so that an unreachable or misauthenticated host is found once instead of job by job
+"""
+import asyncio
+import logging
+import time
+from http import HTTPStatus
+
+import requests
+from typeguard import typechecked
+
+from jenkify.constants.jenkins_yaml import BUILD, HOSTS, URL
+from jenkify.enums.host_preflight import HostPreflightStatus
+from jenkify.enums.http_request_methods import HttpRequestMethod
+from jenkify.exceptions.request_retry_exception import RequestRetryException
+from jenkify.utils.environment.Environment import Environment
+from jenkify.utils.http_request_settings import HttpRequestSettings
+from jenkify.utils.jenkins.jenkins_crumbs import set_jenkins_crumb_headers
+from jenkify.utils.json.json_codecs import decode_json
+from jenkify.utils.request_retry import make_request_based_on_input
+
+HOST_PREFLIGHT_POLICIES = ('skip', 'abort')
+HOST_PREFLIGHT_TABLE_COLUMNS = ('host', 'status', 'version', 'crumb', 'latency-millis', 'detail')
+HOST_PREFLIGHT_UNAUTHORIZED_STATUS_CODES = (HTTPStatus.UNAUTHORIZED, HTTPStatus.FORBIDDEN)
+
+
+@typechecked
+def get_host_preflight(host_url: str,
+                       status: HostPreflightStatus,
+                       *,
+                       version: str | None = None,
+                       crumb: str | None = None,
+                       latency_millis: int | None = None,
+                       detail: str | None = None) -> dict:
+    """Gets the preflight result dict of a host, with a value per HOST_PREFLIGHT_TABLE_COLUMNS column"""
+    return {'host': host_url,
+            'status': status,
+            'version': version,
+            'crumb': crumb,
+            'latency-millis': latency_millis,
+            'detail': detail}
+
+
+@typechecked
+def get_failed_response_host_preflight(host_url: str,
+                                       request_name: str,
+                                       status_code: int | None,
+                                       version: str | None,
+                                       latency_millis: int) -> dict | None:
+    """
+    Gets the preflight result dict of a host whose preflight request was not answered with HTTP 200
+    :param host_url: URL of the host
+    :param request_name: Name of the request, reported in the detail
+    :param status_code: Status code the request was answered with, None if it was not (e.g. proxy error)
+    :param version: Version of the host, if known yet
+    :param latency_millis: Latency of the host
+    :return: preflight result dict of the host (see get_host_preflight), None if the request succeeded
+    """
+    if status_code == HTTPStatus.OK:
+        return None
+    status = (HostPreflightStatus.UNAUTHORIZED if status_code in HOST_PREFLIGHT_UNAUTHORIZED_STATUS_CODES else
+              HostPreflightStatus.ERROR)
+    return get_host_preflight(host_url, status, version=version, latency_millis=latency_millis,
+                              detail=f'{request_name} answered HTTP {status_code}')
+
+
+@typechecked
+def preflight_jenkins_host_crumb(host_url: str,
+                                 http_request_settings: HttpRequestSettings,
+                                 version: str | None,
+                                 latency_millis: int) -> dict:
+    """
+    Checks the CSRF crumb of a host which is reachable and authenticated, keeping it for the requests to come.
+    Hosts without a crumb issuer (CSRF protection disabled) are ok with a disabled crumb
+    :param host_url: URL of the host
+    :param http_request_settings: Settings of the request, with the host's auth
+    :param version: Version of the host
+    :param latency_millis: Latency of the host
+    :return: preflight result dict of the host (see get_host_preflight)
+    """
+    try:
+        crumb_response = make_request_based_on_input(HttpRequestMethod.GET,
+                                                      f'{host_url}/crumbIssuer/api/json',
+                                                      http_request_settings)
+    except (requests.exceptions.RequestException, RequestRetryException) as exception:
+        return get_host_preflight(host_url, HostPreflightStatus.UNREACHABLE, version=version,
+                                  latency_millis=latency_millis, detail=f'crumbIssuer: {type(exception).__name__}')
+    crumb_status_code = crumb_response.status_code if crumb_response is not None else None
+    if crumb_status_code == HTTPStatus.NOT_FOUND:
+        set_jenkins_crumb_headers(host_url, {})
+        return get_host_preflight(host_url, HostPreflightStatus.OK, version=version, crumb='disabled',
+                                  latency_millis=latency_millis)
+    failed_host_preflight = get_failed_response_host_preflight(host_url, 'crumbIssuer', crumb_status_code, version,
+                                                               latency_millis)
+    if failed_host_preflight is not None:
+        return failed_host_preflight
+    crumb_dict = decode_json(crumb_response.content)
+    set_jenkins_crumb_headers(host_url, {crumb_dict['crumbRequestField']: crumb_dict['crumb']})
+    return get_host_preflight(host_url, HostPreflightStatus.OK, version=version, crumb='ok',
+                              latency_millis=latency_millis)
+
+
+@typechecked
+def preflight_jenkins_host(host_url: str) -> dict:
+    """
+    Checks a host with a single try of each request, instead of the retries job requests get:
+    reachability, auth and version (the X-Jenkins header) through a projected api/json, then the CSRF crumb,
+    which is kept for the requests to come
+    :param host_url: URL of the host
+    :return: preflight result dict of the host (see get_host_preflight), its crumb is ok, disabled or None if unchecked
+    """
+    http_request_settings = HttpRequestSettings(auth=Environment.get_jenkins_request_settings_for_host(host_url).auth)
+    start_time = time.perf_counter()
+    try:
+        response = make_request_based_on_input(HttpRequestMethod.GET,
+                                               f'{host_url}/api/json?tree=mode',
+                                               http_request_settings)
+    except (requests.exceptions.RequestException, RequestRetryException) as exception:
+        return get_host_preflight(host_url, HostPreflightStatus.UNREACHABLE, detail=type(exception).__name__)
+    latency_millis = round((time.perf_counter() - start_time) * 1000)
+    if response is None:
+        return get_host_preflight(host_url, HostPreflightStatus.UNREACHABLE, detail='ProxyError')
+    failed_host_preflight = get_failed_response_host_preflight(host_url, 'api/json', response.status_code, None,
+                                                               latency_millis)
+    if failed_host_preflight is not None:
+        return failed_host_preflight
+    return preflight_jenkins_host_crumb(host_url,
+                                        http_request_settings,
+                                        response.headers.get('X-Jenkins', None),
+                                        latency_millis)
+
+
+@typechecked
+async def preflight_jenkins_hosts(build_jobs_dict: dict) -> list:
+    """
+    Concurrently checks every host of a build jobs (or tracking) dict, see preflight_jenkins_host
+    :return: list of the hosts' preflight result dicts, in the order of the hosts
+    """
+    host_urls = list(dict.fromkeys(host[URL] for host in build_jobs_dict[BUILD][HOSTS]))
+    return list(await asyncio.gather(*[asyncio.to_thread(preflight_jenkins_host, host_url)
+                                       for host_url in host_urls]))
+
+
+@typechecked
+def get_failed_preflight_host_urls(host_preflights: list) -> set:
+    """Gets the URLs of the hosts whose preflight did not succeed"""
+    return {host_preflight['host'] for host_preflight in host_preflights
+            if host_preflight['status'] != HostPreflightStatus.OK}
+
+
+@typechecked
+def format_host_preflight_table(host_preflights: list) -> str:
+    """Formats preflight result dicts as a plain text table, one row per host"""
+    rows = [list(HOST_PREFLIGHT_TABLE_COLUMNS)]
+    for host_preflight in host_preflights:
+        rows.append([host_preflight['status'].value if column == 'status' else
+                     str(host_preflight[column]) if host_preflight[column] is not None else '-'
+                     for column in HOST_PREFLIGHT_TABLE_COLUMNS])
+    column_widths = [max(len(row[column_index]) for row in rows) for column_index in range(len(rows[0]))]
+    return '\n'.join('  '.join(value.ljust(column_width) for value, column_width in zip(row, column_widths)).rstrip()
+                     for row in rows)
+
+
+@typechecked
+def log_host_preflights(host_preflights: list) -> None:
+    """Logs the preflight results table, as an error if any host failed"""
+    log = logging.error if len(get_failed_preflight_host_urls(host_preflights)) > 0 else logging.info
+    log('Host preflight:\n%s', format_host_preflight_table(host_preflights))
@@ -0,0 +1,192 @@
+"""Module containing the crawl of each host's jobs into the job catalog and the resolution of job selectors from it"""
+import asyncio
+import copy
+import logging
+import re
+import time
+from urllib.parse import quote
+
+from typeguard import typechecked
+
+from jenkify.constants.jenkins_yaml import BUILD, HOSTS, JOBS, URL, END, ID, END_GLOB, END_REGEX
+from jenkify.exceptions.job_catalog_exception import JobCatalogException
+from jenkify.utils.environment.Environment import Environment
+from jenkify.utils.jenkins.jenkins_job_catalog_store import JenkinsJobCatalogStore
+from jenkify.utils.jenkins.jenkins_rest_api.jenkins_poll_status import (
+    DEFAULT_MAX_CONCURRENT_REQUESTS_PER_HOST,
+    run_host_request,
+)
+from jenkify.utils.jenkins.jenkins_rest_api.jenkins_utils import JenkinsUtils
+
+JOB_CATALOG_LEVELS_PER_QUERY = 3
+DEFAULT_JOB_CATALOG_TTL_MINUTES = 60
+JOB_GLOB_TOKENS = {'**': '.*', '*': '[^/]*', '?': '[^/]'}
+
+
+@typechecked
+def get_job_catalog_tree(levels: int) -> str:
+    """
+    Gets the api/json tree projection of a folder's jobs nested the given amount of levels deep, plus the names of
+    the jobs one level further, which tell folders at the deepest level apart from jobs and empty folders
+    """
+    if levels == 0:
+        return 'jobs[name]'
+    return f'jobs[name,_class,{get_job_catalog_tree(levels - 1)}]'
+
+
+@typechecked
+def parse_folder_jobs(folder_jobs: list, url_end_prefix: str, levels: int = JOB_CATALOG_LEVELS_PER_QUERY) -> tuple:
+    """
+    Flattens the nested jobs of a folder query
+    :param folder_jobs: jobs of an api/json response projected with get_job_catalog_tree(levels)
+    :param url_end_prefix: URL end of the folder followed by a slash ('' for the host's root)
+    :param levels: Levels the jobs are nested in the response
+    :return: tuple of the (URL end, class) of each job and the URL ends of the non-empty folders at the deepest
+        level, which need a query of their own
+    """
+    jobs = []
+    child_url_ends = []
+    for folder_job in folder_jobs:
+        url_end = f'{url_end_prefix}job/{quote(folder_job['name'])}'
+        if 'jobs' not in folder_job:
+            jobs.append((url_end, folder_job.get('_class', None)))
+        elif levels == 1:
+            if len(folder_job['jobs']) > 0:
+                child_url_ends.append(url_end)
+        else:
+            nested_jobs, nested_child_url_ends = parse_folder_jobs(folder_job['jobs'], f'{url_end}/', levels - 1)
+            jobs.extend(nested_jobs)
+            child_url_ends.extend(nested_child_url_ends)
+    return jobs, child_url_ends
+
+
+@typechecked
+async def index_host_jobs(jenkins_job_catalog_store: JenkinsJobCatalogStore,
+                          host_url: str,
+                          ttl_seconds: float,
+                          host_semaphore: asyncio.Semaphore) -> dict:
+    """
+    Crawls the crawl roots of a host whose time to live has passed, level by level, each level's queries
+    concurrently. Crawl roots still within their time to live are kept and only walked through
+    :return: dict of the amount of crawl roots queried and of queries which failed (whose jobs are kept)
+    """
+    jenkins_utils = JenkinsUtils(Environment.get_jenkins_request_settings_for_host(host_url))
+    jobs_tree = get_job_catalog_tree(JOB_CATALOG_LEVELS_PER_QUERY)
+    indexed_times = jenkins_job_catalog_store.get_crawl_root_indexed_times(host_url)
+    indexed_at_seconds = time.time()
+    visited_url_ends = set()
+    crawl_roots = [('', None)]
+    crawl_counts = {'queried': 0, 'failed': 0}
+    while len(crawl_roots) > 0:
+        expired_crawl_roots = [(url_end, parent_url_end) for url_end, parent_url_end in crawl_roots
+                               if indexed_at_seconds - indexed_times.get(url_end, 0) >= ttl_seconds]
+        folder_jobs_dicts = dict(zip((url_end for url_end, _ in expired_crawl_roots), await asyncio.gather(*[
+            run_host_request(host_semaphore, jenkins_utils.get_jenkins_folder_jobs_dict, url_end, jobs_tree)
+            for url_end, _ in expired_crawl_roots])))
+        crawl_counts['queried'] += len(expired_crawl_roots)
+        next_crawl_roots = []
+        for url_end, parent_url_end in crawl_roots:
+            visited_url_ends.add(url_end)
+            if (folder_jobs_dict := folder_jobs_dicts.get(url_end, None)) is not None:
+                jobs, child_url_ends = parse_folder_jobs(folder_jobs_dict.get(JOBS, []),
+                                                         f'{url_end}/' if url_end != '' else '')
+                jenkins_job_catalog_store.replace_crawl_root(host_url,
+                                                             url_end,
+                                                             parent_url_end=parent_url_end,
+                                                             jobs=jobs,
+                                                             child_url_ends=child_url_ends,
+                                                             indexed_at_seconds=indexed_at_seconds)
+            else:
+                if url_end in folder_jobs_dicts:
+                    logging.error('Could not index the jobs of %s/%s, keeping the ones indexed before', host_url,
+                                  url_end)
+                    crawl_counts['failed'] += 1
+                child_url_ends = jenkins_job_catalog_store.get_child_crawl_roots(host_url, url_end)
+            next_crawl_roots.extend((child_url_end, url_end) for child_url_end in child_url_ends)
+        crawl_roots = next_crawl_roots
+    jenkins_job_catalog_store.remove_crawl_roots(host_url, [url_end for url_end in indexed_times
+                                                            if url_end not in visited_url_ends])
+    return crawl_counts
+
+
+@typechecked
+async def index_jobs(jenkins_job_catalog_store: JenkinsJobCatalogStore,
+                     host_urls: list,
+                     ttl_minutes: int = DEFAULT_JOB_CATALOG_TTL_MINUTES,
+                     max_concurrent_requests_per_host: int = DEFAULT_MAX_CONCURRENT_REQUESTS_PER_HOST) -> dict:
+    """
+    Crawls the jobs of every host into the job catalog concurrently, refreshing only what has expired
+    :param jenkins_job_catalog_store: Catalog to index into
+    :param host_urls: URLs of the hosts to index
+    :param ttl_minutes: Time to live of each crawl root, 0 to refresh everything
+    :param max_concurrent_requests_per_host: Maximum amount of concurrent requests made to a host
+    :return: dict mapping each host URL to its crawl counts (see index_host_jobs)
+    """
+    crawl_counts = await asyncio.gather(*[
+        index_host_jobs(jenkins_job_catalog_store,
+                        host_url,
+                        ttl_minutes * 60,
+                        asyncio.Semaphore(max_concurrent_requests_per_host))
+        for host_url in host_urls])
+    return dict(zip(host_urls, crawl_counts))
+
+
+@typechecked
+def get_job_glob_regex(job_glob: str) -> str:
+    """Translates a job glob into a regex: * and ? match within a single path segment, ** across segments"""
+    return ''.join(JOB_GLOB_TOKENS.get(token, re.escape(token))
+                   for token in re.split(r'(\*\*|\*|\?)', job_glob) if token != '')
+
+
+@typechecked
+def get_job_selector_pattern(job: dict) -> re.Pattern | None:
+    """Gets the compiled pattern of a job's end-glob or end-regex selector, None for a job with a plain end"""
+    if END_REGEX in job:
+        return re.compile(job[END_REGEX])
+    if END_GLOB in job:
+        return re.compile(get_job_glob_regex(job[END_GLOB]))
+    return None
+
+
+@typechecked
+def has_build_job_selectors(build_jobs_dict: dict) -> bool:
+    """Checks whether any job selects its URL ends with an end-glob or end-regex"""
+    return any(END_GLOB in job or END_REGEX in job for host in build_jobs_dict[BUILD][HOSTS] for job in host[JOBS])
+
+
+@typechecked
+def resolve_build_job_selectors(build_jobs_dict: dict, jenkins_job_catalog_store: JenkinsJobCatalogStore) -> dict:
+    """
+    Replaces every job with an end-glob or end-regex selector by one job per matching URL end of the job catalog
+    :param build_jobs_dict: Build jobs dict (usually parsed from YAML)
+    :param jenkins_job_catalog_store: Catalog of the hosts' jobs
+    :return: resolved copy of the build jobs dict
+    :raises JobCatalogException: if a host with selectors is not indexed, or a selector with an id matches
+        more than one job
+    """
+    resolved_build_jobs_dict = copy.deepcopy(build_jobs_dict)
+    for host in resolved_build_jobs_dict[BUILD][HOSTS]:
+        host_url_ends = None
+        resolved_jobs = []
+        for job in host[JOBS]:
+            if (job_selector_pattern := get_job_selector_pattern(job)) is None:
+                resolved_jobs.append(job)
+                continue
+            if host_url_ends is None:
+                if len(jenkins_job_catalog_store.get_crawl_root_indexed_times(host[URL])) == 0:
+                    raise JobCatalogException(f'{host[URL]} is not in the job catalog, run index-jobs first')
+                host_url_ends = jenkins_job_catalog_store.get_job_url_ends(host[URL])
+            matching_url_ends = [url_end for url_end in host_url_ends if job_selector_pattern.fullmatch(url_end)]
+            if len(matching_url_ends) == 0:
+                logging.warning('No job on %s matches %s', host[URL], job.get(END_REGEX, job.get(END_GLOB, None)))
+            if ID in job and len(matching_url_ends) > 1:
+                raise JobCatalogException(f'Job {job[ID]} selects {len(matching_url_ends)} jobs on {host[URL]}, '
+                                          f'an id can only name a single job')
+            logging.info('Resolved %s to %s job(s) on %s', job.get(END_REGEX, job.get(END_GLOB, None)),
+                         len(matching_url_ends), host[URL])
+            resolved_jobs.extend({**copy.deepcopy({key: value for key, value in job.items()
+                                                   if key not in (END_GLOB, END_REGEX)}),
+                                  END: url_end}
+                                 for url_end in matching_url_ends)
+        host[JOBS] = resolved_jobs
+    return resolved_build_jobs_dict
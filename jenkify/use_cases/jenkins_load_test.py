@@ -0,0 +1,217 @@
+"""
+Module containing the controller load test, which triggers builds at a controlled rate and measures their latencies
+"""
+import asyncio
+import itertools
+import logging
+import re
+import time
+from collections import Counter
+from collections.abc import Callable
+
+from typeguard import typechecked
+
+from jenkify.constants.jenkins_yaml import BUILD, HOSTS, JOBS, URL, END, BUILD_PARAMETERS
+from jenkify.use_cases.jenkins_build_history import get_percentiles
+from jenkify.utils.environment.Environment import Environment
+from jenkify.utils.jenkins.jenkins_rest_api.jenkins_poll_status import (
+    DEFAULT_MAX_CONCURRENT_REQUESTS_PER_HOST,
+    run_host_request,
+)
+from jenkify.utils.jenkins.jenkins_rest_api.jenkins_utils import JenkinsUtils
+from jenkify.utils.request_deadline import is_request_deadline_exceeded
+
+LOAD_TEST_LATENCIES = ('trigger', 'queue', 'build', 'end-to-end')
+QUEUE_ITEM_LOCATION_PATTERN = re.compile(r'/queue/item/(\d+)/?$')
+LOAD_TEST_MAX_FAILED_POLLS = 10
+
+
+class LoadTestHostLimits:
+    """Concurrency limits of a host under load test, triggers have their own so that they never wait behind polls"""
+    trigger_semaphore: asyncio.Semaphore
+    poll_semaphore: asyncio.Semaphore
+
+    @typechecked
+    def __init__(self, max_concurrent_requests: int):
+        """:param max_concurrent_requests: Maximum amount of concurrent triggers, and of concurrent polls"""
+        self.trigger_semaphore = asyncio.Semaphore(max_concurrent_requests)
+        self.poll_semaphore = asyncio.Semaphore(max_concurrent_requests)
+
+
+@typechecked
+def get_load_test_rate(elapsed_seconds: float, duration_seconds: float, start_rate: float, end_rate: float) -> float:
+    """Gets the trigger rate (builds per second) of a linear ramp from start_rate to end_rate over the duration"""
+    return start_rate + (end_rate - start_rate) * min(elapsed_seconds / duration_seconds, 1)
+
+
+@typechecked
+def get_load_test_targets(build_jobs_dict: dict) -> list:
+    """Gets the (host URL, URL end, build parameters) of every job of a build jobs dict, triggered round-robin"""
+    return [(host[URL], job[END], JenkinsUtils.get_jenkins_build_params_from_yaml_list(job.get(BUILD_PARAMETERS, None)))
+            for host in build_jobs_dict[BUILD][HOSTS]
+            for job in host[JOBS]]
+
+
+async def poll_load_test_request(poll_semaphore: asyncio.Semaphore,
+                                 poll_seconds: float,
+                                 is_done: Callable[[dict], bool],
+                                 request_function: Callable[..., dict | None],
+                                 *args) -> dict | None:
+    """
+    Polls a request of a load test build until its response is done
+    :param poll_semaphore: Concurrency limit of the host's polls
+    :param poll_seconds: Interval between polls
+    :param is_done: Tells whether a response dict is final
+    :param request_function: Makes the request, returning its response dict or None if it failed
+    :param args: Arguments of request_function
+    :return: final response dict, None if the command's deadline passed or if the last LOAD_TEST_MAX_FAILED_POLLS
+        polls failed (e.g. the queue item or build was deleted)
+    """
+    failed_poll_count = 0
+    while True:
+        response_dict = await run_host_request(poll_semaphore, request_function, *args)
+        if response_dict is not None and is_done(response_dict):
+            return response_dict
+        failed_poll_count = failed_poll_count + 1 if response_dict is None else 0
+        if failed_poll_count >= LOAD_TEST_MAX_FAILED_POLLS or is_request_deadline_exceeded():
+            return None
+        await asyncio.sleep(poll_seconds)
+
+
+@typechecked
+async def run_load_test_build(host_url: str,
+                              url_end: str,
+                              build_parameters: dict | None,
+                              host_limits: LoadTestHostLimits,
+                              poll_seconds: float) -> dict:
+    """
+    Triggers a single build and follows it through the queue to completion
+    :return: dict of the build's outcome and latencies in milliseconds: trigger (POST round trip), queue
+        (queued until started, from Jenkins' clock), build (Jenkins' duration) and end-to-end (trigger until
+        finish was observed, from the local clock, so within a poll interval). A build still queued or running at
+        the command's deadline has the outcome TIMEOUT, one whose queue item or build could no longer be polled
+        has the outcome LOST
+    """
+    jenkins_utils = JenkinsUtils(Environment.get_jenkins_request_settings_for_host(host_url))
+    async with host_limits.trigger_semaphore:
+        triggered_time = time.monotonic()
+        response = await asyncio.to_thread(jenkins_utils.trigger_jenkins_build_url_end, url_end, build_parameters)
+        trigger_millis = round((time.monotonic() - triggered_time) * 1000)
+    queue_item_match = QUEUE_ITEM_LOCATION_PATTERN.search(response.headers.get('Location', '')) \
+        if response is not None else None
+    if queue_item_match is None:
+        logging.error('Failed to trigger %s on %s!', url_end, host_url)
+        return {'host': host_url, 'outcome': 'TRIGGER_FAILED'}
+    await asyncio.sleep(poll_seconds)
+    queue_item_dict = await poll_load_test_request(
+        host_limits.poll_semaphore,
+        poll_seconds,
+        is_load_test_queue_item_done,
+        jenkins_utils.get_jenkins_queue_item_dict,
+        int(queue_item_match[1]))
+    if queue_item_dict is None or queue_item_dict.get('cancelled', False):
+        logging.error('Load test queue item %s of %s on %s did not start a build',
+                      queue_item_match[1],
+                      url_end,
+                      host_url)
+        return {'host': host_url,
+                'outcome': get_load_test_unfinished_outcome(queue_item_dict),
+                'trigger': trigger_millis}
+    build_number = queue_item_dict['executable']['number']
+    build_dict = await poll_load_test_request(
+        host_limits.poll_semaphore,
+        poll_seconds,
+        is_load_test_build_done,
+        jenkins_utils.get_jenkins_build_dict_url_end_build_number,
+        url_end,
+        build_number)
+    if build_dict is None:
+        logging.error('Load test build %s #%s on %s was not seen finishing', url_end, build_number, host_url)
+        return {'host': host_url,
+                'outcome': get_load_test_unfinished_outcome(build_dict),
+                'trigger': trigger_millis}
+    logging.info('Load test build %s #%s on %s finished with %s', url_end, build_number, host_url,
+                 build_dict['result'])
+    return {'host': host_url,
+            'outcome': build_dict['result'],
+            'trigger': trigger_millis,
+            'queue': max(build_dict['timestamp'] - queue_item_dict['inQueueSince'], 0),
+            'build': build_dict['duration'],
+            'end-to-end': round((time.monotonic() - triggered_time) * 1000)}
+
+
+def is_load_test_queue_item_done(queue_item_dict: dict) -> bool:
+    """Tells whether a queue item polled by the load test left the queue, by starting a build or being cancelled"""
+    return queue_item_dict.get('executable', None) is not None or queue_item_dict.get('cancelled', False)
+
+
+def is_load_test_build_done(build_dict: dict) -> bool:
+    """Tells whether a build polled by the load test finished"""
+    return not build_dict.get('building', True) and build_dict.get('result', None) is not None
+
+
+def get_load_test_unfinished_outcome(response_dict: dict | None) -> str:
+    """Gets the outcome of a build which was not followed to completion, given its last response polled (if done)"""
+    if response_dict is not None:
+        return 'CANCELLED'
+    return 'TIMEOUT' if is_request_deadline_exceeded() else 'LOST'
+
+
+@typechecked
+async def run_load_test(load_test_targets: list,
+                        duration_seconds: float,
+                        start_rate: float,
+                        end_rate: float,
+                        *,
+                        poll_seconds: float = 1.0,
+                        max_concurrent_requests_per_host: int = DEFAULT_MAX_CONCURRENT_REQUESTS_PER_HOST) -> list:
+    """
+    Triggers the targets round-robin at a rate ramping linearly from start_rate to end_rate builds per second
+    for the duration, then waits for every triggered build to finish
+    :param load_test_targets: (host URL, URL end, build parameters) of each job to trigger
+    :param duration_seconds: How long to keep triggering builds
+    :param start_rate: Trigger rate (builds per second) at the start
+    :param end_rate: Trigger rate (builds per second) at the end, equal to start_rate for a constant rate
+    :param poll_seconds: Interval between polls of each build's queue item and build
+    :param max_concurrent_requests_per_host: Maximum amount of concurrent polls made to a host, and separately of
+        concurrent triggers
+    :return: list of each triggered build's outcome and latencies
+    """
+    host_limits: dict = {}
+    for host_url, _, _ in load_test_targets:
+        host_limits.setdefault(host_url, LoadTestHostLimits(max_concurrent_requests_per_host))
+    load_test_tasks = []
+    start_time = time.monotonic()
+    next_trigger_time = start_time
+    for host_url, url_end, build_parameters in itertools.cycle(load_test_targets):
+        await asyncio.sleep(max(next_trigger_time - time.monotonic(), 0))
+        if (elapsed_seconds := time.monotonic() - start_time) >= duration_seconds:
+            break
+        if is_request_deadline_exceeded():
+            logging.error('Deadline reached after %s seconds, no longer triggering builds', round(elapsed_seconds))
+            break
+        load_test_tasks.append(asyncio.create_task(run_load_test_build(host_url,
+                                                                       url_end,
+                                                                       build_parameters,
+                                                                       host_limits[host_url],
+                                                                       poll_seconds)))
+        next_trigger_time += 1 / get_load_test_rate(elapsed_seconds, duration_seconds, start_rate, end_rate)
+    logging.info('Triggered %s build(s) in %s seconds, waiting for them to finish...',
+                 len(load_test_tasks), round(min(time.monotonic() - start_time, duration_seconds)))
+    return list(await asyncio.gather(*load_test_tasks))
+
+
+@typechecked
+def get_load_test_report(load_test_builds: list) -> dict:
+    """Summarizes the outcomes and latency percentiles (milliseconds) of a load test's builds per host"""
+    load_test_report: dict = {}
+    for host_url in dict.fromkeys(load_test_build['host'] for load_test_build in load_test_builds):
+        host_builds = [load_test_build for load_test_build in load_test_builds if load_test_build['host'] == host_url]
+        host_report: dict = {'builds': len(host_builds),
+                             'outcomes': dict(Counter(host_build['outcome'] for host_build in host_builds))}
+        for latency in LOAD_TEST_LATENCIES:
+            latencies_millis = [host_build[latency] for host_build in host_builds if latency in host_build]
+            if len(latencies_millis) > 0:
+                host_report[f'{latency}-millis'] = {**get_percentiles(latencies_millis), 'max': max(latencies_millis)}
+        load_test_report[host_url] = host_report
+    return load_test_report
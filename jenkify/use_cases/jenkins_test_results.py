@@ -0,0 +1,173 @@
+"""Module containing the collection of tracked builds' failed tests into a single deduplicated summary"""
+import asyncio
+import logging
+from xml.etree import ElementTree
+
+from typeguard import typechecked
+
+from jenkify.constants.jenkins_yaml import BUILD, HOSTS, JOBS, URL, END, BUILD_INDEX
+from jenkify.utils.environment.Environment import Environment
+from jenkify.utils.jenkins.jenkins_rest_api.jenkins_poll_status import (
+    DEFAULT_MAX_CONCURRENT_REQUESTS_PER_HOST,
+    run_host_request,
+)
+from jenkify.utils.jenkins.jenkins_rest_api.jenkins_utils import JenkinsUtils
+
+TEST_CASE_FAILED_STATUSES = ('FAILED', 'REGRESSION')
+TEST_RESULTS_OUTPUT_FORMATS = ('json', 'junit')
+
+
+@typechecked
+def get_build_test_counts(build_dict: dict) -> dict | None:
+    """Gets the counts of a build's test result action, None if the build has no test results"""
+    for action in build_dict.get('actions', []):
+        if action is not None and 'totalCount' in action:
+            return {'total': action['totalCount'], 'failed': action['failCount'], 'skipped': action['skipCount']}
+    return None
+
+
+@typechecked
+def get_test_report_failed_cases(test_report_dict: dict) -> list:
+    """Gets the failed (and regressed) cases of a projected test report"""
+    return [test_case
+            for test_suite in test_report_dict.get('suites', [])
+            for test_case in test_suite.get('cases', [])
+            if test_case.get('status', None) in TEST_CASE_FAILED_STATUSES]
+
+
+@typechecked
+def fetch_build_test_results(host_url: str, url_end: str, build_number: int) -> dict | None:
+    """
+    Fetches a build's test counts and, only if some tests failed, its failed cases
+    :return: dict of the build's test counts and failed cases, None if the build has no test results
+    """
+    jenkins_utils = JenkinsUtils(Environment.get_jenkins_request_settings_for_host(host_url))
+    if ((build_dict := jenkins_utils.get_jenkins_build_test_counts_dict(url_end, build_number)) is None or
+            (test_counts := get_build_test_counts(build_dict)) is None):
+        return None
+    failed_cases = []
+    if test_counts['failed'] > 0:
+        if (test_report_dict := jenkins_utils.get_jenkins_build_test_report_dict(url_end, build_number)) is None:
+            logging.error('Could not get the test report of %s #%s on %s!', url_end, build_number, host_url)
+        else:
+            failed_cases = get_test_report_failed_cases(test_report_dict)
+    return {**test_counts, 'failed-cases': failed_cases}
+
+
+class JenkinsTestResultsSummary:
+    """Merges the test results of builds as they arrive, deduplicating tests which failed in several builds"""
+    build_count: int
+    reporting_build_counts: dict
+    test_counts: dict
+    failed_tests: dict
+
+    def __init__(self):
+        self.build_count = 0
+        self.reporting_build_counts = {}
+        self.test_counts = {'total': 0, 'failed': 0, 'skipped': 0}
+        self.failed_tests = {}
+
+    @typechecked
+    def add(self, host_url: str, url_end: str, build_number: int, build_test_results: dict | None) -> None:
+        """Merges a build's test results (from fetch_build_test_results, None if it has none)"""
+        self.build_count += 1
+        if build_test_results is None:
+            return
+        job = f'{host_url}/{url_end}'
+        self.reporting_build_counts[job] = self.reporting_build_counts.get(job, 0) + 1
+        for test_count in self.test_counts:
+            self.test_counts[test_count] += build_test_results[test_count]
+        for failed_case in build_test_results['failed-cases']:
+            failed_test = self.failed_tests.setdefault((failed_case['className'], failed_case['name']), {
+                'class-name': failed_case['className'],
+                'name': failed_case['name'],
+                'error-details': failed_case.get('errorDetails', None),
+                'duration': failed_case.get('duration', 0),
+                'failed-builds': {},
+            })
+            failed_test['failed-builds'].setdefault(job, []).append(build_number)
+
+    @typechecked
+    def is_flaky(self, failed_test: dict) -> bool:
+        """Checks whether a failed test passed in another build of a job it failed in"""
+        return any(len(build_numbers) < self.reporting_build_counts[job]
+                   for job, build_numbers in failed_test['failed-builds'].items())
+
+    def get_summary_dict(self) -> dict:
+        """Gets the summary with the failed tests ordered by the amount of builds they failed in, then by name"""
+        failed_tests = sorted(({**failed_test, 'failed-builds': {
+                                   job: sorted(failed_test['failed-builds'][job])
+                                   for job in sorted(failed_test['failed-builds'])}}
+                               for failed_test in self.failed_tests.values()),
+                              key=lambda failed_test: (-sum(len(failed_builds) for failed_builds
+                                                            in failed_test['failed-builds'].values()),
+                                                       failed_test['class-name'],
+                                                       failed_test['name']))
+        return {'builds': self.build_count,
+                'builds-with-test-results': sum(self.reporting_build_counts.values()),
+                'tests': self.test_counts,
+                'failed-tests': [{**failed_test, 'flaky': self.is_flaky(failed_test)} for failed_test in failed_tests]}
+
+    def get_junit_xml_element(self) -> ElementTree.Element:
+        """
+        Gets the failed tests as a JUnit XML testsuites element, one testcase per test.
+        Flaky tests are reported with a flakyFailure (as Maven Surefire does) instead of a failure
+        """
+        summary_dict = self.get_summary_dict()
+        failure_count = sum(not failed_test['flaky'] for failed_test in summary_dict['failed-tests'])
+        testsuites = ElementTree.Element('testsuites', tests=str(len(summary_dict['failed-tests'])),
+                                         failures=str(failure_count))
+        testsuite = ElementTree.SubElement(testsuites, 'testsuite', name='jenkify-collected-failures',
+                                           tests=str(len(summary_dict['failed-tests'])),
+                                           failures=str(failure_count))
+        for failed_test in summary_dict['failed-tests']:
+            testcase = ElementTree.SubElement(testsuite, 'testcase', classname=failed_test['class-name'],
+                                              name=failed_test['name'], time=str(failed_test['duration']))
+            failure = ElementTree.SubElement(testcase, 'flakyFailure' if failed_test['flaky'] else 'failure',
+                                             message=(failed_test['error-details'] or '').split('\n', 1)[0])
+            failure.text = '\n'.join([*(f'Failed in {job} #{build_number}'
+                                        for job, build_numbers in failed_test['failed-builds'].items()
+                                        for build_number in build_numbers),
+                                      failed_test['error-details'] or ''])
+        return testsuites
+
+
+@typechecked
+def get_tracked_builds(build_jobs_tracking_dict: dict) -> list:
+    """Gets the (host URL, URL end, build number) of every tracked build of a tracking dict"""
+    return [(host[URL], job[END], job[BUILD_INDEX])
+            for host in build_jobs_tracking_dict[BUILD][HOSTS]
+            for job in host[JOBS]
+            if job.get(BUILD_INDEX, -1) != -1]
+
+
+@typechecked
+async def collect_test_results(
+        tracked_builds: list,
+        max_concurrent_requests_per_host: int = DEFAULT_MAX_CONCURRENT_REQUESTS_PER_HOST) -> JenkinsTestResultsSummary:
+    """
+    Concurrently fetches the test results of the tracked builds, merging each into the summary as soon as it arrives
+    :param tracked_builds: (host URL, URL end, build number) of each build
+    :param max_concurrent_requests_per_host: Maximum amount of concurrent requests made to a host
+    :return: summary of the builds' test results
+    """
+    host_semaphores: dict = {}
+    for host_url, _, _ in tracked_builds:
+        host_semaphores.setdefault(host_url, asyncio.Semaphore(max_concurrent_requests_per_host))
+
+    async def fetch_tracked_build_test_results(host_url: str, url_end: str, build_number: int) -> tuple:
+        return host_url, url_end, build_number, await run_host_request(host_semaphores[host_url],
+                                                                       fetch_build_test_results,
+                                                                       host_url,
+                                                                       url_end,
+                                                                       build_number)
+
+    test_results_summary = JenkinsTestResultsSummary()
+    for fetched_test_results in asyncio.as_completed([fetch_tracked_build_test_results(*tracked_build)
+                                                      for tracked_build in tracked_builds]):
+        host_url, url_end, build_number, build_test_results = await fetched_test_results
+        test_results_summary.add(host_url, url_end, build_number, build_test_results)
+        if build_test_results is not None and len(build_test_results['failed-cases']) > 0:
+            logging.info('%s test(s) of %s #%s on %s failed', len(build_test_results['failed-cases']), url_end,
+                         build_number, host_url)
+    return test_results_summary
@@ -0,0 +1,84 @@
+"""
+Module for streaming build state transitions as newline-delimited JSON events, one line per
+transition, flushed as soon as it happens
+"""
+import contextvars
+import json
+import sys
+import threading
+import time
+
+from typeguard import typechecked
+
+from jenkify.enums.build_events import BuildEventType
+
+STDOUT_EVENTS_OUTPUT = '-'
+
+
+class BuildEventStream:
+    """Writes build events to stdout or a file/FIFO, skipping repeated queued/started states"""
+
+    def __init__(self, output_path: str, output_file):
+        self.output_path = output_path
+        self._output_file = output_file
+        self._last_event_types: dict[tuple, BuildEventType] = {}
+        self._lock = threading.Lock()
+
+    @typechecked
+    def emit(self,
+             event_type: BuildEventType,
+             host: str,
+             url_end: str,
+             build_number: int,
+             **fields) -> None:
+        """Writes a single event line, unless it repeats the build's current state"""
+        build_key = (host, url_end, build_number)
+        with self._lock:
+            if (event_type in (BuildEventType.QUEUED, BuildEventType.STARTED) and
+                    self._last_event_types.get(build_key, None) == event_type):
+                return
+            if event_type != BuildEventType.STAGE:
+                self._last_event_types[build_key] = event_type
+            self._output_file.write(json.dumps({'event': event_type.value,
+                                                'time': time.time(),
+                                                'host': host,
+                                                'end': url_end,
+                                                'build-number': build_number,
+                                                **fields}) + '\n')
+            self._output_file.flush()
+
+    def close(self) -> None:
+        """Closes the output unless it is stdout"""
+        if self.output_path != STDOUT_EVENTS_OUTPUT:
+            self._output_file.close()
+
+
+_build_event_stream: contextvars.ContextVar = contextvars.ContextVar('build_event_stream', default=None)
+
+
+@typechecked
+def open_build_event_stream(output_path: str, append: bool = False) -> BuildEventStream:
+    """Opens an event stream to stdout ('-') or a file/FIFO path and makes it the current one"""
+    if output_path == STDOUT_EVENTS_OUTPUT:
+        output_file = sys.stdout
+    else:
+        output_file = open(output_path, 'a' if append else 'w', encoding='utf-8')  # pylint: disable=consider-using-with
+    build_event_stream = BuildEventStream(output_path, output_file)
+    _build_event_stream.set(build_event_stream)
+    return build_event_stream
+
+
+def get_build_event_stream() -> BuildEventStream | None:
+    """Gets the current event stream, if any"""
+    return _build_event_stream.get()
+
+
+@typechecked
+def emit_build_event(event_type: BuildEventType,
+                     host: str,
+                     url_end: str,
+                     build_number: int,
+                     **fields) -> None:
+    """Emits a build event to the current event stream, if events are enabled"""
+    if (build_event_stream := _build_event_stream.get()) is not None:
+        build_event_stream.emit(event_type, host, url_end, build_number, **fields)
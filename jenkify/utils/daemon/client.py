@@ -0,0 +1,52 @@
+"""Module containing the client used to submit commands to a running jenkify daemon"""
+import json
+import os
+import socket
+import sys
+
+import click
+from typeguard import typechecked
+
+from jenkify.utils.daemon.server import DAEMON_ARGS, DAEMON_VERBOSE, DAEMON_LOG, DAEMON_EXIT_CODE
+
+
+@typechecked
+def submit_command_to_daemon(socket_path: str, args: list, verbose: bool) -> int:
+    """
+    Submits a CLI command to the daemon and streams its log output to stderr as it arrives
+    :param socket_path: Path of the daemon's Unix socket
+    :param args: CLI arguments of the command to run, paths must be absolute
+    :param verbose: Whether the daemon should stream debug output
+    :return: exit code of the command
+    """
+    with socket.socket(socket.AF_UNIX, socket.SOCK_STREAM) as daemon_socket:
+        daemon_socket.connect(socket_path)
+        with daemon_socket.makefile('rwb') as daemon_file:
+            daemon_file.write(json.dumps({DAEMON_ARGS: args, DAEMON_VERBOSE: verbose}).encode('utf-8') + b'\n')
+            daemon_file.flush()
+            for line in daemon_file:
+                message: dict = json.loads(line)
+                if DAEMON_EXIT_CODE in message:
+                    return message[DAEMON_EXIT_CODE]
+                print(message[DAEMON_LOG], file=sys.stderr, flush=True)
+    return 1
+
+
+@typechecked
+def get_daemon_command_args(path_param_names: tuple = ()) -> list:
+    """
+    Rebuilds the CLI arguments of the current command for submission to the daemon, making the
+    values of path parameters absolute and leaving out the daemon socket and verbosity options
+    :param path_param_names: Names of the parameters holding file paths
+    :return: CLI arguments
+    """
+    context = click.get_current_context()
+    args = [context.info_name]
+    for param in context.command.params:
+        value = context.params.get(param.name, None)
+        if param.name in {'daemon_socket', 'verbose'} or value is None or value is False:
+            continue
+        args.append(param.opts[-1])
+        if not getattr(param, 'is_flag', False):
+            args.append(os.path.abspath(value) if param.name in path_param_names else str(value))
+    return args
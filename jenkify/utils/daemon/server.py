@@ -0,0 +1,173 @@
+"""
+Module containing the jenkify daemon, which runs submitted commands inside one long-lived process
+so that per-host HTTP sessions, crumbs and caches stay warm between invocations.
+Requests and responses are newline-delimited JSON over a Unix socket
+"""
+import contextvars
+import errno
+import json
+import logging
+import os
+import socket
+import socketserver
+import stat
+import struct
+import tempfile
+import uuid
+
+import click
+from typeguard import typechecked
+
+from jenkify.utils.http_sessions import close_http_sessions
+from jenkify.utils.logging_utils import set_logger_level_to_handlers
+
+DAEMON_ARGS = 'args'
+DAEMON_VERBOSE = 'verbose'
+DAEMON_LOG = 'log'
+DAEMON_EXIT_CODE = 'exit-code'
+DAEMON_SOCKET_FILE_NAME = 'jenkify.sock'
+PEER_CREDENTIALS = struct.Struct('3i')
+
+_daemon_request_id: contextvars.ContextVar = contextvars.ContextVar('daemon_request_id', default=None)
+
+
+def get_default_daemon_socket_path() -> str:
+    """
+    Gets the daemon socket path in the user's runtime directory ($XDG_RUNTIME_DIR), or in a directory of the user's
+    own under the temporary directory, so that other users cannot reach or replace it
+    """
+    runtime_dir = os.getenv('XDG_RUNTIME_DIR') or os.path.join(tempfile.gettempdir(), f'jenkify-{os.getuid()}')
+    return os.path.join(runtime_dir, DAEMON_SOCKET_FILE_NAME)
+
+
+class DaemonRequestLogHandler(logging.Handler):
+    """Streams the log records of a single daemon request back over its connection"""
+
+    def __init__(self, request_id: str, wfile, verbose: bool):
+        super().__init__(logging.DEBUG if verbose else logging.INFO)
+        self._request_id = request_id
+        self._wfile = wfile
+        self.setFormatter(logging.Formatter(
+            '[%(levelname)s][%(filename)s:%(funcName)s:%(lineno)s][%(asctime)s] '
+            '%(message)s'))
+
+    def filter(self, record: logging.LogRecord) -> bool:
+        return _daemon_request_id.get() == self._request_id
+
+    def emit(self, record: logging.LogRecord) -> None:
+        try:
+            write_daemon_message(self._wfile, {DAEMON_LOG: self.format(record)})
+        except OSError:
+            pass
+
+
+def write_daemon_message(wfile, message: dict) -> None:
+    """Writes a single newline-delimited JSON message and flushes it immediately"""
+    wfile.write(json.dumps(message).encode('utf-8') + b'\n')
+    wfile.flush()
+
+
+class DaemonRequestHandler(socketserver.StreamRequestHandler):
+    """Runs one submitted command per connection against the daemon's CLI"""
+
+    def handle(self) -> None:
+        daemon_request: dict = json.loads(self.rfile.readline())
+        request_id = str(uuid.uuid4())
+        _daemon_request_id.set(request_id)
+        log_handler = DaemonRequestLogHandler(request_id, self.wfile, daemon_request.get(DAEMON_VERBOSE, False))
+        logging.getLogger('').addHandler(log_handler)
+        set_logger_level_to_handlers(logging.getLogger(''))
+        try:
+            exit_code = self.server.run_command(daemon_request[DAEMON_ARGS])
+        finally:
+            logging.getLogger('').removeHandler(log_handler)
+            set_logger_level_to_handlers(logging.getLogger(''))
+        write_daemon_message(self.wfile, {DAEMON_EXIT_CODE: exit_code})
+
+
+class JenkifyDaemon(socketserver.ThreadingUnixStreamServer):
+    """
+    Unix socket server which keeps a single warm jenkify process alive. Commands run with the daemon owner's Jenkins
+    credentials, so its socket is only accessible to its owner and connections from other users are refused
+    """
+    daemon_threads = True
+
+    def __init__(self, socket_path: str, cli: click.Command):
+        self._cli = cli
+        super().__init__(socket_path, DaemonRequestHandler)
+
+    def server_bind(self) -> None:
+        previous_umask = os.umask(0o077)
+        try:
+            super().server_bind()
+        finally:
+            os.umask(previous_umask)
+        os.chmod(self.server_address, 0o600)
+
+    def verify_request(self, request, client_address) -> bool:
+        if not hasattr(socket, 'SO_PEERCRED'):
+            return True
+        _, peer_uid, _ = PEER_CREDENTIALS.unpack(
+            request.getsockopt(socket.SOL_SOCKET, socket.SO_PEERCRED, PEER_CREDENTIALS.size))
+        if peer_uid != os.getuid():
+            logging.warning('Refused daemon connection from user %s', peer_uid)
+            return False
+        return True
+
+    @typechecked
+    def run_command(self, args: list) -> int:
+        """Runs a CLI command in-process and returns its exit code"""
+        logging.debug('Daemon running: %s', args)
+        try:
+            self._cli.main(args=args, standalone_mode=False)
+        except SystemExit as exception:
+            return exception.code if isinstance(exception.code, int) else 1
+        except click.ClickException as exception:
+            logging.error('%s', exception.format_message())
+            return exception.exit_code
+        except Exception:  # pylint: disable=broad-exception-caught
+            logging.exception('Daemon command failed: %s', args)
+            return 1
+        return 0
+
+
+@typechecked
+def remove_stale_daemon_socket(socket_path: str) -> None:
+    """
+    Removes the socket left behind by a daemon which is no longer running, i.e. one refusing connections
+    :param socket_path: Path of the daemon's Unix socket
+    :raises click.ClickException: if the path is not a socket, or a daemon is still listening on it
+    """
+    if not os.path.lexists(socket_path):
+        return
+    if not stat.S_ISSOCK(os.lstat(socket_path).st_mode):
+        raise click.ClickException(f'{socket_path} exists and is not a socket, refusing to replace it')
+    with socket.socket(socket.AF_UNIX, socket.SOCK_STREAM) as probe_socket:
+        connect_error = probe_socket.connect_ex(socket_path)
+    if connect_error == 0:
+        raise click.ClickException(f'A daemon is already listening on {socket_path}')
+    if connect_error != errno.ECONNREFUSED:
+        raise click.ClickException(f'Could not check whether a daemon is listening on {socket_path}: '
+                                   f'{os.strerror(connect_error)}')
+    logging.info('Removing stale daemon socket %s', socket_path)
+    os.remove(socket_path)
+
+
+@typechecked
+def serve_daemon(socket_path: str, cli: click.Command) -> None:
+    """
+    Serves submitted commands on the Unix socket until interrupted
+    :param socket_path: Path of the Unix socket, its directory is created for the owner only if missing
+    :param cli: CLI whose commands are run
+    """
+    os.makedirs(os.path.dirname(os.path.abspath(socket_path)), mode=0o700, exist_ok=True)
+    remove_stale_daemon_socket(socket_path)
+    with JenkifyDaemon(socket_path, cli) as daemon:
+        logging.info('jenkify daemon listening on %s', socket_path)
+        try:
+            daemon.serve_forever()
+        except KeyboardInterrupt:
+            logging.info('Shutting down jenkify daemon...')
+        finally:
+            close_http_sessions()
+            os.remove(socket_path)
@@ -1,4 +1,5 @@
 """Environment utilities abstract class module"""
+import functools
 import os
 from abc import ABC
 
@@ -8,12 +9,27 @@ from jenkify.constants.jenkins_env import JENKINS_URL, JENKINS_USER, JENKINS_TOK
 from jenkify.utils.jenkins.jekins_request_settings import JenkinsRequestSettings
 
 
+@functools.cache
+def load_dotenv_once() -> None:
+    """Loads the .env file on first use only, instead of searching the file system for it on every call"""
+    load_dotenv()
+
+
 class Environment(ABC):
     @staticmethod
     def get_jenkins_request_settings_from_env() -> JenkinsRequestSettings:
-        load_dotenv()
+        load_dotenv_once()
         return JenkinsRequestSettings(
             os.getenv(JENKINS_URL),
             (os.getenv(JENKINS_USER), os.getenv(JENKINS_TOKEN)),
             1,
         )
+
+    @staticmethod
+    def get_jenkins_request_settings_for_host(url: str) -> JenkinsRequestSettings:
+        load_dotenv_once()
+        return JenkinsRequestSettings(
+            url,
+            (os.getenv(JENKINS_USER), os.getenv(JENKINS_TOKEN)),
+            1,
+        )
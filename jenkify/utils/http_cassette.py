@@ -0,0 +1,134 @@
+"""
+Module which records every HTTP request made by the process, with its response and latency, into a cassette file
+and replays a cassette in place of the Jenkins hosts, so that a run can be repeated offline and deterministically
+"""
+import base64
+import gzip
+import json
+import logging
+import threading
+import time
+from collections import deque
+
+import requests
+from requests.structures import CaseInsensitiveDict
+from typeguard import typechecked
+
+from jenkify.enums.http_request_methods import HttpRequestMethod
+
+HTTP_CASSETTE_RECORDED_HEADERS = ('Content-Type', 'X-Text-Size', 'X-More-Data')
+
+
+class HttpCassetteMissException(requests.exceptions.ConnectionError):
+    """Raised when a replayed request has no recorded response, treated like an unreachable host"""
+
+
+class HttpCassette:
+    """Gzipped NDJSON cassette of requests (method, URL) and their responses (status, headers, body, latency)"""
+    cassette_path: str
+    replaying: bool
+    request_count: int
+    miss_count: int
+    _latency_scale: float
+    _lock: threading.Lock
+    _recording_file = None
+    _recorded_responses: dict
+
+    @typechecked
+    def __init__(self, cassette_path: str, replaying: bool, latency_scale: float = 1.0):
+        self.cassette_path = cassette_path
+        self.replaying = replaying
+        self.request_count = 0
+        self.miss_count = 0
+        self._latency_scale = latency_scale
+        self._lock = threading.Lock()
+        self._recorded_responses = {}
+        if replaying:
+            with gzip.open(cassette_path, 'rt', encoding='utf-8') as cassette_file:
+                for line in cassette_file:
+                    interaction = json.loads(line)
+                    self._recorded_responses.setdefault((interaction['method'], interaction['url']),
+                                                        deque()).append(interaction)
+        else:
+            self._recording_file = gzip.open(cassette_path, 'wt', encoding='utf-8')
+
+    @typechecked
+    def record(self, request_method: HttpRequestMethod, url: str, response: requests.Response,
+               elapsed_seconds: float) -> None:
+        """Appends a request and its response to the cassette, reading the response body in full"""
+        interaction = {'method': request_method.name,
+                       'url': url,
+                       'status': response.status_code,
+                       'reason': response.reason,
+                       'headers': {header: response.headers[header]
+                                   for header in HTTP_CASSETTE_RECORDED_HEADERS if header in response.headers},
+                       'body': base64.b64encode(response.content).decode('ascii'),
+                       'elapsed': round(elapsed_seconds, 4)}
+        with self._lock:
+            self.request_count += 1
+            self._recording_file.write(json.dumps(interaction, separators=(',', ':')) + '\n')
+
+    @typechecked
+    def replay(self, request_method: HttpRequestMethod, url: str) -> requests.Response:
+        """
+        Serves the next recorded response to a request after its recorded (scaled) latency.
+        The last response to a request is repeated once the recorded ones run out, e.g. for a longer polling loop
+        :raises HttpCassetteMissException: if the request was never recorded
+        """
+        with self._lock:
+            self.request_count += 1
+            if (recorded_responses := self._recorded_responses.get((request_method.name, url), None)) is None:
+                self.miss_count += 1
+                raise HttpCassetteMissException(f'No recorded response to {request_method.name} {url}')
+            interaction = recorded_responses.popleft() if len(recorded_responses) > 1 else recorded_responses[0]
+        time.sleep(interaction['elapsed'] * self._latency_scale)
+        response = requests.Response()
+        response.status_code = interaction['status']
+        response.reason = interaction['reason']
+        response.headers = CaseInsensitiveDict(interaction['headers'])
+        response.url = url
+        response.encoding = 'utf-8'
+        response._content = base64.b64decode(interaction['body'])  # pylint: disable=protected-access
+        response._content_consumed = True  # pylint: disable=protected-access
+        return response
+
+    def close(self) -> None:
+        """Flushes and closes the cassette being recorded"""
+        if self._recording_file is not None:
+            self._recording_file.close()
+
+
+_http_cassette: HttpCassette | None = None
+
+
+@typechecked
+def open_http_cassette(record_path: str | None, replay_path: str | None, latency_scale: float = 1.0) -> None:
+    """Starts recording to or replaying from a cassette for every request made by the process (or neither)"""
+    global _http_cassette  # pylint: disable=global-statement
+    if replay_path is not None:
+        _http_cassette = HttpCassette(replay_path, replaying=True, latency_scale=latency_scale)
+        logging.info('Replaying HTTP requests from %s...', replay_path)
+    elif record_path is not None:
+        _http_cassette = HttpCassette(record_path, replaying=False)
+        logging.info('Recording HTTP requests to %s...', record_path)
+
+
+def get_http_cassette() -> HttpCassette | None:
+    """Gets the cassette being recorded or replayed, if any"""
+    return _http_cassette
+
+
+def close_http_cassette() -> None:
+    """Stops recording or replaying, logging the amount of requests made through the cassette"""
+    global _http_cassette  # pylint: disable=global-statement
+    if _http_cassette is None:
+        return
+    _http_cassette.close()
+    if _http_cassette.replaying:
+        logging.info('Replayed %s HTTP request(s) from %s, %s without a recorded response',
+                     _http_cassette.request_count,
+                     _http_cassette.cassette_path,
+                     _http_cassette.miss_count)
+    else:
+        logging.info('Recorded %s HTTP request(s) to %s', _http_cassette.request_count, _http_cassette.cassette_path)
+    _http_cassette = None
@@ -13,7 +13,9 @@ class HttpRequestSettings:
             data: dict | None = None,
             proxy: dict | None = None,
             ssl: bool = False,
-            auth: tuple = None
+            auth: tuple = None,
+            headers: dict | None = None,
+            stream: bool = False,
     ):
         self.content_type = content_type
         self.body = body
@@ -21,3 +23,6 @@ class HttpRequestSettings:
         self.proxy = proxy
         self.ssl = ssl
         self.auth = auth
+        self.headers = headers
+        self.stream = stream
+        self.request_headers = {'Content-Type': content_type, **(headers or {})}
@@ -0,0 +1,44 @@
+"""
+Module which keeps one HTTP session (and thereby a pool of warm connections) per host, shared by
+every request made to that host for the lifetime of the process
+"""
+import threading
+from urllib.parse import urlsplit
+
+import requests
+from typeguard import typechecked
+
+_http_sessions: dict[str, requests.Session] = {}
+_http_sessions_lock = threading.Lock()
+
+
+def get_http_session(url: str) -> requests.Session:
+    """
+    Gets the shared HTTP session for the scheme and host of the URL, creating it on first use.
+    Not @typechecked as every request looks its session up
+    :param url: Any URL on the host
+    :return: session
+    :rtype: requests.Session
+    """
+    split_url = urlsplit(url)
+    host_key = f'{split_url.scheme}://{split_url.netloc}'
+    if (http_session := _http_sessions.get(host_key, None)) is None:
+        with _http_sessions_lock:
+            http_session = _http_sessions.setdefault(host_key, requests.Session())
+    return http_session
+
+
+@typechecked
+def set_http_session(url: str, http_session: requests.Session) -> None:
+    """Replaces the shared HTTP session for the scheme and host of the URL, e.g. with one serving canned responses"""
+    split_url = urlsplit(url)
+    with _http_sessions_lock:
+        _http_sessions[f'{split_url.scheme}://{split_url.netloc}'] = http_session
+
+
+def close_http_sessions() -> None:
+    """Closes every shared HTTP session along with its pooled connections"""
+    with _http_sessions_lock:
+        for http_session in _http_sessions.values():
+            http_session.close()
+        _http_sessions.clear()
@@ -0,0 +1,93 @@
+"""
+Module containing a local SQLite store of finished builds' history (results, durations, timestamps and queue times),
+ingested incrementally and read back column by column for analysis
+"""
+import sqlite3
+from array import array
+
+from typeguard import typechecked
+
+DEFAULT_BUILD_HISTORY_STORE_PATH = 'jenkify-history.sqlite3'
+BUILD_HISTORY_COLUMNS = ('build_number', 'result', 'timestamp_millis', 'duration_millis', 'queue_duration_millis')
+BUILD_HISTORY_SCHEMA = """
+CREATE TABLE IF NOT EXISTS builds (
+    host TEXT NOT NULL,
+    url_end TEXT NOT NULL,
+    build_number INTEGER NOT NULL,
+    result TEXT NOT NULL,
+    timestamp_millis INTEGER NOT NULL,
+    duration_millis INTEGER NOT NULL,
+    queue_duration_millis INTEGER,
+    PRIMARY KEY (host, url_end, build_number)
+) WITHOUT ROWID;
+CREATE TABLE IF NOT EXISTS job_sync_cursors (
+    host TEXT NOT NULL,
+    url_end TEXT NOT NULL,
+    next_build_number INTEGER NOT NULL,
+    PRIMARY KEY (host, url_end)
+) WITHOUT ROWID;
+"""
+
+
+class JenkinsBuildHistoryStore:
+    """Stores the history of finished builds per job, keyed by host, URL end and build number"""
+    _connection: sqlite3.Connection
+
+    @typechecked
+    def __init__(self, store_path: str = DEFAULT_BUILD_HISTORY_STORE_PATH):
+        self._connection = sqlite3.connect(store_path)
+        self._connection.executescript(BUILD_HISTORY_SCHEMA)
+
+    def close(self) -> None:
+        """Closes the connection to the store"""
+        self._connection.close()
+
+    @typechecked
+    def get_next_build_number(self, host_url: str, url_end: str) -> int:
+        """Gets the lowest build number of a job which has not been ingested as finished yet"""
+        row = self._connection.execute('SELECT next_build_number FROM job_sync_cursors WHERE host = ? AND url_end = ?',
+                                       (host_url, url_end)).fetchone()
+        return row[0] if row is not None else 1
+
+    @typechecked
+    def add_builds(self, host_url: str, url_end: str, builds: list, next_build_number: int) -> None:
+        """
+        Adds (or replaces) finished builds of a job and moves the job's sync cursor in a single transaction
+        :param host_url: URL of the host the job lives on
+        :param url_end: URL end of the job
+        :param builds: dicts with a value for each of BUILD_HISTORY_COLUMNS
+        :param next_build_number: Lowest build number to ingest on the next sync
+        """
+        with self._connection:
+            self._connection.executemany(
+                'INSERT OR REPLACE INTO builds VALUES (?, ?, ?, ?, ?, ?, ?)',
+                [(host_url, url_end, *(build[column] for column in BUILD_HISTORY_COLUMNS)) for build in builds])
+            self._connection.execute('INSERT OR REPLACE INTO job_sync_cursors VALUES (?, ?, ?)',
+                                     (host_url, url_end, next_build_number))
+
+    @typechecked
+    def get_jobs(self) -> list:
+        """Gets the (host URL, URL end) of every job with stored builds"""
+        return self._connection.execute('SELECT DISTINCT host, url_end FROM builds ORDER BY host, url_end').fetchall()
+
+    @typechecked
+    def get_build_columns(self, host_url: str, url_end: str, since_timestamp_millis: int = 0) -> dict:
+        """
+        Reads a job's builds as columns ordered by timestamp
+        :return: dict mapping each of BUILD_HISTORY_COLUMNS to an array (a list for results). Queue durations
+            unknown to Jenkins are left out, queue_timestamp_millis holds the timestamps of the known ones
+        """
+        rows = self._connection.execute(
+            f'SELECT {', '.join(BUILD_HISTORY_COLUMNS)} FROM builds '
+            'WHERE host = ? AND url_end = ? AND timestamp_millis >= ? ORDER BY timestamp_millis',
+            (host_url, url_end, since_timestamp_millis)).fetchall()
+        build_numbers, results, timestamps, durations, queue_durations = zip(*rows) if len(rows) > 0 else ((),) * 5
+        return {'build_number': array('q', build_numbers),
+                'result': list(results),
+                'timestamp_millis': array('q', timestamps),
+                'duration_millis': array('q', durations),
+                'queue_duration_millis': array('q', (queue_duration for queue_duration in queue_durations
+                                                     if queue_duration is not None)),
+                'queue_timestamp_millis': array('q', (timestamp for timestamp, queue_duration
+                                                      in zip(timestamps, queue_durations)
+                                                      if queue_duration is not None))}
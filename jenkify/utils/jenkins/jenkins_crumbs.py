@@ -0,0 +1,105 @@
+"""Jenkins CSRF crumb utilities module"""
+import logging
+import threading
+from http import HTTPStatus
+
+from requests import Response
+from typeguard import typechecked
+
+from jenkify.enums.http_request_methods import HttpRequestMethod
+from jenkify.exceptions.request_retry_exception import RequestRetryException
+from jenkify.utils.http_request_settings import HttpRequestSettings
+from jenkify.utils.jenkins.jekins_request_settings import JenkinsRequestSettings
+from jenkify.utils.json.JsonUtils import JsonUtils
+from jenkify.utils.request_retry import request_retry
+
+_jenkins_crumb_headers: dict[str, dict] = {}
+_jenkins_crumb_locks: dict[str, threading.Lock] = {}
+_jenkins_crumb_locks_lock = threading.Lock()
+
+
+def get_jenkins_crumb_lock(jenkins_url: str) -> threading.Lock:
+    """Gets the lock guarding the crumb request of a Jenkins host, so that different hosts never wait on each other"""
+    with _jenkins_crumb_locks_lock:
+        return _jenkins_crumb_locks.setdefault(jenkins_url, threading.Lock())
+
+
+@typechecked
+def get_jenkins_crumb_headers(jenkins_request_settings: JenkinsRequestSettings) -> dict:
+    """
+    Gets the CSRF crumb header for a Jenkins host, requesting it only once per host (until it is forgotten).
+    Hosts without a crumb issuer (CSRF protection disabled) get no header
+    :param jenkins_request_settings: Settings of the host to get the crumb for
+    :return: headers dict
+    """
+    if (crumb_headers := _jenkins_crumb_headers.get(jenkins_request_settings.url, None)) is not None:
+        return crumb_headers
+    with get_jenkins_crumb_lock(jenkins_request_settings.url):
+        if jenkins_request_settings.url not in _jenkins_crumb_headers:
+            try:
+                crumb_dict: dict = JsonUtils.get_json_response(
+                    f'{jenkins_request_settings.url}/crumbIssuer/api/json',
+                    jenkins_request_settings.max_retry,
+                    HttpRequestSettings(auth=jenkins_request_settings.auth))
+                crumb_headers = {crumb_dict['crumbRequestField']: crumb_dict['crumb']}
+            except RequestRetryException:
+                crumb_headers = {}
+            _jenkins_crumb_headers[jenkins_request_settings.url] = crumb_headers
+        return _jenkins_crumb_headers[jenkins_request_settings.url]
+
+
+@typechecked
+def set_jenkins_crumb_headers(jenkins_url: str, crumb_headers: dict) -> None:
+    """Keeps a Jenkins host's CSRF crumb header obtained elsewhere (e.g. by preflight), so that it is not requested"""
+    with get_jenkins_crumb_lock(jenkins_url):
+        _jenkins_crumb_headers[jenkins_url] = crumb_headers
+
+
+@typechecked
+def forget_jenkins_crumb_headers(jenkins_url: str, crumb_headers: dict) -> None:
+    """
+    Forgets a Jenkins host's CSRF crumb header so that the next request gets a fresh one, unless it was already
+    replaced by a fresh one since it was used
+    :param jenkins_url: URL of the host
+    :param crumb_headers: Crumb header which was rejected
+    """
+    with get_jenkins_crumb_lock(jenkins_url):
+        if _jenkins_crumb_headers.get(jenkins_url, None) is crumb_headers:
+            del _jenkins_crumb_headers[jenkins_url]
+
+
+@typechecked
+def request_with_jenkins_crumb(jenkins_request_settings: JenkinsRequestSettings,
+                               request_method: HttpRequestMethod,
+                               url: str,
+                               **http_request_settings_kwargs) -> Response:
+    """
+    Makes a request carrying the host's CSRF crumb header. Crumbs are only valid for the session they were issued
+    to, so when the request is forbidden the crumb is refreshed and the request retried once, which keeps a
+    long-lived daemon working after its sessions expire
+    :param jenkins_request_settings: Settings of the host
+    :param request_method: Method of the request
+    :param url: URL of the request
+    :param http_request_settings_kwargs: Other settings of the request (e.g. content type and data)
+    :return: response
+    :raises RequestRetryException: if the request fails, including when still forbidden with a fresh crumb
+    """
+    crumb_headers = get_jenkins_crumb_headers(jenkins_request_settings)
+    try:
+        return request_retry(request_method,
+                             url,
+                             jenkins_request_settings.max_retry,
+                             HttpRequestSettings(auth=jenkins_request_settings.auth,
+                                                 headers=crumb_headers,
+                                                 **http_request_settings_kwargs))
+    except RequestRetryException as exception:
+        if exception.status_code != HTTPStatus.FORBIDDEN:
+            raise
+    logging.warning('%s request to %s was forbidden, retrying once with a fresh crumb', request_method.name, url)
+    forget_jenkins_crumb_headers(jenkins_request_settings.url, crumb_headers)
+    return request_retry(request_method,
+                         url,
+                         jenkins_request_settings.max_retry,
+                         HttpRequestSettings(auth=jenkins_request_settings.auth,
+                                             headers=get_jenkins_crumb_headers(jenkins_request_settings),
+                                             **http_request_settings_kwargs))
@@ -0,0 +1,107 @@
+"""
+Module containing a local SQLite catalog of the jobs on each host, crawled one folder subtree (crawl root) at a time
+so that each subtree can be refreshed on its own once its time to live has passed
+"""
+import sqlite3
+
+from typeguard import typechecked
+
+DEFAULT_JOB_CATALOG_STORE_PATH = 'jenkify-jobs.sqlite3'
+JOB_CATALOG_SCHEMA = """
+CREATE TABLE IF NOT EXISTS jobs (
+    host TEXT NOT NULL,
+    url_end TEXT NOT NULL,
+    class TEXT,
+    crawl_root TEXT NOT NULL,
+    PRIMARY KEY (host, url_end)
+) WITHOUT ROWID;
+CREATE TABLE IF NOT EXISTS crawl_roots (
+    host TEXT NOT NULL,
+    url_end TEXT NOT NULL,
+    parent_url_end TEXT,
+    indexed_at_seconds REAL NOT NULL,
+    PRIMARY KEY (host, url_end)
+) WITHOUT ROWID;
+"""
+
+
+class JenkinsJobCatalogStore:
+    """Stores the URL end and class of every (non-folder) job of each host, along with the crawl roots indexed"""
+    _connection: sqlite3.Connection
+
+    @typechecked
+    def __init__(self, store_path: str = DEFAULT_JOB_CATALOG_STORE_PATH):
+        self._connection = sqlite3.connect(store_path)
+        self._connection.executescript(JOB_CATALOG_SCHEMA)
+
+    def close(self) -> None:
+        """Closes the connection to the store"""
+        self._connection.close()
+
+    @typechecked
+    def get_crawl_root_indexed_times(self, host_url: str) -> dict:
+        """Gets the time (seconds since the epoch) each crawl root of a host was last indexed at"""
+        return dict(self._connection.execute('SELECT url_end, indexed_at_seconds FROM crawl_roots WHERE host = ?',
+                                             (host_url,)).fetchall())
+
+    @typechecked
+    def get_child_crawl_roots(self, host_url: str, url_end: str) -> list:
+        """Gets the crawl roots found below a crawl root when it was last indexed"""
+        return [row[0] for row in self._connection.execute(
+            'SELECT url_end FROM crawl_roots WHERE host = ? AND parent_url_end = ? ORDER BY url_end',
+            (host_url, url_end)).fetchall()]
+
+    @typechecked
+    def replace_crawl_root(self,
+                           host_url: str,
+                           url_end: str,
+                           *,
+                           parent_url_end: str | None,
+                           jobs: list,
+                           child_url_ends: list,
+                           indexed_at_seconds: float) -> None:
+        """
+        Replaces the jobs of a crawl root and records its child crawl roots in a single transaction.
+        Children not indexed yet are recorded as expired, so that they are crawled. Former children which are gone
+        are detached, to be removed with remove_crawl_roots
+        :param host_url: URL of the host
+        :param url_end: URL end of the crawl root's folder ('' for the host's root)
+        :param parent_url_end: URL end of the crawl root it was found below (None for the host's root)
+        :param jobs: (URL end, class) of each job found by the crawl root's query
+        :param child_url_ends: URL ends of the folders below it which need a query of their own
+        :param indexed_at_seconds: Time of the query, in seconds since the epoch
+        """
+        with self._connection:
+            self._connection.execute('DELETE FROM jobs WHERE host = ? AND crawl_root = ?', (host_url, url_end))
+            self._connection.executemany('INSERT OR REPLACE INTO jobs VALUES (?, ?, ?, ?)',
+                                         [(host_url, job_url_end, job_class, url_end)
+                                          for job_url_end, job_class in jobs])
+            self._connection.execute('INSERT OR REPLACE INTO crawl_roots VALUES (?, ?, ?, ?)',
+                                     (host_url, url_end, parent_url_end, indexed_at_seconds))
+            self._connection.execute('UPDATE crawl_roots SET parent_url_end = NULL '
+                                     'WHERE host = ? AND parent_url_end = ?',
+                                     (host_url, url_end))
+            self._connection.executemany('INSERT INTO crawl_roots VALUES (?, ?, ?, 0) '
+                                         'ON CONFLICT (host, url_end) DO UPDATE '
+                                         'SET parent_url_end = excluded.parent_url_end',
+                                         [(host_url, child_url_end, url_end) for child_url_end in child_url_ends])
+
+    @typechecked
+    def remove_crawl_roots(self, host_url: str, url_ends: list) -> None:
+        """Removes crawl roots which no longer exist along with their jobs"""
+        with self._connection:
+            self._connection.executemany('DELETE FROM jobs WHERE host = ? AND crawl_root = ?',
+                                         [(host_url, url_end) for url_end in url_ends])
+            self._connection.executemany('DELETE FROM crawl_roots WHERE host = ? AND url_end = ?',
+                                         [(host_url, url_end) for url_end in url_ends])
+
+    @typechecked
+    def get_job_url_ends(self, host_url: str) -> list:
+        """Gets the URL ends of every job of a host, sorted"""
+        return [row[0] for row in self._connection.execute('SELECT url_end FROM jobs WHERE host = ? ORDER BY url_end',
+                                                           (host_url,)).fetchall()]
+
+    @typechecked
+    def get_job_counts(self) -> dict:
+        """Gets the amount of jobs indexed per host"""
+        return dict(self._connection.execute('SELECT host, COUNT(*) FROM jobs GROUP BY host').fetchall())
@@ -0,0 +1,161 @@
+"""
+Module containing a local store of finished builds' console output. Logs are compressed in blocks of
+lines, each block an independent gzip member (or xz stream) so that the file as a whole still decompresses
+with standard tools, alongside an index of each block's compressed byte offset. Line lookups map the index
+into memory and only decompress the blocks holding the requested lines
+"""
+import gzip
+import lzma
+import mmap
+import os
+import struct
+from collections.abc import Callable, Iterable
+from typing import NamedTuple
+from urllib.parse import quote
+
+from typeguard import typechecked
+
+
+
+class LogStoreCodec(NamedTuple):
+    """Compression codec of stored logs: its id in the index header, log file suffix and (de)compress functions"""
+    codec_id: int
+    suffix: str
+    compress: Callable[[bytes], bytes]
+    decompress: Callable[[bytes], bytes]
+
+
+LOG_STORE_CODECS = {
+    'gzip': LogStoreCodec(1, '.log.gz', gzip.compress, gzip.decompress),
+    'xz': LogStoreCodec(2, '.log.xz', lzma.compress, lzma.decompress),
+}
+DEFAULT_LOG_STORE_CODEC = 'gzip'
+DEFAULT_LOG_STORE_LINES_PER_BLOCK = 1024
+LOG_STORE_INDEX_SUFFIX = '.idx'
+LOG_STORE_INDEX_MAGIC = b'JLI1'
+# magic, codec id, lines per block, total line count
+LOG_STORE_INDEX_HEADER = struct.Struct('<4sIIQ')
+LOG_STORE_INDEX_OFFSET = struct.Struct('<Q')
+
+
+class JenkinsBuildLogStore:
+    """Stores and serves finished builds' console output from local disk"""
+    _store_directory: str
+    _codec: str
+    _lines_per_block: int
+
+    @typechecked
+    def __init__(self,
+                 store_directory: str,
+                 codec: str = DEFAULT_LOG_STORE_CODEC,
+                 lines_per_block: int = DEFAULT_LOG_STORE_LINES_PER_BLOCK):
+        if codec not in LOG_STORE_CODECS:
+            raise ValueError(f'Unknown log store codec: {codec}')
+        self._store_directory = store_directory
+        self._codec = codec
+        self._lines_per_block = lines_per_block
+
+    @typechecked
+    def _get_log_path(self, host_url: str, url_end: str, build_number: int, codec: str) -> str:
+        return os.path.join(self._store_directory,
+                            quote(host_url, safe=''),
+                            quote(url_end, safe=''),
+                            f'{build_number}{LOG_STORE_CODECS[codec].suffix}')
+
+    @typechecked
+    def _get_index_path(self, host_url: str, url_end: str, build_number: int) -> str:
+        return os.path.join(self._store_directory,
+                            quote(host_url, safe=''),
+                            quote(url_end, safe=''),
+                            f'{build_number}{LOG_STORE_INDEX_SUFFIX}')
+
+    @typechecked
+    def has_build_log(self, host_url: str, url_end: str, build_number: int) -> bool:
+        """Checks whether a build's log is stored (the index is written last, so it marks a complete log)"""
+        return os.path.exists(self._get_index_path(host_url, url_end, build_number))
+
+    @typechecked
+    def store_build_log(self, host_url: str, url_end: str, build_number: int, lines: Iterable) -> int:
+        """
+        Compresses a finished build's log to disk block by block, holding a single block in memory
+        :param host_url: URL of the host the job lives on
+        :param url_end: URL end of the job
+        :param build_number: Build number of the job
+        :param lines: Log lines (bytes or str) without line endings
+        :return: amount of lines stored
+        """
+        log_store_codec = LOG_STORE_CODECS[self._codec]
+        log_path = self._get_log_path(host_url, url_end, build_number, self._codec)
+        index_path = self._get_index_path(host_url, url_end, build_number)
+        os.makedirs(os.path.dirname(log_path), exist_ok=True)
+        block_offsets = [0]
+        block_lines: list = []
+        line_count = 0
+        with open(f'{log_path}.tmp', 'wb') as log_file:
+            for line in lines:
+                block_lines.append(line if isinstance(line, bytes) else line.encode('utf-8'))
+                line_count += 1
+                if len(block_lines) == self._lines_per_block:
+                    log_file.write(log_store_codec.compress(b'\n'.join(block_lines) + b'\n'))
+                    block_offsets.append(log_file.tell())
+                    block_lines.clear()
+            if len(block_lines) > 0:
+                log_file.write(log_store_codec.compress(b'\n'.join(block_lines) + b'\n'))
+                block_offsets.append(log_file.tell())
+        with open(f'{index_path}.tmp', 'wb') as index_file:
+            index_file.write(LOG_STORE_INDEX_HEADER.pack(LOG_STORE_INDEX_MAGIC,
+                                                         log_store_codec.codec_id,
+                                                         self._lines_per_block,
+                                                         line_count))
+            for block_offset in block_offsets:
+                index_file.write(LOG_STORE_INDEX_OFFSET.pack(block_offset))
+        os.replace(f'{log_path}.tmp', log_path)
+        os.replace(f'{index_path}.tmp', index_path)
+        return line_count
+
+    @typechecked
+    def get_build_log_line_count(self, host_url: str, url_end: str, build_number: int) -> int:
+        """Gets the amount of lines of a stored build's log from its index"""
+        with open(self._get_index_path(host_url, url_end, build_number), 'rb') as index_file:
+            return LOG_STORE_INDEX_HEADER.unpack(index_file.read(LOG_STORE_INDEX_HEADER.size))[3]
+
+    @typechecked
+    def get_build_log_lines(self,
+                            host_url: str,
+                            url_end: str,
+                            build_number: int,
+                            first_line_number: int = 1,
+                            last_line_number: int | None = None) -> list:
+        """
+        Reads an inclusive range of lines of a stored build's log, decompressing only the blocks holding them
+        :param host_url: URL of the host the job lives on
+        :param url_end: URL end of the job
+        :param build_number: Build number of the job
+        :param first_line_number: First line to read, starting at 1
+        :param last_line_number: Last line to read, the log's last line if None
+        :return: list of lines (str) without line endings
+        """
+        with open(self._get_index_path(host_url, url_end, build_number), 'rb') as index_file, \
+                mmap.mmap(index_file.fileno(), 0, access=mmap.ACCESS_READ) as index:
+            magic, codec_id, lines_per_block, line_count = LOG_STORE_INDEX_HEADER.unpack_from(index, 0)
+            if magic != LOG_STORE_INDEX_MAGIC:
+                raise ValueError(f'Corrupt log store index for {url_end} #{build_number}')
+            codec = next(codec for codec, log_store_codec in LOG_STORE_CODECS.items()
+                         if log_store_codec.codec_id == codec_id)
+            first_line_number = max(first_line_number, 1)
+            last_line_number = line_count if last_line_number is None else min(last_line_number, line_count)
+            if first_line_number > last_line_number:
+                return []
+            first_block = (first_line_number - 1) // lines_per_block
+            last_block = (last_line_number - 1) // lines_per_block
+            first_block_offset = LOG_STORE_INDEX_OFFSET.unpack_from(
+                index, LOG_STORE_INDEX_HEADER.size + first_block * LOG_STORE_INDEX_OFFSET.size)[0]
+            end_block_offset = LOG_STORE_INDEX_OFFSET.unpack_from(
+                index, LOG_STORE_INDEX_HEADER.size + (last_block + 1) * LOG_STORE_INDEX_OFFSET.size)[0]
+        decompress = LOG_STORE_CODECS[codec].decompress
+        with open(self._get_log_path(host_url, url_end, build_number, codec), 'rb') as log_file:
+            log_file.seek(first_block_offset)
+            block_lines = decompress(log_file.read(end_block_offset - first_block_offset)).split(b'\n')[:-1]
+        first_line_index = first_line_number - 1 - first_block * lines_per_block
+        return [line.decode('utf-8', errors='replace')
+                for line in block_lines[first_line_index:first_line_index + last_line_number - first_line_number + 1]]
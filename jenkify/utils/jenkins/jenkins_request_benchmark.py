@@ -0,0 +1,89 @@
+"""
+Module containing a benchmark of the client-side CPU time jenkify spends per polling request. Requests are answered
+by a session serving a canned response, so that neither network I/O nor the requests library itself is measured
+"""
+import time
+
+import requests
+from typeguard import typechecked
+
+from jenkify.utils.http_sessions import set_http_session
+from jenkify.utils.jenkins.jekins_request_settings import JenkinsRequestSettings
+from jenkify.utils.jenkins.jenkins_rest_api.jenkins_utils import JenkinsUtils
+from jenkify.utils.jenkins.jenkins_wfapi.runs import get_job_runs_since_build_number
+
+BENCHMARK_BUILD_HOST_URL = 'http://builds.jenkify-benchmark.invalid'
+BENCHMARK_RUNS_HOST_URL = 'http://runs.jenkify-benchmark.invalid'
+BENCHMARK_URL_END = 'job/Benchmark'
+BENCHMARK_ROUNDS = 5
+DEFAULT_REQUEST_CPU_BUDGET_MICROS = 100
+CANNED_BUILD_CONTENT = b'{"_class":"hudson.model.FreeStyleBuild","number":1,"result":null,"building":true}'
+CANNED_JOB_RUNS_CONTENT = b'[{"id":"2","status":"IN_PROGRESS","stages":[]},{"id":"1","status":"SUCCESS","stages":[]}]'
+
+
+class CannedResponseSession(requests.Session):
+    """Session answering every request with a 200 response carrying the same content, without sending anything"""
+    _content: bytes
+
+    @typechecked
+    def __init__(self, content: bytes):
+        super().__init__()
+        self._content = content
+
+    def request(self, method, url, *_, **__) -> requests.Response:
+        response = requests.Response()
+        response.status_code = 200
+        response.reason = 'OK'
+        response.url = url
+        response._content = self._content  # pylint: disable=protected-access
+        response._content_consumed = True  # pylint: disable=protected-access
+        return response
+
+
+@typechecked
+def measure_cpu_micros_per_request(request, request_count: int, rounds: int = BENCHMARK_ROUNDS) -> float:
+    """
+    Measures the process CPU time per call of request (given the call's index), in microseconds.
+    The calls are split into rounds and the best round is kept, so that noise from the rest of the machine is left out
+    """
+    request(0)
+    round_request_count = max(1, request_count // rounds)
+    best_seconds = None
+    for _ in range(rounds):
+        start = time.process_time()
+        for request_index in range(round_request_count):
+            request(request_index)
+        elapsed_seconds = time.process_time() - start
+        best_seconds = elapsed_seconds if best_seconds is None else min(best_seconds, elapsed_seconds)
+    return best_seconds * 1_000_000 / round_request_count
+
+
+@typechecked
+def benchmark_request_overhead(request_count: int = 5000) -> dict:
+    """
+    Measures the client-side CPU time per request of the endpoints each poll requests, from building the request to
+    decoding its response
+    :param request_count: Amount of timed requests per endpoint
+    :return: dict mapping each endpoint to its CPU time per request, in microseconds
+    """
+    set_http_session(BENCHMARK_BUILD_HOST_URL, CannedResponseSession(CANNED_BUILD_CONTENT))
+    set_http_session(BENCHMARK_RUNS_HOST_URL, CannedResponseSession(CANNED_JOB_RUNS_CONTENT))
+    jenkins_utils = JenkinsUtils(JenkinsRequestSettings(BENCHMARK_BUILD_HOST_URL, ('user', 'token'), 1))
+    runs_request_settings = JenkinsRequestSettings(BENCHMARK_RUNS_HOST_URL, ('user', 'token'), 1)
+    return {
+        'build api/json': round(measure_cpu_micros_per_request(
+            lambda build_number: jenkins_utils.get_jenkins_build_dict_url_end_build_number(BENCHMARK_URL_END,
+                                                                                           build_number),
+            request_count), 1),
+        'wfapi/runs': round(measure_cpu_micros_per_request(
+            lambda build_number: get_job_runs_since_build_number(runs_request_settings,
+                                                                 BENCHMARK_URL_END,
+                                                                 build_number),
+            request_count), 1),
+    }
+
+
+@typechecked
+def get_over_budget_endpoints(cpu_micros_per_request: dict, budget_micros: float) -> list:
+    """Gets the endpoints of benchmark_request_overhead results whose CPU time per request exceeds the budget"""
+    return [endpoint for endpoint, cpu_micros in cpu_micros_per_request.items() if cpu_micros > budget_micros]
@@ -0,0 +1,64 @@
+"""
+Module containing prebuilt GET requests to the endpoints polled the most, so that each poll only formats the path
+parameters of its URL instead of rebuilding the request settings and re-validating them
+"""
+import threading
+
+from typeguard import typechecked
+
+from jenkify.utils.http_request_settings import HttpRequestSettings
+from jenkify.utils.jenkins.jekins_request_settings import JenkinsRequestSettings
+from jenkify.utils.json.JsonUtils import JsonUtils
+
+BUILD_API_JSON_PATH = '{}/{}/api/json'
+JOB_RUNS_SINCE_PATH = '{}/wfapi/runs?since=%23{}'
+RUN_DESCRIPTION_PATH = '{}/{}/wfapi/describe'
+
+_jenkins_request_templates: dict = {}
+_jenkins_request_templates_lock = threading.Lock()
+
+
+class JenkinsRequestTemplate:
+    """GET request to one endpoint of a host, with its URL prefix, validated retry count and settings built once"""
+    url_template: str
+    max_retry: int
+    http_request_settings: HttpRequestSettings
+
+    @typechecked
+    def __init__(self, jenkins_request_settings: JenkinsRequestSettings, path_template: str):
+        """
+        :param jenkins_request_settings: Settings of the host
+        :param path_template: Path of the endpoint below the host URL, with a {} placeholder per path parameter
+        :raises ValueError: if the host's max retry is invalid
+        """
+        JsonUtils.validate_max_retry(jenkins_request_settings.max_retry)
+        self.url_template = f'{jenkins_request_settings.url}/{path_template}'
+        self.max_retry = jenkins_request_settings.max_retry
+        self.http_request_settings = HttpRequestSettings(auth=jenkins_request_settings.auth)
+
+    def get_url(self, *path_params) -> str:
+        """Gets the URL of the request for the given path parameters"""
+        return self.url_template.format(*path_params)
+
+    def get_json(self, *path_params) -> dict | list:
+        """Gets the JSON response of the request for the given path parameters"""
+        return JsonUtils.get_json_response(self.url_template.format(*path_params),
+                                           self.max_retry,
+                                           self.http_request_settings)
+
+
+def get_jenkins_request_template(jenkins_request_settings: JenkinsRequestSettings,
+                                 path_template: str) -> JenkinsRequestTemplate:
+    """
+    Gets the shared request template of a host's endpoint, building it on first use.
+    Not @typechecked as it is looked up on every poll, JenkinsRequestTemplate checks its arguments when built
+    """
+    template_key = (jenkins_request_settings.url,
+                    jenkins_request_settings.auth,
+                    jenkins_request_settings.max_retry,
+                    path_template)
+    if (jenkins_request_template := _jenkins_request_templates.get(template_key, None)) is None:
+        jenkins_request_template = JenkinsRequestTemplate(jenkins_request_settings, path_template)
+        with _jenkins_request_templates_lock:
+            jenkins_request_template = _jenkins_request_templates.setdefault(template_key, jenkins_request_template)
+    return jenkins_request_template
@@ -0,0 +1,199 @@
+"""Module containing code for searching the console output of many builds concurrently"""
+import asyncio
+import functools
+import logging
+import re
+import threading
+from collections import deque
+from collections.abc import Iterable, Iterator
+
+import click
+import requests
+from typeguard import typechecked
+
+from jenkify.constants.jenkins_yaml import BUILD, HOSTS, JOBS, URL, END, BUILD_INDEX
+from jenkify.utils.environment.Environment import Environment
+from jenkify.utils.jenkins.jenkins_rest_api.jenkins_poll_status import (
+    DEFAULT_MAX_CONCURRENT_REQUESTS_PER_HOST,
+    run_host_request,
+)
+from jenkify.utils.jenkins.jenkins_rest_api.jenkins_utils import JenkinsUtils
+
+LOG_SEARCH_MATCH_SEPARATOR = ':'
+LOG_SEARCH_CONTEXT_SEPARATOR = '-'
+LOG_SEARCH_GROUP_SEPARATOR = '--'
+
+
+class LogSearchPrinter:
+    """Prints matched and context lines of concurrently searched logs without interleaving them mid-line"""
+    _print_lock: threading.Lock
+
+    def __init__(self):
+        self._print_lock = threading.Lock()
+
+    @typechecked
+    def print_line(self, build_label: str, line_number: int, separator: str, line: str) -> None:
+        """Prints a single line prefixed grep-style with its build and line number"""
+        with self._print_lock:
+            click.echo(f'{build_label}{separator}{line_number}{separator}{line}')
+
+    @typechecked
+    def print_group_separator(self) -> None:
+        """Prints the separator between non-contiguous groups of lines"""
+        with self._print_lock:
+            click.echo(LOG_SEARCH_GROUP_SEPARATOR)
+
+
+@typechecked
+def get_build_label(host_url: str, url_end: str, build_number: int) -> str:
+    """Gets the label printed in front of every line of a build's log"""
+    return f'{host_url}/{url_end}#{build_number}'
+
+
+@typechecked
+def search_log_lines(lines: Iterable,
+                     pattern: re.Pattern,
+                     build_label: str,
+                     context_lines: int,
+                     log_search_printer: LogSearchPrinter) -> int:
+    """
+    Matches a stream of log lines against a pattern, printing matches along with their context.
+    Only the context lines preceding the current line are held in memory
+    :param lines: Log lines (bytes or str) in order
+    :param pattern: Compiled regular expression searched for in each line
+    :param build_label: Label printed in front of every line
+    :param context_lines: Amount of lines printed before and after each match
+    :param log_search_printer: Printer shared by every concurrent search
+    :return: amount of matching lines
+    """
+    preceding_lines: deque = deque(maxlen=context_lines)
+    following_lines_remaining = 0
+    last_printed_line_number = 0
+    match_count = 0
+    for line_number, line in enumerate(lines, start=1):
+        if isinstance(line, bytes):
+            line = line.decode('utf-8', errors='replace')
+        if pattern.search(line) is not None:
+            match_count += 1
+            first_line_number = preceding_lines[0][0] if len(preceding_lines) > 0 else line_number
+            if 0 < last_printed_line_number < first_line_number - 1:
+                log_search_printer.print_group_separator()
+            for preceding_line_number, preceding_line in preceding_lines:
+                log_search_printer.print_line(build_label,
+                                              preceding_line_number,
+                                              LOG_SEARCH_CONTEXT_SEPARATOR,
+                                              preceding_line)
+            preceding_lines.clear()
+            log_search_printer.print_line(build_label, line_number, LOG_SEARCH_MATCH_SEPARATOR, line)
+            last_printed_line_number = line_number
+            following_lines_remaining = context_lines
+        elif following_lines_remaining > 0:
+            log_search_printer.print_line(build_label, line_number, LOG_SEARCH_CONTEXT_SEPARATOR, line)
+            last_printed_line_number = line_number
+            following_lines_remaining -= 1
+        elif context_lines > 0:
+            preceding_lines.append((line_number, line))
+    return match_count
+
+
+def iter_lines_until_cut_off(lines: Iterable, build_label: str) -> Iterator:
+    """
+    Passes a build's streamed log lines through, ending them early (with an error reporting how much of the log was
+    searched) if the stream is cut off mid-way, so that the lines read until then are still searched
+    :param lines: Log lines streamed from the build's console output
+    :param build_label: Label of the build, see get_build_label
+    :return: iterator over the lines read before the stream ended or was cut off
+    """
+    line_count = 0
+    try:
+        for line in lines:
+            yield line
+            line_count += 1
+    except requests.exceptions.ChunkedEncodingError as exception:
+        logging.error('Console output of %s was cut off mid-stream, only its first %s line(s) were searched: %s',
+                      build_label, line_count, exception)
+
+
+@typechecked
+def search_build_console_output(host_url: str,
+                                url_end: str,
+                                build_number: int,
+                                pattern: re.Pattern,
+                                *,
+                                context_lines: int,
+                                log_search_printer: LogSearchPrinter) -> int | None:
+    """
+    Streams the console output of a single build through the matcher
+    :return: amount of matching lines (in the part searched if the stream was cut off), or None if the console
+        output could not be fetched
+    """
+    response = JenkinsUtils(
+        Environment.get_jenkins_request_settings_for_host(host_url)
+    ).get_jenkins_build_console_output_stream(url_end, build_number)
+    if response is None:
+        logging.error('Could not get console output for %s #%s on %s!', url_end, build_number, host_url)
+        return None
+    build_label = get_build_label(host_url, url_end, build_number)
+    with response:
+        return search_log_lines(iter_lines_until_cut_off(response.iter_lines(), build_label),
+                                pattern,
+                                build_label,
+                                context_lines,
+                                log_search_printer)
+
+
+@typechecked
+def get_builds_to_search_from_tracking_dict(build_jobs_tracking_dict: dict) -> list:
+    """Gets the (host URL, URL end, build number) of every build in a tracking dict"""
+    return [(host[URL], job[END], job[BUILD_INDEX])
+            for host in build_jobs_tracking_dict[BUILD][HOSTS]
+            for job in host[JOBS]]
+
+
+@typechecked
+def get_builds_to_search_from_build_range(host_url: str, url_end: str, build_range: str) -> list:
+    """
+    Gets the (host URL, URL end, build number) of every build in an inclusive range
+    :param host_url: URL of the host the job lives on
+    :param url_end: URL end of the job
+    :param build_range: Single build number (e.g. 42) or inclusive range (e.g. 100-150)
+    :raises ValueError: if the build range is malformed
+    """
+    first_build_number, _, last_build_number = build_range.partition('-')
+    first_build_number = int(first_build_number)
+    last_build_number = int(last_build_number) if last_build_number != '' else first_build_number
+    if first_build_number > last_build_number:
+        raise ValueError(f'Build range {build_range} ends before it starts')
+    return [(host_url, url_end, build_number)
+            for build_number in range(first_build_number, last_build_number + 1)]
+
+
+@typechecked
+async def search_builds_console_output(
+        builds_to_search: list,
+        pattern: re.Pattern,
+        context_lines: int = 0,
+        max_concurrent_requests_per_host: int = DEFAULT_MAX_CONCURRENT_REQUESTS_PER_HOST) -> dict:
+    """
+    Searches the console output of many builds concurrently, each streamed line by line
+    :param builds_to_search: (host URL, URL end, build number) of each build to search
+    :param pattern: Compiled regular expression searched for in each line
+    :param context_lines: Amount of lines printed before and after each match
+    :param max_concurrent_requests_per_host: Maximum amount of logs streamed from a host at once
+    :return: dict mapping each searched build's label to its amount of matching lines (None if unavailable)
+    """
+    host_semaphores: dict = {}
+    for host_url, _, _ in builds_to_search:
+        host_semaphores.setdefault(host_url, asyncio.Semaphore(max_concurrent_requests_per_host))
+    search_build = functools.partial(search_build_console_output,
+                                     context_lines=context_lines,
+                                     log_search_printer=LogSearchPrinter())
+    match_counts = await asyncio.gather(*[run_host_request(host_semaphores[host_url],
+                                                           search_build,
+                                                           host_url,
+                                                           url_end,
+                                                           build_number,
+                                                           pattern)
+                                          for host_url, url_end, build_number in builds_to_search])
+    return {get_build_label(host_url, url_end, build_number): match_count
+            for (host_url, url_end, build_number), match_count in zip(builds_to_search, match_counts)}
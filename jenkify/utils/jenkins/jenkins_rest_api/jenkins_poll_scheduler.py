@@ -0,0 +1,139 @@
+"""
+Module containing a poll scheduler which keeps the next due time of every tracked job in a single timer heap,
+instead of one sleeping coroutine per job, and dispatches due polls in batches to a bounded pool of workers
+"""
+import asyncio
+import heapq
+import itertools
+import logging
+
+from typeguard import typechecked
+
+from jenkify.utils.request_deadline import get_request_deadline_remaining_seconds, is_request_deadline_exceeded
+
+DEFAULT_MAX_CONCURRENT_POLLS = 32
+
+
+class JenkinsPollScheduler:
+    """
+    Polls targets, each with an async poll() returning whether it is done, every interval until they are done.
+    Due times are fixed-rate (a slow poll does not push back the following ones) and missed polls are not caught up
+    """
+    _interval_seconds: float
+    _max_concurrent_polls: int
+    _due_polls: list
+    _sequence: itertools.count
+    _polls_in_flight: int
+    _done_polls: list
+    _poll_finished: asyncio.Event | None
+    _poll_exception: BaseException | None
+
+    @typechecked
+    def __init__(self, interval_seconds: float, max_concurrent_polls: int = DEFAULT_MAX_CONCURRENT_POLLS):
+        self._interval_seconds = interval_seconds
+        self._max_concurrent_polls = max_concurrent_polls
+        self._due_polls = []
+        self._sequence = itertools.count()
+        self._polls_in_flight = 0
+        self._done_polls = []
+        self._poll_finished = None
+        self._poll_exception = None
+
+    @typechecked
+    def schedule(self, poll_targets: list) -> None:
+        """Schedules the first polls of the targets spread evenly over one interval, to smooth the load on hosts"""
+        start_time = asyncio.get_running_loop().time()
+        spacing_seconds = self._interval_seconds / max(len(poll_targets), 1)
+        for poll_target_index, poll_target in enumerate(poll_targets):
+            heapq.heappush(self._due_polls, (start_time + spacing_seconds * poll_target_index,
+                                             next(self._sequence),
+                                             poll_target))
+
+    async def run(self, until_first_done: bool = False) -> list:
+        """
+        Dispatches due polls until every scheduled target is done, re-raising the first exception of a poll.
+        Stops early once the command's deadline has passed, leaving the targets which are not done as they are
+        :param until_first_done: Stop dispatching as soon as a target is done, letting the polls in flight finish so
+            that the targets which are not done stay scheduled for the next run (e.g. to schedule more targets)
+        :return: the targets done during this run, in the order they were done
+        """
+        self._poll_finished = asyncio.Event()
+        self._done_polls = []
+        ready_polls: asyncio.Queue = asyncio.Queue()
+        workers = [asyncio.create_task(self._run_worker(ready_polls))
+                   for _ in range(min(self._max_concurrent_polls, max(len(self._due_polls), 1)))]
+        loop = asyncio.get_running_loop()
+        try:
+            while len(self._due_polls) > 0 or self._polls_in_flight > 0:
+                if self._poll_exception is not None:
+                    raise self._poll_exception
+                remaining_seconds = get_request_deadline_remaining_seconds()
+                if remaining_seconds is not None and remaining_seconds <= 0:
+                    logging.error('Deadline reached with %s poll(s) scheduled and %s in flight, stopping polling!',
+                                  len(self._due_polls), self._polls_in_flight)
+                    break
+                stopping = until_first_done and len(self._done_polls) > 0
+                if stopping and self._polls_in_flight == 0:
+                    break
+                wait_seconds = None if stopping else self._dispatch_due_polls(ready_polls, loop.time())
+                self._poll_finished.clear()
+                if remaining_seconds is not None:
+                    wait_seconds = remaining_seconds if wait_seconds is None else min(wait_seconds, remaining_seconds)
+                try:
+                    await asyncio.wait_for(self._poll_finished.wait(), wait_seconds)
+                except asyncio.TimeoutError:
+                    pass
+            if self._poll_exception is not None:
+                raise self._poll_exception
+        finally:
+            for worker in workers:
+                worker.cancel()
+            await asyncio.gather(*workers, return_exceptions=True)
+        return self._done_polls
+
+    def _dispatch_due_polls(self, ready_polls: asyncio.Queue, now: float) -> float | None:
+        """
+        Hands every poll which is due to the workers
+        :return: seconds until the next poll is due, None if no poll is scheduled
+        """
+        due_poll_count = 0
+        while len(self._due_polls) > 0 and self._due_polls[0][0] <= now:
+            due_time, _, poll_target = heapq.heappop(self._due_polls)
+            ready_polls.put_nowait((due_time, poll_target))
+            due_poll_count += 1
+        if due_poll_count > 0:
+            self._polls_in_flight += due_poll_count
+            logging.debug('Dispatching %s due poll(s), %s scheduled',
+                          due_poll_count, len(self._due_polls))
+        return self._due_polls[0][0] - now if len(self._due_polls) > 0 else None
+
+    async def _run_worker(self, ready_polls: asyncio.Queue) -> None:
+        """Polls ready targets one at a time, rescheduling those which are not done yet"""
+        loop = asyncio.get_running_loop()
+        while True:
+            due_time, poll_target = await ready_polls.get()
+            try:
+                if not await poll_target.poll():
+                    heapq.heappush(self._due_polls, (max(due_time + self._interval_seconds, loop.time()),
+                                                     next(self._sequence),
+                                                     poll_target))
+                else:
+                    self._done_polls.append(poll_target)
+            except Exception as exception:  # pylint: disable=broad-exception-caught
+                self._poll_exception = exception
+            self._polls_in_flight -= 1
+            self._poll_finished.set()
+
+
+@typechecked
+async def run_poll_scheduler(poll_targets: list, interval_seconds: float) -> None:
+    """
+    Polls the targets from a single scheduler until every one of them is done.
+    Once the command's deadline has passed, the targets which are not done are timed out (see their time_out())
+    """
+    poll_scheduler = JenkinsPollScheduler(interval_seconds)
+    poll_scheduler.schedule(poll_targets)
+    await poll_scheduler.run()
+    if is_request_deadline_exceeded():
+        for poll_target in poll_targets:
+            poll_target.time_out()
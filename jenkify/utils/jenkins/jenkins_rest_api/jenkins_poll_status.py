@@ -4,15 +4,52 @@ import logging
 import os
 from http import HTTPStatus
 
-from requests import Response
 from typeguard import typechecked
 
-from jenkify.constants.jenkins_env import JENKINS_USER, JENKINS_TOKEN
-from jenkify.constants.jenkins_yaml import BUILD, HOSTS, JOBS, URL, END
+from jenkify.constants.jenkins_yaml import (
+    BUILD, HOSTS, JOBS, URL, END, BUILD_INDEX, USER_INPUT, STATUS, STAGES, SUBMITTED_INPUTS,
+)
+from jenkify.enums.build_events import BuildEventType
 from jenkify.enums.jenkins import JenkinsJobStatus
+from jenkify.exceptions.deadline_exceeded_exception import DeadlineExceededException
+from jenkify.exceptions.request_retry_exception import RequestRetryException
+from jenkify.utils.build_events import emit_build_event
+from jenkify.utils.environment.Environment import Environment
 from jenkify.utils.jenkins.jekins_request_settings import JenkinsRequestSettings
+from jenkify.utils.jenkins.jenkins_rest_api.jenkins_poll_scheduler import run_poll_scheduler
+from jenkify.utils.jenkins.jenkins_rest_api.jenkins_stage_progress import JenkinsStageProgressTracker
+from jenkify.utils.jenkins.jenkins_rest_api.jenkins_user_input_tracker import JenkinsUserInputTracker
 from jenkify.utils.jenkins.jenkins_rest_api.jenkins_utils import JenkinsUtils
+from jenkify.utils.jenkins.jenkins_wfapi.runs import (
+    WFAPI_RUN_FINISHED_STATUSES,
+    WFAPI_RUN_PAUSED_PENDING_INPUT,
+    get_job_runs_since_build_number,
+    get_run_description,
+    get_run_stage_statuses,
+)
 from jenkify.utils.logging_utils import logging_line_break
+from jenkify.utils.request_deadline import get_request_deadline_remaining_seconds, is_request_deadline_exceeded
+
+DEFAULT_MAX_CONCURRENT_REQUESTS_PER_HOST = 4
+MAX_FAILED_JOB_RUNS_POLLS = 10
+FAIL_FAST_STATUSES = (JenkinsJobStatus.FAILURE, JenkinsJobStatus.ABORTED)
+
+
+class BuildStatusCollector:
+    """Collects build statuses as builds finish and signals the first failure for fail-fast tracking"""
+    statuses: list
+    first_failure: asyncio.Event
+
+    def __init__(self):
+        self.statuses = []
+        self.first_failure = asyncio.Event()
+
+    @typechecked
+    def add(self, build_job_status: dict) -> None:
+        """Records a finished build's status dict"""
+        self.statuses.append(build_job_status)
+        if build_job_status['status'] in FAIL_FAST_STATUSES:
+            self.first_failure.set()
 
 
 @typechecked
@@ -25,123 +62,608 @@ async def update_build_jobs_tracking_dict(
             for job in host[JOBS]:
                 if (build_job_status['host'] == host[URL] and
                         build_job_status[END] == job[END] and
-                        build_job_status['build_number'] == job['build-index']):
-                    job['status'] = build_job_status['status'].name
+                        build_job_status['build_number'] == job[BUILD_INDEX]):
+                    job[STATUS] = build_job_status['status'].name
+                    if STAGES in build_job_status:
+                        job[STAGES] = build_job_status[STAGES]
+                    if len(build_job_status.get(SUBMITTED_INPUTS, [])) > 0:
+                        job[SUBMITTED_INPUTS] = build_job_status[SUBMITTED_INPUTS]
 
 
 @typechecked
-async def track_multiple_build_job_statuses(build_jobs_tracking_dict: dict):
-    """Tracks multiple build job statuses"""
-    url_combos: list[dict] = []
-    for host_index in range(len(build_jobs_tracking_dict[BUILD][HOSTS])):
-        host = build_jobs_tracking_dict[BUILD][HOSTS][host_index]
-        for job_index in range(len(build_jobs_tracking_dict[BUILD][HOSTS][host_index][JOBS])):
-            job = build_jobs_tracking_dict[BUILD][HOSTS][host_index][JOBS][job_index]
-            url_combos.append({
-                'host': host,
-                'job': {'end': job['end'], 'build-index': job['build-index'],
-                        'user-input': job.get('user-input', None)},
-            })
-    call_list = [poll_jenkins_job_for_desirable_status(
-        JenkinsRequestSettings(url_combo['host'][URL],
-                               (os.getenv(JENKINS_USER),
-                                os.getenv(JENKINS_TOKEN)),
-                               1),
-        url_combo['job']['end'],
-        url_combo['job']['build-index'],
-        url_combo['job'].get('user-input', None)
-    ) for url_combo in url_combos]
-    statuses: list = list(await asyncio.gather(*call_list))
-    await update_build_jobs_tracking_dict(statuses, build_jobs_tracking_dict)
+async def track_multiple_build_job_statuses(
+        build_jobs_tracking_dict: dict,
+        max_concurrent_requests_per_host: int = DEFAULT_MAX_CONCURRENT_REQUESTS_PER_HOST,
+        *,
+        fail_fast: bool = False,
+        abort_remaining: bool = False,
+        shared_failure_event=None,
+        stage_progress: bool = False):
+    """
+    Tracks multiple build job statuses, grouping the tracked builds of each job together.
+    The jobs are polled from a single scheduler, their first polls spread evenly over the poll interval
+    :param build_jobs_tracking_dict: Tracking dict (usually parsed from YAML), updated in place
+    :param max_concurrent_requests_per_host: Maximum amount of concurrent requests made to a host
+    :param fail_fast: Stop tracking as soon as any build fails or is aborted
+    :param abort_remaining: When failing fast, abort every build which has not finished yet
+    :param shared_failure_event: Event (e.g. multiprocessing) shared with other shards, set on and
+        checked for a failure so that every shard fails fast together
+    :type shared_failure_event: multiprocessing.managers.EventProxy | None
+    :param stage_progress: Report stage state changes of in-progress pipeline builds
+    Builds still running at the command's deadline, if any, are recorded as TIMEOUT
+    """
+    builds_to_track: dict[tuple[str, str], dict[int, list | None]] = {}
+    submitted_input_ids: dict[tuple[str, str], dict[int, list]] = {}
+    host_semaphores: dict[str, asyncio.Semaphore] = {}
+    for host in build_jobs_tracking_dict[BUILD][HOSTS]:
+        host_semaphores.setdefault(host[URL], asyncio.Semaphore(max_concurrent_requests_per_host))
+        for job in host[JOBS]:
+            builds_to_track.setdefault((host[URL], job[END]), {})[job[BUILD_INDEX]] = job.get(USER_INPUT, None)
+            submitted_input_ids.setdefault((host[URL], job[END]), {})[job[BUILD_INDEX]] = job.get(SUBMITTED_INPUTS, [])
+    build_status_collector = BuildStatusCollector()
+    stage_progress_tracker = JenkinsStageProgressTracker() if stage_progress else None
+    job_runs_polls = [JenkinsJobRunsPoll(
+        Environment.get_jenkins_request_settings_for_host(host_url),
+        url_end,
+        builds,
+        host_semaphore=host_semaphores[host_url],
+        user_input_tracker=JenkinsUserInputTracker(
+            JenkinsUtils(Environment.get_jenkins_request_settings_for_host(host_url)),
+            submitted_input_ids[(host_url, url_end)]),
+        build_status_collector=build_status_collector,
+        stage_progress_tracker=stage_progress_tracker,
+    ) for (host_url, url_end), builds in builds_to_track.items()]
+    poll_tasks = [asyncio.create_task(run_poll_scheduler(job_runs_polls, int(os.getenv('POLL_RATE_SECONDS'))))]
+    if fail_fast:
+        await wait_for_builds_or_first_failure(poll_tasks, build_status_collector, shared_failure_event)
+    else:
+        await asyncio.gather(*poll_tasks)
+    await update_build_jobs_tracking_dict(build_status_collector.statuses, build_jobs_tracking_dict)
+    if fail_fast and abort_remaining and build_status_collector.first_failure.is_set():
+        await abort_unfinished_builds(builds_to_track, build_status_collector, host_semaphores)
+        await update_build_jobs_tracking_dict(build_status_collector.statuses, build_jobs_tracking_dict)
+
+
+async def wait_for_builds_or_first_failure(poll_tasks: list,
+                                           build_status_collector: BuildStatusCollector,
+                                           shared_failure_event=None) -> None:
+    """Waits for every poll task to finish, cancelling the rest as soon as any build fails"""
+    poll_tasks_gathered = asyncio.gather(*poll_tasks)
+    first_failure_task = asyncio.create_task(build_status_collector.first_failure.wait())
+    shared_failure_task = asyncio.create_task(
+        watch_shared_failure_event(shared_failure_event, build_status_collector))
+    await asyncio.wait([poll_tasks_gathered, first_failure_task], return_when=asyncio.FIRST_COMPLETED)
+    if build_status_collector.first_failure.is_set():
+        logging.error('A build failed, failing fast and cancelling %s outstanding poll task(s)!',
+                      len([poll_task for poll_task in poll_tasks if not poll_task.done()]))
+        if shared_failure_event is not None:
+            shared_failure_event.set()
+        for poll_task in poll_tasks:
+            poll_task.cancel()
+    await asyncio.gather(poll_tasks_gathered, return_exceptions=True)
+    first_failure_task.cancel()
+    shared_failure_task.cancel()
+    await asyncio.gather(first_failure_task, shared_failure_task, return_exceptions=True)
+
+
+async def watch_shared_failure_event(shared_failure_event, build_status_collector: BuildStatusCollector) -> None:
+    """Relays a failure signalled by another shard to this shard's collector"""
+    if shared_failure_event is None:
+        return
+    while not build_status_collector.first_failure.is_set():
+        if shared_failure_event.is_set():
+            build_status_collector.first_failure.set()
+            return
+        await asyncio.sleep(1)
 
 
 @typechecked
-async def poll_jenkins_job_for_desirable_status(jenkins_request_settings: JenkinsRequestSettings,
-                                                url_end: str,
-                                                build_number: int,
-                                                user_input: list | None) -> dict:
-    """Polls jenkins job continuously for success or unstable status"""
-    jenkins_job_status: JenkinsJobStatus = JenkinsJobStatus.UNKNOWN
-    none_responses_count = 0
-    unknown_responses_count = 0
-    should_poll = True
-    while should_poll:
-        response_dict = JenkinsUtils().get_jenkins_build_dict_url_end_build_number(
+async def abort_unfinished_builds(builds_to_track: dict,
+                                  build_status_collector: BuildStatusCollector,
+                                  host_semaphores: dict) -> None:
+    """
+    Concurrently aborts every tracked build which has no status yet, recording it as ABORTED.
+    Builds which have not started yet are cancelled in the build queue instead
+    """
+    finished_builds = {(build_job_status['host'], build_job_status[END], build_job_status['build_number'])
+                       for build_job_status in build_status_collector.statuses}
+    unfinished_builds = [(host_url, url_end, build_number)
+                         for (host_url, url_end), builds in builds_to_track.items()
+                         for build_number in builds
+                         if (host_url, url_end, build_number) not in finished_builds]
+    if len(unfinished_builds) == 0:
+        return
+    logging.warning('Aborting %s unfinished build(s)...', len(unfinished_builds))
+    stop_status_codes = await asyncio.gather(*[run_host_request(
+        host_semaphores[host_url],
+        JenkinsUtils(Environment.get_jenkins_request_settings_for_host(host_url)).stop_jenkins_build_url_end,
+        url_end,
+        build_number,
+    ) for host_url, url_end, build_number in unfinished_builds])
+    aborted_builds = [unfinished_build for unfinished_build, stop_status_code
+                      in zip(unfinished_builds, stop_status_codes) if stop_status_code < 400]
+    queued_builds: dict[str, dict[str, list]] = {}
+    for (host_url, url_end, build_number), stop_status_code in zip(unfinished_builds, stop_status_codes):
+        if stop_status_code == HTTPStatus.NOT_FOUND:
+            queued_builds.setdefault(host_url, {}).setdefault(url_end, []).append(build_number)
+    for cancelled_builds in await asyncio.gather(*[
+            cancel_queued_builds(host_url, queued_job_builds, host_semaphores[host_url])
+            for host_url, queued_job_builds in queued_builds.items()]):
+        aborted_builds.extend(cancelled_builds)
+    for host_url, url_end, build_number in unfinished_builds:
+        if (host_url, url_end, build_number) not in aborted_builds:
+            logging.error('Failed to abort %s #%s on %s!', url_end, build_number, host_url)
+            continue
+        logging.info('Aborted %s #%s on %s', url_end, build_number, host_url)
+        build_status_collector.statuses.append({'host': host_url,
+                                                END: url_end,
+                                                'build_number': build_number,
+                                                'status': JenkinsJobStatus.ABORTED})
+        emit_build_event(BuildEventType.FINISHED,
+                         host_url,
+                         url_end,
+                         build_number,
+                         status=JenkinsJobStatus.ABORTED.name)
+
+
+@typechecked
+async def cancel_queued_builds(host_url: str,
+                               queued_job_builds: dict,
+                               host_semaphore: asyncio.Semaphore) -> list:
+    """
+    Cancels the queue items of builds which have not started yet. A queue item only gets its build number once it
+    leaves the queue, so a job's queue items are matched to its build numbers in order, oldest first
+    :param host_url: URL of the host
+    :param queued_job_builds: URL ends of jobs mapped to the build numbers which have not started yet
+    :param host_semaphore: Limits the number of concurrent requests made to the host
+    :return: list of (host URL, URL end, build number) of the cancelled builds
+    """
+    jenkins_utils = JenkinsUtils(Environment.get_jenkins_request_settings_for_host(host_url))
+    queue_dict = await run_host_request(host_semaphore, jenkins_utils.get_jenkins_queue_dict, 'items[id,task[url]]')
+    if queue_dict is None:
+        logging.error('Could not read the build queue of %s to cancel queued builds!', host_url)
+        return []
+    queued_builds = []
+    for url_end, build_numbers in queued_job_builds.items():
+        queue_item_ids = sorted(queue_item['id'] for queue_item in queue_dict.get('items', [])
+                                if queue_item['task']['url'].rstrip('/').endswith(f'/{url_end.strip("/")}'))
+        queued_builds.extend((url_end, build_number, queue_item_id)
+                             for build_number, queue_item_id in zip(sorted(build_numbers), queue_item_ids))
+    cancel_status_codes = await asyncio.gather(*[
+        run_host_request(host_semaphore, jenkins_utils.cancel_jenkins_queue_item, queue_item_id)
+        for _, _, queue_item_id in queued_builds])
+    return [(host_url, url_end, build_number)
+            for (url_end, build_number, _), cancel_status_code in zip(queued_builds, cancel_status_codes)
+            if cancel_status_code < 400]
+
+
+class JenkinsJobRunsPoll:
+    """
+    Polls every tracked build of a pipeline job with a single wfapi/runs request per poll.
+    Jobs without the wfapi endpoint (e.g. freestyle jobs) fall back to polling each build's api/json
+    """
+    statuses: list
+    _jenkins_request_settings: JenkinsRequestSettings
+    _url_end: str
+    _outstanding_builds: dict
+    _missing_run_polls: dict
+    _failed_polls_count: int
+    _host_semaphore: asyncio.Semaphore | None
+    _user_input_tracker: JenkinsUserInputTracker
+    _build_status_collector: BuildStatusCollector | None
+    _stage_progress_tracker: JenkinsStageProgressTracker | None
+    _build_polls: list | None
+
+    @typechecked
+    def __init__(self,
+                 jenkins_request_settings: JenkinsRequestSettings,
+                 url_end: str,
+                 builds: dict,
+                 *,
+                 host_semaphore: asyncio.Semaphore | None = None,
+                 user_input_tracker: JenkinsUserInputTracker | None = None,
+                 build_status_collector: BuildStatusCollector | None = None,
+                 stage_progress_tracker: JenkinsStageProgressTracker | None = None):
+        """
+        :param jenkins_request_settings: Settings of the host the job lives on
+        :param url_end: URL end of the job
+        :param builds: Build numbers to track mapped to their user input (or None)
+        :param host_semaphore: Limits the number of concurrent requests made to the host
+        :param user_input_tracker: Records the user input submitted for the job's builds
+        :param build_status_collector: Receives each build's status as soon as the build finishes
+        :param stage_progress_tracker: Reports the stage changes carried by each poll's runs, if set
+        """
+        self.statuses = []
+        self._jenkins_request_settings = jenkins_request_settings
+        self._url_end = url_end
+        self._outstanding_builds = dict(builds)
+        self._missing_run_polls = {}
+        self._failed_polls_count = 0
+        self._host_semaphore = host_semaphore
+        self._user_input_tracker = (user_input_tracker if user_input_tracker is not None
+                                    else JenkinsUserInputTracker(JenkinsUtils(jenkins_request_settings)))
+        self._build_status_collector = build_status_collector
+        self._stage_progress_tracker = stage_progress_tracker
+        self._build_polls = None
+
+    async def poll(self) -> bool:
+        """Polls the job's outstanding builds once and returns whether all of them have finished"""
+        if self._build_polls is not None:
+            return await self._poll_builds()
+        if len(self._outstanding_builds) == 0:
+            return True
+        try:
+            runs: list = await run_host_request(self._host_semaphore,
+                                                get_job_runs_since_build_number,
+                                                self._jenkins_request_settings,
+                                                self._url_end,
+                                                min(self._outstanding_builds))
+        except DeadlineExceededException:
+            return False
+        except RequestRetryException as exception:
+            if exception.status_code == HTTPStatus.NOT_FOUND:
+                logging.debug('wfapi/runs not found for %s, polling each build instead', self._url_end)
+                return await self._fall_back_to_build_polls()
+            return self._handle_failed_poll(exception)
+        self._failed_polls_count = 0
+        runs_by_build_number = {int(run['id']): run for run in runs}
+        missing_run_build_numbers = []
+        for build_number in sorted(self._outstanding_builds):
+            if (run := runs_by_build_number.get(build_number, None)) is None:
+                missing_run_build_numbers.append(build_number)
+            else:
+                await self._handle_run(build_number, run)
+        await asyncio.gather(*[self._poll_missing_run(build_number) for build_number in missing_run_build_numbers])
+        return len(self._outstanding_builds) == 0
+
+    def time_out(self) -> None:
+        """Records every build which has not finished yet as TIMEOUT, once the deadline has passed"""
+        if len(self._outstanding_builds) == 0:
+            return
+        if self._build_polls is not None:
+            for build_poll in self._build_polls:
+                build_poll.time_out()
+            self.statuses.extend(build_poll.build_job_status for build_poll in self._build_polls)
+        else:
+            for build_number in sorted(self._outstanding_builds):
+                logging.error('%s #%s is still running at the deadline, stopping polling!', self._url_end,
+                              build_number)
+                self._add_status({'host': self._jenkins_request_settings.url,
+                                  END: self._url_end,
+                                  'build_number': build_number,
+                                  'status': JenkinsJobStatus.TIMEOUT,
+                                  SUBMITTED_INPUTS: self._user_input_tracker.get_submitted_input_ids(build_number)})
+        self._outstanding_builds.clear()
+
+    async def _fall_back_to_build_polls(self) -> bool:
+        """Polls each outstanding build's api/json from now on, for jobs without the wfapi endpoint"""
+        self._build_polls = [JenkinsBuildPoll(self._jenkins_request_settings,
+                                              self._url_end,
+                                              build_number,
+                                              user_input,
+                                              host_semaphore=self._host_semaphore,
+                                              user_input_tracker=self._user_input_tracker,
+                                              build_status_collector=self._build_status_collector,
+                                              stage_progress_tracker=self._stage_progress_tracker)
+                             for build_number, user_input in self._outstanding_builds.items()]
+        return await self._poll_builds()
+
+    def _handle_failed_poll(self, exception: RequestRetryException) -> bool:
+        """
+        Handles a failed wfapi/runs request (e.g. a server error), giving up on the outstanding builds as UNKNOWN
+        after MAX_FAILED_JOB_RUNS_POLLS failed polls in a row
+        :return: whether polling has given up
+        """
+        self._failed_polls_count += 1
+        logging.warning('Could not poll wfapi/runs of %s (attempt #%s): %s',
+                        self._url_end, self._failed_polls_count, exception)
+        if self._failed_polls_count < MAX_FAILED_JOB_RUNS_POLLS:
+            return False
+        for build_number in sorted(self._outstanding_builds):
+            logging.error('Could not poll %s #%s for the last %s attempts, stopping polling!',
+                          self._url_end, build_number, self._failed_polls_count)
+            self._add_status({'host': self._jenkins_request_settings.url,
+                              END: self._url_end,
+                              'build_number': build_number,
+                              'status': JenkinsJobStatus.UNKNOWN,
+                              SUBMITTED_INPUTS: self._user_input_tracker.get_submitted_input_ids(build_number)})
+        self._outstanding_builds.clear()
+        return True
+
+    async def _poll_missing_run(self, build_number: int) -> None:
+        """
+        Polls the api/json of a build missing from the wfapi/runs response: it is either still queued, or has
+        fallen out of the window of recent runs wfapi/runs returns while running or once finished
+        """
+        logging.debug('No run of %s #%s in wfapi/runs, polling its api/json', self._url_end, build_number)
+        if (build_poll := self._missing_run_polls.get(build_number, None)) is None:
+            build_poll = JenkinsBuildPoll(self._jenkins_request_settings,
+                                          self._url_end,
+                                          build_number,
+                                          self._outstanding_builds[build_number],
+                                          host_semaphore=self._host_semaphore,
+                                          user_input_tracker=self._user_input_tracker,
+                                          build_status_collector=self._build_status_collector,
+                                          stage_progress_tracker=self._stage_progress_tracker)
+            self._missing_run_polls[build_number] = build_poll
+        if await build_poll.poll():
+            self.statuses.append(build_poll.build_job_status)
+            del self._outstanding_builds[build_number]
+            del self._missing_run_polls[build_number]
+
+    async def _handle_run(self, build_number: int, run: dict) -> None:
+        """Handles the run of a build: records it once finished, submits its user input while it is pending"""
+        url_end = self._url_end
+        jenkins_request_settings = self._jenkins_request_settings
+        self._missing_run_polls.pop(build_number, None)
+        if self._stage_progress_tracker is not None:
+            self._stage_progress_tracker.update(jenkins_request_settings.url,
+                                                url_end,
+                                                build_number,
+                                                run.get('stages', []))
+        if run[STATUS] in WFAPI_RUN_FINISHED_STATUSES:
+            jenkins_job_status = WFAPI_RUN_FINISHED_STATUSES[run[STATUS]]
+            logging.info('Polling for %s #%s complete with status %s!',
+                         url_end,
+                         build_number,
+                         jenkins_job_status)
+            self._add_status({'host': jenkins_request_settings.url,
+                              END: url_end,
+                              'build_number': build_number,
+                              'status': jenkins_job_status,
+                              STAGES: get_run_stage_statuses(run),
+                              SUBMITTED_INPUTS: self._user_input_tracker.get_submitted_input_ids(build_number)})
+            del self._outstanding_builds[build_number]
+            if self._stage_progress_tracker is not None:
+                self._stage_progress_tracker.forget(jenkins_request_settings.url, url_end, build_number)
+            return
+        emit_build_event(BuildEventType.STARTED, jenkins_request_settings.url, url_end, build_number)
+        if run[STATUS] == WFAPI_RUN_PAUSED_PENDING_INPUT:
+            await handle_pending_or_user_input_status(url_end,
+                                                      build_number,
+                                                      jenkins_request_settings,
+                                                      self._user_input_tracker,
+                                                      user_input=self._outstanding_builds[build_number],
+                                                      host_semaphore=self._host_semaphore,
+                                                      awaiting_input=True)
+        else:
+            logging.info('Continuing to poll %s #%s with status: %s...',
+                         url_end,
+                         build_number,
+                         run[STATUS])
+
+    async def _poll_builds(self) -> bool:
+        """Polls each unfinished build's api/json once and returns whether all of them have finished"""
+        await asyncio.gather(*[build_poll.poll() for build_poll in self._build_polls
+                               if build_poll.build_job_status is None])
+        if any(build_poll.build_job_status is None for build_poll in self._build_polls):
+            return False
+        self.statuses.extend(build_poll.build_job_status for build_poll in self._build_polls)
+        self._outstanding_builds.clear()
+        return True
+
+    def _add_status(self, build_job_status: dict) -> None:
+        """Records a finished build's status dict, passing it on to the collector and the event stream"""
+        self.statuses.append(build_job_status)
+        if self._build_status_collector is not None:
+            self._build_status_collector.add(build_job_status)
+        emit_build_event(BuildEventType.FINISHED,
+                         self._jenkins_request_settings.url,
+                         self._url_end,
+                         build_job_status['build_number'],
+                         status=build_job_status['status'].name)
+
+
+class JenkinsBuildPoll:
+    """Polls a single build's api/json for its result, submitting configured user input while it is running"""
+    build_job_status: dict | None
+    _jenkins_request_settings: JenkinsRequestSettings
+    _jenkins_utils: JenkinsUtils
+    _url_end: str
+    _build_number: int
+    _user_input: list | None
+    _host_semaphore: asyncio.Semaphore | None
+    _user_input_tracker: JenkinsUserInputTracker
+    _build_status_collector: BuildStatusCollector | None
+    _stage_progress_tracker: JenkinsStageProgressTracker | None
+    _inconclusive_responses_counts: dict[str | None, int]
+
+    @typechecked
+    def __init__(self,
+                 jenkins_request_settings: JenkinsRequestSettings,
+                 url_end: str,
+                 build_number: int,
+                 user_input: list | None,
+                 *,
+                 host_semaphore: asyncio.Semaphore | None = None,
+                 user_input_tracker: JenkinsUserInputTracker | None = None,
+                 build_status_collector: BuildStatusCollector | None = None,
+                 stage_progress_tracker: JenkinsStageProgressTracker | None = None):
+        self.build_job_status = None
+        self._jenkins_request_settings = jenkins_request_settings
+        self._jenkins_utils = JenkinsUtils(jenkins_request_settings)
+        self._url_end = url_end
+        self._build_number = build_number
+        self._user_input = user_input
+        self._host_semaphore = host_semaphore
+        self._user_input_tracker = (user_input_tracker if user_input_tracker is not None
+                                    else JenkinsUserInputTracker(self._jenkins_utils))
+        self._build_status_collector = build_status_collector
+        self._stage_progress_tracker = stage_progress_tracker
+        self._inconclusive_responses_counts = {None: 0, 'UNKNOWN': 0}
+
+    async def poll(self) -> bool:
+        """Polls the build once and returns whether it has finished (or polling has given up)"""
+        if self.build_job_status is not None:
+            return True
+        url_end = self._url_end
+        build_number = self._build_number
+        jenkins_request_settings = self._jenkins_request_settings
+        response_dict = await run_host_request(
+            self._host_semaphore,
+            self._jenkins_utils.get_jenkins_build_dict_url_end_build_number,
             url_end,
             build_number)
         if response_dict is None:
-            none_responses_count += 1
+            emit_build_event(BuildEventType.QUEUED, jenkins_request_settings.url, url_end, build_number)
+            self._inconclusive_responses_counts[None] += 1
             logging.debug('None response for %s #%s', url_end, build_number)
-            if none_responses_count >= 10:
+            if self._inconclusive_responses_counts[None] >= 10:
                 logging.info('None response for %s #%s '
                              'None Response #%s',
                              url_end,
                              build_number,
-                             none_responses_count)
-                jenkins_job_status = JenkinsJobStatus.UNKNOWN
+                             self._inconclusive_responses_counts[None])
                 logging.error(
                     'Result of %s #%s is None for the last '
                     '%s attempts, stopping polling!',
                     url_end,
                     build_number,
-                    none_responses_count)
-                break
+                    self._inconclusive_responses_counts[None])
+                return self._finish(JenkinsJobStatus.UNKNOWN)
             logging.info(
                 'Continuing to poll %s #%s with status None'
                 'response for attempt #%s',
                 url_end,
                 build_number,
-                (none_responses_count + 1))
-            await log_and_sleep(int(os.getenv('POLL_RATE_SECONDS')))
-        elif response_dict['result'] == 'SUCCESS':
-            # pylint: disable=redefined-variable-type
-            jenkins_job_status = handle_success_status(url_end, build_number)
-            break
-        elif response_dict['result'] == 'UNSTABLE':
-            jenkins_job_status = handle_unstable_status(url_end, build_number)
-            break
-        elif response_dict['result'] == 'UNKNOWN':
-            unknown_responses_count += 1
+                (self._inconclusive_responses_counts[None] + 1))
+            return False
+        if response_dict['result'] == 'SUCCESS':
+            return self._finish(handle_success_status(url_end, build_number))
+        if response_dict['result'] == 'UNSTABLE':
+            return self._finish(handle_unstable_status(url_end, build_number))
+        if response_dict['result'] == 'UNKNOWN':
+            self._inconclusive_responses_counts['UNKNOWN'] += 1
+            unknown_responses_count = self._inconclusive_responses_counts['UNKNOWN']
             logging.info('UNKNOWN for %s #%s', url_end, build_number)
             if unknown_responses_count >= 10:
-                handle_unknown_status_limit_reached(url_end, build_number, unknown_responses_count)
-                break
+                return self._finish(handle_unknown_status_limit_reached(url_end, build_number, unknown_responses_count))
             logging.info(
                 'Continuing to poll %s #%s with status '
                 'UNKNOWN for attempt #%s',
                 url_end,
                 build_number,
                 (unknown_responses_count + 1))
-            await log_and_sleep(int(os.getenv('POLL_RATE_SECONDS')))
-        elif response_dict['result'] == 'FAILURE':
-            jenkins_job_status = JenkinsJobStatus.FAILURE
+            return False
+        if response_dict['result'] in (JenkinsJobStatus.FAILURE.name, JenkinsJobStatus.ABORTED.name):
+            jenkins_job_status = JenkinsJobStatus[response_dict['result']]
             logging.error('Result of %s #%s'
                           'is %s, stopping polling!',
                           url_end,
                           build_number,
-                          JenkinsJobStatus.FAILURE)
+                          jenkins_job_status)
+            return self._finish(jenkins_job_status)
+        emit_build_event(BuildEventType.STARTED, jenkins_request_settings.url, url_end, build_number)
+        if self._stage_progress_tracker is not None:
+            self._stage_progress_tracker = await update_build_stage_progress(jenkins_request_settings,
+                                                                             url_end,
+                                                                             build_number,
+                                                                             self._host_semaphore,
+                                                                             self._stage_progress_tracker)
+        await handle_pending_or_user_input_status(url_end,
+                                                  build_number,
+                                                  jenkins_request_settings,
+                                                  self._user_input_tracker,
+                                                  user_input=self._user_input,
+                                                  host_semaphore=self._host_semaphore)
+        return False
+
+    def time_out(self) -> None:
+        """Records the build as TIMEOUT if it has not finished yet, once the deadline has passed"""
+        if self.build_job_status is None:
+            logging.error('%s #%s is still running at the deadline, stopping polling!', self._url_end,
+                          self._build_number)
+            self._finish(JenkinsJobStatus.TIMEOUT)
+
+    def _finish(self, jenkins_job_status: JenkinsJobStatus) -> bool:
+        """
+        Records the build's final status dict, passing it on to the collector and the event stream,
+        and drops its stage states
+        """
+        logging.info('Polling for %s #%s '
+                     'complete with status %s!',
+                     self._url_end,
+                     self._build_number,
+                     jenkins_job_status)
+        logging_line_break()
+        emit_build_event(BuildEventType.FINISHED,
+                         self._jenkins_request_settings.url,
+                         self._url_end,
+                         self._build_number,
+                         status=jenkins_job_status.name)
+        self.build_job_status = {'host': self._jenkins_request_settings.url,
+                                 END: self._url_end,
+                                 'build_number': self._build_number,
+                                 'status': jenkins_job_status,
+                                 SUBMITTED_INPUTS: self._user_input_tracker.get_submitted_input_ids(
+                                     self._build_number)}
+        if self._build_status_collector is not None:
+            self._build_status_collector.add(self.build_job_status)
+        if self._stage_progress_tracker is not None:
+            self._stage_progress_tracker.forget(self._jenkins_request_settings.url, self._url_end, self._build_number)
+        return True
+
+
+@typechecked
+async def poll_jenkins_job_for_desirable_status(jenkins_request_settings: JenkinsRequestSettings,
+                                                url_end: str,
+                                                build_number: int,
+                                                user_input: list | None,
+                                                *,
+                                                host_semaphore: asyncio.Semaphore | None = None,
+                                                user_input_tracker: JenkinsUserInputTracker | None = None,
+                                                build_status_collector: BuildStatusCollector | None = None,
+                                                stage_progress_tracker: JenkinsStageProgressTracker | None = None
+                                                ) -> dict:
+    """Polls jenkins job continuously for success or unstable status, until the deadline if there is one"""
+    build_poll = JenkinsBuildPoll(jenkins_request_settings,
+                                  url_end,
+                                  build_number,
+                                  user_input,
+                                  host_semaphore=host_semaphore,
+                                  user_input_tracker=user_input_tracker,
+                                  build_status_collector=build_status_collector,
+                                  stage_progress_tracker=stage_progress_tracker)
+    while not await build_poll.poll():
+        if is_request_deadline_exceeded():
+            build_poll.time_out()
             break
-        elif response_dict['result'] == 'ABORTED':
-            jenkins_job_status = JenkinsJobStatus.ABORTED
-            logging.error('Result of %s #%s'
-                          'is %s, stopping polling!',
-                          url_end,
-                          build_number,
-                          JenkinsJobStatus.ABORTED)
-        else:
-            await handle_pending_or_user_input_status(url_end, build_number, jenkins_request_settings, user_input)
-            await log_and_sleep(int(os.getenv('POLL_RATE_SECONDS')))
+        await log_and_sleep_until_deadline(int(os.getenv('POLL_RATE_SECONDS')))
+    return build_poll.build_job_status
+
+
+async def update_build_stage_progress(jenkins_request_settings: JenkinsRequestSettings,
+                                      url_end: str,
+                                      build_number: int,
+                                      host_semaphore: asyncio.Semaphore | None,
+                                      stage_progress_tracker: JenkinsStageProgressTracker
+                                      ) -> JenkinsStageProgressTracker | None:
+    """
+    Fetches wfapi/describe of an in-progress build and reports its stage changes
+    :return: the stage progress tracker, or None if the build has no stages to describe (e.g. a freestyle build)
+    """
+    try:
+        run_description = await run_host_request(host_semaphore,
+                                                 get_run_description,
+                                                 jenkins_request_settings,
+                                                 url_end,
+                                                 build_number)
+    except RequestRetryException:
+        logging.debug('wfapi/describe unavailable for %s #%s, not reporting stage progress', url_end, build_number)
+        return None
+    stage_progress_tracker.update(jenkins_request_settings.url,
+                                  url_end,
+                                  build_number,
+                                  run_description.get('stages', []))
+    return stage_progress_tracker
+
 
-    logging.info('Polling for %s #%s '
-                 'complete with status %s!',
-                 url_end,
-                 build_number,
-                 jenkins_job_status)
-    logging_line_break()
-    return {'host': jenkins_request_settings.url,
-            END: url_end,
-            'build_number': build_number,
-            'status': jenkins_job_status}
+async def run_host_request(host_semaphore: asyncio.Semaphore | None, request_function, *args):
+    """Runs a blocking request in a worker thread, bounded by the host's concurrency limit"""
+    if host_semaphore is None:
+        return await asyncio.to_thread(request_function, *args)
+    async with host_semaphore:
+        return await asyncio.to_thread(request_function, *args)
 
 
 async def log_and_sleep(seconds: int):
@@ -149,6 +671,12 @@ async def log_and_sleep(seconds: int):
     await asyncio.sleep(seconds)
 
 
+async def log_and_sleep_until_deadline(seconds: int):
+    """Sleeps for the given seconds, or only until the deadline if it is sooner"""
+    remaining_seconds = get_request_deadline_remaining_seconds()
+    await log_and_sleep(seconds if remaining_seconds is None else max(min(seconds, remaining_seconds), 0))
+
+
 @typechecked
 def handle_success_status(url_end: str, build_number: int) -> JenkinsJobStatus:
     logging.debug('Result of %s #%s is'
@@ -190,23 +718,38 @@ def handle_unknown_status_limit_reached(url_end: str, build_number: int,
 @typechecked
 async def handle_pending_or_user_input_status(url_end: str, build_number: int,
                                               jenkins_request_settings: JenkinsRequestSettings,
-                                              user_input: list | None = None):
-    if (user_input_status := JenkinsUtils().query_jenkins_job_for_user_input(url_end, build_number)) is not None:
-        if user_input is None:
-            logging.info('Awaiting input for %s',
-                         f'{jenkins_request_settings.url}/{url_end}/{build_number}/input')
+                                              user_input_tracker: JenkinsUserInputTracker,
+                                              *,
+                                              user_input: list | None = None,
+                                              host_semaphore: asyncio.Semaphore | None = None,
+                                              awaiting_input: bool = False):
+    """
+    Submits configured user input for a build which has not finished yet. Pending inputs are only
+    queried for builds with user input configured, and each input is only submitted once
+    """
+    if user_input is None:
+        if awaiting_input:
+            logging.info('Awaiting input for %s/%s/%s/input',
+                         jenkins_request_settings.url,
+                         url_end,
+                         build_number)
         else:
-            logging.info('Simulating input for %s',
-                         f'{url_end} #{build_number}')
-            input_simulation_response: Response = JenkinsUtils().simulate_jenkins_job_user_input(url_end,
-                                                                                                 build_number,
-                                                                                                 user_input_status[
-                                                                                                     'id'],
-                                                                                                 user_input)
-            if input_simulation_response is not None and input_simulation_response.status_code == HTTPStatus.OK:
-                logging.info('Input for %s simulated successfully!',
-                             f'{jenkins_request_settings.url}/{url_end}/{build_number}/input')
-    else:
+            logging.info('Continuing to poll %s #%s with status: PENDING...',
+                         url_end,
+                         build_number)
+        return
+    submitted_input_ids = await run_host_request(host_semaphore,
+                                                 user_input_tracker.submit_pending_user_input,
+                                                 url_end,
+                                                 build_number,
+                                                 user_input)
+    for submitted_input_id in submitted_input_ids:
+        emit_build_event(BuildEventType.INPUT_SUBMITTED,
+                         jenkins_request_settings.url,
+                         url_end,
+                         build_number,
+                         input_id=submitted_input_id)
+    if len(submitted_input_ids) == 0:
         logging.info('Continuing to poll %s #%s with status: PENDING...',
                      url_end,
                      build_number)
@@ -0,0 +1,111 @@
+"""Module containing code for tracking build job statuses sharded by host across processes"""
+import asyncio
+import copy
+import functools
+import logging
+import multiprocessing
+from concurrent.futures import ProcessPoolExecutor
+
+from typeguard import typechecked
+
+from jenkify.constants.jenkins_yaml import BUILD, HOSTS, JOBS
+from jenkify.utils.build_events import get_build_event_stream, open_build_event_stream
+from jenkify.utils.jenkins.jenkins_rest_api.jenkins_poll_status import (
+    DEFAULT_MAX_CONCURRENT_REQUESTS_PER_HOST,
+    track_multiple_build_job_statuses,
+)
+from jenkify.utils.request_coalescing import log_request_coalescing_stats
+from jenkify.utils.request_deadline import get_request_deadline_remaining_seconds, start_request_deadline
+from jenkify.utils.request_hedging import (
+    RequestHedgingPolicy,
+    get_request_hedging_policy,
+    log_request_hedging_stats,
+    start_request_hedging,
+)
+
+
+@typechecked
+def split_build_jobs_tracking_dict_by_host(build_jobs_tracking_dict: dict, shard_count: int) -> list:
+    """
+    Splits the hosts of a tracking dict into at most shard_count shards, balanced by job count.
+    Each host is kept whole so that its concurrency limit can be enforced within a single shard
+    :param build_jobs_tracking_dict: Tracking dict (usually parsed from YAML)
+    :param shard_count: Maximum amount of shards to create
+    :return: list of shards, each a list of (host index, host) tuples
+    """
+    shards: list = [[] for _ in range(shard_count)]
+    shard_job_counts: list = [0] * shard_count
+    hosts = build_jobs_tracking_dict[BUILD][HOSTS]
+    for host_index in sorted(range(len(hosts)), key=lambda index: len(hosts[index][JOBS]), reverse=True):
+        least_loaded_shard_index = shard_job_counts.index(min(shard_job_counts))
+        shards[least_loaded_shard_index].append((host_index, hosts[host_index]))
+        shard_job_counts[least_loaded_shard_index] += len(hosts[host_index][JOBS])
+    return [shard for shard in shards if len(shard) > 0]
+
+
+def track_build_jobs_tracking_shard(shard: list,
+                                    max_concurrent_requests_per_host: int,
+                                    *,
+                                    events_output: str | None = None,
+                                    fail_fast: bool = False,
+                                    abort_remaining: bool = False,
+                                    shared_failure_event=None,
+                                    stage_progress: bool = False,
+                                    deadline_seconds: float | None = None,
+                                    request_hedging_policy: RequestHedgingPolicy | None = None) -> list:
+    """Tracks the hosts of a single shard on the event loop of the current (worker) process"""
+    if events_output is not None:
+        open_build_event_stream(events_output, append=True)
+    start_request_deadline(deadline_seconds)
+    start_request_hedging(request_hedging_policy)
+    shard_tracking_dict = {BUILD: {HOSTS: [host for _, host in shard]}}
+    asyncio.run(track_multiple_build_job_statuses(shard_tracking_dict,
+                                                  max_concurrent_requests_per_host,
+                                                  fail_fast=fail_fast,
+                                                  abort_remaining=abort_remaining,
+                                                  shared_failure_event=shared_failure_event,
+                                                  stage_progress=stage_progress))
+    log_request_coalescing_stats()
+    if request_hedging_policy is not None:
+        log_request_hedging_stats()
+    return [(host_index, host) for (host_index, _), host in zip(shard, shard_tracking_dict[BUILD][HOSTS])]
+
+
+@typechecked
+def track_multiple_build_job_statuses_sharded(
+        build_jobs_tracking_dict: dict,
+        shard_count: int,
+        max_concurrent_requests_per_host: int = DEFAULT_MAX_CONCURRENT_REQUESTS_PER_HOST,
+        *,
+        fail_fast: bool = False,
+        abort_remaining: bool = False,
+        stage_progress: bool = False) -> None:
+    """
+    Tracks multiple build job statuses across a process pool and merges the results in place.
+    When failing fast, a failure in any shard stops every shard. Every shard stops at the command's deadline and
+    hedges the command's requests, if it does
+    """
+    shards = split_build_jobs_tracking_dict_by_host(copy.deepcopy(build_jobs_tracking_dict), shard_count)
+    if len(shards) == 0:
+        return
+    logging.info('Tracking %s host(s) across %s process(es)...',
+                 len(build_jobs_tracking_dict[BUILD][HOSTS]),
+                 len(shards))
+    build_event_stream = get_build_event_stream()
+    events_output = build_event_stream.output_path if build_event_stream is not None else None
+    deadline_seconds = get_request_deadline_remaining_seconds()
+    request_hedging_policy = get_request_hedging_policy()
+    with multiprocessing.Manager() as manager, ProcessPoolExecutor(max_workers=len(shards)) as executor:
+        shared_failure_event = manager.Event() if fail_fast else None
+        track_shard = functools.partial(track_build_jobs_tracking_shard,
+                                        max_concurrent_requests_per_host=max_concurrent_requests_per_host,
+                                        events_output=events_output,
+                                        fail_fast=fail_fast,
+                                        abort_remaining=abort_remaining,
+                                        shared_failure_event=shared_failure_event,
+                                        stage_progress=stage_progress,
+                                        deadline_seconds=deadline_seconds,
+                                        request_hedging_policy=request_hedging_policy)
+        for tracked_shard in executor.map(track_shard, shards):
+            for host_index, host in tracked_shard:
+                build_jobs_tracking_dict[BUILD][HOSTS][host_index] = host
@@ -0,0 +1,60 @@
+"""Module containing code for reporting stage-level progress of in-progress pipeline builds"""
+import logging
+
+from typeguard import typechecked
+
+from jenkify.enums.build_events import BuildEventType
+from jenkify.utils.build_events import emit_build_event
+
+WFAPI_STAGE_FINISHED_STATUSES = ('SUCCESS', 'UNSTABLE', 'FAILED', 'ABORTED', 'NOT_EXECUTED')
+
+
+class JenkinsStageProgressTracker:
+    """Remembers the stage states of tracked builds between polls and reports only the stages which changed"""
+    _stage_statuses: dict
+
+    def __init__(self):
+        self._stage_statuses = {}
+
+    @typechecked
+    def update(self, host_url: str, url_end: str, build_number: int, stages: list) -> list:
+        """
+        Diffs the stages of a wfapi run (or describe) against the previous poll, logging and emitting each change.
+        Finished stages are reported once and never again
+        :param host_url: URL of the host the job lives on
+        :param url_end: URL end of the job
+        :param build_number: Build number of the job
+        :param stages: wfapi stages, each with at least a name and status
+        :return: list of the stages which changed since the previous poll
+        """
+        stage_statuses = self._stage_statuses.setdefault((host_url, url_end, build_number), {})
+        changed_stages = [stage for stage in stages
+                          if stage_statuses.get(stage.get('id', stage['name']), None) not in
+                          (stage['status'], *WFAPI_STAGE_FINISHED_STATUSES)]
+        for stage in changed_stages:
+            stage_statuses[stage.get('id', stage['name'])] = stage['status']
+        finished_stage_count = len([stage_status for stage_status in stage_statuses.values()
+                                    if stage_status in WFAPI_STAGE_FINISHED_STATUSES])
+        for stage in changed_stages:
+            logging.info('Stage %s of %s #%s is %s (%s/%s stages finished)',
+                         stage['name'],
+                         url_end,
+                         build_number,
+                         stage['status'],
+                         finished_stage_count,
+                         len(stage_statuses))
+            emit_build_event(BuildEventType.STAGE,
+                             host_url,
+                             url_end,
+                             build_number,
+                             stage=stage['name'],
+                             status=stage['status'],
+                             duration_millis=stage.get('durationMillis', None),
+                             finished_stages=finished_stage_count,
+                             known_stages=len(stage_statuses))
+        return changed_stages
+
+    @typechecked
+    def forget(self, host_url: str, url_end: str, build_number: int) -> None:
+        """Drops the stage states of a build once it has finished"""
+        self._stage_statuses.pop((host_url, url_end, build_number), None)
@@ -0,0 +1,74 @@
+"""Module containing code for tracking and submitting pipeline build user input"""
+import logging
+import threading
+
+from typeguard import typechecked
+
+from jenkify.constants.jenkins_yaml import ID
+from jenkify.utils.jenkins.jenkins_rest_api.jenkins_utils import JenkinsUtils
+
+
+class JenkinsUserInputTracker:
+    """
+    Submits the configured user input of a job's builds, each pending input exactly once,
+    and records which inputs have been submitted
+    """
+    _jenkins_utils: JenkinsUtils
+    _submitted_input_ids: dict[int, list]
+
+    def __init__(self, jenkins_utils: JenkinsUtils, submitted_input_ids: dict | None = None):
+        self._jenkins_utils = jenkins_utils
+        self._submitted_input_ids = {build_number: list(input_ids)
+                                     for build_number, input_ids in (submitted_input_ids or {}).items()}
+        self._submitted_input_ids_lock = threading.Lock()
+
+    @typechecked
+    def get_submitted_input_ids(self, build_number: int) -> list:
+        """Gets the ids of the inputs submitted so far for the build"""
+        with self._submitted_input_ids_lock:
+            return list(self._submitted_input_ids.get(build_number, []))
+
+    @staticmethod
+    def get_user_input_for_pending_input_action(pending_input_action_id: str, user_input: list) -> list:
+        """
+        Gets the configured user input elements for a pending input. Jenkins capitalises input ids,
+        so ids are compared case-insensitively. Without a matching id every element is used
+        """
+        matching_user_input = [user_input_element for user_input_element in user_input
+                               if str(user_input_element.get(ID, '')).casefold() == pending_input_action_id.casefold()]
+        return matching_user_input if len(matching_user_input) > 0 else user_input
+
+    @typechecked
+    def submit_pending_user_input(self, url_end: str, build_number: int, user_input: list) -> list:
+        """
+        Submits configured input for every input the build is waiting for which was not submitted yet
+        :param url_end: URL end of the job
+        :param build_number: Build number of the build awaiting input
+        :param user_input: Configured user input elements of the job
+        :return: ids of the inputs submitted by this call
+        """
+        pending_input_actions = self._jenkins_utils.get_jenkins_build_pending_input_actions(url_end, build_number)
+        submitted_input_ids = []
+        for pending_input_action in pending_input_actions or []:
+            if (pending_input_action_id := pending_input_action[ID]) in self.get_submitted_input_ids(build_number):
+                continue
+            logging.info('Simulating input %s for %s #%s', pending_input_action_id, url_end, build_number)
+            if self._jenkins_utils.simulate_jenkins_job_user_input(
+                    url_end,
+                    build_number,
+                    pending_input_action_id,
+                    self.get_user_input_for_pending_input_action(pending_input_action_id, user_input),
+            ) is None:
+                logging.error('Failed to simulate input %s for %s #%s',
+                              pending_input_action_id,
+                              url_end,
+                              build_number)
+                continue
+            logging.info('Input %s for %s #%s simulated successfully!',
+                         pending_input_action_id,
+                         url_end,
+                         build_number)
+            with self._submitted_input_ids_lock:
+                self._submitted_input_ids.setdefault(build_number, []).append(pending_input_action_id)
+            submitted_input_ids.append(pending_input_action_id)
+        return submitted_input_ids
@@ -13,6 +13,8 @@ from jenkify.types.jenkins_responses.rest_api.build_api_json import BuildApiJson
 from jenkify.utils.environment.Environment import Environment
 from jenkify.utils.http_request_settings import HttpRequestSettings
 from jenkify.utils.jenkins.jekins_request_settings import JenkinsRequestSettings
+from jenkify.utils.jenkins.jenkins_crumbs import request_with_jenkins_crumb
+from jenkify.utils.jenkins.jenkins_request_templates import BUILD_API_JSON_PATH, get_jenkins_request_template
 from jenkify.utils.json.JsonUtils import JsonUtils
 from jenkify.utils.request_retry import request_retry
 
@@ -73,6 +75,25 @@ class JenkinsUtils:
                              HttpRequestSettings(auth=self._jenkins_request_settings.auth)
                              ).text
 
+    @typechecked
+    def get_jenkins_build_console_output_stream(
+            self,
+            url_end: str,
+            build_number: int) -> Response | None:
+        """
+        Opens the console output of a specific job's build without reading it into memory,
+        the caller iterates over and closes the response
+        """
+        JsonUtils.validate_max_retry(self._jenkins_request_settings.max_retry)
+        try:
+            return request_retry(HttpRequestMethod.GET,
+                                 f'{self._jenkins_request_settings.url}/{url_end}/{build_number}'
+                                 '/logText/progressiveText?start=0',
+                                 self._jenkins_request_settings.max_retry,
+                                 HttpRequestSettings(auth=self._jenkins_request_settings.auth, stream=True))
+        except RequestRetryException:
+            return None
+
     @typechecked
     def get_jenkins_build_dict(
             self,
@@ -92,18 +113,133 @@ class JenkinsUtils:
     def get_jenkins_build_dict_url_end(
             self,
             url_end: str,
+            tree: str | None = None,
     ) -> dict | None:
-        """Gets Jenkins job JSON data for a specific job's build based on URL ending"""
+        """
+        Gets Jenkins job JSON data for a specific job's build based on URL ending
+        :param url_end: URL end of the build
+        :param tree: Tree projection of the fields to get, every field if None
+        :return: build dict, None if it could not be fetched
+        """
         JsonUtils.validate_max_retry(self._jenkins_request_settings.max_retry)
         try:
             response_dict = self._get_json_response(
-                f'{self._jenkins_request_settings.url}/{url_end}/api/json',
+                f'{self._jenkins_request_settings.url}/{url_end}/api/json{f'?tree={tree}' if tree is not None else ''}',
                 self._jenkins_request_settings.max_retry,
                 HttpRequestSettings(auth=self._jenkins_request_settings.auth))
             return response_dict
         except RequestRetryException:
             return None
 
+    @typechecked
+    def get_jenkins_job_latest_builds_dict(
+            self,
+            url_end: str,
+            build_count: int = 1,
+    ) -> dict | None:
+        """Gets only the numbers of a job's latest builds based on URL ending, instead of every build's data"""
+        JsonUtils.validate_max_retry(self._jenkins_request_settings.max_retry)
+        try:
+            return self._get_json_response(
+                f'{self._jenkins_request_settings.url}/{url_end}/api/json'
+                f'?tree=builds[number]{{0,{build_count}}}',
+                self._jenkins_request_settings.max_retry,
+                HttpRequestSettings(auth=self._jenkins_request_settings.auth))
+        except RequestRetryException:
+            return None
+
+    @typechecked
+    def get_jenkins_job_reusable_builds_dict(
+            self,
+            url_end: str,
+            build_count: int,
+    ) -> dict | None:
+        """
+        Gets a job's parameter defaults and its latest builds' results, parameters and built SCM revisions (per
+        branch) based on URL ending, for finding a build which can be reused instead of starting a new one
+        """
+        JsonUtils.validate_max_retry(self._jenkins_request_settings.max_retry)
+        try:
+            return self._get_json_response(
+                f'{self._jenkins_request_settings.url}/{url_end}/api/json'
+                '?tree=property[parameterDefinitions[name,defaultParameterValue[value]]],'
+                'builds[number,result,building,timestamp,'
+                f'actions[parameters[name,value],lastBuiltRevision[SHA1,branch[name]]]]{{0,{build_count}}}',
+                self._jenkins_request_settings.max_retry,
+                HttpRequestSettings(auth=self._jenkins_request_settings.auth))
+        except RequestRetryException:
+            return None
+
+    @typechecked
+    def get_jenkins_job_build_history_page_dict(
+            self,
+            url_end: str,
+            start_index: int,
+            end_index: int,
+    ) -> dict | None:
+        """
+        Gets the number, result, timestamp and duration of a page of a job's builds based on URL ending, newest first
+        :param url_end: URL end of the job
+        :param start_index: Index of the page's first build, 0 being the newest build
+        :param end_index: Index after the page's last build
+        :return: dict of the job's allBuilds page, None if it could not be fetched
+        """
+        JsonUtils.validate_max_retry(self._jenkins_request_settings.max_retry)
+        try:
+            return self._get_json_response(
+                f'{self._jenkins_request_settings.url}/{url_end}/api/json'
+                f'?tree=allBuilds[number,result,timestamp,duration,building]{{{start_index},{end_index}}}',
+                self._jenkins_request_settings.max_retry,
+                HttpRequestSettings(auth=self._jenkins_request_settings.auth))
+        except RequestRetryException:
+            return None
+
+    @typechecked
+    def get_jenkins_folder_jobs_dict(
+            self,
+            folder_url_end: str,
+            jobs_tree: str,
+    ) -> dict | None:
+        """Gets the (nested) jobs of a folder based on URL ending ('' for the host's root) and a tree projection"""
+        JsonUtils.validate_max_retry(self._jenkins_request_settings.max_retry)
+        folder_url = (f'{self._jenkins_request_settings.url}/{folder_url_end}' if folder_url_end != ''
+                      else self._jenkins_request_settings.url)
+        try:
+            return self._get_json_response(
+                f'{folder_url}/api/json?tree={jobs_tree}',
+                self._jenkins_request_settings.max_retry,
+                HttpRequestSettings(auth=self._jenkins_request_settings.auth))
+        except RequestRetryException:
+            return None
+
+    @typechecked
+    def get_jenkins_computer_set_dict(self) -> dict | None:
+        """Gets the busy and total executor counts across all of the Jenkins host's nodes"""
+        JsonUtils.validate_max_retry(self._jenkins_request_settings.max_retry)
+        try:
+            return self._get_json_response(
+                f'{self._jenkins_request_settings.url}/computer/api/json?tree=busyExecutors,totalExecutors',
+                self._jenkins_request_settings.max_retry,
+                HttpRequestSettings(auth=self._jenkins_request_settings.auth))
+        except RequestRetryException:
+            return None
+
+    @typechecked
+    def get_jenkins_queue_dict(self, tree: str = 'items[id]') -> dict | None:
+        """
+        Gets the items currently waiting in the Jenkins host's build queue
+        :param tree: Projection of the queue, only the ids of its items by default
+        :return: queue dict, None if it could not be fetched
+        """
+        JsonUtils.validate_max_retry(self._jenkins_request_settings.max_retry)
+        try:
+            return self._get_json_response(
+                f'{self._jenkins_request_settings.url}/queue/api/json?tree={tree}',
+                self._jenkins_request_settings.max_retry,
+                HttpRequestSettings(auth=self._jenkins_request_settings.auth))
+        except RequestRetryException:
+            return None
+
     @typechecked
     def query_jenkins_job_for_user_input(self,
                                          url_end: str,
@@ -120,6 +256,22 @@ class JenkinsUtils:
         except RequestRetryException:
             return None
 
+    @typechecked
+    def get_jenkins_build_pending_input_actions(self,
+                                                url_end: str,
+                                                build_number: int) -> list | None:
+        """Gets every input a pipeline build is currently waiting for"""
+        JsonUtils.validate_max_retry(self._jenkins_request_settings.max_retry)
+        try:
+            return self._get_json_response(
+                f'{self._jenkins_request_settings.url}/{url_end}/{build_number}'
+                '/wfapi/pendingInputActions',
+                self._jenkins_request_settings.max_retry,
+                HttpRequestSettings(auth=self._jenkins_request_settings.auth)
+            )
+        except RequestRetryException:
+            return None
+
     @typechecked
     def simulate_jenkins_job_user_input(self,
                                         url_end: str,
@@ -135,35 +287,66 @@ class JenkinsUtils:
                 user_input_params_list.append({'name': name, 'value': value})
 
         try:
-            response = request_retry(HttpRequestMethod.POST,
-                                     f'{self._jenkins_request_settings.url}/{url_end}/{build_number}'
-                                     f'/wfapi/inputSubmit?'
-                                     f'{urlencode(OrderedDict(inputId=user_input_id))}',
-                                     self._jenkins_request_settings.max_retry,
-                                     HttpRequestSettings(auth=self._jenkins_request_settings.auth,
-                                                         content_type='application/x-www-form-urlencoded',
-                                                         data={'json': {
-                                                             json.dumps({'parameter': user_input_params_list})}})
-                                     )
+            response = request_with_jenkins_crumb(self._jenkins_request_settings,
+                                                  HttpRequestMethod.POST,
+                                                  f'{self._jenkins_request_settings.url}/{url_end}/{build_number}'
+                                                  f'/wfapi/inputSubmit?'
+                                                  f'{urlencode(OrderedDict(inputId=user_input_id))}',
+                                                  content_type='application/x-www-form-urlencoded',
+                                                  data={'json': {
+                                                      json.dumps({'parameter': user_input_params_list})}})
             return response
         except RequestRetryException:
             return None
 
-    @typechecked
     def get_jenkins_build_dict_url_end_build_number(
             self,
             url_end: str,
             build_number: int,
     ) -> dict | None:
-        """Gets Jenkins job JSON data based on URL end and build number"""
+        """
+        Gets Jenkins job JSON data based on URL end and build number, through the host's prebuilt request.
+        Not @typechecked as it is requested on every poll of a build
+        """
+        build_api_json_request = get_jenkins_request_template(self._jenkins_request_settings, BUILD_API_JSON_PATH)
+        try:
+            return self._get_json_response(build_api_json_request.get_url(url_end, build_number),
+                                           build_api_json_request.max_retry,
+                                           build_api_json_request.http_request_settings)
+        except RequestRetryException:
+            return None
+
+    @typechecked
+    def get_jenkins_build_test_counts_dict(
+            self,
+            url_end: str,
+            build_number: int,
+    ) -> dict | None:
+        """Gets only the test counts of a build's actions (those of its test result action, if any)"""
         JsonUtils.validate_max_retry(self._jenkins_request_settings.max_retry)
         try:
-            response_dict = self._get_json_response(
+            return self._get_json_response(
                 f'{self._jenkins_request_settings.url}/{url_end}/{build_number}'
-                '/api/json',
+                '/api/json?tree=actions[_class,failCount,skipCount,totalCount]',
+                self._jenkins_request_settings.max_retry,
+                HttpRequestSettings(auth=self._jenkins_request_settings.auth))
+        except RequestRetryException:
+            return None
+
+    @typechecked
+    def get_jenkins_build_test_report_dict(
+            self,
+            url_end: str,
+            build_number: int,
+    ) -> dict | None:
+        """Gets the test cases of a build's test report, projected to their identity, status and error details"""
+        JsonUtils.validate_max_retry(self._jenkins_request_settings.max_retry)
+        try:
+            return self._get_json_response(
+                f'{self._jenkins_request_settings.url}/{url_end}/{build_number}'
+                '/testReport/api/json?tree=suites[name,cases[className,name,status,duration,errorDetails]]',
                 self._jenkins_request_settings.max_retry,
                 HttpRequestSettings(auth=self._jenkins_request_settings.auth))
-            return response_dict
         except RequestRetryException:
             return None
 
@@ -174,10 +357,9 @@ class JenkinsUtils:
     ) -> Response:
         """Kicks off a build for specified Jenkins job based on job name"""
         JsonUtils.validate_max_retry(self._jenkins_request_settings.max_retry)
-        return request_retry(HttpRequestMethod.POST,
-                             f'{self._jenkins_request_settings.url}/job/{job_name}/build?delay=0sec',
-                             self._jenkins_request_settings.max_retry,
-                             HttpRequestSettings(auth=self._jenkins_request_settings.auth))
+        return request_with_jenkins_crumb(self._jenkins_request_settings,
+                                          HttpRequestMethod.POST,
+                                          f'{self._jenkins_request_settings.url}/job/{job_name}/build?delay=0sec')
 
     @typechecked
     def start_jenkins_build_url_end(
@@ -186,17 +368,68 @@ class JenkinsUtils:
             build_parameters: dict | None = None,
     ) -> int:
         """Kicks off a build for a specified Jenkins job based on URL ending"""
+        response = self.trigger_jenkins_build_url_end(url_end, build_parameters)
+        return response.status_code if response is not None else 500
+
+    @typechecked
+    def trigger_jenkins_build_url_end(
+            self,
+            url_end: str,
+            build_parameters: dict | None = None,
+    ) -> Response | None:
+        """Kicks off a build for a specified Jenkins job based on URL ending, its Location header is the queue item"""
         JsonUtils.validate_max_retry(self._jenkins_request_settings.max_retry)
         initial_url = f'{self._jenkins_request_settings.url}/{url_end}'
         query_string = f'?{urlencode(build_parameters)}' if build_parameters else ''
         try:
-            status_code = request_retry(HttpRequestMethod.POST,
-                                        f'{initial_url}/'
-                                        f'{'build' if query_string == '' else 'buildWithParameters'}'
-                                        f'{query_string}',
-                                        self._jenkins_request_settings.max_retry,
-                                        HttpRequestSettings(auth=self._jenkins_request_settings.auth)
-                                        ).status_code
-            return status_code
+            return request_with_jenkins_crumb(self._jenkins_request_settings,
+                                              HttpRequestMethod.POST,
+                                              f'{initial_url}/'
+                                              f'{'build' if query_string == '' else 'buildWithParameters'}'
+                                              f'{query_string}')
+        except RequestRetryException:
+            return None
+
+    @typechecked
+    def get_jenkins_queue_item_dict(self, queue_item_id: int) -> dict | None:
+        """Gets when a queue item was queued and, once started, the build it became"""
+        JsonUtils.validate_max_retry(self._jenkins_request_settings.max_retry)
+        try:
+            return self._get_json_response(
+                f'{self._jenkins_request_settings.url}/queue/item/{queue_item_id}/api/json'
+                '?tree=inQueueSince,cancelled,executable[number]',
+                self._jenkins_request_settings.max_retry,
+                HttpRequestSettings(auth=self._jenkins_request_settings.auth))
         except RequestRetryException:
-            return 500
+            return None
+
+    @typechecked
+    def stop_jenkins_build_url_end(
+            self,
+            url_end: str,
+            build_number: int,
+    ) -> int:
+        """
+        Aborts a running build of a specified Jenkins job based on URL ending
+        :return: status code of the stop request, 404 if the build has not started (e.g. it is still queued)
+        """
+        JsonUtils.validate_max_retry(self._jenkins_request_settings.max_retry)
+        try:
+            return request_with_jenkins_crumb(self._jenkins_request_settings,
+                                              HttpRequestMethod.POST,
+                                              f'{self._jenkins_request_settings.url}/{url_end}/{build_number}/stop'
+                                              ).status_code
+        except RequestRetryException as exception:
+            return exception.status_code if exception.status_code is not None else 500
+
+    @typechecked
+    def cancel_jenkins_queue_item(self, queue_item_id: int) -> int:
+        """Cancels an item waiting in the Jenkins host's build queue, so that it never becomes a build"""
+        JsonUtils.validate_max_retry(self._jenkins_request_settings.max_retry)
+        try:
+            return request_with_jenkins_crumb(self._jenkins_request_settings,
+                                              HttpRequestMethod.POST,
+                                              f'{self._jenkins_request_settings.url}/queue/cancelItem'
+                                              f'?id={queue_item_id}').status_code
+        except RequestRetryException as exception:
+            return exception.status_code if exception.status_code is not None else 500
@@ -1,10 +1,25 @@
 """wfapi runs endpoints utilities module"""
 from typeguard import typechecked
 
+from jenkify.enums.jenkins import JenkinsJobStatus
 from jenkify.utils.http_request_settings import HttpRequestSettings
 from jenkify.utils.jenkins.jekins_request_settings import JenkinsRequestSettings
+from jenkify.utils.jenkins.jenkins_request_templates import (
+    JOB_RUNS_SINCE_PATH,
+    RUN_DESCRIPTION_PATH,
+    get_jenkins_request_template,
+)
 from jenkify.utils.json.JsonUtils import JsonUtils
 
+WFAPI_RUN_FINISHED_STATUSES: dict[str, JenkinsJobStatus] = {
+    'SUCCESS': JenkinsJobStatus.SUCCESS,
+    'UNSTABLE': JenkinsJobStatus.UNSTABLE,
+    'FAILED': JenkinsJobStatus.FAILURE,
+    'ABORTED': JenkinsJobStatus.ABORTED,
+    'NOT_EXECUTED': JenkinsJobStatus.ABORTED,
+}
+WFAPI_RUN_PAUSED_PENDING_INPUT = 'PAUSED_PENDING_INPUT'
+
 
 @typechecked
 def get_job_runs_response_content(
@@ -15,3 +30,30 @@ def get_job_runs_response_content(
     return JsonUtils.get_json_response(f'{request_settings.url}/job/{job_name}/wfapi/runs',
                              request_settings.max_retry,
                              HttpRequestSettings(auth=request_settings.auth))
+
+
+def get_job_runs_since_build_number(
+        request_settings: JenkinsRequestSettings,
+        url_end: str,
+        since_build_number: int,
+) -> list:
+    """
+    Obtains every run of a pipeline job from the specified build number onwards in one request.
+    Not @typechecked as it is requested on every poll, through the host's prebuilt request
+    """
+    return get_jenkins_request_template(request_settings, JOB_RUNS_SINCE_PATH).get_json(url_end, since_build_number)
+
+
+def get_run_description(
+        request_settings: JenkinsRequestSettings,
+        url_end: str,
+        build_number: int,
+) -> dict:
+    """Obtains the stages of a single pipeline run, not @typechecked as it is requested on every poll of a build"""
+    return get_jenkins_request_template(request_settings, RUN_DESCRIPTION_PATH).get_json(url_end, build_number)
+
+
+@typechecked
+def get_run_stage_statuses(run: dict) -> list:
+    """Reduces a wfapi run to the name and status of each of its stages"""
+    return [{'name': stage['name'], 'status': stage['status']} for stage in run.get('stages', [])]
@@ -1,5 +1,7 @@
 from jenkify.enums.http_request_methods import HttpRequestMethod
 from jenkify.utils.http_request_settings import HttpRequestSettings
+from jenkify.utils.json.json_codecs import decode_json
+from jenkify.utils.request_coalescing import coalesce_request
 from jenkify.utils.request_retry import request_retry
 
 
@@ -16,10 +18,26 @@ class JsonUtils:
             max_retry: int,
             http_request_settings: HttpRequestSettings,
     ) -> dict | list:
-        """Common util function which gets JSON response as dict"""
+        """
+        Common util function which gets JSON response as dict.
+        Identical concurrent requests share a single request and its (read-only) result, see request_coalescing
+        """
         JsonUtils.validate_max_retry(max_retry)
-        return (request_retry(HttpRequestMethod.GET,
-                              url,
-                              max_retry,
-                              http_request_settings)
-                .json())
+        return coalesce_request((HttpRequestMethod.GET, url, http_request_settings.auth),
+                                JsonUtils.fetch_json_response,
+                                url,
+                                max_retry,
+                                http_request_settings)
+
+    @staticmethod
+    def fetch_json_response(
+            url: str,
+            max_retry: int,
+            http_request_settings: HttpRequestSettings,
+    ) -> dict | list:
+        """Gets and decodes a JSON response, without coalescing it with identical concurrent requests"""
+        return decode_json(request_retry(HttpRequestMethod.GET,
+                                         url,
+                                         max_retry,
+                                         http_request_settings)
+                           .content)
@@ -0,0 +1,65 @@
+"""Module containing a benchmark of the available JSON decoding strategies"""
+import json
+import time
+import tracemalloc
+
+from typeguard import typechecked
+
+from jenkify.utils.json.json_codecs import JSON_CODECS
+from jenkify.utils.json.json_stream import iter_json_array_items
+
+JSON_BENCHMARK_CHUNK_SIZE = 64 * 1024
+
+
+@typechecked
+def get_synthetic_job_runs_content(run_count: int) -> bytes:
+    """Builds a wfapi/runs-like JSON array of run_count runs with a few stages each"""
+    return json.dumps([{'id': str(run_number),
+                        'name': f'#{run_number}',
+                        'status': 'SUCCESS',
+                        'startTimeMillis': 1_700_000_000_000 + run_number * 60_000,
+                        'durationMillis': 600_000,
+                        'queueDurationMillis': 1_000,
+                        'stages': [{'id': str(stage_index),
+                                    'name': f'Stage {stage_index}',
+                                    'status': 'SUCCESS',
+                                    'startTimeMillis': 1_700_000_000_000,
+                                    'durationMillis': 100_000}
+                                   for stage_index in range(6)]}
+                       for run_number in range(run_count, 0, -1)]).encode('utf-8')
+
+
+@typechecked
+def measure(decode, iterations: int) -> dict:
+    """Measures the best wall time and the peak traced memory of a decode callable"""
+    best_seconds = None
+    for _ in range(iterations):
+        start = time.perf_counter()
+        decode()
+        elapsed_seconds = time.perf_counter() - start
+        best_seconds = elapsed_seconds if best_seconds is None else min(best_seconds, elapsed_seconds)
+    tracemalloc.start()
+    decode()
+    _, peak_bytes = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    return {'best-millis': round(best_seconds * 1000, 2), 'peak-kib': peak_bytes // 1024}
+
+
+@typechecked
+def benchmark_json_decoding(content: bytes, iterations: int = 5, limit: int = 10) -> dict:
+    """
+    Compares decoding a JSON array document in full with each available codec against streaming its first items
+    :param content: JSON array document
+    :param iterations: Amount of timed runs of each strategy, the best one is reported
+    :param limit: Amount of items the streaming strategy stops after
+    :return: dict mapping each strategy to its best wall time and peak memory
+    """
+    chunks = [content[offset:offset + JSON_BENCHMARK_CHUNK_SIZE]
+              for offset in range(0, len(content), JSON_BENCHMARK_CHUNK_SIZE)]
+    results = {f'{json_codec} (full document)': measure(lambda json_decode=json_decode: json_decode(content),
+                                                        iterations)
+               for json_codec, json_decode in JSON_CODECS.items()}
+    results['json (full document via str)'] = measure(lambda: json.loads(content.decode('utf-8')), iterations)
+    results['stream (all items)'] = measure(lambda: list(iter_json_array_items(chunks)), iterations)
+    results[f'stream (first {limit} items)'] = measure(lambda: list(iter_json_array_items(chunks, limit)), iterations)
+    return results
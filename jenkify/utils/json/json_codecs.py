@@ -0,0 +1,43 @@
+"""
+Module containing the pluggable JSON codecs responses are decoded with. The codec is selected with the
+JENKIFY_JSON_CODEC environment variable, orjson is used only if it is installed
+"""
+import json
+import os
+from collections.abc import Callable
+
+from typeguard import typechecked
+
+try:
+    import orjson
+except ImportError:
+    orjson = None
+
+JSON_CODEC_ENV = 'JENKIFY_JSON_CODEC'
+DEFAULT_JSON_CODEC = 'json'
+JSON_CODECS: dict[str, Callable[[bytes], dict | list]] = {'json': json.loads}
+if orjson is not None:
+    JSON_CODECS['orjson'] = orjson.loads
+
+
+@typechecked
+def get_json_codec(json_codec: str | None = None) -> Callable[[bytes], dict | list]:
+    """
+    Gets the decode function of a JSON codec
+    :param json_codec: Name of the codec, JENKIFY_JSON_CODEC (or the standard library json module) if None
+    :raises ValueError: if the codec is unknown or not installed
+    """
+    if (json_codec := json_codec or os.getenv(JSON_CODEC_ENV, DEFAULT_JSON_CODEC)) not in JSON_CODECS:
+        raise ValueError(f'JSON codec {json_codec} is unknown or not installed, '
+                         f'available codecs: {', '.join(JSON_CODECS)}')
+    return JSON_CODECS[json_codec]
+
+
+def decode_json(content: bytes, json_codec: str | None = None) -> dict | list:
+    """
+    Decodes a JSON document straight from bytes, without first decoding it into a str.
+    Not @typechecked as every response goes through it, the codec is only looked up in full when it is unknown
+    """
+    if (json_decode := JSON_CODECS.get(json_codec or os.getenv(JSON_CODEC_ENV, DEFAULT_JSON_CODEC), None)) is None:
+        json_decode = get_json_codec(json_codec)
+    return json_decode(content)
@@ -0,0 +1,111 @@
+"""Module containing an incremental decoder of JSON arrays streamed in chunks"""
+import codecs
+import json
+from collections.abc import Iterable, Iterator
+
+JSON_WHITESPACE = ' \t\n\r'
+
+
+class JsonChunkReader:
+    """Reads a JSON document from chunks of bytes, holding only the part of it which has not been consumed yet"""
+    _chunks: Iterator
+    _utf8_decoder: codecs.IncrementalDecoder
+    _buffer: str
+    _position: int
+    _chunks_exhausted: bool
+
+    def __init__(self, chunks: Iterable):
+        self._chunks = iter(chunks)
+        self._utf8_decoder = codecs.getincrementaldecoder('utf-8')()
+        self._buffer = ''
+        self._position = 0
+        self._chunks_exhausted = False
+
+    def read_chunks(self, min_length: int = 0) -> None:
+        """
+        Appends the next chunk to the unconsumed part of the buffer, then more chunks until that part is at least
+        min_length characters long, noting when the chunks run out
+        """
+        buffer_parts = [self._buffer[self._position:]]
+        buffer_length = len(buffer_parts[0])
+        while True:
+            chunk = next(self._chunks, None)
+            self._chunks_exhausted = chunk is None
+            buffer_parts.append(self._utf8_decoder.decode(chunk if chunk is not None else b'', final=chunk is None))
+            buffer_length += len(buffer_parts[-1])
+            if self._chunks_exhausted or buffer_length >= min_length:
+                break
+        self._buffer = ''.join(buffer_parts)
+        self._position = 0
+
+    def peek_char(self) -> str:
+        """
+        Gets the next character which is not whitespace, without consuming it
+        :raises ValueError: if the document ends first
+        """
+        while True:
+            while self._position < len(self._buffer) and self._buffer[self._position] in JSON_WHITESPACE:
+                self._position += 1
+            if self._position < len(self._buffer):
+                return self._buffer[self._position]
+            if self._chunks_exhausted:
+                raise ValueError('Unexpected end of streamed JSON array')
+            self.read_chunks()
+
+    def read_char(self) -> str:
+        """Gets and consumes the next character which is not whitespace, see peek_char"""
+        char = self.peek_char()
+        self._position += 1
+        return char
+
+    def read_value(self, json_decoder: json.JSONDecoder):
+        """
+        Decodes and consumes the next JSON value, reading as many chunks as it spans.
+        An incomplete value is only decoded again once its part of the buffer has doubled, so that a value spanning
+        k chunks is decoded O(log k) times rather than k times
+        :raises ValueError: if the value is malformed
+        """
+        self.peek_char()
+        while True:
+            try:
+                value, value_end = json_decoder.raw_decode(self._buffer, self._position)
+            except json.JSONDecodeError as exception:
+                if self._chunks_exhausted:
+                    raise ValueError(f'Malformed streamed JSON array: {exception}') from exception
+                self.read_chunks(2 * (len(self._buffer) - self._position))
+                continue
+            if value_end < len(self._buffer) or self._chunks_exhausted:
+                self._position = value_end
+                return value
+            # a number may continue in the next chunk, only trust it once followed by a delimiter
+            self.read_chunks()
+
+
+def iter_json_array_items(chunks: Iterable, limit: int | None = None) -> Iterator:
+    """
+    Decodes the items of a top-level JSON array one by one as its chunks arrive, so that only the item being
+    decoded (not the whole document) is held in memory and reading can stop after the first items.
+    Decoding a whole document is faster with decode_json, so this is only worth it for callers which stop early.
+    Not @typechecked as every streamed response goes through it
+    :param chunks: Chunks (bytes) of a JSON document whose top level is an array
+    :param limit: Stop after decoding this many items, leaving the rest of the document unread
+    :return: iterator over the decoded items
+    :raises ValueError: if the document is not a JSON array or is malformed
+    """
+    json_decoder = json.JSONDecoder()
+    json_chunk_reader = JsonChunkReader(chunks)
+    if json_chunk_reader.read_char() != '[':
+        raise ValueError('Streamed JSON document is not an array')
+    item_count = 0
+    while limit is None or item_count < limit:
+        if item_count == 0:
+            if json_chunk_reader.peek_char() == ']':
+                return
+        else:
+            separator = json_chunk_reader.read_char()
+            if separator == ']':
+                return
+            if separator != ',':
+                raise ValueError(f'Malformed streamed JSON array: expected "," or "]" but got "{separator}"')
+        yield json_chunk_reader.read_value(json_decoder)
+        item_count += 1
@@ -14,7 +14,6 @@ def initialize_logging(verbose: bool = False):
     """
     logger = logging.getLogger('')
     if not logger.handlers:
-        logger.setLevel(logging.DEBUG)
         console = logging.StreamHandler()
         formatter = logging.Formatter(
             '[%(levelname)s][%(filename)s:%(funcName)s:%(lineno)s][%(asctime)s] '
@@ -38,6 +37,17 @@ def set_logging_verbosity_level(logger: logging.Logger, verbose: bool):
         console.setLevel(logging.DEBUG)
     else:
         console.setLevel(logging.INFO)
+    set_logger_level_to_handlers(logger)
+
+
+@typechecked
+def set_logger_level_to_handlers(logger: logging.Logger):
+    """
+    Sets the level of the logger to the lowest level of its handlers, so that records no handler would output are
+    dropped before being created (and logging.debug calls on hot paths stay cheap when not verbose)
+    :param logger: The logger to set the level of
+    """
+    logger.setLevel(min((handler.level for handler in logger.handlers), default=logging.WARNING))
 
 
 def logging_line_break():
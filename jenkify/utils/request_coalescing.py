@@ -0,0 +1,89 @@
+"""
+Module coalescing identical concurrent requests (singleflight): while a request is in flight, identical requests wait
+for it and share its decoded result (or its exception) instead of making their own HTTP call.
+Requests made from the event loop run on threads (asyncio.to_thread) like every other request, so coalescing across
+threads covers both the threaded and the asyncio paths
+"""
+import logging
+import threading
+from collections.abc import Callable
+
+from jenkify.exceptions.deadline_exceeded_exception import DeadlineExceededException
+from jenkify.utils.request_deadline import get_request_deadline_remaining_seconds
+
+_in_flight_requests: dict = {}
+_in_flight_requests_lock = threading.Lock()
+_request_coalescing_counts = {'requests': 0, 'coalesced': 0}
+
+
+class InFlightRequest:
+    """
+    Outcome of a request being made on behalf of identical concurrent ones.
+    Its event is only created once an identical request has to wait for it, as most requests have none
+    """
+    result: object
+    exception: BaseException | None
+    done_event: threading.Event | None
+
+    def __init__(self):
+        self.result = None
+        self.exception = None
+        self.done_event = None
+
+
+def coalesce_request(request_key: tuple, request_function: Callable, *args):
+    """
+    Calls request_function(*args), unless an identical request is already in flight, in which case its result is
+    waited for and shared (or its exception re-raised). Shared results are the very same objects, so callers must not
+    modify them. A waiting caller only waits until its own command's deadline, as the in-flight request may belong
+    to a command with a later one (e.g. another command run by the daemon).
+    Not @typechecked as every JSON request goes through it
+    :param request_key: Identifies identical requests, e.g. method, URL (including its tree projection) and auth
+    :param request_function: Makes the request and decodes its response
+    :param args: Arguments of request_function
+    :return: result of the in-flight identical request, or of request_function
+    :raises DeadlineExceededException: if the deadline passes while waiting for the in-flight identical request
+    :raises BaseException: whatever request_function raised, in every caller which waited for it
+    """
+    with _in_flight_requests_lock:
+        _request_coalescing_counts['requests'] += 1
+        if (in_flight_request := _in_flight_requests.get(request_key, None)) is None:
+            in_flight_request = _in_flight_requests[request_key] = InFlightRequest()
+            done_event = None
+        else:
+            _request_coalescing_counts['coalesced'] += 1
+            if in_flight_request.done_event is None:
+                in_flight_request.done_event = threading.Event()
+            done_event = in_flight_request.done_event
+    if done_event is not None:
+        if not done_event.wait(get_request_deadline_remaining_seconds()):
+            raise DeadlineExceededException('Deadline exceeded while waiting for an identical in-flight request')
+        if in_flight_request.exception is not None:
+            raise in_flight_request.exception
+        return in_flight_request.result
+    try:
+        in_flight_request.result = request_function(*args)
+    except BaseException as exception:
+        in_flight_request.exception = exception
+        raise
+    finally:
+        with _in_flight_requests_lock:
+            del _in_flight_requests[request_key]
+            done_event = in_flight_request.done_event
+        if done_event is not None:
+            done_event.set()
+    return in_flight_request.result
+
+
+def get_request_coalescing_counts() -> dict:
+    """Gets the amount of coalescible requests made by the process, and of those coalesced into in-flight ones"""
+    with _in_flight_requests_lock:
+        return dict(_request_coalescing_counts)
+
+
+def log_request_coalescing_stats() -> None:
+    """Logs how many requests were saved by coalescing them into identical in-flight ones"""
+    request_coalescing_counts = get_request_coalescing_counts()
+    logging.info('Coalesced %s of %s JSON request(s) into identical in-flight ones',
+                 request_coalescing_counts['coalesced'],
+                 request_coalescing_counts['requests'])
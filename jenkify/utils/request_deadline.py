@@ -0,0 +1,45 @@
+"""
+Module keeping the end-to-end deadline of the command being run. Every request gets the smaller of its own timeout and
+the time left, and poll loops stop at the deadline, so that a command finishes in bounded time however slow its hosts
+are. The deadline is a context variable: it follows the command into its tasks and asyncio.to_thread calls, and
+commands run concurrently by the daemon each have their own
+"""
+import contextvars
+import time
+
+from typeguard import typechecked
+
+from jenkify.exceptions.deadline_exceeded_exception import DeadlineExceededException
+
+_request_deadline: contextvars.ContextVar = contextvars.ContextVar('request_deadline', default=None)
+
+
+@typechecked
+def start_request_deadline(deadline_seconds: float | None) -> None:
+    """Starts a deadline deadline_seconds from now for the current command (None for no deadline)"""
+    _request_deadline.set(time.monotonic() + deadline_seconds if deadline_seconds is not None else None)
+
+
+def get_request_deadline_remaining_seconds() -> float | None:
+    """Gets the seconds left before the deadline (negative once it has passed), None if there is no deadline"""
+    request_deadline = _request_deadline.get()
+    return request_deadline - time.monotonic() if request_deadline is not None else None
+
+
+def is_request_deadline_exceeded() -> bool:
+    """Checks whether the deadline has passed"""
+    request_deadline = _request_deadline.get()
+    return request_deadline is not None and time.monotonic() >= request_deadline
+
+
+def get_request_timeout(timeout_seconds: float) -> float:
+    """
+    Gets the smaller of a request's own timeout and the time left before the deadline
+    :raises DeadlineExceededException: if the deadline has passed
+    """
+    remaining_seconds = get_request_deadline_remaining_seconds()
+    if remaining_seconds is None:
+        return timeout_seconds
+    if remaining_seconds <= 0:
+        raise DeadlineExceededException('Deadline exceeded before the request could be made')
+    return min(timeout_seconds, remaining_seconds)
@@ -0,0 +1,189 @@
+"""
+Module hedging idempotent requests against tail latency: once a request to a host has been outstanding for longer than
+a percentile of that host's recent latencies, a duplicate is sent and whichever answers first is used.
+Hedges are capped by a per-host budget, a small share of the requests made, so that a slow host does not get its load
+doubled. Hedging is opted into per command (a context variable, like the deadline), latencies are kept per host for the
+lifetime of the process (like the HTTP sessions)
+"""
+import contextvars
+import logging
+import threading
+import time
+from collections import deque
+from concurrent.futures import FIRST_COMPLETED, Future, ThreadPoolExecutor, wait
+from urllib.parse import urlsplit
+
+from typeguard import typechecked
+
+DEFAULT_HEDGE_BUDGET_PERCENT = 5.0
+HEDGE_LATENCY_WINDOW = 100
+HEDGE_MIN_LATENCY_SAMPLES = 20
+HEDGE_MAX_BUDGET_BURST = 10
+HEDGE_MAX_WORKERS = 64
+
+
+class RequestHedgingPolicy:
+    """When requests are hedged: the latency percentile to wait for, and the share of requests hedged at most"""
+    percentile: float
+    budget_percent: float
+
+    @typechecked
+    def __init__(self, percentile: float, budget_percent: float = DEFAULT_HEDGE_BUDGET_PERCENT):
+        """
+        :param percentile: Percentile of the host's recent latencies after which a duplicate request is sent
+        :param budget_percent: Maximum percentage of a host's requests which are hedged
+        """
+        self.percentile = percentile
+        self.budget_percent = budget_percent
+
+
+class HostRequestHedger:
+    """Recent request latencies, hedge budget and hedge counts of a single host"""
+    request_count: int
+    hedge_count: int
+    hedge_win_count: int
+    _latencies: deque
+    _budget: float
+    _lock: threading.Lock
+
+    def __init__(self):
+        self.request_count = 0
+        self.hedge_count = 0
+        self.hedge_win_count = 0
+        self._latencies = deque(maxlen=HEDGE_LATENCY_WINDOW)
+        self._budget = 0.0
+        self._lock = threading.Lock()
+
+    def add_request(self, budget_percent: float) -> None:
+        """Counts a request, earning its share of a hedge (up to a small burst)"""
+        with self._lock:
+            self.request_count += 1
+            self._budget = min(self._budget + budget_percent / 100, HEDGE_MAX_BUDGET_BURST)
+
+    def add_latency(self, latency_seconds: float) -> None:
+        """Records the latency of a request which was answered"""
+        with self._lock:
+            self._latencies.append(latency_seconds)
+
+    def add_hedge_win(self) -> None:
+        """Counts a hedge which was answered before the request it duplicates"""
+        with self._lock:
+            self.hedge_win_count += 1
+
+    def get_hedge_delay_seconds(self, percentile: float) -> float | None:
+        """Gets the percentile of the recent latencies, None until enough requests have been answered"""
+        with self._lock:
+            if len(self._latencies) < HEDGE_MIN_LATENCY_SAMPLES:
+                return None
+            latencies = sorted(self._latencies)
+        return latencies[min(int(len(latencies) * percentile / 100), len(latencies) - 1)]
+
+    def try_spend_hedge(self) -> bool:
+        """Spends a hedge out of the budget, if one has been earned"""
+        with self._lock:
+            if self._budget < 1:
+                return False
+            self._budget -= 1
+            self.hedge_count += 1
+            return True
+
+
+_request_hedging_policy: contextvars.ContextVar = contextvars.ContextVar('request_hedging_policy', default=None)
+_host_request_hedgers: dict[str, HostRequestHedger] = {}
+_host_request_hedgers_lock = threading.Lock()
+_hedge_executor = ThreadPoolExecutor(max_workers=HEDGE_MAX_WORKERS, thread_name_prefix='jenkify-hedge')
+
+
+@typechecked
+def start_request_hedging(request_hedging_policy: RequestHedgingPolicy | None) -> None:
+    """Hedges the idempotent requests of the current command according to the policy (None for no hedging)"""
+    _request_hedging_policy.set(request_hedging_policy)
+
+
+def get_request_hedging_policy() -> RequestHedgingPolicy | None:
+    """Gets the hedging policy of the current command, None if its requests are not hedged"""
+    return _request_hedging_policy.get()
+
+
+def get_host_request_hedger(url: str) -> HostRequestHedger:
+    """Gets the hedger of the scheme and host of the URL, creating it on first use"""
+    split_url = urlsplit(url)
+    host_key = f'{split_url.scheme}://{split_url.netloc}'
+    if (host_request_hedger := _host_request_hedgers.get(host_key, None)) is None:
+        with _host_request_hedgers_lock:
+            host_request_hedger = _host_request_hedgers.setdefault(host_key, HostRequestHedger())
+    return host_request_hedger
+
+
+def send_timed_request(send_request, *args) -> tuple:
+    """Sends a request, returning its response along with its latency in seconds"""
+    start_time = time.perf_counter()
+    response = send_request(*args)
+    return response, time.perf_counter() - start_time
+
+
+def close_losing_response(request_future: Future) -> None:
+    """Releases the connection of a hedged request's response which arrived second"""
+    if not request_future.cancelled() and request_future.exception() is None:
+        request_future.result()[0].close()
+
+
+def send_hedged_request(request_hedging_policy: RequestHedgingPolicy,
+                        send_request,
+                        http_session,
+                        url: str,
+                        *,
+                        request_settings,
+                        timeout: float):
+    """
+    Sends an idempotent request (see the HTTP_REQUEST_SENDERS of request_retry), and a duplicate of it if it is still
+    outstanding after the hedge delay of its host and the budget allows. The first response is returned; the other
+    request cannot be interrupted mid-flight, so it is cancelled if it has not started yet, or its response is
+    discarded and its connection released as soon as it arrives.
+    Not @typechecked as every hedged request goes through it
+    :return: response
+    :rtype: requests.Response
+    """
+    host_request_hedger = get_host_request_hedger(url)
+    host_request_hedger.add_request(request_hedging_policy.budget_percent)
+    hedge_delay_seconds = host_request_hedger.get_hedge_delay_seconds(request_hedging_policy.percentile)
+    primary_future = _hedge_executor.submit(send_timed_request, send_request, http_session, url, request_settings,
+                                            timeout)
+
+    def add_primary_latency(request_future: Future) -> None:
+        if request_future.exception() is None:
+            host_request_hedger.add_latency(request_future.result()[1])
+
+    primary_future.add_done_callback(add_primary_latency)
+    if hedge_delay_seconds is None or hedge_delay_seconds >= timeout:
+        return primary_future.result()[0]
+    wait([primary_future], timeout=hedge_delay_seconds)
+    if primary_future.done() or not host_request_hedger.try_spend_hedge():
+        return primary_future.result()[0]
+    logging.debug('Hedging request to %s, outstanding for over %.3f seconds', url, hedge_delay_seconds)
+    hedge_future = _hedge_executor.submit(send_timed_request, send_request, http_session, url, request_settings,
+                                          timeout - hedge_delay_seconds)
+    pending_futures = {primary_future, hedge_future}
+    while len(pending_futures) > 0:
+        done_futures, pending_futures = wait(pending_futures, return_when=FIRST_COMPLETED)
+        for request_future in (primary_future, hedge_future):
+            if request_future in done_futures and request_future.exception() is None:
+                losing_future = hedge_future if request_future is primary_future else primary_future
+                losing_future.cancel()
+                losing_future.add_done_callback(close_losing_response)
+                if request_future is hedge_future:
+                    host_request_hedger.add_hedge_win()
+                return request_future.result()[0]
+    return primary_future.result()[0]
+
+
+def log_request_hedging_stats() -> None:
+    """Logs how many requests were hedged per host, and how many of those were answered first by the hedge"""
+    with _host_request_hedgers_lock:
+        host_request_hedgers = dict(_host_request_hedgers)
+    for host_key, host_request_hedger in host_request_hedgers.items():
+        logging.info('Hedged %s of %s request(s) to %s, %s answered first by the hedge',
+                     host_request_hedger.hedge_count,
+                     host_request_hedger.request_count,
+                     host_key,
+                     host_request_hedger.hedge_win_count)
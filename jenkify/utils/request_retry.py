@@ -11,11 +11,26 @@ import urllib3
 from typeguard import typechecked
 
 from jenkify.enums.http_request_methods import HttpRequestMethod
+from jenkify.exceptions.deadline_exceeded_exception import DeadlineExceededException
 from jenkify.exceptions.request_retry_exception import RequestRetryException
+from jenkify.utils.http_cassette import get_http_cassette
 from jenkify.utils.http_request_settings import HttpRequestSettings
+from jenkify.utils.http_sessions import get_http_session
+from jenkify.utils.request_deadline import (
+    get_request_deadline_remaining_seconds,
+    get_request_timeout,
+    is_request_deadline_exceeded,
+)
+from jenkify.utils.request_hedging import get_request_hedging_policy, send_hedged_request
 
 urllib3.disable_warnings(urllib3.exceptions.InsecureRequestWarning)
 
+VALID_RESPONSE_CODES = frozenset((
+    requests.codes['ok'],
+    requests.codes['created'],
+    requests.codes['no_content'],
+))
+
 
 @typechecked
 def request_retry_download_file(
@@ -36,7 +51,6 @@ def request_retry_download_file(
         output_file.write(response.text)
 
 
-@typechecked
 def request_retry(
         request_method: HttpRequestMethod,
         url: str,
@@ -44,47 +58,46 @@ def request_retry(
         request_settings: HttpRequestSettings):
     """
     Function to retry requests if the target host is not found. Geometric retry is used here.
+    Each try's timeout and the retries are bounded by the command's deadline, if any (see request_deadline).
+    Not @typechecked as every request goes through it, its callers check the arguments they build it from.
     :param request_method: Which REST request is being conducted
     :param url: URL you want to run your request against
     :param max_retry: Amount of times to retry the request
     :param request_settings: Settings for the request namely body, proxy, and SSL
     :return: response
     :rtype: requests.Response
+    :raises RequestRetryException: if the request is bad, or every try failed
+    :raises DeadlineExceededException: if the deadline passes before a try succeeds
     """
     count = 0
     response = None
-    valid_response_codes = [
-        requests.codes['ok'],
-        requests.codes['created'],
-        requests.codes['no_content']
-    ]
-    logging.debug('type_of_request: %s', request_method.name)
-    logging.debug('url: %s', str(url))
+    logging.debug('type_of_request: %s, url: %s', request_method.name, url)
     while count < max_retry:
         try:
             response = make_request_based_on_input(request_method, url, request_settings)
-            if response and response.status_code in valid_response_codes:
+            if response is not None and response.status_code in VALID_RESPONSE_CODES:
                 break
-            logging.debug(
-                'Raising RequestException as response status code is: %s',
-                response.status_code)
+            if response is not None:
+                logging.debug('Raising RequestException as response status code is: %s', response.status_code)
             raise requests.exceptions.RequestException
         except requests.exceptions.RequestException:
-            logging.debug('Could not make the %s request', request_method.name)
-            logging.debug('Response status code: %s', str(response.status_code))
-            logging.debug('Response reason: %s', str(response.reason))
-            logging.debug('Response output: %s', str(response.text))
-
-            if response.status_code == requests.codes['bad_request']:
-                raise RequestRetryException('Bad request detected') \
+            log_failed_request(request_method, response)
+            if response is not None and response.status_code == requests.codes['bad_request']:
+                raise RequestRetryException('Bad request detected', response.status_code) \
                     from requests.exceptions.RequestException
         count += 1
         if count == max_retry:
             raise RequestRetryException(
-                f'Failed to execute {request_method.name} request after {max_retry} tries'
+                f'Failed to execute {request_method.name} request after {max_retry} tries',
+                response.status_code if response is not None else None,
             )
 
         sleep_time = 2 ** count
+        remaining_seconds = get_request_deadline_remaining_seconds()
+        if remaining_seconds is not None and remaining_seconds <= sleep_time:
+            raise DeadlineExceededException(
+                f'Deadline reached after {count} tries of {request_method.name} request'
+            )
         logging.warning('Failed to make %s request. '
                         'Sleeping and then trying again in %s seconds',
                         request_method.name,
@@ -93,65 +106,138 @@ def request_retry(
     return response
 
 
-@typechecked
+def log_failed_request(request_method: HttpRequestMethod, response: requests.Response | None) -> None:
+    """Logs the details of a failed request at debug level, if that level is enabled"""
+    if not logging.root.isEnabledFor(logging.DEBUG):
+        return
+    logging.debug('Could not make the %s request', request_method.name)
+    if response is None:
+        logging.debug('No response')
+    else:
+        logging.debug('Response status code: %s', response.status_code)
+        logging.debug('Response reason: %s', response.reason)
+        logging.debug('Response output: %s', response.text)
+
+
+def send_get_request(http_session: requests.Session,
+                     url: str,
+                     request_settings: HttpRequestSettings,
+                     timeout: float):
+    """Sends a GET request with the session"""
+    return http_session.get(url,
+                            headers=request_settings.request_headers,
+                            proxies=request_settings.proxy,
+                            timeout=timeout,
+                            verify=request_settings.ssl,
+                            auth=request_settings.auth,
+                            stream=request_settings.stream)
+
+
+def send_patch_request(http_session: requests.Session,
+                       url: str,
+                       request_settings: HttpRequestSettings,
+                       timeout: float):
+    """Sends a PATCH request with the session"""
+    return http_session.patch(url,
+                              headers=request_settings.request_headers,
+                              json=request_settings.body,
+                              timeout=timeout,
+                              proxies=request_settings.proxy,
+                              verify=request_settings.ssl,
+                              auth=request_settings.auth)
+
+
+def send_put_request(http_session: requests.Session,
+                     url: str,
+                     request_settings: HttpRequestSettings,
+                     timeout: float):
+    """Sends a PUT request with the session"""
+    return http_session.put(url,
+                            headers=request_settings.request_headers,
+                            json=request_settings.body,
+                            timeout=timeout,
+                            proxies=request_settings.proxy,
+                            verify=request_settings.ssl,
+                            auth=request_settings.auth)
+
+
+def send_post_request(http_session: requests.Session,
+                      url: str,
+                      request_settings: HttpRequestSettings,
+                      timeout: float):
+    """Sends a POST request with the session"""
+    return http_session.post(url,
+                             headers=request_settings.request_headers,
+                             json=request_settings.body,
+                             data=request_settings.data,
+                             timeout=timeout,
+                             proxies=request_settings.proxy,
+                             verify=request_settings.ssl,
+                             auth=request_settings.auth)
+
+
+def send_delete_request(http_session: requests.Session,
+                        url: str,
+                        request_settings: HttpRequestSettings,
+                        timeout: float):
+    """Sends a DELETE request with the session"""
+    return http_session.delete(url,
+                               headers=request_settings.request_headers,
+                               timeout=timeout,
+                               proxies=request_settings.proxy,
+                               verify=request_settings.ssl)
+
+
+HTTP_REQUEST_TIMEOUTS = {
+    HttpRequestMethod.GET: 10,
+    HttpRequestMethod.PATCH: 20,
+    HttpRequestMethod.PUT: 5,
+    HttpRequestMethod.POST: 20,
+    HttpRequestMethod.DELETE: 10,
+}
+HTTP_REQUEST_SENDERS = {
+    HttpRequestMethod.GET: send_get_request,
+    HttpRequestMethod.PATCH: send_patch_request,
+    HttpRequestMethod.PUT: send_put_request,
+    HttpRequestMethod.POST: send_post_request,
+    HttpRequestMethod.DELETE: send_delete_request,
+}
+
+
 def make_request_based_on_input(
         request_method: HttpRequestMethod,
         url: str,
         request_settings: HttpRequestSettings):
     """
-    Makes a request based on the request type passed in
+    Makes a request based on the request type passed in.
+    GET requests, being idempotent, are hedged if the command opted into it (see request_hedging)
     :param request_method: Which REST request is being conducted
     :param url: URL you want to run your request against
     :param request_settings: Settings for the request namely body, proxy, and SSL
     :return: response
     :rtype: requests.Response
+    :raises DeadlineExceededException: if the command's deadline has passed, or passes during the request
+    :raises requests.exceptions.Timeout: if the request times out before the command's deadline
     """
-    logging.debug('Trying to make %s request', request_method.name)
+    timeout = get_request_timeout(HTTP_REQUEST_TIMEOUTS[request_method])
+    http_cassette = get_http_cassette()
+    if http_cassette is not None and http_cassette.replaying:
+        return http_cassette.replay(request_method, url)
     response = None
+    request_start_time = time.perf_counter()
+    request_hedging_policy = get_request_hedging_policy() if request_method is HttpRequestMethod.GET else None
     try:
-        if request_method == HttpRequestMethod.GET:
-            logging.debug('Doing a %s request', request_method.name)
-            response = requests.get(url,
-                                    headers={'Content-Type': request_settings.content_type},
-                                    proxies=request_settings.proxy,
-                                    timeout=10,
-                                    verify=request_settings.ssl,
-                                    auth=request_settings.auth)
-        elif request_method == HttpRequestMethod.PATCH:
-            logging.debug('Doing a %s request', request_method.name)
-            response = requests.patch(url,
-                                      headers={'Content-Type': request_settings.content_type},
-                                      json=request_settings.body,
-                                      timeout=20,
-                                      proxies=request_settings.proxy,
-                                      verify=request_settings.ssl,
-                                      auth=request_settings.auth)
-        elif request_method == HttpRequestMethod.PUT:
-            logging.debug('Doing a %s request', request_method.name)
-            response = requests.put(url,
-                                    headers={'Content-Type': request_settings.content_type},
-                                    json=request_settings.body,
-                                    timeout=5,
-                                    proxies=request_settings.proxy,
-                                    verify=request_settings.ssl,
-                                    auth=request_settings.auth)
-        elif request_method == HttpRequestMethod.POST:
-            logging.debug('Doing a %s request', request_method.name)
-            response = requests.post(url,
-                                     headers={'Content-Type': request_settings.content_type},
-                                     json=request_settings.body,
-                                     data=request_settings.data,
-                                     timeout=20,
-                                     proxies=request_settings.proxy,
-                                     verify=request_settings.ssl,
-                                     auth=request_settings.auth)
-        elif request_method == HttpRequestMethod.DELETE:
-            logging.debug('Doing a %s request', request_method.name)
-            response = requests.delete(url,
-                                       headers={'Content-Type': request_settings.content_type},
-                                       timeout=10,
-                                       proxies=request_settings.proxy,
-                                       verify=request_settings.ssl)
+        if request_hedging_policy is not None:
+            response = send_hedged_request(request_hedging_policy, send_get_request, get_http_session(url), url,
+                                           request_settings=request_settings, timeout=timeout)
+        else:
+            response = HTTP_REQUEST_SENDERS[request_method](get_http_session(url), url, request_settings, timeout)
     except (requests.exceptions.ProxyError, AssertionError):
         logging.error('Could not make %s request due to a Proxy Error', request_method.name)
+    except requests.exceptions.Timeout as exception:
+        if is_request_deadline_exceeded():
+            raise DeadlineExceededException(f'Deadline reached during {request_method.name} request') from exception
+        raise
+    if http_cassette is not None and response is not None:
+        http_cassette.record(request_method, url, response, time.perf_counter() - request_start_time)
     return response
@@ -0,0 +1,111 @@
+import asyncio
+import contextvars
+import os
+import unittest
+from unittest.mock import patch
+
+from jenkify.constants.jenkins_yaml import STATUS, SUBMITTED_INPUTS, SUCCESSFUL_JOBS, FAILED_JOBS
+from jenkify.enums.jenkins import JenkinsJobStatus
+from jenkify.exceptions.build_job_dag_exception import BuildJobDagException
+from jenkify.use_cases.jenkins_build_dag import (
+    get_build_job_critical_path_priorities,
+    get_build_job_dag,
+    run_build_jobs_dag,
+)
+from jenkify.utils.request_deadline import start_request_deadline
+
+
+def get_build_jobs_dict(jobs: list) -> dict:
+    return {'build': {'hosts': [{'url': 'http://localhost:8080', 'jobs': jobs}]}}
+
+
+class FinishedBuildPoll:
+    failed_url_ends: set = set()
+
+    def __init__(self, _, url_end: str, *__):
+        self.build_job_status = None
+        self._url_end = url_end
+
+    async def poll(self) -> bool:
+        self.build_job_status = {STATUS: JenkinsJobStatus.FAILURE if self._url_end in self.failed_url_ends
+                                 else JenkinsJobStatus.SUCCESS,
+                                 SUBMITTED_INPUTS: []}
+        return True
+
+
+class BuildJobDagTestCase(unittest.TestCase):
+
+    def test_get_build_job_dag_when_cycle_then_except(self):
+        build_jobs_dict = get_build_jobs_dict([
+            {'end': 'job/A', 'depends-on': ['job/B']},
+            {'end': 'job/B', 'depends-on': ['job/A']},
+        ])
+        with self.assertRaises(BuildJobDagException):
+            get_build_job_dag(build_jobs_dict)
+
+    def test_get_build_job_dag_when_unknown_dependency_then_except(self):
+        build_jobs_dict = get_build_jobs_dict([{'end': 'job/A', 'depends-on': ['job/Missing']}])
+        with self.assertRaises(BuildJobDagException):
+            get_build_job_dag(build_jobs_dict)
+
+    def test_get_critical_path_priorities_when_longer_chain_then_higher_priority(self):
+        build_job_dag = get_build_job_dag(get_build_jobs_dict([
+            {'end': 'job/Short'},
+            {'end': 'job/Long'},
+            {'end': 'job/LongDownstream', 'depends-on': ['job/Long']},
+        ]))
+        priorities = get_build_job_critical_path_priorities(build_job_dag, {
+            'job/Short': 50,
+            'job/Long': 30,
+            'job/LongDownstream': None,
+        })
+        self.assertEqual({'job/Short': 50, 'job/Long': 70, 'job/LongDownstream': 40}, priorities)
+
+
+
+@patch.dict(os.environ, {'POLL_RATE_SECONDS': '0'})
+@patch('jenkify.use_cases.jenkins_build_dag.Environment')
+@patch('jenkify.use_cases.jenkins_build_dag.get_build_job_estimated_duration', return_value=None)
+@patch('jenkify.use_cases.jenkins_build_dag.kick_off_build_job_group')
+@patch('jenkify.use_cases.jenkins_build_dag.JenkinsBuildPoll', FinishedBuildPoll)
+class RunBuildJobsDagTestCase(unittest.TestCase):
+
+    @patch.object(FinishedBuildPoll, 'failed_url_ends', {'job/b'})
+    def test_run_build_jobs_dag_when_upstream_fails_then_downstream_skipped(self, kick_off_group, _, __):
+        kick_off_group.side_effect = lambda build_host, job_indices, *_: [10 + job_index for job_index in job_indices]
+        build_jobs_dict = get_build_jobs_dict([{'end': 'job/a'},
+                                               {'end': 'job/b', 'depends-on': ['job/a']},
+                                               {'end': 'job/c', 'depends-on': ['job/b']}])
+        jobs_info_dict = asyncio.run(run_build_jobs_dag(build_jobs_dict))
+        self.assertEqual([('job/a', 10), ('job/b', 11)],
+                         [(job['end'], job['build_number']) for job in jobs_info_dict[SUCCESSFUL_JOBS]])
+        self.assertEqual([{'url': 'http://localhost:8080', 'end': 'job/c', 'index': 2}], jobs_info_dict[FAILED_JOBS])
+        self.assertEqual(['SUCCESS', 'FAILURE', 'SKIPPED'],
+                         [job[STATUS] for job in build_jobs_dict['build']['hosts'][0]['jobs']])
+
+    def test_run_build_jobs_dag_when_host_skipped_then_its_jobs_and_downstream_skipped(self, kick_off_group,
+                                                                                      estimate, _):
+        kick_off_group.side_effect = lambda build_host, job_indices, *_: [1] * len(job_indices)
+        build_jobs_dict = {'build': {'hosts': [
+            {'url': 'http://localhost:8080', 'jobs': [{'end': 'job/a'}, {'end': 'job/c', 'depends-on': ['job/b']}]},
+            {'url': 'http://skipped:8080', 'jobs': [{'end': 'job/b'}]}]}}
+        jobs_info_dict = asyncio.run(run_build_jobs_dag(build_jobs_dict, skipped_host_urls={'http://skipped:8080'}))
+        self.assertEqual(['job/a'], [job['end'] for job in jobs_info_dict[SUCCESSFUL_JOBS]])
+        self.assertEqual({'job/b', 'job/c'}, {job['end'] for job in jobs_info_dict[FAILED_JOBS]})
+        self.assertEqual(2, estimate.call_count)
+
+    def test_run_build_jobs_dag_when_deadline_passed_then_ready_jobs_timed_out_once(self, kick_off_group, _, __):
+        build_jobs_dict = get_build_jobs_dict([{'end': 'job/a'}, {'end': 'job/b', 'depends-on': ['job/a']}])
+
+        async def run_with_passed_deadline() -> dict:
+            start_request_deadline(0.0)
+            return await run_build_jobs_dag(build_jobs_dict)
+
+        jobs_info_dict = contextvars.copy_context().run(asyncio.run, run_with_passed_deadline())
+        kick_off_group.assert_not_called()
+        self.assertEqual(['job/a', 'job/b'], [job['end'] for job in jobs_info_dict[FAILED_JOBS]])
+        self.assertEqual(['TIMEOUT', 'SKIPPED'], [job[STATUS] for job in build_jobs_dict['build']['hosts'][0]['jobs']])
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,62 @@
+import unittest
+from unittest.mock import MagicMock
+
+from jenkify.use_cases.jenkins_build_history import (
+    BUILD_HISTORY_PAGE_SIZE,
+    MILLIS_PER_DAY,
+    analyze_build_columns,
+    fetch_job_builds_since,
+)
+from jenkify.utils.jenkins.jenkins_build_history_store import JenkinsBuildHistoryStore
+
+HOST_URL = 'http://localhost:8080'
+
+
+class AnalyzeBuildColumnsTestCase(unittest.TestCase):
+
+    def test_analyze_build_columns_when_builds_stored_then_percentiles_rates_and_trends(self):
+        jenkins_build_history_store = JenkinsBuildHistoryStore(':memory:')
+        jenkins_build_history_store.add_builds(HOST_URL, 'job/Test', [
+            {'build_number': number,
+             'result': 'FAILURE' if number == 4 else 'SUCCESS',
+             'timestamp_millis': number * MILLIS_PER_DAY,
+             'duration_millis': number * 1000,
+             'queue_duration_millis': number * 100 if number > 1 else None}
+            for number in range(1, 6)], 6)
+        self.assertEqual(6, jenkins_build_history_store.get_next_build_number(HOST_URL, 'job/Test'))
+        analysis = analyze_build_columns(jenkins_build_history_store.get_build_columns(HOST_URL, 'job/Test'))
+        self.assertEqual(5, analysis['builds'])
+        self.assertEqual(0.2, analysis['failure-rate'])
+        self.assertEqual(3000, analysis['duration-millis']['p50'])
+        self.assertEqual(1000.0, analysis['duration-trend-millis-per-day'])
+        self.assertEqual(500, analysis['queue-duration-millis']['max'])
+        self.assertEqual(100.0, analysis['queue-duration-trend-millis-per-day'])
+
+
+
+class FetchJobBuildsSinceTestCase(unittest.TestCase):
+
+    @staticmethod
+    def get_jenkins_utils(newest_build_number: int) -> MagicMock:
+        jenkins_utils = MagicMock()
+        jenkins_utils.get_jenkins_job_build_history_page_dict.side_effect = \
+            lambda url_end, start_index, end_index: {'allBuilds': [
+                {'number': number} for number in range(newest_build_number, 0, -1)][start_index:end_index]}
+        return jenkins_utils
+
+    def test_fetch_job_builds_since_when_cursor_in_first_page_then_only_first_page_fetched(self):
+        jenkins_utils = self.get_jenkins_utils(250)
+        builds = fetch_job_builds_since(jenkins_utils, 'job/Test', 180)
+        self.assertEqual(list(range(250, 179, -1)), [build['number'] for build in builds])
+        jenkins_utils.get_jenkins_job_build_history_page_dict.assert_called_once_with('job/Test', 0,
+                                                                                      BUILD_HISTORY_PAGE_SIZE)
+
+    def test_fetch_job_builds_since_when_first_sync_then_pages_until_oldest_build(self):
+        jenkins_utils = self.get_jenkins_utils(250)
+        builds = fetch_job_builds_since(jenkins_utils, 'job/Test', 1)
+        self.assertEqual(250, len(builds))
+        self.assertEqual(3, jenkins_utils.get_jenkins_job_build_history_page_dict.call_count)
+
+
+if __name__ == '__main__':
+    unittest.main()
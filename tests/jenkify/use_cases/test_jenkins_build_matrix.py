@@ -0,0 +1,74 @@
+import unittest
+
+from jenkify.exceptions.build_matrix_exception import BuildMatrixException
+from jenkify.use_cases.jenkins_build_matrix import expand_build_matrices, get_build_matrix_combinations
+
+
+def get_build_jobs_dict(jobs: list) -> dict:
+    return {'build': {'hosts': [{'url': 'http://localhost:8080', 'jobs': jobs}]}}
+
+
+class BuildMatrixTestCase(unittest.TestCase):
+
+    def test_get_build_matrix_combinations_when_exclude_and_include_then_applied(self):
+        combinations = get_build_matrix_combinations({
+            'axes': [{'name': 'OS', 'values': ['linux', 'windows']}, {'name': 'PY', 'values': ['3.11', '3.12']}],
+            'exclude': [{'OS': 'windows', 'PY': '3.11'}],
+            'include': [{'OS': 'macos', 'PY': '3.12'}],
+        })
+        self.assertEqual([{'OS': 'linux', 'PY': '3.11'},
+                          {'OS': 'linux', 'PY': '3.12'},
+                          {'OS': 'windows', 'PY': '3.12'},
+                          {'OS': 'macos', 'PY': '3.12'}], combinations)
+
+    def test_get_build_matrix_combinations_when_axis_without_values_then_except(self):
+        with self.assertRaises(BuildMatrixException):
+            get_build_matrix_combinations({'axes': [{'name': 'OS', 'values': []}]})
+
+    def test_expand_build_matrices_when_matrix_then_jobs_per_combination(self):
+        build_jobs_dict = get_build_jobs_dict([{
+            'end': 'job/Test',
+            'build-parameters': [{'name': 'OS', 'value': 'any'}, {'name': 'MODE', 'value': 'fast'}],
+            'build-matrix': {'axes': [{'name': 'OS', 'values': ['linux', 'windows']}]},
+        }])
+        jobs = expand_build_matrices(build_jobs_dict)['build']['hosts'][0]['jobs']
+        self.assertEqual(['job/Test[OS=linux]', 'job/Test[OS=windows]'], [job['id'] for job in jobs])
+        self.assertEqual([{'name': 'MODE', 'value': 'fast'}, {'name': 'OS', 'value': 'windows'}],
+                         jobs[1]['build-parameters'])
+        self.assertNotIn('build-matrix', jobs[0])
+        self.assertIn('build-matrix', build_jobs_dict['build']['hosts'][0]['jobs'][0])
+
+    def test_expand_build_matrices_when_identical_triggers_then_collapsed_and_dependencies_aliased(self):
+        build_jobs_dict = get_build_jobs_dict([
+            {'end': 'job/Test', 'id': 'nightly', 'build-parameters': [{'name': 'OS', 'value': 'linux'}]},
+            {'end': 'job/Test', 'build-matrix': {'axes': [{'name': 'OS', 'values': ['linux', 'windows']}]}},
+            {'end': 'job/Deploy', 'depends-on': ['job/Test']},
+            {'end': 'job/Report', 'depends-on': ['nightly']},
+        ])
+        jobs = expand_build_matrices(build_jobs_dict)['build']['hosts'][0]['jobs']
+        self.assertEqual(['nightly', 'job/Test[OS=windows]', 'job/Deploy', 'job/Report'],
+                         [job.get('id', job['end']) for job in jobs])
+        self.assertEqual(['nightly', 'job/Test[OS=windows]'], jobs[2]['depends-on'])
+        self.assertEqual(['nightly'], jobs[3]['depends-on'])
+
+    def test_expand_build_matrices_when_identical_jobs_written_out_then_not_collapsed(self):
+        build_jobs_dict = get_build_jobs_dict([
+            {'end': 'job/Test', 'id': 'first', 'build-parameters': [{'name': 'OS', 'value': 'linux'}]},
+            {'end': 'job/Test', 'id': 'second', 'build-parameters': [{'name': 'OS', 'value': 'linux'}]},
+        ])
+        jobs = expand_build_matrices(build_jobs_dict)['build']['hosts'][0]['jobs']
+        self.assertEqual(['first', 'second'], [job['id'] for job in jobs])
+
+    def test_expand_build_matrices_when_user_input_differs_then_not_collapsed(self):
+        build_jobs_dict = get_build_jobs_dict([
+            {'end': 'job/Test', 'id': 'nightly', 'build-parameters': [{'name': 'OS', 'value': 'linux'}],
+             'user-input': [{'id': 'userInput', 'params': [{'name': 'Config', 'value': 'Test'}]}]},
+            {'end': 'job/Test', 'build-matrix': {'axes': [{'name': 'OS', 'values': ['linux']}]}},
+        ])
+        jobs = expand_build_matrices(build_jobs_dict)['build']['hosts'][0]['jobs']
+        self.assertEqual(['nightly', 'job/Test[OS=linux]'], [job['id'] for job in jobs])
+        self.assertIn('user-input', jobs[0])
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,70 @@
+import unittest
+
+from jenkify.use_cases.jenkins_build_reuse import find_reusable_build_number
+
+
+def get_build(number: int,
+              result: str | None,
+              revision: str | None,
+              parameters: dict,
+              *,
+              building: bool = False,
+              branch: str = 'origin/main') -> dict:
+    return {'number': number,
+            'result': result,
+            'building': building,
+            'timestamp': number * 1000,
+            'actions': [{},
+                        {'parameters': [{'name': name, 'value': value} for name, value in parameters.items()]},
+                        {'lastBuiltRevision': {'SHA1': revision, 'branch': [{'name': branch}]}}
+                        if revision is not None else {}]}
+
+
+def get_job_builds_dict(builds: list) -> dict:
+    return {'property': [{'parameterDefinitions': [{'name': 'MODE', 'defaultParameterValue': {'value': 'full'}},
+                                                   {'name': 'DRY_RUN', 'defaultParameterValue': {'value': False}}]}],
+            'builds': builds}
+
+
+class BuildReuseTestCase(unittest.TestCase):
+
+    def test_find_reusable_build_number_when_same_parameters_and_revision_then_latest_success(self):
+        job_builds_dict = get_job_builds_dict([
+            get_build(3, None, None, {'MODE': 'fast', 'DRY_RUN': False}, building=True),
+            get_build(2, 'SUCCESS', 'abc', {'MODE': 'fast', 'DRY_RUN': False}),
+            get_build(1, 'SUCCESS', 'abc', {'MODE': 'fast', 'DRY_RUN': False}),
+        ])
+        self.assertEqual(2, find_reusable_build_number(job_builds_dict, {'MODE': 'fast', 'DRY_RUN': 'false'}, 0))
+
+    def test_find_reusable_build_number_when_defaults_differ_then_none(self):
+        job_builds_dict = get_job_builds_dict([get_build(1, 'SUCCESS', 'abc', {'MODE': 'fast', 'DRY_RUN': False})])
+        self.assertIsNone(find_reusable_build_number(job_builds_dict, None, 0))
+
+    def test_find_reusable_build_number_when_newer_revision_built_then_none(self):
+        job_builds_dict = get_job_builds_dict([
+            get_build(2, 'FAILURE', 'def', {'MODE': 'full', 'DRY_RUN': False}),
+            get_build(1, 'SUCCESS', 'abc', {'MODE': 'full', 'DRY_RUN': False}),
+        ])
+        self.assertIsNone(find_reusable_build_number(job_builds_dict, None, 0))
+
+    def test_find_reusable_build_number_when_newer_revision_built_on_other_branch_then_reused(self):
+        job_builds_dict = get_job_builds_dict([
+            get_build(2, 'FAILURE', 'def', {'MODE': 'full', 'DRY_RUN': False}, branch='origin/feature'),
+            get_build(1, 'SUCCESS', 'abc', {'MODE': 'full', 'DRY_RUN': False}),
+        ])
+        self.assertEqual(1, find_reusable_build_number(job_builds_dict, None, 0))
+
+    def test_find_reusable_build_number_when_running_build_checked_out_newer_revision_then_none(self):
+        job_builds_dict = get_job_builds_dict([
+            get_build(2, None, 'def', {'MODE': 'full', 'DRY_RUN': False}, building=True),
+            get_build(1, 'SUCCESS', 'abc', {'MODE': 'full', 'DRY_RUN': False}),
+        ])
+        self.assertIsNone(find_reusable_build_number(job_builds_dict, None, 0))
+
+    def test_find_reusable_build_number_when_too_old_then_none(self):
+        job_builds_dict = get_job_builds_dict([get_build(1, 'SUCCESS', 'abc', {'MODE': 'full', 'DRY_RUN': False})])
+        self.assertIsNone(find_reusable_build_number(job_builds_dict, None, 2000))
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,71 @@
+import unittest
+from unittest.mock import MagicMock, patch
+
+import requests
+
+from jenkify.enums.host_preflight import HostPreflightStatus
+from jenkify.use_cases.jenkins_host_preflight import (
+    format_host_preflight_table,
+    get_failed_preflight_host_urls,
+    get_host_preflight,
+    preflight_jenkins_host,
+)
+
+HOST_URL = 'http://jenkins.example.invalid'
+
+
+def get_response(status_code: int, content: bytes = b'{}', headers: dict | None = None) -> MagicMock:
+    response = MagicMock()
+    response.status_code = status_code
+    response.content = content
+    response.headers = headers if headers is not None else {}
+    return response
+
+
+@patch('jenkify.use_cases.jenkins_host_preflight.Environment')
+@patch('jenkify.use_cases.jenkins_host_preflight.set_jenkins_crumb_headers')
+@patch('jenkify.use_cases.jenkins_host_preflight.make_request_based_on_input')
+class HostPreflightTestCase(unittest.TestCase):
+
+    def test_preflight_jenkins_host_when_crumb_issued_then_ok_and_crumb_kept(self, make_request, set_crumb_headers, _):
+        make_request.side_effect = [
+            get_response(200, headers={'X-Jenkins': '2.440.1'}),
+            get_response(200, b'{"crumbRequestField":"Jenkins-Crumb","crumb":"abc"}'),
+        ]
+        host_preflight = preflight_jenkins_host(HOST_URL)
+        self.assertEqual(HostPreflightStatus.OK, host_preflight['status'])
+        self.assertEqual('2.440.1', host_preflight['version'])
+        self.assertEqual('ok', host_preflight['crumb'])
+        set_crumb_headers.assert_called_once_with(HOST_URL, {'Jenkins-Crumb': 'abc'})
+
+    def test_preflight_jenkins_host_when_crumb_issuer_missing_then_ok_and_crumb_disabled(self, make_request, _, __):
+        make_request.side_effect = [get_response(200), get_response(404)]
+        host_preflight = preflight_jenkins_host(HOST_URL)
+        self.assertEqual(HostPreflightStatus.OK, host_preflight['status'])
+        self.assertEqual('disabled', host_preflight['crumb'])
+
+    def test_preflight_jenkins_host_when_401_then_unauthorized(self, make_request, _, __):
+        make_request.return_value = get_response(401)
+        self.assertEqual(HostPreflightStatus.UNAUTHORIZED, preflight_jenkins_host(HOST_URL)['status'])
+        self.assertEqual(1, make_request.call_count)
+
+    def test_preflight_jenkins_host_when_connection_error_then_unreachable(self, make_request, _, __):
+        make_request.side_effect = requests.exceptions.ConnectionError()
+        host_preflight = preflight_jenkins_host(HOST_URL)
+        self.assertEqual(HostPreflightStatus.UNREACHABLE, host_preflight['status'])
+        self.assertEqual('ConnectionError', host_preflight['detail'])
+
+    def test_format_host_preflight_table_when_hosts_then_row_per_host_and_failed_urls(self, _, __, ___):
+        host_preflights = [get_host_preflight(HOST_URL, HostPreflightStatus.OK, version='2.440.1', crumb='ok',
+                                              latency_millis=12),
+                           get_host_preflight('http://other.invalid', HostPreflightStatus.UNREACHABLE,
+                                              detail='ConnectTimeout')]
+        table_lines = format_host_preflight_table(host_preflights).splitlines()
+        self.assertEqual(3, len(table_lines))
+        self.assertTrue(table_lines[0].startswith('host'))
+        self.assertIn('unreachable', table_lines[2])
+        self.assertEqual({'http://other.invalid'}, get_failed_preflight_host_urls(host_preflights))
+
+
+if __name__ == '__main__':
+    unittest.main()
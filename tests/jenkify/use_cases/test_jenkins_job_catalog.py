@@ -0,0 +1,90 @@
+import asyncio
+import unittest
+from unittest.mock import patch
+
+from jenkify.exceptions.job_catalog_exception import JobCatalogException
+from jenkify.use_cases.jenkins_job_catalog import (
+    get_job_glob_regex,
+    index_jobs,
+    parse_folder_jobs,
+    resolve_build_job_selectors,
+)
+from jenkify.utils.jenkins.jenkins_job_catalog_store import JenkinsJobCatalogStore
+
+HOST_URL = 'http://localhost:8080'
+
+
+def get_folder_jobs(folder: dict, levels: int) -> list:
+    return [{'name': name, '_class': child} if isinstance(child, str) else
+            {'name': name, 'jobs': get_folder_jobs(child, levels - 1) if levels > 0 else
+             [{'name': grandchild_name} for grandchild_name in child]}
+            for name, child in folder.items()]
+
+
+class JenkinsJobCatalogTestCase(unittest.TestCase):
+
+    def test_parse_folder_jobs_when_nested_then_jobs_flattened_and_deepest_folders_returned(self):
+        folder_jobs = get_folder_jobs({'Build': 'FreeStyleProject',
+                                       'team a': {'deploy': 'WorkflowJob',
+                                                  'empty': {},
+                                                  'deep': {'job': 'WorkflowJob'}}},
+                                      1)
+        jobs, child_url_ends = parse_folder_jobs(folder_jobs, '', levels=2)
+        self.assertEqual([('job/Build', 'FreeStyleProject'), ('job/team%20a/job/deploy', 'WorkflowJob')], jobs)
+        self.assertEqual(['job/team%20a/job/deep'], child_url_ends)
+
+    def test_get_job_glob_regex_when_single_and_double_star_then_segment_and_path_wildcards(self):
+        self.assertEqual(r'job/team\-[^/]*/job/deploy\-.*', get_job_glob_regex('job/team-*/job/deploy-**'))
+
+    @patch('jenkify.use_cases.jenkins_job_catalog.Environment')
+    @patch('jenkify.use_cases.jenkins_job_catalog.JenkinsUtils')
+    def test_index_jobs_when_folder_removed_then_only_expired_crawled_and_stale_jobs_removed(self,
+                                                                                            jenkins_utils,
+                                                                                            _):
+        host_tree = {'top': {'a': {'b': {'c': {'job': 'WorkflowJob'}}}}}
+
+        def get_folder_jobs_dict(folder_url_end: str, jobs_tree: str) -> dict:
+            folder = host_tree
+            for name in folder_url_end.split('/')[1::2]:
+                folder = folder[name]
+            return {'jobs': get_folder_jobs(folder, jobs_tree.count('_class') - 1)}
+
+        jenkins_utils.return_value.get_jenkins_folder_jobs_dict.side_effect = get_folder_jobs_dict
+        jenkins_job_catalog_store = JenkinsJobCatalogStore(':memory:')
+        asyncio.run(index_jobs(jenkins_job_catalog_store, [HOST_URL]))
+        self.assertEqual(['job/top/job/a/job/b/job/c/job/job'], jenkins_job_catalog_store.get_job_url_ends(HOST_URL))
+        self.assertEqual({HOST_URL: {'queried': 0, 'failed': 0}},
+                         asyncio.run(index_jobs(jenkins_job_catalog_store, [HOST_URL])))
+        host_tree['top'] = {'other': 'WorkflowJob'}
+        self.assertEqual({HOST_URL: {'queried': 1, 'failed': 0}},
+                         asyncio.run(index_jobs(jenkins_job_catalog_store, [HOST_URL], ttl_minutes=0)))
+        self.assertEqual(['job/top/job/other'], jenkins_job_catalog_store.get_job_url_ends(HOST_URL))
+        self.assertEqual([''], list(jenkins_job_catalog_store.get_crawl_root_indexed_times(HOST_URL)))
+
+    def test_resolve_build_job_selectors_when_glob_and_regex_then_job_per_match(self):
+        jenkins_job_catalog_store = JenkinsJobCatalogStore(':memory:')
+        jenkins_job_catalog_store.replace_crawl_root(HOST_URL, '', parent_url_end=None, jobs=[
+            ('job/team-a/job/deploy-web', None),
+            ('job/team-a/job/deploy-api', None),
+            ('job/team-b/job/deploy-web', None),
+            ('job/team-b/job/build', None),
+        ], child_url_ends=[], indexed_at_seconds=0.0)
+        build_jobs_dict = {'build': {'hosts': [{'url': HOST_URL, 'jobs': [
+            {'end-glob': 'job/team-*/job/deploy-web', 'build-parameters': [{'name': 'MODE', 'value': 'fast'}]},
+            {'end-regex': 'job/team-a/job/deploy-(api|db)', 'id': 'api'},
+            {'end': 'job/Plain'},
+        ]}]}}
+        jobs = resolve_build_job_selectors(build_jobs_dict, jenkins_job_catalog_store)['build']['hosts'][0]['jobs']
+        self.assertEqual([{'build-parameters': [{'name': 'MODE', 'value': 'fast'}],
+                           'end': 'job/team-a/job/deploy-web'},
+                          {'build-parameters': [{'name': 'MODE', 'value': 'fast'}],
+                           'end': 'job/team-b/job/deploy-web'},
+                          {'id': 'api', 'end': 'job/team-a/job/deploy-api'},
+                          {'end': 'job/Plain'}], jobs)
+        build_jobs_dict['build']['hosts'][0]['jobs'][1]['end-regex'] = 'job/team-a/job/.*'
+        with self.assertRaises(JobCatalogException):
+            resolve_build_job_selectors(build_jobs_dict, jenkins_job_catalog_store)
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,52 @@
+import asyncio
+import unittest
+from unittest.mock import MagicMock, patch
+
+from jenkify.use_cases.jenkins_load_test import (
+    LOAD_TEST_MAX_FAILED_POLLS,
+    LoadTestHostLimits,
+    get_load_test_rate,
+    get_load_test_report,
+    run_load_test_build,
+)
+
+HOST_URL = 'http://localhost:8080'
+
+
+class LoadTestTestCase(unittest.TestCase):
+
+    def test_get_load_test_rate_when_ramping_then_linear_until_duration(self):
+        self.assertEqual([1.0, 2.0, 3.0, 3.0],
+                         [get_load_test_rate(elapsed_seconds, 10, 1.0, 3.0) for elapsed_seconds in (0, 5, 10, 20)])
+
+    def test_get_load_test_report_when_trigger_failed_then_excluded_from_latencies(self):
+        load_test_report = get_load_test_report([
+            {'host': HOST_URL, 'outcome': 'SUCCESS', 'trigger': 10, 'queue': 100, 'build': 1000, 'end-to-end': 1200},
+            {'host': HOST_URL, 'outcome': 'FAILURE', 'trigger': 30, 'queue': 300, 'build': 3000, 'end-to-end': 3400},
+            {'host': HOST_URL, 'outcome': 'TRIGGER_FAILED'},
+        ])
+        self.assertEqual(3, load_test_report[HOST_URL]['builds'])
+        self.assertEqual({'SUCCESS': 1, 'FAILURE': 1, 'TRIGGER_FAILED': 1}, load_test_report[HOST_URL]['outcomes'])
+        self.assertEqual(200, load_test_report[HOST_URL]['queue-millis']['p50'])
+        self.assertEqual(3400, load_test_report[HOST_URL]['end-to-end-millis']['max'])
+
+    @patch('jenkify.use_cases.jenkins_load_test.Environment')
+    @patch('jenkify.use_cases.jenkins_load_test.JenkinsUtils')
+    def test_run_load_test_build_when_build_deleted_then_lost(self, jenkins_utils_class, _):
+        jenkins_utils = jenkins_utils_class.return_value
+        jenkins_utils.trigger_jenkins_build_url_end.return_value = MagicMock(
+            headers={'Location': f'{HOST_URL}/queue/item/7/'})
+        jenkins_utils.get_jenkins_queue_item_dict.return_value = {'inQueueSince': 0, 'executable': {'number': 3}}
+        jenkins_utils.get_jenkins_build_dict_url_end_build_number.return_value = None
+
+        async def run_build() -> dict:
+            return await run_load_test_build(HOST_URL, 'job/Load', None, LoadTestHostLimits(4), 0.0)
+
+        load_test_build = asyncio.run(run_build())
+        self.assertEqual('LOST', load_test_build['outcome'])
+        self.assertEqual(LOAD_TEST_MAX_FAILED_POLLS,
+                         jenkins_utils.get_jenkins_build_dict_url_end_build_number.call_count)
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,56 @@
+import unittest
+from unittest.mock import patch
+
+from jenkify.use_cases.jenkins_test_results import JenkinsTestResultsSummary, fetch_build_test_results
+
+HOST_URL = 'http://localhost:8080'
+
+
+def get_failed_case(class_name: str, name: str) -> dict:
+    return {'className': class_name, 'name': name, 'status': 'FAILED', 'duration': 1.0, 'errorDetails': 'boom'}
+
+
+class JenkinsTestResultsTestCase(unittest.TestCase):
+
+    @patch('jenkify.use_cases.jenkins_test_results.Environment')
+    @patch('jenkify.use_cases.jenkins_test_results.JenkinsUtils')
+    def test_fetch_build_test_results_when_no_failures_then_report_not_fetched(self, jenkins_utils, _):
+        jenkins_utils.return_value.get_jenkins_build_test_counts_dict.return_value = {'actions': [
+            {}, None, {'failCount': 0, 'skipCount': 1, 'totalCount': 5}]}
+        self.assertEqual({'total': 5, 'failed': 0, 'skipped': 1, 'failed-cases': []},
+                         fetch_build_test_results(HOST_URL, 'job/TestJob', 1))
+        jenkins_utils.return_value.get_jenkins_build_test_report_dict.assert_not_called()
+
+    @patch('jenkify.use_cases.jenkins_test_results.Environment')
+    @patch('jenkify.use_cases.jenkins_test_results.JenkinsUtils')
+    def test_fetch_build_test_results_when_failures_then_only_failed_cases_kept(self, jenkins_utils, _):
+        jenkins_utils.return_value.get_jenkins_build_test_counts_dict.return_value = {'actions': [
+            {'failCount': 1, 'skipCount': 0, 'totalCount': 2}]}
+        jenkins_utils.return_value.get_jenkins_build_test_report_dict.return_value = {'suites': [{'cases': [
+            {'className': 'a.B', 'name': 'test_passing', 'status': 'PASSED'},
+            {'className': 'a.B', 'name': 'test_regressed', 'status': 'REGRESSION'},
+        ]}]}
+        build_test_results = fetch_build_test_results(HOST_URL, 'job/TestJob', 1)
+        self.assertEqual(['test_regressed'],
+                         [failed_case['name'] for failed_case in build_test_results['failed-cases']])
+
+    def test_summary_when_test_fails_in_several_builds_then_deduplicated_and_flaky_flagged(self):
+        test_results_summary = JenkinsTestResultsSummary()
+        test_results_summary.add(HOST_URL, 'job/TestJob', 2, {
+            'total': 3, 'failed': 2, 'skipped': 0,
+            'failed-cases': [get_failed_case('a.B', 'test_broken'), get_failed_case('a.B', 'test_flaky')]})
+        test_results_summary.add(HOST_URL, 'job/TestJob', 1, {
+            'total': 3, 'failed': 1, 'skipped': 0, 'failed-cases': [get_failed_case('a.B', 'test_broken')]})
+        test_results_summary.add(HOST_URL, 'job/NoTests', 1, None)
+        summary_dict = test_results_summary.get_summary_dict()
+        self.assertEqual(3, summary_dict['builds'])
+        self.assertEqual(2, summary_dict['builds-with-test-results'])
+        self.assertEqual([('test_broken', [1, 2], False), ('test_flaky', [2], True)],
+                         [(failed_test['name'], failed_test['failed-builds'][f'{HOST_URL}/job/TestJob'],
+                           failed_test['flaky']) for failed_test in summary_dict['failed-tests']])
+        testcases = test_results_summary.get_junit_xml_element().findall('testsuite/testcase')
+        self.assertEqual(['failure', 'flakyFailure'], [testcase[0].tag for testcase in testcases])
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,47 @@
+import os
+import shutil
+import socket
+import stat
+import tempfile
+import unittest
+
+import click
+
+from jenkify.utils.daemon.server import JenkifyDaemon, remove_stale_daemon_socket
+
+
+class RemoveStaleDaemonSocketTestCase(unittest.TestCase):
+
+    def setUp(self):
+        temp_dir = tempfile.mkdtemp()
+        self.addCleanup(shutil.rmtree, temp_dir)
+        self.socket_path = os.path.join(temp_dir, 'jenkify.sock')
+
+    def test_remove_stale_daemon_socket_when_nothing_listening_then_removed(self):
+        with socket.socket(socket.AF_UNIX, socket.SOCK_STREAM) as stale_socket:
+            stale_socket.bind(self.socket_path)
+        remove_stale_daemon_socket(self.socket_path)
+        self.assertFalse(os.path.exists(self.socket_path))
+
+    def test_remove_stale_daemon_socket_when_daemon_listening_then_except(self):
+        with socket.socket(socket.AF_UNIX, socket.SOCK_STREAM) as listening_socket:
+            listening_socket.bind(self.socket_path)
+            listening_socket.listen()
+            with self.assertRaises(click.ClickException):
+                remove_stale_daemon_socket(self.socket_path)
+        self.assertTrue(os.path.exists(self.socket_path))
+
+    def test_remove_stale_daemon_socket_when_not_socket_then_except(self):
+        with open(self.socket_path, 'w', encoding='utf-8'):
+            pass
+        with self.assertRaises(click.ClickException):
+            remove_stale_daemon_socket(self.socket_path)
+        self.assertTrue(os.path.exists(self.socket_path))
+
+    def test_daemon_when_bound_then_socket_only_accessible_to_owner(self):
+        with JenkifyDaemon(self.socket_path, click.Command('cli')):
+            self.assertEqual(0o600, stat.S_IMODE(os.stat(self.socket_path).st_mode))
+
+
+if __name__ == '__main__':
+    unittest.main()
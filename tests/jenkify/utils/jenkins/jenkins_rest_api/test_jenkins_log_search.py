@@ -0,0 +1,48 @@
+import re
+import unittest
+from unittest.mock import MagicMock, patch
+
+import requests
+
+from jenkify.utils.jenkins.jenkins_rest_api.jenkins_log_search import (
+    LogSearchPrinter,
+    search_build_console_output,
+    search_log_lines,
+)
+
+
+class SearchLogLinesTestCase(unittest.TestCase):
+
+    def test_search_log_lines_when_matches_apart_then_context_printed_in_separate_groups(self):
+        log_search_printer = MagicMock(spec=LogSearchPrinter)
+        lines = [b'one', b'ERROR two', b'three', b'four', b'five', b'ERROR six']
+        match_count = search_log_lines(lines, re.compile('error', re.IGNORECASE), 'job/Test#1', 1, log_search_printer)
+        self.assertEqual(2, match_count)
+        self.assertEqual([(1, '-', 'one'), (2, ':', 'ERROR two'), (3, '-', 'three'),
+                          (5, '-', 'five'), (6, ':', 'ERROR six')],
+                         [call.args[1:] for call in log_search_printer.print_line.call_args_list])
+        log_search_printer.print_group_separator.assert_called_once()
+
+
+class SearchBuildConsoleOutputTestCase(unittest.TestCase):
+
+    @patch('jenkify.utils.jenkins.jenkins_rest_api.jenkins_log_search.Environment')
+    @patch('jenkify.utils.jenkins.jenkins_rest_api.jenkins_log_search.JenkinsUtils')
+    def test_search_build_console_output_when_stream_cut_off_then_partial_search_reported(self, jenkins_utils, _):
+        def iter_lines():
+            yield b'ERROR one'
+            yield b'two'
+            raise requests.exceptions.ChunkedEncodingError('Connection broken')
+
+        response = jenkins_utils.return_value.get_jenkins_build_console_output_stream.return_value
+        response.iter_lines.return_value = iter_lines()
+        log_search_printer = MagicMock(spec=LogSearchPrinter)
+        with self.assertLogs(level='ERROR') as logs:
+            match_count = search_build_console_output('http://localhost:8080', 'job/Test', 1, re.compile('ERROR'),
+                                                      context_lines=0, log_search_printer=log_search_printer)
+        self.assertEqual(1, match_count)
+        self.assertIn('only its first 2 line(s) were searched', logs.output[0])
+
+
+if __name__ == '__main__':
+    unittest.main()
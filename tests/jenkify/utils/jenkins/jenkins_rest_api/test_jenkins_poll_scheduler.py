@@ -0,0 +1,82 @@
+import asyncio
+import unittest
+
+from jenkify.utils.jenkins.jenkins_rest_api.jenkins_poll_scheduler import JenkinsPollScheduler
+from jenkify.utils.request_deadline import start_request_deadline
+
+
+class CountingPollTarget:
+
+    def __init__(self, poll_count: int):
+        self.poll_times = []
+        self._poll_count = poll_count
+
+    async def poll(self) -> bool:
+        self.poll_times.append(asyncio.get_running_loop().time())
+        return len(self.poll_times) >= self._poll_count
+
+
+class FailingPollTarget:
+
+    async def poll(self) -> bool:
+        raise ValueError('Poll failed')
+
+
+class JenkinsPollSchedulerTestCase(unittest.TestCase):
+
+    def test_run_when_targets_then_first_polls_spread_and_polled_every_interval_until_done(self):
+        async def run_scheduler() -> tuple:
+            poll_targets = [CountingPollTarget(3), CountingPollTarget(2)]
+            poll_scheduler = JenkinsPollScheduler(0.2, max_concurrent_polls=1)
+            start_time = asyncio.get_running_loop().time()
+            poll_scheduler.schedule(poll_targets)
+            await poll_scheduler.run()
+            return start_time, poll_targets
+
+        start_time, poll_targets = asyncio.run(run_scheduler())
+        self.assertEqual([3, 2], [len(poll_target.poll_times) for poll_target in poll_targets])
+        for poll_target, first_due_offset in zip(poll_targets, (0.0, 0.1)):
+            for poll_index, poll_time in enumerate(poll_target.poll_times):
+                self.assertAlmostEqual(start_time + first_due_offset + 0.2 * poll_index, poll_time, delta=0.05)
+
+    def test_run_when_until_first_done_then_stopped_with_rest_still_scheduled(self):
+        async def run_scheduler() -> tuple:
+            poll_targets = [CountingPollTarget(1), CountingPollTarget(3)]
+            poll_scheduler = JenkinsPollScheduler(0.05)
+            poll_scheduler.schedule(poll_targets)
+            first_done_polls = await poll_scheduler.run(until_first_done=True)
+            polls_count_after_first_run = len(poll_targets[1].poll_times)
+            return poll_targets, first_done_polls, polls_count_after_first_run, await poll_scheduler.run()
+
+        poll_targets, first_done_polls, polls_count_after_first_run, second_done_polls = asyncio.run(run_scheduler())
+        self.assertEqual([poll_targets[0]], first_done_polls)
+        self.assertLess(polls_count_after_first_run, 3)
+        self.assertEqual([poll_targets[1]], second_done_polls)
+        self.assertEqual(3, len(poll_targets[1].poll_times))
+
+    def test_run_when_poll_raises_then_raised(self):
+        async def run_scheduler() -> None:
+            poll_scheduler = JenkinsPollScheduler(0.0)
+            poll_scheduler.schedule([CountingPollTarget(100), FailingPollTarget()])
+            await poll_scheduler.run()
+
+        with self.assertRaises(ValueError):
+            asyncio.run(run_scheduler())
+
+    def test_run_when_deadline_reached_then_stopped_before_targets_done(self):
+        async def run_scheduler() -> tuple:
+            start_request_deadline(0.3)
+            poll_target = CountingPollTarget(100)
+            poll_scheduler = JenkinsPollScheduler(0.1)
+            start_time = asyncio.get_running_loop().time()
+            poll_scheduler.schedule([poll_target])
+            await poll_scheduler.run()
+            return asyncio.get_running_loop().time() - start_time, poll_target
+
+        elapsed_seconds, poll_target = asyncio.run(run_scheduler())
+        self.assertAlmostEqual(0.3, elapsed_seconds, delta=0.1)
+        self.assertLess(len(poll_target.poll_times), 100)
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,162 @@
+import asyncio
+import contextvars
+import os
+import unittest
+from unittest.mock import MagicMock, patch
+
+from jenkify.enums.jenkins import JenkinsJobStatus
+from jenkify.exceptions.request_retry_exception import RequestRetryException
+from jenkify.utils.jenkins.jekins_request_settings import JenkinsRequestSettings
+from jenkify.utils.jenkins.jenkins_rest_api.jenkins_poll_scheduler import run_poll_scheduler
+from jenkify.utils.jenkins.jenkins_rest_api.jenkins_poll_status import (
+    JenkinsBuildPoll,
+    JenkinsJobRunsPoll,
+    track_multiple_build_job_statuses,
+)
+from jenkify.utils.request_deadline import start_request_deadline
+
+JENKINS_REQUEST_SETTINGS = JenkinsRequestSettings(
+    max_retry=1,
+    url='http://localhost:8080',
+    auth=('user', 'token'),
+)
+
+
+class PollJenkinsJobRunsTestCase(unittest.TestCase):
+
+    @patch('jenkify.utils.jenkins.jenkins_rest_api.jenkins_poll_status.get_job_runs_since_build_number')
+    def test_poll_job_runs_when_runs_finished_then_one_request_for_all_builds(self, get_job_runs):
+        get_job_runs.return_value = [
+            {'id': '12', 'status': 'FAILED', 'stages': [{'name': 'Build', 'status': 'FAILED'}]},
+            {'id': '11', 'status': 'SUCCESS', 'stages': []},
+        ]
+        job_runs_poll = JenkinsJobRunsPoll(JENKINS_REQUEST_SETTINGS, 'job/TestJob', {11: None, 12: None})
+        asyncio.run(run_poll_scheduler([job_runs_poll], 0))
+        statuses = job_runs_poll.statuses
+        get_job_runs.assert_called_once_with(JENKINS_REQUEST_SETTINGS, 'job/TestJob', 11)
+        self.assertEqual([JenkinsJobStatus.SUCCESS, JenkinsJobStatus.FAILURE],
+                         [status['status'] for status in statuses])
+        self.assertEqual([{'name': 'Build', 'status': 'FAILED'}], statuses[1]['stages'])
+
+    @patch('jenkify.utils.jenkins.jenkins_rest_api.jenkins_poll_status.get_job_runs_since_build_number')
+    def test_poll_job_runs_when_deadline_passed_then_running_builds_timed_out(self, get_job_runs):
+        get_job_runs.return_value = [
+            {'id': '12', 'status': 'IN_PROGRESS', 'stages': []},
+            {'id': '11', 'status': 'SUCCESS', 'stages': []},
+        ]
+        job_runs_poll = JenkinsJobRunsPoll(JENKINS_REQUEST_SETTINGS, 'job/TestJob', {11: None, 12: None})
+
+        async def poll_until_deadline_passed() -> None:
+            start_request_deadline(0.05)
+            await run_poll_scheduler([job_runs_poll], 0.01)
+
+        contextvars.copy_context().run(asyncio.run, poll_until_deadline_passed())
+        statuses = job_runs_poll.statuses
+        self.assertEqual([(11, JenkinsJobStatus.SUCCESS), (12, JenkinsJobStatus.TIMEOUT)],
+                         [(status['build_number'], status['status']) for status in statuses])
+
+    @patch('jenkify.utils.jenkins.jenkins_rest_api.jenkins_poll_status.JenkinsUtils')
+    @patch('jenkify.utils.jenkins.jenkins_rest_api.jenkins_poll_status.get_job_runs_since_build_number')
+    def test_time_out_when_build_polls_finished_then_statuses_not_duplicated(self, get_job_runs, jenkins_utils):
+        get_job_runs.side_effect = RequestRetryException('wfapi not found', 404)
+        jenkins_utils.return_value.get_jenkins_build_dict_url_end_build_number.return_value = {'result': 'SUCCESS'}
+        job_runs_poll = JenkinsJobRunsPoll(JENKINS_REQUEST_SETTINGS, 'job/Freestyle', {11: None, 12: None})
+        self.assertTrue(asyncio.run(job_runs_poll.poll()))
+        job_runs_poll.time_out()
+        self.assertEqual([(11, JenkinsJobStatus.SUCCESS), (12, JenkinsJobStatus.SUCCESS)],
+                         [(status['build_number'], status['status']) for status in job_runs_poll.statuses])
+
+    @patch('jenkify.utils.jenkins.jenkins_rest_api.jenkins_poll_status.JenkinsUtils')
+    @patch('jenkify.utils.jenkins.jenkins_rest_api.jenkins_poll_status.get_job_runs_since_build_number')
+    def test_poll_when_build_missing_from_runs_but_finished_then_api_json_status(self, get_job_runs, jenkins_utils):
+        get_job_runs.return_value = [{'id': '12', 'status': 'SUCCESS', 'stages': []}]
+        jenkins_utils.return_value.get_jenkins_build_dict_url_end_build_number.return_value = {'result': 'FAILURE'}
+        job_runs_poll = JenkinsJobRunsPoll(JENKINS_REQUEST_SETTINGS, 'job/TestJob', {11: None, 12: None})
+        self.assertTrue(asyncio.run(job_runs_poll.poll()))
+        jenkins_utils.return_value.get_jenkins_build_dict_url_end_build_number.assert_called_once_with(
+            'job/TestJob', 11)
+        self.assertEqual([(12, JenkinsJobStatus.SUCCESS), (11, JenkinsJobStatus.FAILURE)],
+                         [(status['build_number'], status['status']) for status in job_runs_poll.statuses])
+
+    @patch('jenkify.utils.jenkins.jenkins_rest_api.jenkins_poll_status.JenkinsUtils')
+    @patch('jenkify.utils.jenkins.jenkins_rest_api.jenkins_poll_status.get_job_runs_since_build_number')
+    def test_poll_when_runs_server_error_then_no_fall_back_to_build_polls(self, get_job_runs, jenkins_utils):
+        get_job_runs.side_effect = [RequestRetryException('server error', 503),
+                                    [{'id': '11', 'status': 'SUCCESS', 'stages': []}]]
+        job_runs_poll = JenkinsJobRunsPoll(JENKINS_REQUEST_SETTINGS, 'job/TestJob', {11: None})
+        self.assertFalse(asyncio.run(job_runs_poll.poll()))
+        self.assertTrue(asyncio.run(job_runs_poll.poll()))
+        jenkins_utils.return_value.get_jenkins_build_dict_url_end_build_number.assert_not_called()
+        self.assertEqual([(11, JenkinsJobStatus.SUCCESS)],
+                         [(status['build_number'], status['status']) for status in job_runs_poll.statuses])
+
+
+class JenkinsBuildPollTestCase(unittest.TestCase):
+
+    @patch('jenkify.utils.jenkins.jenkins_rest_api.jenkins_poll_status.JenkinsUtils')
+    def test_poll_when_build_finished_then_stage_progress_forgotten(self, jenkins_utils):
+        jenkins_utils.return_value.get_jenkins_build_dict_url_end_build_number.return_value = {'result': 'FAILURE'}
+        stage_progress_tracker = MagicMock()
+        build_poll = JenkinsBuildPoll(JENKINS_REQUEST_SETTINGS, 'job/TestJob', 11, None,
+                                      stage_progress_tracker=stage_progress_tracker)
+        self.assertTrue(asyncio.run(build_poll.poll()))
+        stage_progress_tracker.forget.assert_called_once_with(JENKINS_REQUEST_SETTINGS.url, 'job/TestJob', 11)
+
+
+class TrackMultipleBuildJobStatusesTestCase(unittest.TestCase):
+
+    @patch.dict(os.environ, {'POLL_RATE_SECONDS': '0'})
+    @patch('jenkify.utils.jenkins.jenkins_rest_api.jenkins_poll_status.JenkinsUtils')
+    @patch('jenkify.utils.jenkins.jenkins_rest_api.jenkins_poll_status.Environment')
+    @patch('jenkify.utils.jenkins.jenkins_rest_api.jenkins_poll_status.get_job_runs_since_build_number')
+    def test_track_when_fail_fast_and_abort_remaining_then_running_builds_aborted(self,
+                                                                                   get_job_runs,
+                                                                                   environment,
+                                                                                   jenkins_utils):
+        environment.get_jenkins_request_settings_for_host.return_value = JENKINS_REQUEST_SETTINGS
+        jenkins_utils.return_value.stop_jenkins_build_url_end.return_value = 200
+        get_job_runs.side_effect = lambda settings, url_end, since: (
+            [{'id': '1', 'status': 'FAILED', 'stages': []}] if url_end == 'job/Failing'
+            else [{'id': '2', 'status': 'IN_PROGRESS', 'stages': []}])
+        build_jobs_tracking_dict = {'build': {'hosts': [{'url': JENKINS_REQUEST_SETTINGS.url, 'jobs': [
+            {'end': 'job/Failing', 'build-index': 1},
+            {'end': 'job/Running', 'build-index': 2},
+        ]}]}}
+        asyncio.run(track_multiple_build_job_statuses(build_jobs_tracking_dict,
+                                                      fail_fast=True,
+                                                      abort_remaining=True))
+        jenkins_utils.return_value.stop_jenkins_build_url_end.assert_called_once_with('job/Running', 2)
+        self.assertEqual(['FAILURE', 'ABORTED'],
+                         [job['status'] for job in build_jobs_tracking_dict['build']['hosts'][0]['jobs']])
+
+    @patch.dict(os.environ, {'POLL_RATE_SECONDS': '0'})
+    @patch('jenkify.utils.jenkins.jenkins_rest_api.jenkins_poll_status.JenkinsUtils')
+    @patch('jenkify.utils.jenkins.jenkins_rest_api.jenkins_poll_status.Environment')
+    @patch('jenkify.utils.jenkins.jenkins_rest_api.jenkins_poll_status.get_job_runs_since_build_number')
+    def test_track_when_abort_remaining_and_build_queued_then_queue_item_cancelled(self,
+                                                                                    get_job_runs,
+                                                                                    environment,
+                                                                                    jenkins_utils):
+        environment.get_jenkins_request_settings_for_host.return_value = JENKINS_REQUEST_SETTINGS
+        jenkins_utils.return_value.stop_jenkins_build_url_end.return_value = 404
+        jenkins_utils.return_value.get_jenkins_queue_dict.return_value = {'items': [
+            {'id': 31, 'task': {'url': f'{JENKINS_REQUEST_SETTINGS.url}/job/Other/'}},
+            {'id': 30, 'task': {'url': f'{JENKINS_REQUEST_SETTINGS.url}/job/Queued/'}},
+        ]}
+        jenkins_utils.return_value.cancel_jenkins_queue_item.return_value = 200
+        get_job_runs.side_effect = lambda settings, url_end, since: (
+            [{'id': '1', 'status': 'FAILED', 'stages': []}] if url_end == 'job/Failing' else [])
+        build_jobs_tracking_dict = {'build': {'hosts': [{'url': JENKINS_REQUEST_SETTINGS.url, 'jobs': [
+            {'end': 'job/Failing', 'build-index': 1},
+            {'end': 'job/Queued', 'build-index': 2},
+        ]}]}}
+        asyncio.run(track_multiple_build_job_statuses(build_jobs_tracking_dict,
+                                                      fail_fast=True,
+                                                      abort_remaining=True))
+        jenkins_utils.return_value.cancel_jenkins_queue_item.assert_called_once_with(30)
+        self.assertEqual(['FAILURE', 'ABORTED'],
+                         [job['status'] for job in build_jobs_tracking_dict['build']['hosts'][0]['jobs']])
+
+
+if __name__ == '__main__':
+    unittest.main()
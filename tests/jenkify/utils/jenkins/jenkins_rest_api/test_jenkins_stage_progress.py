@@ -0,0 +1,32 @@
+import unittest
+
+from jenkify.utils.jenkins.jenkins_rest_api.jenkins_stage_progress import JenkinsStageProgressTracker
+
+HOST_URL = 'http://localhost:8080'
+
+
+class JenkinsStageProgressTrackerTestCase(unittest.TestCase):
+
+    def test_update_when_polled_repeatedly_then_only_changes_reported(self):
+        stage_progress_tracker = JenkinsStageProgressTracker()
+        first_changes = stage_progress_tracker.update(HOST_URL, 'job/Test', 1, [
+            {'id': '6', 'name': 'Build', 'status': 'SUCCESS'},
+            {'id': '12', 'name': 'Test', 'status': 'IN_PROGRESS'},
+        ])
+        second_changes = stage_progress_tracker.update(HOST_URL, 'job/Test', 1, [
+            {'id': '6', 'name': 'Build', 'status': 'SUCCESS'},
+            {'id': '12', 'name': 'Test', 'status': 'IN_PROGRESS'},
+        ])
+        third_changes = stage_progress_tracker.update(HOST_URL, 'job/Test', 1, [
+            {'id': '6', 'name': 'Build', 'status': 'SUCCESS'},
+            {'id': '12', 'name': 'Test', 'status': 'FAILED'},
+            {'id': '20', 'name': 'Deploy', 'status': 'NOT_EXECUTED'},
+        ])
+        self.assertEqual(['Build', 'Test'], [stage['name'] for stage in first_changes])
+        self.assertEqual([], second_changes)
+        self.assertEqual([('Test', 'FAILED'), ('Deploy', 'NOT_EXECUTED')],
+                         [(stage['name'], stage['status']) for stage in third_changes])
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,33 @@
+import unittest
+from unittest.mock import MagicMock
+
+from jenkify.utils.jenkins.jenkins_rest_api.jenkins_user_input_tracker import JenkinsUserInputTracker
+
+USER_INPUT = [
+    {'id': 'userInput', 'params': [{'name': 'Config', 'value': 'Test'}]},
+    {'id': 'otherInput', 'params': [{'name': 'Other', 'value': 'Value'}]},
+]
+
+
+class JenkinsUserInputTrackerTestCase(unittest.TestCase):
+
+    def test_submit_pending_user_input_when_polled_twice_then_submitted_once(self):
+        jenkins_utils = MagicMock()
+        jenkins_utils.get_jenkins_build_pending_input_actions.return_value = [{'id': 'UserInput'}]
+        user_input_tracker = JenkinsUserInputTracker(jenkins_utils)
+        self.assertEqual(['UserInput'], user_input_tracker.submit_pending_user_input('job/TestJob', 2, USER_INPUT))
+        self.assertEqual([], user_input_tracker.submit_pending_user_input('job/TestJob', 2, USER_INPUT))
+        jenkins_utils.simulate_jenkins_job_user_input.assert_called_once_with(
+            'job/TestJob', 2, 'UserInput', [USER_INPUT[0]])
+        self.assertEqual(['UserInput'], user_input_tracker.get_submitted_input_ids(2))
+
+    def test_submit_pending_user_input_when_already_recorded_then_not_submitted(self):
+        jenkins_utils = MagicMock()
+        jenkins_utils.get_jenkins_build_pending_input_actions.return_value = [{'id': 'UserInput'}]
+        user_input_tracker = JenkinsUserInputTracker(jenkins_utils, {2: ['UserInput']})
+        self.assertEqual([], user_input_tracker.submit_pending_user_input('job/TestJob', 2, USER_INPUT))
+        jenkins_utils.simulate_jenkins_job_user_input.assert_not_called()
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,39 @@
+import unittest
+from unittest.mock import MagicMock, patch
+
+from jenkify.enums.http_request_methods import HttpRequestMethod
+from jenkify.exceptions.request_retry_exception import RequestRetryException
+from jenkify.utils.jenkins.jekins_request_settings import JenkinsRequestSettings
+from jenkify.utils.jenkins.jenkins_crumbs import request_with_jenkins_crumb, set_jenkins_crumb_headers
+
+HOST_URL = 'http://crumbs.jenkify-test.invalid'
+
+
+@patch('jenkify.utils.jenkins.jenkins_crumbs.JsonUtils')
+@patch('jenkify.utils.jenkins.jenkins_crumbs.request_retry')
+class JenkinsCrumbsTestCase(unittest.TestCase):
+
+    def test_request_with_jenkins_crumb_when_forbidden_then_fresh_crumb_and_retried_once(self, request_retry,
+                                                                                         json_utils):
+        set_jenkins_crumb_headers(HOST_URL, {'Jenkins-Crumb': 'expired'})
+        json_utils.get_json_response.return_value = {'crumbRequestField': 'Jenkins-Crumb', 'crumb': 'fresh'}
+        response = MagicMock(status_code=201)
+        request_retry.side_effect = [RequestRetryException('Forbidden', 403), response]
+        self.assertIs(response, request_with_jenkins_crumb(JenkinsRequestSettings(HOST_URL, ('user', 'token'), 1),
+                                                           HttpRequestMethod.POST,
+                                                           f'{HOST_URL}/job/a/build'))
+        self.assertEqual({'Jenkins-Crumb': 'fresh'}, request_retry.call_args.args[3].headers)
+
+    def test_request_with_jenkins_crumb_when_other_failure_then_not_retried(self, request_retry, json_utils):
+        set_jenkins_crumb_headers(HOST_URL, {'Jenkins-Crumb': 'valid'})
+        request_retry.side_effect = RequestRetryException('Server error', 500)
+        with self.assertRaises(RequestRetryException):
+            request_with_jenkins_crumb(JenkinsRequestSettings(HOST_URL, ('user', 'token'), 1),
+                                       HttpRequestMethod.POST,
+                                       f'{HOST_URL}/job/a/build')
+        self.assertEqual(1, request_retry.call_count)
+        json_utils.get_json_response.assert_not_called()
+
+
+if __name__ == '__main__':
+    unittest.main()
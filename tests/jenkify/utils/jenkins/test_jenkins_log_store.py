@@ -0,0 +1,30 @@
+import gzip
+import os
+import tempfile
+import unittest
+
+from jenkify.utils.jenkins.jenkins_log_store import JenkinsBuildLogStore
+
+HOST_URL = 'http://localhost:8080'
+
+
+class JenkinsBuildLogStoreTestCase(unittest.TestCase):
+
+    def test_get_build_log_lines_when_range_spans_blocks_then_lines_returned(self):
+        with tempfile.TemporaryDirectory() as store_directory:
+            log_store = JenkinsBuildLogStore(store_directory, lines_per_block=3)
+            log_store.store_build_log(HOST_URL, 'job/Test', 1, (f'line {number}'.encode() for number in range(1, 11)))
+            self.assertTrue(log_store.has_build_log(HOST_URL, 'job/Test', 1))
+            self.assertEqual(10, log_store.get_build_log_line_count(HOST_URL, 'job/Test', 1))
+            self.assertEqual(['line 3', 'line 4', 'line 5', 'line 6', 'line 7'],
+                             log_store.get_build_log_lines(HOST_URL, 'job/Test', 1, 3, 7))
+            self.assertEqual(['line 10'], log_store.get_build_log_lines(HOST_URL, 'job/Test', 1, 10))
+            log_path, = [os.path.join(directory, file_name)
+                         for directory, _, file_names in os.walk(store_directory)
+                         for file_name in file_names if file_name.endswith('.log.gz')]
+            with gzip.open(log_path, 'rt') as log_file:
+                self.assertEqual(10, len(log_file.read().splitlines()))
+
+
+if __name__ == '__main__':
+    unittest.main()
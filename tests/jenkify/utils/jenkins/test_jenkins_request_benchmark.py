@@ -0,0 +1,39 @@
+import unittest
+
+from jenkify.utils.jenkins.jekins_request_settings import JenkinsRequestSettings
+from jenkify.utils.jenkins.jenkins_request_benchmark import (
+    BENCHMARK_BUILD_HOST_URL,
+    BENCHMARK_URL_END,
+    benchmark_request_overhead,
+    get_over_budget_endpoints,
+)
+from jenkify.utils.jenkins.jenkins_rest_api.jenkins_utils import JenkinsUtils
+from jenkify.utils.jenkins.jenkins_request_templates import JOB_RUNS_SINCE_PATH, get_jenkins_request_template
+
+
+class JenkinsRequestBenchmarkTestCase(unittest.TestCase):
+
+    def test_get_jenkins_request_template_when_same_host_and_endpoint_then_built_once(self):
+        jenkins_request_template = get_jenkins_request_template(
+            JenkinsRequestSettings('http://localhost:8080', ('user', 'token'), 1), JOB_RUNS_SINCE_PATH)
+        self.assertIs(jenkins_request_template, get_jenkins_request_template(
+            JenkinsRequestSettings('http://localhost:8080', ('user', 'token'), 1), JOB_RUNS_SINCE_PATH))
+        self.assertEqual('http://localhost:8080/job/a%20b/wfapi/runs?since=%2312',
+                         jenkins_request_template.get_url('job/a%20b', 12))
+        with self.assertRaises(ValueError):
+            get_jenkins_request_template(JenkinsRequestSettings('http://localhost:8080', ('user', 'token'), 0),
+                                         JOB_RUNS_SINCE_PATH)
+
+    def test_benchmark_request_overhead_when_polling_endpoints_then_each_measured(self):
+        cpu_micros_per_request = benchmark_request_overhead(50)
+        self.assertEqual(['build api/json', 'wfapi/runs'], list(cpu_micros_per_request))
+        self.assertTrue(all(cpu_micros >= 0 for cpu_micros in cpu_micros_per_request.values()))
+        self.assertTrue(JenkinsUtils(JenkinsRequestSettings(BENCHMARK_BUILD_HOST_URL, ('user', 'token'), 1))
+                        .get_jenkins_build_dict_url_end_build_number(BENCHMARK_URL_END, 1)['building'])
+
+    def test_get_over_budget_endpoints_when_some_exceed_then_only_those(self):
+        self.assertEqual(['wfapi/runs'],
+                         get_over_budget_endpoints({'build api/json': 40.0, 'wfapi/runs': 120.5}, 100))
+
+if __name__ == '__main__':
+    unittest.main()
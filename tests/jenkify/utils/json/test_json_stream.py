@@ -0,0 +1,53 @@
+import json
+import unittest
+
+from jenkify.utils.json.json_stream import JsonChunkReader, iter_json_array_items
+
+RUNS = [{'id': '12', 'status': 'SUCCESS', 'name': 'Ünïcode'}, 1234, 'text', [1, 2], None]
+
+
+class IterJsonArrayItemsTestCase(unittest.TestCase):
+
+    def test_iter_json_array_items_when_chunks_split_items_then_items_decoded(self):
+        content = json.dumps(RUNS, ensure_ascii=False).encode('utf-8')
+        chunks = [content[offset:offset + 3] for offset in range(0, len(content), 3)]
+        self.assertEqual(RUNS, list(iter_json_array_items(chunks)))
+
+    def test_iter_json_array_items_when_limit_then_remaining_chunks_unread(self):
+        chunks = iter([b'[{"id": "12"}, ', b'{"id": "11"}, ', b'{"id": "10"}]'])
+        self.assertEqual([{'id': '12'}], list(iter_json_array_items(chunks, limit=1)))
+        self.assertEqual(b'{"id": "11"}, ', next(chunks))
+
+    def test_iter_json_array_items_when_empty_array_then_no_items(self):
+        self.assertEqual([], list(iter_json_array_items([b' [', b' ] '])))
+
+    def test_iter_json_array_items_when_separator_missing_then_value_error(self):
+        with self.assertRaises(ValueError):
+            list(iter_json_array_items([b'[1 2]']))
+        with self.assertRaises(ValueError):
+            list(iter_json_array_items([b'[{"id": "12"}', b'{"id": "11"}]']))
+
+    def test_iter_json_array_items_when_not_array_then_value_error(self):
+        with self.assertRaises(ValueError):
+            list(iter_json_array_items([b'{"builds": []}']))
+
+
+class JsonChunkReaderTestCase(unittest.TestCase):
+
+    def test_read_value_when_value_spans_many_chunks_then_decoded_logarithmically_often(self):
+        content = json.dumps(list(range(1000))).encode('utf-8')
+        json_decoder = json.JSONDecoder()
+        raw_decode_calls = []
+
+        def raw_decode(buffer: str, position: int) -> tuple:
+            raw_decode_calls.append(position)
+            return json.JSONDecoder.raw_decode(json_decoder, buffer, position)
+
+        json_decoder.raw_decode = raw_decode
+        json_chunk_reader = JsonChunkReader(content[offset:offset + 4] for offset in range(0, len(content), 4))
+        self.assertEqual(list(range(1000)), json_chunk_reader.read_value(json_decoder))
+        self.assertLess(len(raw_decode_calls), 20)
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,37 @@
+import os
+import tempfile
+import unittest
+
+import requests
+
+from jenkify.enums.http_request_methods import HttpRequestMethod
+from jenkify.utils.http_cassette import HttpCassette, HttpCassetteMissException
+
+URL = 'http://localhost:8080/job/Test/wfapi/runs'
+
+
+class HttpCassetteTestCase(unittest.TestCase):
+
+    def test_replay_when_recorded_then_responses_served_in_order_and_last_repeated(self):
+        with tempfile.TemporaryDirectory() as cassette_directory:
+            cassette_path = os.path.join(cassette_directory, 'cassette.ndjson.gz')
+            recording_cassette = HttpCassette(cassette_path, replaying=False)
+            for body in (b'[{"status": "IN_PROGRESS"}]', b'[{"status": "SUCCESS"}]'):
+                response = requests.Response()
+                response.status_code = 200
+                response.reason = 'OK'
+                response.headers['Content-Type'] = 'application/json'
+                response._content = body
+                recording_cassette.record(HttpRequestMethod.GET, URL, response, 0.5)
+            recording_cassette.close()
+            replaying_cassette = HttpCassette(cassette_path, replaying=True, latency_scale=0)
+            self.assertEqual([{'status': 'IN_PROGRESS'}], replaying_cassette.replay(HttpRequestMethod.GET, URL).json())
+            self.assertEqual([{'status': 'SUCCESS'}], replaying_cassette.replay(HttpRequestMethod.GET, URL).json())
+            self.assertEqual([{'status': 'SUCCESS'}], replaying_cassette.replay(HttpRequestMethod.GET, URL).json())
+            with self.assertRaises(HttpCassetteMissException):
+                replaying_cassette.replay(HttpRequestMethod.POST, URL)
+            self.assertEqual((4, 1), (replaying_cassette.request_count, replaying_cassette.miss_count))
+
+
+if __name__ == '__main__':
+    unittest.main()
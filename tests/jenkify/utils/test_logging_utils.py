@@ -0,0 +1,25 @@
+import logging
+import unittest
+
+from jenkify.utils.logging_utils import set_logger_level_to_handlers
+
+
+class LoggingUtilsTestCase(unittest.TestCase):
+
+    def test_set_logger_level_to_handlers_when_info_handler_then_debug_disabled(self):
+        logger = logging.Logger('jenkify-test', logging.DEBUG)
+        logger.addHandler(logging.NullHandler(logging.INFO))
+        set_logger_level_to_handlers(logger)
+        self.assertFalse(logger.isEnabledFor(logging.DEBUG))
+        self.assertTrue(logger.isEnabledFor(logging.INFO))
+
+    def test_set_logger_level_to_handlers_when_debug_handler_added_then_debug_enabled(self):
+        logger = logging.Logger('jenkify-test', logging.INFO)
+        logger.addHandler(logging.NullHandler(logging.INFO))
+        logger.addHandler(logging.NullHandler(logging.DEBUG))
+        set_logger_level_to_handlers(logger)
+        self.assertTrue(logger.isEnabledFor(logging.DEBUG))
+
+
+if __name__ == '__main__':
+    unittest.main()
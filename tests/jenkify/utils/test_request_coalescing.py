@@ -0,0 +1,89 @@
+import asyncio
+import threading
+import time
+import unittest
+from concurrent.futures import ThreadPoolExecutor
+from unittest.mock import MagicMock, patch
+
+from jenkify.exceptions.deadline_exceeded_exception import DeadlineExceededException
+from jenkify.utils.http_request_settings import HttpRequestSettings
+from jenkify.utils.json.JsonUtils import JsonUtils
+from jenkify.utils.request_coalescing import coalesce_request, get_request_coalescing_counts
+from jenkify.utils.request_deadline import start_request_deadline
+
+
+class RequestCoalescingTestCase(unittest.TestCase):
+
+    @patch('jenkify.utils.json.JsonUtils.request_retry')
+    def test_get_json_response_when_identical_concurrent_requests_then_one_request_shared(self, request_retry):
+        def slow_request(*_) -> MagicMock:
+            time.sleep(0.2)
+            return MagicMock(content=b'{"result": "SUCCESS"}')
+
+        async def get_build_dicts() -> list:
+            return await asyncio.gather(*[asyncio.to_thread(JsonUtils.get_json_response,
+                                                            'http://localhost:8080/job/TestJob/1/api/json',
+                                                            1,
+                                                            HttpRequestSettings(auth=('user', 'token')))
+                                          for _ in range(4)])
+
+        request_retry.side_effect = slow_request
+        coalesced_count = get_request_coalescing_counts()['coalesced']
+        build_dicts = asyncio.run(get_build_dicts())
+        request_retry.assert_called_once()
+        self.assertEqual([{'result': 'SUCCESS'}] * 4, build_dicts)
+        self.assertEqual(coalesced_count + 3, get_request_coalescing_counts()['coalesced'])
+
+    def test_coalesce_when_request_fails_then_waiting_requests_raise_its_exception(self):
+        request_started = threading.Event()
+        release_request = threading.Event()
+
+        def failing_request() -> None:
+            request_started.set()
+            release_request.wait()
+            raise ValueError('Request failed')
+
+        with ThreadPoolExecutor(max_workers=2) as executor:
+            leading_future = executor.submit(coalesce_request, ('GET', 'http://localhost:8080/failing'),
+                                             failing_request)
+            request_started.wait()
+            waiting_future = executor.submit(coalesce_request, ('GET', 'http://localhost:8080/failing'),
+                                             failing_request)
+            time.sleep(0.1)
+            release_request.set()
+            for request_future in (leading_future, waiting_future):
+                with self.assertRaises(ValueError):
+                    request_future.result()
+
+    def test_coalesce_when_waiting_past_own_deadline_then_deadline_exceeded(self):
+        request_started = threading.Event()
+        release_request = threading.Event()
+
+        def slow_request() -> str:
+            request_started.set()
+            release_request.wait()
+            return 'result'
+
+        def wait_with_deadline() -> str:
+            start_request_deadline(0.1)
+            return coalesce_request(('GET', 'http://localhost:8080/slow'), slow_request)
+
+        with ThreadPoolExecutor(max_workers=2) as executor:
+            leading_future = executor.submit(coalesce_request, ('GET', 'http://localhost:8080/slow'), slow_request)
+            request_started.wait()
+            waiting_future = executor.submit(wait_with_deadline)
+            with self.assertRaises(DeadlineExceededException):
+                waiting_future.result(timeout=5)
+            release_request.set()
+            self.assertEqual('result', leading_future.result())
+
+    def test_coalesce_when_different_or_sequential_requests_then_not_coalesced(self):
+        request_function = MagicMock(side_effect=lambda url: url)
+        self.assertEqual('a', coalesce_request(('GET', 'a'), request_function, 'a'))
+        self.assertEqual('b', coalesce_request(('GET', 'b'), request_function, 'b'))
+        self.assertEqual('a', coalesce_request(('GET', 'a'), request_function, 'a'))
+        self.assertEqual(3, request_function.call_count)
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,45 @@
+import contextvars
+import unittest
+from unittest.mock import patch
+
+from jenkify.enums.http_request_methods import HttpRequestMethod
+from jenkify.exceptions.deadline_exceeded_exception import DeadlineExceededException
+from jenkify.utils.http_request_settings import HttpRequestSettings
+from jenkify.utils.request_deadline import get_request_timeout, start_request_deadline
+from jenkify.utils.request_retry import request_retry
+
+
+def run_with_deadline(deadline_seconds: float, function, *args):
+    """Runs the function with a deadline set in a copy of the current context, leaving the other tests without one"""
+    def run() -> object:
+        start_request_deadline(deadline_seconds)
+        return function(*args)
+    return contextvars.copy_context().run(run)
+
+
+class RequestDeadlineTestCase(unittest.TestCase):
+
+    def test_get_request_timeout_when_no_deadline_then_own_timeout(self):
+        self.assertEqual(10, get_request_timeout(10))
+
+    def test_get_request_timeout_when_deadline_sooner_then_capped_to_remaining_time(self):
+        self.assertLessEqual(run_with_deadline(2.0, get_request_timeout, 10), 2.0)
+        self.assertEqual(1, run_with_deadline(60.0, get_request_timeout, 1))
+
+    def test_get_request_timeout_when_deadline_passed_then_raised(self):
+        with self.assertRaises(DeadlineExceededException):
+            run_with_deadline(0.0, get_request_timeout, 10)
+
+    @patch('jenkify.utils.request_retry.time.sleep')
+    @patch('jenkify.utils.request_retry.make_request_based_on_input')
+    def test_request_retry_when_deadline_before_next_try_then_retries_stopped(self, make_request, sleep):
+        make_request.return_value = None
+        with self.assertRaises(DeadlineExceededException):
+            run_with_deadline(1.5, request_retry, HttpRequestMethod.GET, 'http://localhost:8080', 5,
+                              HttpRequestSettings())
+        make_request.assert_called_once()
+        sleep.assert_not_called()
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,69 @@
+import threading
+import time
+import unittest
+from unittest.mock import MagicMock
+
+from jenkify.utils.request_hedging import (
+    HEDGE_MIN_LATENCY_SAMPLES,
+    RequestHedgingPolicy,
+    get_host_request_hedger,
+    send_hedged_request,
+)
+
+
+class SlowFirstRequestSender:
+    """Sends requests answering the first one after a delay and the following ones immediately"""
+
+    def __init__(self, first_delay_seconds: float):
+        self.responses = []
+        self._first_delay_seconds = first_delay_seconds
+        self._lock = threading.Lock()
+
+    def __call__(self, http_session, url: str, request_settings, timeout: float):
+        with self._lock:
+            response = MagicMock()
+            self.responses.append(response)
+            is_first = len(self.responses) == 1
+        if is_first:
+            time.sleep(self._first_delay_seconds)
+        return response
+
+
+def add_fast_latencies(host_url: str) -> None:
+    for _ in range(HEDGE_MIN_LATENCY_SAMPLES):
+        get_host_request_hedger(host_url).add_latency(0.01)
+
+
+class RequestHedgingTestCase(unittest.TestCase):
+
+    def test_send_when_request_slower_than_percentile_then_hedge_answers_first(self):
+        host_url = 'http://hedged.localhost'
+        add_fast_latencies(host_url)
+        send_request = SlowFirstRequestSender(1.0)
+        start_time = time.perf_counter()
+        response = send_hedged_request(RequestHedgingPolicy(95.0, budget_percent=100.0), send_request, None,
+                                       f'{host_url}/job/TestJob/1/api/json', request_settings=None, timeout=10.0)
+        self.assertLess(time.perf_counter() - start_time, 0.5)
+        self.assertIs(send_request.responses[1], response)
+        self.assertEqual(1, get_host_request_hedger(host_url).hedge_win_count)
+
+    def test_send_when_budget_spent_then_not_hedged(self):
+        host_url = 'http://over-budget.localhost'
+        add_fast_latencies(host_url)
+        send_request = SlowFirstRequestSender(0.2)
+        response = send_hedged_request(RequestHedgingPolicy(95.0, budget_percent=0.0), send_request, None,
+                                       f'{host_url}/job/TestJob/1/api/json', request_settings=None, timeout=10.0)
+        self.assertEqual([response], send_request.responses)
+        self.assertEqual(0, get_host_request_hedger(host_url).hedge_count)
+
+    def test_send_when_too_few_latencies_then_not_hedged(self):
+        host_url = 'http://cold.localhost'
+        send_request = SlowFirstRequestSender(0.2)
+        send_hedged_request(RequestHedgingPolicy(50.0, budget_percent=100.0), send_request, None,
+                            f'{host_url}/job/TestJob/1/api/json', request_settings=None, timeout=10.0)
+        self.assertEqual(1, len(send_request.responses))
+        self.assertEqual(0, get_host_request_hedger(host_url).hedge_count)
+
+
+if __name__ == '__main__':
+    unittest.main()